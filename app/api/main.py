@@ -15,6 +15,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.config import APIConfig
 from app.api.middleware.auth import AuthMiddleware
+from app.api.middleware.loaders import LoadersMiddleware
 from app.api.v1.router import api_v1_router
 
 
@@ -42,6 +43,9 @@ def create_api_app() -> FastAPI:
     # Middleware de autenticacion
     app.add_middleware(AuthMiddleware)
 
+    # Alcance de DataLoaders por request (batching de lecturas por ID)
+    app.add_middleware(LoadersMiddleware)
+
     # Router v1
     app.include_router(api_v1_router, prefix="/api/v1")
 
@@ -1,4 +1,5 @@
 """Middleware de la API."""
 from app.api.middleware.auth import AuthMiddleware
+from app.api.middleware.loaders import LoadersMiddleware
 
-__all__ = ["AuthMiddleware"]
+__all__ = ["AuthMiddleware", "LoadersMiddleware"]
@@ -0,0 +1,23 @@
+"""
+Middleware que abre un alcance de DataLoaders por request.
+
+Dentro del request, `repo.loader().cargar(id)` concurrentes se agrupan en
+una sola query y cada ID se memoriza hasta que termina la respuesta.
+Middleware ASGI puro: no envuelve el body ni cambia de tarea.
+"""
+from app.repositories.shared import alcance_loaders
+
+
+class LoadersMiddleware:
+    """Envuelve cada request HTTP en `alcance_loaders()`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with alcance_loaders():
+            await self.app(scope, receive, send)
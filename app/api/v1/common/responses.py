@@ -12,7 +12,12 @@ def ok(data: T, total: int = 1, message: str | None = None) -> APIResponse[T]:
     return APIResponse(success=True, data=data, total=total, message=message)
 
 
-def ok_list(items: Sequence[T] | Iterable[T], total: int | None = None, message: str | None = None) -> APIListResponse[T]:
+def ok_list(
+    items: Sequence[T] | Iterable[T],
+    total: int | None = None,
+    message: str | None = None,
+    siguiente_cursor: str | None = None,
+) -> APIListResponse[T]:
     """Crea respuesta APIListResponse exitosa."""
     data = list(items)
     return APIListResponse(
@@ -20,4 +25,5 @@ def ok_list(items: Sequence[T] | Iterable[T], total: int | None = None, message:
         data=data,
         total=len(data) if total is None else total,
         message=message,
+        siguiente_cursor=siguiente_cursor,
     )
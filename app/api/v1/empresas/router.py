@@ -6,6 +6,8 @@ No duplican logica de negocio.
 """
 import logging
 
+from typing import Optional
+
 from fastapi import APIRouter, Query
 
 from app.services import empresa_service
@@ -27,29 +29,36 @@ router = APIRouter(prefix="/empresas", tags=["Empresas"])
 async def listar_empresas(
     incluir_inactivas: bool = Query(False, description="Incluir empresas inactivas"),
     busqueda: str = Query("", description="Buscar por nombre o razon social (min 2 chars)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en siguiente_cursor"),
+    limite: int = Query(100, ge=1, le=500, description="Tamano de pagina"),
 ):
     """
     Obtiene empresas del sistema.
 
-    - Sin parametros: devuelve empresas activas
+    - Sin parametros: devuelve la primera pagina de empresas activas
+    - Con cursor: devuelve la pagina siguiente (ver siguiente_cursor)
     - Con busqueda: filtra por nombre comercial o razon social
     - Con incluir_inactivas=true: incluye todas
     """
     try:
+        siguiente_cursor = None
         if busqueda and len(busqueda) >= 2:
             empresas = await empresa_service.buscar_por_nombre(busqueda, limite=50)
         else:
-            empresas = await empresa_service.obtener_todas(
+            pagina = await empresa_service.obtener_pagina(
                 incluir_inactivas=incluir_inactivas,
-                limite=100,
+                cursor=cursor,
+                limite=limite,
             )
+            empresas = pagina.items
+            siguiente_cursor = pagina.siguiente_cursor
 
         data = [
             EmpresaResponse.model_validate(e.model_dump())
             for e in empresas
         ]
 
-        return ok_list(data)
+        return ok_list(data, siguiente_cursor=siguiente_cursor)
 
     except Exception as e:
         raise_http_from_exc(e, logger, "listando empresas")
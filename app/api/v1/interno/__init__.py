@@ -0,0 +1,4 @@
+"""Endpoints internos (diagnostico y metricas)."""
+from app.api.v1.interno.router import router
+
+__all__ = ["router"]
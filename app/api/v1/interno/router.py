@@ -0,0 +1,68 @@
+"""
+Endpoints REST internos de diagnostico.
+
+Exponen las metricas de queries (`registro_consultas`), de la cache de
+repositorios (`cache_consultas`) y de los catalogos compartidos. Con API_AUTH_ENABLED=true solo los
+administradores pueden consultarlas.
+"""
+import logging
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.database.instrumentacion import registro_consultas
+from app.repositories.shared import cache_consultas
+from app.services.catalogos_compartidos import catalogos_compartidos
+from app.api.config import APIConfig
+from app.api.v1.common import ok
+from app.api.v1.schemas import APIResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/interno", tags=["Interno"])
+
+ROLES_PERMITIDOS = {"admin", "superadmin"}
+
+
+def _exigir_admin(request: Request) -> None:
+    """Rechaza la peticion si hay auth y el usuario no es administrador."""
+    if not APIConfig.AUTH_ENABLED:
+        return
+    usuario = getattr(request.state, "user", None) or {}
+    if usuario.get("rol") not in ROLES_PERMITIDOS:
+        raise HTTPException(status_code=403, detail="Solo administradores")
+
+
+@router.get(
+    "/consultas",
+    response_model=APIResponse[dict[str, Any]],
+    summary="Metricas de queries",
+    description=(
+        "Latencia (histograma y percentiles), filas y bytes por tabla y "
+        "operacion, metodos que mas tiempo consumen, queries lentas "
+        "recientes y estadisticas de la cache de repositorios. Requiere "
+        "DB_INSTRUMENTACION; metodos y bytes exactos salen de una muestra "
+        "(DB_INSTRUMENTACION_MUESTRA), el resto de bytes es estimado."
+    ),
+)
+async def metricas_consultas(request: Request):
+    """Resumen de queries desde el arranque (o el ultimo reinicio)."""
+    _exigir_admin(request)
+    return ok({
+        **registro_consultas.estadisticas(),
+        "cache": cache_consultas.estadisticas(),
+        "catalogos": catalogos_compartidos.estadisticas(),
+    })
+
+
+@router.delete(
+    "/consultas",
+    response_model=APIResponse[None],
+    summary="Reiniciar metricas de queries",
+)
+async def reiniciar_metricas_consultas(request: Request):
+    """Descarta los acumulados para medir una ventana nueva."""
+    _exigir_admin(request)
+    registro_consultas.limpiar()
+    logger.info("Metricas de queries reiniciadas")
+    return ok(None, total=0, message="Metricas reiniciadas")
@@ -9,6 +9,7 @@ from fastapi import APIRouter
 from app.api.v1.empresas.router import router as empresas_router
 from app.api.v1.curp.router import router as curp_router
 from app.api.v1.onboarding.router import router as onboarding_router
+from app.api.v1.interno.router import router as interno_router
 
 api_v1_router = APIRouter()
 
@@ -16,6 +17,7 @@ api_v1_router = APIRouter()
 api_v1_router.include_router(empresas_router)
 api_v1_router.include_router(curp_router)
 api_v1_router.include_router(onboarding_router)
+api_v1_router.include_router(interno_router)
 
 # Para agregar nuevos modulos:
 # from app.api.v1.empleados.router import router as empleados_router
@@ -23,3 +23,4 @@ class APIListResponse(BaseModel, Generic[T]):
     data: List[T] = Field(default_factory=list)
     total: int = 0
     message: Optional[str] = None
+    siguiente_cursor: Optional[str] = None
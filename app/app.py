@@ -2,6 +2,8 @@ import reflex as rx
 
 from app.presentation.theme import GLOBAL_STYLES
 from app.api.main import api_app
+from app.services.metricas_snapshot import refrescar_snapshots_periodicamente
+from app.services.importacion_alta_masiva_service import reanudar_importaciones_periodicamente
 
 # BACKOFFICE — Dashboard
 from .presentation.pages.admin.dashboard import super_admin_dashboard_page
@@ -117,6 +119,12 @@ app = rx.App(
     style=GLOBAL_STYLES
 )
 
+# Recalcula en segundo plano los snapshots de métricas de los dashboards
+app.register_lifespan_task(refrescar_snapshots_periodicamente)
+
+# Retoma las importaciones de alta masiva que quedaron a medias
+app.register_lifespan_task(reanudar_importaciones_periodicamente)
+
 # =============================================================================
 # RAIZ — Dispatcher + Dashboard
 # =============================================================================
@@ -0,0 +1,9 @@
+"""
+Micro-benchmarks de rutas calientes.
+
+No forman parte de la suite de tests; se corren a mano:
+
+    python -m app.benchmarks.bench_hidratacion
+    python -m app.benchmarks.bench_servicios   # flujos completos sobre SupabaseEnMemoria
+    python -m app.benchmarks.bench_calculadoras --verificar   # contra baselines/
+"""
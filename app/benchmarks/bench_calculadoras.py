@@ -0,0 +1,276 @@
+"""
+Benchmark: calculadoras de nómina y costo patronal.
+
+Mide ops/s y memoria pico (tracemalloc) de cada calculadora de
+`app/core/calculations`, de `CatalogoConceptosNomina.calcular_exencion` y
+del cálculo de movimientos de `NominaCalculoService` (escalar y
+vectorial), sobre poblaciones sintéticas de 1k, 10k y 100k empleados con
+salarios concentrados alrededor del salario mínimo, 3 UMA y 25 UMA.
+
+    python -m app.benchmarks.bench_calculadoras [--tamanos 1000,10000,100000]
+        [--repeticiones 3] [--solo isr] [--guardar] [--verificar] [--umbral 0.25]
+
+`--guardar` escribe la línea base en `baselines/calculadoras.json`;
+`--verificar` sale con código 1 si algún caso pierde más de `--umbral`
+de ops/s (o crece más de `--umbral` su memoria pico) contra ella. Las
+líneas base dependen de la máquina: regenérelas al cambiar de equipo.
+
+`_calcular_nomina_empleado` hace I/O; se mide su parte de cálculo
+(`_calcular_movimientos`) y su equivalente por lote.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.core.calculations import (
+    CalculadoraCostoPatronal,
+    CalculadoraIMSS,
+    CalculadoraISR,
+    CalculadoraProvisiones,
+)
+from app.core.catalogs import CatalogoUMA
+from app.core.catalogs.laboral.prestaciones import CatalogoPrestaciones
+from app.core.catalogs.nomina.conceptos import CatalogoConceptosNomina
+from app.entities.costo_patronal import ConfiguracionEmpresa, Trabajador
+
+RUTA_BASELINE = Path(__file__).parent / "baselines" / "calculadoras.json"
+TAMANOS = (1_000, 10_000, 100_000)
+
+SALARIO_MINIMO = float(CatalogoPrestaciones.SALARIO_MINIMO_GENERAL)
+UMA = float(CatalogoUMA.DIARIO)
+
+_CLAVES_EXENCION = ("SUELDO", "HORAS_EXTRA_DOBLES", "PRIMA_DOMINICAL", "PRIMA_VACACIONAL", "AGUINALDO")
+_PERIODO = {"id": 1, "periodicidad": "QUINCENAL", "estatus": "EN_PROCESO_CONTABILIDAD"}
+
+
+# =============================================================================
+# POBLACIÓN SINTÉTICA
+# =============================================================================
+
+def _salario(rnd: random.Random) -> float:
+    """
+    Salario diario con la forma de una plantilla de servicios: muchos en
+    el mínimo (Art. 36 LSS), otros justo arriba de 3 UMA (excedente E.M.),
+    una cola lognormal y unos pocos sobre el tope de 25 UMA.
+    """
+    tramo = rnd.random()
+    if tramo < 0.30:
+        return SALARIO_MINIMO
+    if tramo < 0.50:
+        return rnd.uniform(SALARIO_MINIMO, 3 * UMA * 1.15)
+    if tramo < 0.95:
+        return min(max(rnd.lognormvariate(6.2, 0.45), SALARIO_MINIMO), 25 * UMA)
+    return rnd.uniform(25 * UMA, 40 * UMA)
+
+
+def poblacion(n: int, semilla: int = 2026) -> List[dict]:
+    """`n` empleados como filas de `nominas_empleado` (quincena de 15 días)."""
+    rnd = random.Random(semilla)
+    filas = []
+    for i in range(1, n + 1):
+        salario = round(_salario(rnd), 2)
+        faltas = rnd.choice((0, 0, 0, 0, 1, 2))
+        incapacidad = rnd.choice((0, 0, 0, 0, 0, 3))
+        filas.append({
+            "id": i,
+            "empleado_id": 1000 + i,
+            "salario_diario": f"{salario:.2f}",
+            "salario_diario_integrado": f"{salario * 1.0493:.2f}",
+            "antiguedad_anos": rnd.choice((0, 1, 1, 2, 3, 5, 8, 12, 20)),
+            "dias_periodo": 15,
+            "dias_trabajados": 15 - faltas - incapacidad,
+            "dias_faltas": faltas,
+            "dias_incapacidad": incapacidad,
+            "dias_vacaciones": 0,
+            "horas_extra_dobles": f"{rnd.choice((0, 0, 0, 2, 4, 9)):.2f}",
+            "horas_extra_triples": f"{rnd.choice((0, 0, 0, 0, 2)):.2f}",
+            "domingos_trabajados": rnd.choice((0, 0, 1, 2)),
+        })
+    return filas
+
+
+# =============================================================================
+# CASOS
+# =============================================================================
+
+def _config() -> ConfiguracionEmpresa:
+    return ConfiguracionEmpresa(nombre="BENCH", estado="puebla", prima_riesgo=0.025984)
+
+
+def caso_costo_patronal(filas: List[dict]) -> Callable[[], object]:
+    calc = CalculadoraCostoPatronal(_config())
+    trabajadores = [
+        Trabajador(nombre=str(f["id"]), salario_diario=float(f["salario_diario"]), antiguedad_anos=f["antiguedad_anos"])
+        for f in filas
+    ]
+    return lambda: [calc.calcular(t) for t in trabajadores]
+
+
+def caso_imss(filas: List[dict]) -> Callable[[], object]:
+    calc = CalculadoraIMSS()
+    datos = [(float(f["salario_diario_integrado"]), float(f["salario_diario"]) <= SALARIO_MINIMO) for f in filas]
+
+    def _correr():
+        for sbc, es_minimo in datos:
+            calc.calcular_patronal(sbc, 30, 0.025984)
+            calc.calcular_obrero(sbc, 30, es_minimo, True)
+    return _correr
+
+
+def caso_isr(filas: List[dict]) -> Callable[[], object]:
+    calc = CalculadoraISR()
+    datos = [(float(f["salario_diario"]) * 30.4, float(f["salario_diario"]) <= SALARIO_MINIMO) for f in filas]
+    return lambda: [calc.calcular(base, es_minimo) for base, es_minimo in datos]
+
+
+def caso_provisiones(filas: List[dict]) -> Callable[[], object]:
+    calc = CalculadoraProvisiones()
+    datos = [(float(f["salario_diario"]), f["antiguedad_anos"]) for f in filas]
+    return lambda: [calc.calcular(sd, antiguedad, 15, 0.25) for sd, antiguedad in datos]
+
+
+def caso_exencion(filas: List[dict]) -> Callable[[], object]:
+    uma = CatalogoUMA.DIARIO
+    datos = [
+        (_CLAVES_EXENCION[f["id"] % len(_CLAVES_EXENCION)], Decimal(f["salario_diario"]) * 15)
+        for f in filas
+    ]
+    return lambda: [CatalogoConceptosNomina.calcular_exencion(clave, monto, uma) for clave, monto in datos]
+
+
+def _servicio_nomina():
+    # El servicio no hace I/O aquí, pero construirlo importa db_manager
+    os.environ.setdefault("DB_BACKEND", "memoria")
+    from app.services.nomina_calculo_service import NominaCalculoService, _CLAVES_SISTEMA
+
+    service = NominaCalculoService()
+    service._concepto_ids = {clave: i for i, clave in enumerate(sorted(_CLAVES_SISTEMA), 1)}
+    return service
+
+
+def caso_nomina_escalar(filas: List[dict]) -> Callable[[], object]:
+    service = _servicio_nomina()
+    return lambda: [service._calcular_movimientos(f, _PERIODO) for f in filas]
+
+
+def caso_nomina_vectorial(filas: List[dict]) -> Callable[[], object]:
+    service = _servicio_nomina()
+    return lambda: service._calcular_movimientos_lote(filas, _PERIODO, {"errores": []})
+
+
+CASOS: Dict[str, Callable[[List[dict]], Callable[[], object]]] = {
+    "costo_patronal": caso_costo_patronal,
+    "imss": caso_imss,
+    "isr": caso_isr,
+    "provisiones": caso_provisiones,
+    "exencion": caso_exencion,
+    "nomina_escalar": caso_nomina_escalar,
+    "nomina_vectorial": caso_nomina_vectorial,
+}
+
+
+# =============================================================================
+# MEDICIÓN Y LÍNEA BASE
+# =============================================================================
+
+def medir(fn: Callable[[], object], n: int, repeticiones: int) -> dict:
+    """ops/s (mejor de `repeticiones`) y memoria pico de una corrida."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"ops_s": round(n / mejor, 1), "kib_pico": round(pico / 1024, 1)}
+
+
+def comparar(actual: Dict[str, dict], base: Dict[str, dict], umbral: float) -> List[str]:
+    """Regresiones de `actual` contra `base` que exceden `umbral` (fracción)."""
+    regresiones = []
+    for clave, medida in actual.items():
+        referencia = base.get(clave)
+        if referencia is None:
+            continue
+        if medida["ops_s"] < referencia["ops_s"] * (1 - umbral):
+            regresiones.append(
+                f"{clave}: {medida['ops_s']:.0f} ops/s vs {referencia['ops_s']:.0f} "
+                f"({medida['ops_s'] / referencia['ops_s'] - 1:+.0%})"
+            )
+        if medida["kib_pico"] > referencia["kib_pico"] * (1 + umbral) + 64:
+            regresiones.append(
+                f"{clave}: {medida['kib_pico']:.0f} KiB pico vs {referencia['kib_pico']:.0f}"
+            )
+    return regresiones
+
+
+def cargar_baseline(ruta: Path = RUTA_BASELINE) -> Dict[str, dict]:
+    if not ruta.exists():
+        return {}
+    return json.loads(ruta.read_text(encoding="utf-8"))["resultados"]
+
+
+def guardar_baseline(resultados: Dict[str, dict], ruta: Path = RUTA_BASELINE) -> None:
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    previos = cargar_baseline(ruta)
+    contenido = {
+        "maquina": {"python": platform.python_version(), "procesador": platform.processor() or platform.machine()},
+        "resultados": dict(sorted({**previos, **resultados}.items())),
+    }
+    ruta.write_text(json.dumps(contenido, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def correr(tamanos, repeticiones: int, solo: Optional[str] = None) -> Dict[str, dict]:
+    resultados = {}
+    print(f"{'caso':<28}{'ops/s':>14}{'KiB pico':>12}")
+    for n in tamanos:
+        filas = poblacion(n)
+        for nombre, caso in CASOS.items():
+            if solo and solo not in nombre:
+                continue
+            clave = f"{nombre}@{n}"
+            resultados[clave] = medir(caso(filas), n, repeticiones)
+            print(f"{clave:<28}{resultados[clave]['ops_s']:>14,.0f}{resultados[clave]['kib_pico']:>12,.1f}")
+    return resultados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", default=",".join(str(t) for t in TAMANOS))
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--solo", help="Corre sólo los casos que contienen este texto")
+    parser.add_argument("--guardar", action="store_true", help="Actualiza la línea base")
+    parser.add_argument("--verificar", action="store_true", help="Falla si hay regresiones")
+    parser.add_argument("--umbral", type=float, default=0.25)
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(",") if t]
+    resultados = correr(tamanos, args.repeticiones, args.solo)
+
+    if args.guardar:
+        guardar_baseline(resultados)
+        print(f"Línea base guardada en {RUTA_BASELINE}")
+    if args.verificar:
+        regresiones = comparar(resultados, cargar_baseline(), args.umbral)
+        if regresiones:
+            print("Regresiones (umbral {:.0%}):\n- ".format(args.umbral) + "\n- ".join(regresiones))
+            return 1
+        print("Sin regresiones contra la línea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Benchmark: hidratación de filas de empleados.
+
+Compara `Empleado(**fila)` (validación completa) contra
+`hidratar_confiable` con la fila completa y con una proyección de las
+columnas que usa la tabla de empleados.
+
+    python -m app.benchmarks.bench_hidratacion [--filas 5000] [--repeticiones 5]
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from app.entities.empleado import Empleado
+from app.repositories.shared.hidratacion import hidratar_confiable
+
+# Proyección de la página de empleados (`empleados_state.CAMPOS_LISTA`)
+CAMPOS_TABLA = (
+    "id", "clave", "curp", "rfc", "nss", "nombre", "apellido_paterno",
+    "apellido_materno", "empresa_id", "estatus", "fecha_ingreso", "fecha_nacimiento",
+    "genero", "telefono", "email", "direccion", "contacto_emergencia", "notas",
+    "fecha_baja", "motivo_baja", "estatus_onboarding", "is_restricted",
+    "restriction_reason", "restricted_at", "restricted_by",
+)
+
+
+def filas_empleado(n: int) -> List[dict]:
+    """Filas con la forma de `select('*')` sobre `empleados`."""
+    return [
+        {
+            "id": i,
+            "clave": f"B25-{i:05d}",
+            "empresa_id": 1 + i % 20,
+            "curp": f"PEGJ{900101 + i % 28:06d}HPLRRN0{i % 10}",
+            "rfc": f"PEGJ{900101 + i % 28:06d}AB{i % 10}",
+            "nss": f"{12345678900 + i}",
+            "nombre": "JUAN CARLOS",
+            "apellido_paterno": "PEREZ",
+            "apellido_materno": "GARCIA",
+            "fecha_nacimiento": "1990-01-01",
+            "genero": "MASCULINO",
+            "telefono": "2221234567",
+            "email": f"empleado{i}@ejemplo.com",
+            "direccion": "AV. REFORMA 123, PUEBLA",
+            "contacto_emergencia": "MARIA PEREZ 2227654321",
+            "estatus": "ACTIVO",
+            "fecha_ingreso": "2025-01-15",
+            "fecha_baja": None,
+            "motivo_baja": None,
+            "notas": None,
+            "is_restricted": False,
+            "restriction_reason": None,
+            "restricted_at": None,
+            "restricted_by": None,
+            "cuenta_bancaria": None,
+            "banco": None,
+            "clabe_interbancaria": None,
+            "entidad_nacimiento": "PUEBLA",
+            "renapo_validado": True,
+            "renapo_fecha_validacion": "2025-01-15T10:00:00+00:00",
+            "estatus_onboarding": "ACTIVO_COMPLETO",
+            "user_id": None,
+            "requiere_cambio_password": False,
+            "fecha_primer_acceso": None,
+            "sede_id": None,
+            "fecha_creacion": "2025-01-15T10:00:00+00:00",
+            "fecha_actualizacion": "2025-02-01T12:30:00+00:00",
+        }
+        for i in range(n)
+    ]
+
+
+def _medir(fn: Callable[[], object], repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de `repeticiones` corridas."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=5000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    filas = filas_empleado(args.filas)
+    proyectadas = [{c: f[c] for c in CAMPOS_TABLA} for f in filas]
+
+    # Las filas deben ser válidas para que la comparación sea justa
+    Empleado(**filas[0])
+    hidratar_confiable(Empleado, filas[:1])
+
+    casos = [
+        ("Empleado(**fila)", lambda: [Empleado(**f) for f in filas]),
+        ("hidratar_confiable", lambda: hidratar_confiable(Empleado, filas)),
+        ("hidratar_confiable + campos", lambda: hidratar_confiable(Empleado, proyectadas)),
+    ]
+
+    base = None
+    print(f"{args.filas} filas, mejor de {args.repeticiones}")
+    print(f"{'caso':<30}{'total ms':>10}{'us/fila':>10}{'x':>8}")
+    for nombre, fn in casos:
+        segundos = _medir(fn, args.repeticiones)
+        base = base or segundos
+        print(
+            f"{nombre:<30}{segundos * 1000:>10.1f}"
+            f"{segundos * 1e6 / args.filas:>10.2f}{base / segundos:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
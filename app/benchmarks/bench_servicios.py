@@ -0,0 +1,175 @@
+"""
+Benchmark: throughput de servicios sobre el backend en memoria.
+
+Corre el código real de `NominaCalculoService`, `AltaMasivaService` y
+`DispersionService` contra `SupabaseEnMemoria` con latencia simulada por
+llamada, y reporta tiempo, empleados/s y llamadas a BD de cada flujo.
+
+    python -m app.benchmarks.bench_servicios [--empleados 500] [--latencia-ms 2] [--repeticiones 3]
+
+No requiere proyecto de Supabase: fija `DB_BACKEND=memoria` si no está
+definido.
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+os.environ.setdefault("DB_BACKEND", "memoria")
+
+from app.core.validation import calcular_digito_verificador_clabe  # noqa: E402
+from app.database import db_manager  # noqa: E402
+from app.database.memoria import SupabaseEnMemoria  # noqa: E402
+from app.repositories.shared import alcance_loaders, cache_consultas  # noqa: E402
+
+Tablas = Dict[str, List[dict]]
+Flujo = Callable[[], Awaitable[object]]
+
+_BANCOS = (
+    ("BANREGIO", "TXT_POSICIONES", "058"),
+    ("HSBC", "TXT_CSV", "021"),
+    ("FONDEADORA", "CSV", "699"),
+)
+
+
+def _empresa() -> dict:
+    return {
+        "id": 1, "nombre_comercial": "LIMPIEZA DEL SUR", "razon_social": "LIMPIEZA DEL SUR SA DE CV",
+        "tipo_empresa": "NOMINA", "rfc": "LSU010101AB1", "estatus": "ACTIVO",
+    }
+
+
+def _curp(i: int) -> str:
+    letras = "".join(chr(65 + (i // 26 ** k) % 26) for k in range(3))
+    return f"PEGA{900101 + i % 28:06d}HPL{letras[:2]}N{letras[2]}{i % 10}"
+
+
+def _clabe(banco: str, i: int) -> str:
+    base = f"{banco}650{i:011d}"
+    return base + str(calcular_digito_verificador_clabe(base))
+
+
+def _nominas(n: int, periodo_id: int, **extra) -> List[dict]:
+    return [
+        {
+            "id": i, "periodo_id": periodo_id, "empleado_id": i, "empresa_id": 1,
+            "salario_diario": f"{300 + i % 700}.00", "salario_diario_integrado": f"{315 + i % 700}.00",
+            "dias_trabajados": 15, "dias_periodo": 15, **extra,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def escenario_nomina(n: int, modo: str) -> Tuple[Tablas, Flujo]:
+    from app.services.nomina_calculo_service import NominaCalculoService, _CLAVES_SISTEMA
+
+    tablas = {
+        "periodos_nomina": [{"id": 1, "empresa_id": 1, "estatus": "EN_PROCESO_CONTABILIDAD", "periodicidad": "QUINCENAL"}],
+        "conceptos_nomina": [{"id": i, "clave": c} for i, c in enumerate(sorted(_CLAVES_SISTEMA), 1)],
+        "nominas_empleado": _nominas(n, 1),
+    }
+    return tablas, lambda: NominaCalculoService().calcular_periodo(1, modo=modo)
+
+
+def _csv_alta(n: int) -> bytes:
+    filas = ["curp,nombre,apellido_paterno,apellido_materno"]
+    filas += [f"{_curp(i)},ANA,PEREZ,GARCIA" for i in range(1, n + 1)]
+    return "\n".join(filas).encode()
+
+
+def escenario_alta_validar(n: int) -> Tuple[Tablas, Flujo]:
+    from app.services.alta_masiva_service import alta_masiva_service
+
+    contenido = _csv_alta(n)
+    return (
+        {"empresas": [_empresa()], "empleados": []},
+        lambda: alta_masiva_service.validar_archivo(contenido, "alta.csv", 1),
+    )
+
+
+def escenario_alta_procesar(n: int) -> Tuple[Tablas, Flujo]:
+    from app.services.alta_masiva_service import alta_masiva_service
+
+    contenido = _csv_alta(n)
+
+    async def _flujo():
+        validacion = await alta_masiva_service.validar_archivo(contenido, "alta.csv", 1)
+        return await alta_masiva_service.procesar(validacion, 1)
+
+    return {"empresas": [_empresa()], "empleados": []}, _flujo
+
+
+def escenario_dispersion(n: int) -> Tuple[Tablas, Flujo]:
+    from app.services.dispersion_service import dispersion_service
+
+    nominas = _nominas(n, 1)
+    for nomina in nominas:
+        banco, _, codigo = _BANCOS[nomina["id"] % len(_BANCOS)]
+        nomina.update(
+            banco_destino=banco, clabe_destino=_clabe(codigo, nomina["id"]),
+            total_neto=f"{4000 + nomina['id'] % 900}.50",
+        )
+    tablas = {
+        "periodos_nomina": [{"id": 1, "empresa_id": 1, "estatus": "CALCULADO", "nombre": "QNA 01 2026"}],
+        "nominas_empleado": nominas,
+        "empleados": [
+            {"id": i, "clave": f"B26-{i:05d}", "nombre": "ANA", "apellido_paterno": "PEREZ"}
+            for i in range(1, n + 1)
+        ],
+        "configuracion_bancos_empresa": [
+            {
+                "id": i, "empresa_id": 1, "nombre_banco": banco, "formato": formato, "activo": True,
+                "clabe_origen": _clabe(codigo, 0), "referencia_pago": "NOMINA",
+            }
+            for i, (banco, formato, codigo) in enumerate(_BANCOS, 1)
+        ],
+    }
+    return tablas, lambda: dispersion_service.generar_layouts(1)
+
+
+ESCENARIOS: Dict[str, Callable[[int], Tuple[Tablas, Flujo]]] = {
+    "nomina.calcular_periodo (lote)": lambda n: escenario_nomina(n, "lote"),
+    "nomina.calcular_periodo (individual)": lambda n: escenario_nomina(n, "individual"),
+    "alta_masiva.validar_archivo": escenario_alta_validar,
+    "alta_masiva.procesar": escenario_alta_procesar,
+    "dispersion.generar_layouts": escenario_dispersion,
+}
+
+
+def correr(tablas: Tablas, flujo: Flujo, latencia_ms: float) -> Tuple[float, int]:
+    """Corre `flujo` sobre un backend nuevo; retorna (segundos, llamadas a BD)."""
+    cliente = SupabaseEnMemoria(tablas, latencia_ms=latencia_ms, unicos={"empleados": [("curp",), ("clave",)]})
+    cache_consultas.limpiar()
+    try:
+        with db_manager.usar_cliente(cliente), alcance_loaders():
+            inicio = time.perf_counter()
+            asyncio.run(flujo())
+            return time.perf_counter() - inicio, cliente.llamadas
+    finally:
+        cache_consultas.limpiar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--empleados", type=int, default=500)
+    parser.add_argument("--latencia-ms", type=float, default=2.0)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--solo", help="Corre sólo los escenarios que contienen este texto")
+    args = parser.parse_args()
+
+    print(f"{args.empleados} empleados, latencia {args.latencia_ms} ms/llamada, mejor de {args.repeticiones}")
+    print(f"{'escenario':<40}{'total ms':>10}{'emp/s':>10}{'llamadas':>10}")
+    for nombre, escenario in ESCENARIOS.items():
+        if args.solo and args.solo not in nombre:
+            continue
+        mejor, llamadas = float("inf"), 0
+        for _ in range(args.repeticiones):
+            tablas, flujo = escenario(args.empleados)
+            segundos, llamadas = correr(tablas, flujo, args.latencia_ms)
+            mejor = min(mejor, segundos)
+        print(f"{nombre:<40}{mejor * 1000:>10.1f}{args.empleados / mejor:>10.0f}{llamadas:>10}")
+
+
+if __name__ == "__main__":
+    main()
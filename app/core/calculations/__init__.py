@@ -6,6 +6,7 @@ Exporta las calculadoras para importación conveniente:
 - CalculadoraIMSS: Cuotas IMSS patronales y obreras
 - CalculadoraISR: Impuesto sobre la renta
 - CalculadoraProvisiones: Aguinaldo, vacaciones, prima vacacional
+- CalculadoraNominaVectorial: Kernel columnar de conceptos SISTEMA de nómina
 
 Uso:
     from app.core.calculations import CalculadoraCostoPatronal
@@ -18,10 +19,13 @@ from .simulador_costo_patronal import CalculadoraCostoPatronal
 from .calculadora_imss import CalculadoraIMSS
 from .calculadora_isr import CalculadoraISR
 from .calculadora_provisiones import CalculadoraProvisiones
+from .calculadora_nomina_vectorial import CalculadoraNominaVectorial, ResultadoNominaVectorial
 
 __all__ = [
     "CalculadoraCostoPatronal",
     "CalculadoraIMSS",
     "CalculadoraISR",
     "CalculadoraProvisiones",
+    "CalculadoraNominaVectorial",
+    "ResultadoNominaVectorial",
 ]
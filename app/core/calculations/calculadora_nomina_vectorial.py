@@ -0,0 +1,334 @@
+"""
+Calculadora vectorial de nómina (kernel columnar con NumPy).
+
+Calcula los conceptos SISTEMA de un período completo en una sola pasada
+sobre arreglos (un elemento por empleado), con resultados idénticos al
+flujo escalar de `NominaCalculoService._calcular_movimientos`.
+
+Responsabilidades:
+- Sueldo, horas extra dobles/triples, prima dominical, faltas, incapacidad
+- Exenciones ISR (reglas de CatalogoConceptosNomina)
+- ISR con `np.searchsorted` sobre la tabla Art. 96 y subsidio al empleo
+- Cuotas IMSS obreras (misma aritmética float que CalculadoraIMSS)
+
+Aritmética:
+    Los importes se manejan como enteros int64 en diezmilésimos de peso
+    (ESCALA = 10_000) y el redondeo a centavos es ROUND_HALF_UP exacto,
+    equivalente a `_round2`. Se usa esa escala porque la parte exenta de
+    horas extra (50%) puede tener medio centavo.
+
+Fecha: 2026-10-16
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP
+from typing import ClassVar, Optional, Sequence
+
+import numpy as np
+
+from app.core.catalogs import CatalogoConceptosNomina, CatalogoIMSS, CatalogoUMA
+from app.core.catalogs.fiscal.isr import CatalogoISR
+from app.core.enums import TratamientoISR
+
+# Escala entera de los importes (1 unidad = $0.0001)
+ESCALA = 10_000
+_CENTAVO = ESCALA // 100
+
+# Conceptos SISTEMA en el orden en que el flujo escalar los genera
+CONCEPTOS_SISTEMA: tuple[tuple[str, str], ...] = (
+    ('SUELDO', 'PERCEPCION'),
+    ('HORAS_EXTRA_DOBLES', 'PERCEPCION'),
+    ('HORAS_EXTRA_TRIPLES', 'PERCEPCION'),
+    ('PRIMA_DOMINICAL', 'PERCEPCION'),
+    ('DESCUENTO_FALTAS', 'DEDUCCION'),
+    ('DESCUENTO_INCAPACIDAD', 'DEDUCCION'),
+    ('ISR', 'DEDUCCION'),
+    ('SUBSIDIO_EMPLEO', 'OTRO_PAGO'),
+    ('IMSS_OBRERO', 'DEDUCCION'),
+)
+
+
+def _entero_escalado(valor: Decimal, decimales: int) -> int:
+    """Convierte un Decimal a entero con `decimales` fijos (debe ser exacto)."""
+    escalado = valor.scaleb(decimales)
+    if escalado != escalado.to_integral_value():
+        raise ValueError(f"{valor} tiene más de {decimales} decimales")
+    return int(escalado)
+
+
+def _div_redondeo(numerador: np.ndarray, denominador: int) -> np.ndarray:
+    """División entera con ROUND_HALF_UP para numeradores no negativos."""
+    return (2 * numerador + denominador) // (2 * denominador)
+
+
+def _a_centavos(valores) -> np.ndarray:
+    """Arreglo de importes con 2 decimales → int64 en centavos."""
+    return np.rint(np.asarray(valores, dtype=np.float64) * 100).astype(np.int64)
+
+
+@dataclass
+class ResultadoNominaVectorial:
+    """
+    Conceptos SISTEMA calculados para N empleados.
+
+    Todos los importes son int64 en unidades de ESCALA. `aplica[clave]`
+    indica si el flujo escalar generaría el movimiento para ese empleado.
+    """
+
+    ESCALA: ClassVar[int] = ESCALA
+
+    monto: dict[str, np.ndarray] = field(default_factory=dict)
+    gravable: dict[str, np.ndarray] = field(default_factory=dict)
+    exento: dict[str, np.ndarray] = field(default_factory=dict)
+    aplica: dict[str, np.ndarray] = field(default_factory=dict)
+    base_mensual: Optional[np.ndarray] = None
+
+    def total_por_tipo(self, tipo: str) -> np.ndarray:
+        """Suma por empleado de los conceptos aplicables de un tipo."""
+        total = np.zeros_like(self.base_mensual)
+        for clave, tipo_concepto in CONCEPTOS_SISTEMA:
+            if tipo_concepto != tipo:
+                continue
+            if tipo == 'PERCEPCION':
+                importe = self.gravable[clave] + self.exento[clave]
+            else:
+                importe = self.monto[clave]
+            total += np.where(self.aplica[clave], importe, 0)
+        return total
+
+    @staticmethod
+    def a_decimal(valor) -> Decimal:
+        """Convierte un importe escalado a Decimal en pesos."""
+        return Decimal(int(valor)).scaleb(-4)
+
+
+class CalculadoraNominaVectorial:
+    """
+    Kernel columnar del cálculo de nómina.
+
+    Los parámetros fiscales (tabla ISR, subsidio, UMA, tasas IMSS y reglas
+    de exención) se precalculan una vez en el constructor.
+
+    Uso:
+        calc = CalculadoraNominaVectorial()
+        res = calc.calcular(
+            salario_diario=[400.0, 250.0], sdi=[418.0, 261.0],
+            dias_trabajados=[15, 15], factor_mensual=Decimal('2'),
+        )
+        res.monto['ISR']  # int64, diezmilésimos de peso
+    """
+
+    def __init__(self):
+        tabla = CatalogoISR.TABLA_MENSUAL
+        self._isr_limite_inf = np.array(
+            [_entero_escalado(r.limite_inferior, 2) for r in tabla], dtype=np.int64
+        )
+        self._isr_cuota = np.array(
+            [_entero_escalado(r.cuota_fija, 2) for r in tabla], dtype=np.int64
+        )
+        # Tasa con 4 decimales (0.1088 → 1088)
+        self._isr_tasa = np.array(
+            [_entero_escalado(r.tasa_excedente, 4) for r in tabla], dtype=np.int64
+        )
+        self._subsidio_c = _entero_escalado(CatalogoISR.SUBSIDIO_MENSUAL, 2)
+        self._limite_subsidio_c = _entero_escalado(CatalogoISR.LIMITE_SUBSIDIO, 2)
+        self._uma_c = _entero_escalado(CatalogoUMA.DIARIO, 2)
+
+        # IMSS obrero: mismos floats que CalculadoraIMSS.calcular_obrero
+        self._tres_uma = float(CatalogoUMA.TRES_UMA)
+        self._tasas_obrero = (
+            float(CatalogoIMSS.PREST_DINERO_OBRERO),
+            float(CatalogoIMSS.GASTOS_MED_OBRERO),
+            float(CatalogoIMSS.INVALIDEZ_VIDA_OBRERO),
+            float(CatalogoIMSS.CESANTIA_VEJEZ_OBRERO),
+        )
+        self._tasa_excedente_obrero = float(CatalogoIMSS.EXCEDENTE_OBRERO)
+
+    # =========================================================================
+    # PÚBLICO
+    # =========================================================================
+
+    def calcular(
+        self,
+        salario_diario: Sequence,
+        sdi: Sequence,
+        dias_trabajados: Sequence,
+        factor_mensual: Decimal,
+        dias_faltas: Optional[Sequence] = None,
+        dias_incapacidad: Optional[Sequence] = None,
+        dias_vacaciones: Optional[Sequence] = None,
+        horas_extra_dobles: Optional[Sequence] = None,
+        horas_extra_triples: Optional[Sequence] = None,
+        domingos: Optional[Sequence] = None,
+    ) -> ResultadoNominaVectorial:
+        """
+        Calcula todos los conceptos SISTEMA de N empleados.
+
+        Args:
+            salario_diario: Salario diario (2 decimales) por empleado
+            sdi: Salario diario integrado por empleado
+            dias_trabajados: Días trabajados en el período
+            factor_mensual: Factor para proyectar a mensual (QUINCENAL = 2)
+            dias_faltas, dias_incapacidad, dias_vacaciones: Días (default 0)
+            horas_extra_dobles, horas_extra_triples: Horas (2 decimales)
+            domingos: Domingos trabajados
+
+        Returns:
+            ResultadoNominaVectorial con monto/gravable/exento por concepto
+        """
+        s_c = _a_centavos(salario_diario)
+        n = s_c.shape[0]
+
+        def _enteros(valores):
+            if valores is None:
+                return np.zeros(n, dtype=np.int64)
+            return np.asarray(valores, dtype=np.int64)
+
+        def _centesimos(valores):
+            if valores is None:
+                return np.zeros(n, dtype=np.int64)
+            return _a_centavos(valores)
+
+        dias = _enteros(dias_trabajados)
+        faltas = _enteros(dias_faltas)
+        incapacidad = _enteros(dias_incapacidad)
+        vacaciones = _enteros(dias_vacaciones)
+        hd_c = _centesimos(horas_extra_dobles)
+        ht_c = _centesimos(horas_extra_triples)
+        dom = _enteros(domingos)
+        sdi_f = np.asarray(sdi, dtype=np.float64)
+
+        res = ResultadoNominaVectorial()
+        cero = np.zeros(n, dtype=np.int64)
+
+        def _registrar(clave, monto, gravable, exento, aplica):
+            res.monto[clave] = monto
+            res.gravable[clave] = gravable
+            res.exento[clave] = exento
+            res.aplica[clave] = aplica
+
+        # ── Percepciones ─────────────────────────────────────────────────
+        sueldo = s_c * dias * _CENTAVO
+        _registrar('SUELDO', sueldo, sueldo, cero, sueldo > 0)
+
+        # s/8*2*h → centavos = s_c*h_c/400
+        hed = _div_redondeo(s_c * hd_c, 400) * _CENTAVO
+        hed_grav, hed_exe = self._exencion('HORAS_EXTRA_DOBLES', hed)
+        _registrar('HORAS_EXTRA_DOBLES', hed, hed_grav, hed_exe, hd_c > 0)
+
+        # s/8*3*h → centavos = 3*s_c*h_c/800
+        het = _div_redondeo(3 * s_c * ht_c, 800) * _CENTAVO
+        _registrar('HORAS_EXTRA_TRIPLES', het, het, cero, ht_c > 0)
+
+        # s*0.25*domingos → centavos = s_c*dom/4
+        pd = _div_redondeo(s_c * dom, 4) * _CENTAVO
+        pd_grav, pd_exe = self._exencion('PRIMA_DOMINICAL', pd)
+        _registrar('PRIMA_DOMINICAL', pd, pd_grav, pd_exe, dom > 0)
+
+        # ── Deducciones por días ─────────────────────────────────────────
+        monto_faltas = s_c * faltas * _CENTAVO
+        _registrar('DESCUENTO_FALTAS', monto_faltas, cero, cero, faltas > 0)
+        monto_incap = s_c * incapacidad * _CENTAVO
+        _registrar('DESCUENTO_INCAPACIDAD', monto_incap, cero, cero, incapacidad > 0)
+
+        # ── ISR y subsidio ───────────────────────────────────────────────
+        factor_milesimos = _entero_escalado(factor_mensual, 3)
+        base_periodo = sueldo + hed_grav + het + pd_grav
+        # base (1e-4) * factor (1e-3) → 1e-7; a centavos: / 1e5
+        base_mensual_c = _div_redondeo(base_periodo * factor_milesimos, 100_000)
+        res.base_mensual = base_mensual_c * _CENTAVO
+
+        isr_periodo_c = self._isr_periodo(base_mensual_c, factor_milesimos)
+        isr = isr_periodo_c * _CENTAVO
+        _registrar('ISR', isr, cero, cero, isr > 0)
+
+        subsidio_mensual_c = np.where(
+            base_mensual_c > self._limite_subsidio_c, 0, self._subsidio_c
+        ).astype(np.int64)
+        # subsidio / factor → centavos = sub_c * 1000 / factor_milesimos
+        subsidio = _div_redondeo(subsidio_mensual_c * 1000, factor_milesimos) * _CENTAVO
+        _registrar('SUBSIDIO_EMPLEO', subsidio, cero, cero, subsidio > 0)
+
+        # ── IMSS obrero ──────────────────────────────────────────────────
+        imss = self._imss_obrero_centavos(sdi_f, dias + vacaciones) * _CENTAVO
+        _registrar('IMSS_OBRERO', imss, cero, cero, imss > 0)
+
+        return res
+
+    # =========================================================================
+    # INTERNOS
+    # =========================================================================
+
+    def _exencion(self, clave: str, monto: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Versión vectorial de CatalogoConceptosNomina.calcular_exencion."""
+        cero = np.zeros_like(monto)
+        try:
+            concepto = CatalogoConceptosNomina.obtener(clave)
+        except KeyError:
+            return monto, cero
+
+        tratamiento = concepto.tratamiento_isr
+        if tratamiento == TratamientoISR.GRAVABLE:
+            return monto, cero
+        if tratamiento == TratamientoISR.EXENTO:
+            return cero, monto
+        if tratamiento == TratamientoISR.NO_APLICA:
+            return cero, cero
+
+        porcentaje = concepto.porcentaje_exento
+        limite = concepto.limite_exencion_uma
+        tope = None
+        if limite is not None:
+            # uma (centavos) * límite (2 decimales) → diezmilésimos
+            tope = self._uma_c * _entero_escalado(limite, 2)
+
+        if porcentaje is not None:
+            # monto (diezmilésimos) * porcentaje exacto con 2 decimales
+            exento = monto * _entero_escalado(porcentaje, 2) // 100
+            if tope is not None:
+                exento = np.minimum(exento, tope)
+        elif tope is not None:
+            exento = np.minimum(monto, tope)
+        else:
+            return monto, cero
+        return monto - exento, exento
+
+    def _isr_periodo(self, base_mensual_c: np.ndarray, factor_milesimos: int) -> np.ndarray:
+        """ISR del período en centavos (tabla mensual / factor)."""
+        idx = np.searchsorted(self._isr_limite_inf, base_mensual_c, side='right') - 1
+        aplica = (base_mensual_c > 0) & (idx >= 0)
+        idx = np.clip(idx, 0, len(self._isr_limite_inf) - 1)
+
+        # ISR mensual en millonésimos: cuota*1e4 + excedente(c) * tasa(1e-4)
+        isr_millonesimos = (
+            self._isr_cuota[idx] * 10_000
+            + (base_mensual_c - self._isr_limite_inf[idx]) * self._isr_tasa[idx]
+        )
+        isr_millonesimos = np.where(aplica, isr_millonesimos, 0)
+        # / factor → centavos = millonésimos / (factor_milesimos * 10)
+        return _div_redondeo(isr_millonesimos, factor_milesimos * 10)
+
+    def _imss_obrero_centavos(self, sbc: np.ndarray, dias: np.ndarray) -> np.ndarray:
+        """
+        Cuota IMSS obrera en centavos.
+
+        Replica la suma float de CalculadoraIMSS y el redondeo
+        `_round2(Decimal(str(total)))`. Los pocos valores cuyo tercer
+        decimal queda a un ulp de .5 se resuelven con Decimal para que
+        el redondeo coincida exactamente con la ruta escalar.
+        """
+        d = dias.astype(np.float64)
+        excedente_base = np.maximum(0, sbc - self._tres_uma)
+        total = 0 + excedente_base * self._tasa_excedente_obrero * d
+        for tasa in self._tasas_obrero:
+            total = total + sbc * tasa * d
+
+        escalado = total * 100
+        centavos = np.floor(escalado + 0.5).astype(np.int64)
+        ambiguos = np.flatnonzero(np.abs(escalado - np.floor(escalado) - 0.5) < 1e-6)
+        for i in ambiguos:
+            valor = Decimal(str(float(total[i]))).quantize(
+                Decimal('0.01'), rounding=ROUND_HALF_UP
+            )
+            centavos[i] = int(valor.scaleb(2))
+        return centavos
@@ -12,6 +12,22 @@ class Config:
     SUPABASE_KEY =os.getenv("SUPABASE_KEY")
     SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
+    # Backend de datos: "supabase" o "memoria" (SupabaseEnMemoria, para
+    # benchmarks y pruebas de carga sin proyecto de Supabase)
+    DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+    # Latencia simulada por llamada con DB_BACKEND=memoria
+    DB_LATENCIA_MS = float(os.getenv("DB_LATENCIA_MS", "0"))
+
+    # Hilos del pool acotado para ejecutar queries sin bloquear el event loop
+    DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "8"))
+
+    # Instrumentación de queries (latencia/filas por tabla y log de lentas)
+    DB_INSTRUMENTACION = os.getenv("DB_INSTRUMENTACION", "FALSE").lower() == "true"
+    # Fracción de queries medidas a detalle (método llamador y bytes exactos)
+    DB_INSTRUMENTACION_MUESTRA = float(os.getenv("DB_INSTRUMENTACION_MUESTRA", "0.05"))
+    DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "500"))
+    DB_SLOW_QUERY_BUFFER = int(os.getenv("DB_SLOW_QUERY_BUFFER", "100"))
+
     # Control de autenticación
     SKIP_AUTH = os.getenv("SKIP_AUTH", "FALSE").lower() == "true"
 
@@ -24,6 +40,8 @@ class Config:
 
     @classmethod
     def validate_config(cls):
+        if cls.DB_BACKEND == "memoria":
+            return True
         if not cls.SUPABASE_URL:
             raise ValueError("SUPABASE_URL no esta configurada")
         if not cls.SUPABASE_KEY:
@@ -4,7 +4,8 @@ Módulo de validación centralizado.
 Estructura:
 - constants.py: Patrones regex y constantes de longitud
 - field_config.py: Clase FieldConfig para validación declarativa
-- validator_factory.py: crear_validador() + helpers
+- validator_factory.py: crear_validador(), validar_lote(), registro de
+  patrones/validadores precompilados + helpers
 - fields_catalog.py: Configuraciones predefinidas de campos
 - custom_validators.py: Validadores complejos (RFC, registro patronal)
 
@@ -26,8 +27,12 @@ from .field_config import FieldConfig, InputType
 
 # Factory y helpers
 from .validator_factory import (
+    ValidadorCampo,
     crear_validador,
+    patron,
+    validador_para,
     validar_con_config,
+    validar_lote,
     validar_patron,
     validar_longitud,
     validar_requerido,
@@ -295,8 +300,12 @@ __all__ = [
     "FieldConfig",
     "InputType",
     # Factory y helpers
+    "ValidadorCampo",
     "crear_validador",
+    "patron",
+    "validador_para",
     "validar_con_config",
+    "validar_lote",
     "validar_patron",
     "validar_longitud",
     "validar_requerido",
@@ -7,8 +7,6 @@ patrón/longitud simple, como RFC con feedback detallado.
 Estos validadores son usados tanto por frontend (empresas_validators.py)
 como por backend (entities con Pydantic).
 """
-import re
-
 from .constants import (
     RFC_PATTERN,
     RFC_PREFIX_PATTERN,
@@ -27,6 +25,15 @@ from app.core.error_messages import (
     msg_registro_patronal_longitud,
     MSG_REGISTRO_PATRONAL_INVALIDO,
 )
+from .validator_factory import patron
+
+_RFC = patron(RFC_PATTERN)
+_RFC_PREFIJO = patron(RFC_PREFIX_PATTERN)
+_RFC_FECHA = patron(RFC_FECHA_PATTERN)
+_REGISTRO_PATRONAL_LIMPIO = patron(REGISTRO_PATRONAL_LIMPIO_PATTERN)
+_ESPACIOS_GUIONES = patron(r'[\s\-]')
+_NO_ALFANUMERICO = patron(r'[^A-Z0-9]')
+_SEPARADORES_TELEFONO = patron(r'[\s\-\(\)\+]')
 
 
 # =============================================================================
@@ -63,20 +70,20 @@ def validar_rfc_detallado(rfc: str, requerido: bool = True) -> str:
         return msg_rfc_longitud(len(rfc_limpio))
 
     # Validar patrón completo
-    if re.match(RFC_PATTERN, rfc_limpio):
+    if _RFC.match(rfc_limpio):
         return ""  # Válido
 
     # Feedback específico: identificar qué parte está mal
 
     # 1. Validar prefijo (3-4 letras)
-    if not re.match(RFC_PREFIX_PATTERN, rfc_limpio[:4]):
+    if not _RFC_PREFIJO.match(rfc_limpio[:4]):
         return MSG_RFC_LETRAS_INVALIDAS
 
     # 2. Validar fecha (6 dígitos después del prefijo)
     inicio = 4 if len(rfc_limpio) == 13 else 3
     fecha = rfc_limpio[inicio:inicio + 6]
 
-    if not re.match(RFC_FECHA_PATTERN, fecha):
+    if not _RFC_FECHA.match(fecha):
         return MSG_RFC_FECHA_INVALIDA
 
     # 3. Si llegamos aquí, es la homoclave
@@ -120,7 +127,7 @@ def validar_registro_patronal_detallado(valor: str, requerido: bool = False) ->
         return "Registro patronal es obligatorio" if requerido else ""
 
     # Limpiar: quitar guiones, espacios, convertir a mayúsculas
-    limpio = re.sub(r'[\s\-]', '', valor.strip().upper())
+    limpio = _ESPACIOS_GUIONES.sub('', valor.strip().upper())
 
     # Validar longitud
     if len(limpio) != REGISTRO_PATRONAL_LEN:
@@ -155,12 +162,12 @@ def formatear_registro_patronal(valor: str) -> str:
         ValueError: Si el formato es inválido
     """
     # Limpiar: solo letras y números
-    limpio = re.sub(r'[^A-Z0-9]', '', valor.upper())
+    limpio = _NO_ALFANUMERICO.sub('', valor.upper())
 
     if len(limpio) != REGISTRO_PATRONAL_LEN:
         raise ValueError(msg_registro_patronal_longitud(REGISTRO_PATRONAL_LEN, len(limpio)))
 
-    if not re.match(REGISTRO_PATRONAL_LIMPIO_PATTERN, limpio):
+    if not _REGISTRO_PATRONAL_LIMPIO.match(limpio):
         raise ValueError(MSG_REGISTRO_PATRONAL_INVALIDO)
 
     # Formatear: Y12-34567-10-1
@@ -183,4 +190,4 @@ def limpiar_telefono(telefono: str) -> str:
     """
     if not telefono:
         return ""
-    return re.sub(r'[\s\-\(\)\+]', '', telefono.strip())
+    return _SEPARADORES_TELEFONO.sub('', telefono.strip())
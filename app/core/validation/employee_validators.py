@@ -1,5 +1,4 @@
 """Validadores centralizados para campos de empleados (UI)."""
-import re
 from datetime import date
 
 from .constants import (
@@ -39,6 +38,15 @@ from .common_validators import (
     validar_texto_opcional,
 )
 from .custom_validators import limpiar_telefono
+from .validator_factory import patron
+
+_CURP = patron(CURP_PATTERN)
+_RFC_PERSONA = patron(RFC_PERSONA_PATTERN)
+_NSS = patron(NSS_PATTERN)
+_EMAIL = patron(EMAIL_PATTERN)
+_TELEFONO = patron(TELEFONO_PATTERN)
+_CUENTA_BANCARIA = patron(CUENTA_BANCARIA_PATTERN)
+_CLABE = patron(CLABE_PATTERN)
 
 
 # =============================================================================
@@ -55,7 +63,7 @@ def validar_curp_empleado(curp: str) -> str:
     if len(curp_limpio) != CURP_LEN:
         return f"CURP debe tener {CURP_LEN} caracteres (tiene {len(curp_limpio)})"
 
-    if not re.match(CURP_PATTERN, curp_limpio):
+    if not _CURP.match(curp_limpio):
         primeros_4 = curp_limpio[:4]
         if not primeros_4.isalpha():
             return "CURP: Los primeros 4 caracteres deben ser letras"
@@ -86,7 +94,7 @@ def validar_rfc_empleado(rfc: str) -> str:
     if len(rfc_limpio) != RFC_PERSONA_LEN:
         return f"RFC debe tener {RFC_PERSONA_LEN} caracteres (tiene {len(rfc_limpio)})"
 
-    if not re.match(RFC_PERSONA_PATTERN, rfc_limpio):
+    if not _RFC_PERSONA.match(rfc_limpio):
         primeros_4 = rfc_limpio[:4]
         if not all(c.isalpha() or c in '&Ñ' for c in primeros_4):
             return "RFC: Los primeros 4 caracteres deben ser letras"
@@ -105,7 +113,7 @@ def validar_nss_empleado(nss: str) -> str:
         return ""  # opcional en backoffice
 
     nss_limpio = str(nss).strip()
-    if not re.match(NSS_PATTERN, nss_limpio):
+    if not _NSS.match(nss_limpio):
         if len(nss_limpio) != NSS_LEN:
             return f"NSS debe tener {NSS_LEN} dígitos (tiene {len(nss_limpio)})"
         if not nss_limpio.isdigit():
@@ -154,7 +162,7 @@ def validar_email_empleado(email: str) -> str:
     email_limpio = email.strip().lower()
     if len(email_limpio) > EMAIL_MAX:
         return f"Email no puede exceder {EMAIL_MAX} caracteres"
-    if not re.match(EMAIL_PATTERN, email_limpio):
+    if not _EMAIL.match(email_limpio):
         return "Email con formato inválido"
     return ""
 
@@ -250,7 +258,7 @@ def validar_contacto_emergencia_telefono(telefono: str) -> str:
     if not telefono:
         return ""
     telefono_limpio = limpiar_telefono(telefono)
-    if not re.match(TELEFONO_PATTERN, telefono_limpio):
+    if not _TELEFONO.match(telefono_limpio):
         return f"Telefono debe tener {TELEFONO_DIGITOS} digitos (tiene {len(telefono_limpio)})"
     return ""
 
@@ -261,7 +269,7 @@ def validar_cuenta_bancaria_empleado(cuenta: str) -> str:
         return ""
 
     cuenta_limpia = normalizar_cuenta_bancaria(cuenta)
-    if not re.match(CUENTA_BANCARIA_PATTERN, cuenta_limpia):
+    if not _CUENTA_BANCARIA.match(cuenta_limpia):
         if not cuenta_limpia.isdigit():
             return "Cuenta bancaria debe contener solo números"
         if len(cuenta_limpia) < CUENTA_BANCARIA_MIN:
@@ -305,7 +313,7 @@ def validar_clabe_empleado(clabe: str) -> str:
         return ""
 
     clabe_limpia = normalizar_clabe_interbancaria(clabe)
-    if not re.match(CLABE_PATTERN, clabe_limpia):
+    if not _CLABE.match(clabe_limpia):
         if not clabe_limpia.isdigit():
             return "CLABE interbancaria debe contener solo números"
         if len(clabe_limpia) != CLABE_LEN:
@@ -15,9 +15,8 @@ Uso en formularios (labels y hints como referencia):
     from app.core.validation import CAMPO_RFC
     # label=CAMPO_RFC.label, placeholder=CAMPO_RFC.placeholder, hint=CAMPO_RFC.hint
 """
-import re
-
 from .field_config import FieldConfig, InputType
+from .validator_factory import patron, precompilar
 from .constants import (
     # Patrones
     RFC_PATTERN,
@@ -85,6 +84,9 @@ SECCION_CONTACTO = "contacto"
 SECCION_IMSS = "imss"
 SECCION_CONTROL = "control"
 
+_SEPARADORES_TELEFONO = patron(r'[\s\-\(\)\+]')
+_SEPARADORES_REGISTRO_PATRONAL = patron(r'[\s\-]')
+
 
 # =============================================================================
 # CAMPOS DE EMPRESA
@@ -172,7 +174,7 @@ CAMPO_TELEFONO = FieldConfig(
     max_len=TELEFONO_DIGITOS,
     patron=TELEFONO_PATTERN,
     patron_error='Debe tener 10 dígitos',
-    transformar=lambda v: re.sub(r'[\s\-\(\)\+]', '', v),
+    transformar=lambda v: _SEPARADORES_TELEFONO.sub('', v),
     # UI
     label='Teléfono',
     placeholder='(55) 1234-5678',
@@ -217,7 +219,7 @@ CAMPO_REGISTRO_PATRONAL = FieldConfig(
     max_len=REGISTRO_PATRONAL_LEN,
     patron=REGISTRO_PATRONAL_LIMPIO_PATTERN,
     patron_error=MSG_REGISTRO_PATRONAL_INVALIDO,
-    transformar=lambda v: re.sub(r'[\s\-]', '', v.upper()),
+    transformar=lambda v: _SEPARADORES_REGISTRO_PATRONAL.sub('', v.upper()),
     # UI
     label='Registro Patronal IMSS',
     placeholder='Y12-34567-10-1',
@@ -718,3 +720,7 @@ CAMPOS_CONTACTO_BUAP = {
     'cargo': CAMPO_CARGO_CONTACTO,
     'extension': CAMPO_EXTENSION_CONTACTO,
 }
+
+
+# Compila una sola vez los validadores de todo el catálogo
+precompilar(v for v in list(globals().values()) if isinstance(v, FieldConfig))
@@ -21,7 +21,7 @@ from typing import Any
 from pydantic import Field, field_validator
 
 from .field_config import FieldConfig
-from .validator_factory import validar_con_config
+from .validator_factory import validador_para
 
 
 def pydantic_field(config: FieldConfig, **override) -> Any:
@@ -100,13 +100,15 @@ def campo_validador(nombre_campo: str, config: FieldConfig):
         lo importante es el primer argumento (nombre_campo) que debe
         coincidir con el nombre del atributo en el modelo.
     """
+    validador = validador_para(config)
+
     def validator(cls, v):
         # Si es None o vacío y no es requerido, permitir
         if not v and not config.requerido:
             return v
 
         # Aplicar validación y transformación usando FieldConfig
-        valor_transformado, error = validar_con_config(v, config)
+        valor_transformado, error = validador.validar_y_transformar(v)
 
         if error:
             raise ValueError(error)
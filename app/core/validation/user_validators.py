@@ -1,5 +1,4 @@
 """Validadores centralizados para campos de usuario (UI + entidades)."""
-import re
 from typing import Optional
 
 from .constants import (
@@ -10,6 +9,9 @@ from .constants import (
     PASSWORD_MIN,
 )
 from .custom_validators import limpiar_telefono
+from .validator_factory import patron
+
+_EMAIL = patron(EMAIL_PATTERN)
 
 
 # =============================================================================
@@ -21,7 +23,7 @@ def validar_email_usuario(email: str) -> str:
     """Valida email requerido para formularios de usuario."""
     if not email or not email.strip():
         return "El email es requerido"
-    if not re.match(EMAIL_PATTERN, email.strip().lower()):
+    if not _EMAIL.match(email.strip().lower()):
         return "Formato de email invalido"
     return ""
 
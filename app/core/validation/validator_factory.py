@@ -2,20 +2,154 @@
 Fábrica de validadores y funciones auxiliares.
 
 Contiene:
+- patron(): Regex compilado una sola vez por expresión
+- ValidadorCampo / validador_para(): FieldConfig compilado una sola vez
+  (los del catálogo se compilan al importar fields_catalog)
 - crear_validador(): Factory que genera validadores desde FieldConfig
 - validar_con_config(): Para usar FieldConfig en Pydantic validators
+- validar_lote(): Valida muchos registros columna por columna
 - Helpers reutilizables: validar_patron, validar_longitud, validar_requerido
 """
 import re
-from typing import Callable, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 from .field_config import FieldConfig
 
 
+# =============================================================================
+# REGISTRO DE PATRONES Y VALIDADORES COMPILADOS
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def patron(expresion: str) -> re.Pattern:
+    """
+    Regex compilado de `expresion` (se compila una sola vez por proceso).
+
+    Example:
+        >>> _CURP = patron(CURP_PATTERN)  # a nivel de módulo
+        >>> _CURP.match("PEGA900101HPLRRN01")
+    """
+    return re.compile(expresion)
+
+
+class ValidadorCampo:
+    """
+    Validador de un FieldConfig con su patrón ya compilado.
+
+    Se invoca como la función de `crear_validador` (regresa el mensaje de
+    error o ""); `validar_y_transformar` tiene la semántica de
+    `validar_con_config`.
+    """
+
+    __slots__ = ('config', '_patron')
+
+    def __init__(self, config: FieldConfig):
+        self.config = config
+        self._patron = patron(config.patron) if config.patron else None
+
+    def __call__(self, valor: str) -> str:
+        config = self.config
+
+        # Transformar si aplica (ej: str.upper)
+        if config.transformar and valor:
+            valor = config.transformar(valor)
+
+        # Validar requerido
+        if config.requerido:
+            if not valor or not valor.strip():
+                return f"{config.nombre} es obligatorio"
+        elif not valor or not valor.strip():
+            return ""  # Campo opcional vacío es válido
+
+        valor = valor.strip()
+
+        # Validar longitud mínima
+        if config.min_len and len(valor) < config.min_len:
+            return f"{config.nombre_display} debe tener al menos {config.min_len} caracteres"
+
+        # Validar longitud máxima
+        if config.max_len and len(valor) > config.max_len:
+            return f"{config.nombre_display} no puede tener más de {config.max_len} caracteres"
+
+        # Validar patrón regex
+        if self._patron and not self._patron.match(valor):
+            return config.patron_error or "Formato inválido"
+
+        # Validador personalizado
+        if config.validador_custom:
+            error = config.validador_custom(valor)
+            if error:
+                return error
+
+        return ""
+
+    def validar_y_transformar(self, valor: str) -> Tuple[str, str]:
+        config = self.config
+
+        if not valor:
+            if config.requerido:
+                return valor, f"{config.nombre} es obligatorio"
+            return valor, ""
+
+        # Aplicar transformación
+        valor_transformado = valor
+        if config.transformar:
+            valor_transformado = config.transformar(valor)
+
+        valor_limpio = valor_transformado.strip() if isinstance(valor_transformado, str) else valor_transformado
+
+        # Validar longitud mínima
+        if config.min_len and len(valor_limpio) < config.min_len:
+            return valor_transformado, f"{config.nombre} debe tener al menos {config.min_len} caracteres"
+
+        # Validar longitud máxima
+        if config.max_len and len(valor_limpio) > config.max_len:
+            return valor_transformado, f"{config.nombre} no puede tener más de {config.max_len} caracteres"
+
+        # Validar patrón
+        if self._patron and not self._patron.match(valor_limpio):
+            return valor_transformado, config.patron_error or "Formato inválido"
+
+        # Validador custom
+        if config.validador_custom:
+            error = config.validador_custom(valor_limpio)
+            if error:
+                return valor_transformado, error
+
+        return valor_transformado, ""
+
+
+# id(config) -> (config, validador). Guarda el config para que su id no se reutilice.
+_validadores: Dict[int, Tuple[FieldConfig, ValidadorCampo]] = {}
+
+
+def precompilar(configs: Iterable[FieldConfig]) -> None:
+    """Compila y registra los validadores de `configs` (p. ej. el catálogo)."""
+    for config in configs:
+        if id(config) not in _validadores:
+            _validadores[id(config)] = (config, ValidadorCampo(config))
+
+
+def validador_para(config: FieldConfig) -> ValidadorCampo:
+    """
+    Validador compilado de `config`: el registrado si es del catálogo;
+    si no, uno nuevo (no se registra, para no retener configs de paso).
+    """
+    registrado = _validadores.get(id(config))
+    if registrado is not None:
+        return registrado[1]
+    return ValidadorCampo(config)
+
+
 # =============================================================================
 # FUNCIONES HELPER REUTILIZABLES
 # =============================================================================
 
+# `validar_patron` recibe un parámetro llamado `patron`
+_patron_de = patron
+
+
 def validar_patron(valor: str, patron: str, mensaje_error: str) -> str:
     """
     Valida un valor contra un patrón regex.
@@ -28,7 +162,7 @@ def validar_patron(valor: str, patron: str, mensaje_error: str) -> str:
     Returns:
         String vacío si es válido, mensaje de error si no
     """
-    if not re.match(patron, valor):
+    if not _patron_de(patron).match(valor):
         return mensaje_error
     return ""
 
@@ -84,7 +218,7 @@ def validar_requerido(valor: Optional[str], nombre_campo: str = "Campo") -> str:
 
 def crear_validador(config: FieldConfig) -> Callable[[str], str]:
     """
-    Crea una función validadora a partir de una configuración.
+    Regresa el validador compilado de una configuración.
 
     Args:
         config: Configuración del campo (FieldConfig)
@@ -97,41 +231,7 @@ def crear_validador(config: FieldConfig) -> Callable[[str], str]:
         >>> validar_rfc = crear_validador(CAMPO_RFC)
         >>> validar_rfc("XAXX010101AB1")  # "" = válido
     """
-    def validar(valor: str) -> str:
-        # Transformar si aplica (ej: str.upper)
-        if config.transformar and valor:
-            valor = config.transformar(valor)
-
-        # Validar requerido
-        if config.requerido:
-            if not valor or not valor.strip():
-                return f"{config.nombre} es obligatorio"
-        elif not valor or not valor.strip():
-            return ""  # Campo opcional vacío es válido
-
-        valor = valor.strip()
-
-        # Validar longitud mínima
-        if config.min_len and len(valor) < config.min_len:
-            return f"{config.nombre_display} debe tener al menos {config.min_len} caracteres"
-
-        # Validar longitud máxima
-        if config.max_len and len(valor) > config.max_len:
-            return f"{config.nombre_display} no puede tener más de {config.max_len} caracteres"
-
-        # Validar patrón regex
-        if config.patron and not re.match(config.patron, valor):
-            return config.patron_error or "Formato inválido"
-
-        # Validador personalizado
-        if config.validador_custom:
-            error = config.validador_custom(valor)
-            if error:
-                return error
-
-        return ""
-
-    return validar
+    return validador_para(config)
 
 
 # =============================================================================
@@ -161,34 +261,44 @@ def validar_con_config(valor: str, config: FieldConfig) -> Tuple[str, str]:
         - Si es válido: (valor_transformado, "")
         - Si hay error: (valor_original, "mensaje de error")
     """
-    if not valor:
-        if config.requerido:
-            return valor, f"{config.nombre} es obligatorio"
-        return valor, ""
+    return validador_para(config).validar_y_transformar(valor)
+
+
+# =============================================================================
+# VALIDACIÓN POR LOTE
+# =============================================================================
 
-    # Aplicar transformación
-    valor_transformado = valor
-    if config.transformar:
-        valor_transformado = config.transformar(valor)
+def validar_lote(
+    registros: Sequence[Mapping[str, Any]],
+    campos: Mapping[str, Union[FieldConfig, Callable[[Any], str]]],
+) -> List[List[str]]:
+    """
+    Valida muchos registros columna por columna.
 
-    valor_limpio = valor_transformado.strip() if isinstance(valor_transformado, str) else valor_transformado
+    Cada validador se resuelve una vez y recorre su columna completa; los
+    errores de cada fila quedan en el orden de `campos`. Los validadores
+    se llaman en el orden de los registros, así que pueden llevar estado
+    (p. ej. detectar duplicados en el archivo).
 
-    # Validar longitud mínima
-    if config.min_len and len(valor_limpio) < config.min_len:
-        return valor_transformado, f"{config.nombre} debe tener al menos {config.min_len} caracteres"
+    Example:
+        >>> errores = validar_lote(filas, {'rfc': CAMPO_RFC, 'curp': validar_curp_empleado})
+        >>> errores[0]  # [] = fila válida
 
-    # Validar longitud máxima
-    if config.max_len and len(valor_limpio) > config.max_len:
-        return valor_transformado, f"{config.nombre} no puede tener más de {config.max_len} caracteres"
+    Args:
+        registros: Diccionarios campo -> valor (un campo ausente vale None)
+        campos: Campo -> FieldConfig o función `valor -> mensaje de error o ""`
 
-    # Validar patrón
-    if config.patron and not re.match(config.patron, valor_limpio):
-        return valor_transformado, config.patron_error or "Formato inválido"
+    Returns:
+        Una lista de errores por registro (vacía si es válido)
+    """
+    errores: List[List[str]] = [[] for _ in registros]
 
-    # Validador custom
-    if config.validador_custom:
-        error = config.validador_custom(valor_limpio)
-        if error:
-            return valor_transformado, error
+    for campo, validador in campos.items():
+        if isinstance(validador, FieldConfig):
+            validador = validador_para(validador)
+        for errores_fila, registro in zip(errores, registros):
+            error = validador(registro.get(campo))
+            if error:
+                errores_fila.append(error)
 
-    return valor_transformado, ""
+    return errores
@@ -4,10 +4,30 @@ Gestor de conexion a base de datos Supabase.
 Usa service_role key para el cliente principal (bypass RLS).
 La seguridad de acceso se maneja en la capa de servicios (AuthState, roles).
 RLS protege contra acceso directo a la BD (API REST, client SDK).
+
+supabase-py es sincrono: cada `.execute()` bloquea el hilo que lo llama.
+Para no congelar el event loop de Reflex/FastAPI, el manager expone un
+pool acotado de hilos (`ejecutar` / `ejecutar_query`) que los repositorios
+y servicios usan desde sus metodos `async`.
+
+`get_client()` entrega el cliente envuelto por
+`instrumentacion.ClienteInstrumentado`, que mide cada query (con
+`DB_INSTRUMENTACION`) y permite cambiar el backend en caliente con
+`usar_cliente` (p. ej. `memoria.SupabaseEnMemoria` en tests).
+Con `DB_BACKEND=memoria` toda la app arranca sobre `SupabaseEnMemoria`
+(benchmarks y pruebas de carga sin proyecto de Supabase).
 """
+import asyncio
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
 from supabase import create_client, Client
 from app.core.config import Config
+from app.database.instrumentacion import ClienteInstrumentado, registro_consultas
+from app.database.memoria import SupabaseEnMemoria
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +35,29 @@ logger = logging.getLogger(__name__)
 class DatabaseManager:
     """Manejador singleton de la conexion a Supabase"""
 
+    # Envoltura instrumentada del cliente principal (lazy, ver get_client)
+    _cliente_instrumentado: Optional[ClienteInstrumentado] = None
+
     def __init__(self):
         """
         Inicializa el cliente de Supabase.
 
         Usa service_role key si esta disponible (bypass RLS).
         Fallback a anon key si no hay service key.
+        Con `Config.DB_BACKEND == "memoria"` no se conecta a Supabase.
         """
+        # Pool de I/O (lazy): se crea en la primera query async
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        if Config.DB_BACKEND == "memoria":
+            logger.warning(
+                "DatabaseManager usando backend en memoria (latencia %.1f ms). "
+                "Los datos no se persisten.", Config.DB_LATENCIA_MS,
+            )
+            self.supabase = SupabaseEnMemoria(latencia_ms=Config.DB_LATENCIA_MS)
+            self._anon_client = self.supabase
+            return
+
         # Preferir service_role key para operaciones backend
         key = Config.SUPABASE_SERVICE_KEY or Config.SUPABASE_KEY
         if Config.SUPABASE_SERVICE_KEY:
@@ -40,13 +76,63 @@ class DatabaseManager:
         )
 
     def get_client(self) -> Client:
-        """Retorna el cliente principal (service_role, bypass RLS)."""
-        return self.supabase
+        """Retorna el cliente principal (service_role, bypass RLS), instrumentado."""
+        if self._cliente_instrumentado is None:
+            self._cliente_instrumentado = ClienteInstrumentado(self.supabase, registro_consultas)
+        return self._cliente_instrumentado
+
+    @contextmanager
+    def usar_cliente(self, cliente) -> Iterator[Any]:
+        """
+        Redirige temporalmente todas las queries a `cliente`.
+
+        Aplica también a repositorios y servicios ya construidos, porque
+        todos guardan la envoltura de `get_client()`. No limpia caches.
+        """
+        envoltura = self.get_client()
+        anterior, envoltura.cliente = envoltura.cliente, cliente
+        try:
+            yield cliente
+        finally:
+            envoltura.cliente = anterior
 
     def get_anon_client(self) -> Client:
         """Retorna el cliente con anon key (para auth de usuario)."""
         return self._anon_client
 
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Retorna el pool acotado de hilos para queries (lo crea si no existe)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, Config.DB_EXECUTOR_WORKERS),
+                thread_name_prefix="supabase-io",
+            )
+        return self._executor
+
+    async def ejecutar(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta una funcion bloqueante en el pool de I/O sin bloquear el loop.
+
+        Args:
+            fn: Funcion sincrona (tipicamente una closure que hace `.execute()`)
+
+        Returns:
+            El valor retornado por `fn`. Las excepciones se propagan tal cual.
+        """
+        loop = asyncio.get_running_loop()
+        llamada = functools.partial(fn, *args, **kwargs)
+        return await loop.run_in_executor(self.get_executor(), llamada)
+
+    async def ejecutar_query(self, query) -> Any:
+        """Ejecuta `query.execute()` en el pool de I/O y retorna la respuesta."""
+        return await self.ejecutar(query.execute)
+
+    def cerrar(self) -> None:
+        """Libera el pool de I/O (idempotente)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
     def test_connection(self) -> bool:
         """Prueba la conexion con la base de datos"""
         try:
@@ -0,0 +1,507 @@
+"""
+Instrumentación de consultas a Supabase/PostgREST.
+
+`DatabaseManager.get_client()` entrega el cliente envuelto en
+`ClienteInstrumentado`: cada `.table(...)` / `.rpc(...)` regresa un
+builder que anota la forma de la consulta (operación y columnas de los
+filtros, nunca los valores) y, al hacer `.execute()`, registra duración,
+filas, bytes aproximados de la respuesta y el método que la originó.
+Está apagada por defecto (`Config.DB_INSTRUMENTACION`).
+
+Recorrer la pila y serializar la respuesta cuesta CPU en el pool de I/O,
+así que sólo una muestra (`Config.DB_INSTRUMENTACION_MUESTRA`) registra
+llamador y bytes exactos; las lentas también miden sus bytes. Para el
+resto los bytes se estiman con los bytes por fila ya medidos.
+
+Los datos se agregan en `registro_consultas` (histogramas por tabla y
+operación) y las consultas que superan `Config.DB_SLOW_QUERY_MS` se
+escriben en el logger `app.database.instrumentacion.lentas`. Quien
+necesite enterarse de escrituras (p. ej. snapshots de métricas) se
+suscribe con `registro_consultas.al_escribir(fn)`; el aviso de
+escrituras no depende de `Config.DB_INSTRUMENTACION`.
+
+Todo lo que no es `table`/`from_`/`rpc` (auth, storage, ...) pasa al
+cliente real sin tocar.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from app.core.config import Config
+
+logger = logging.getLogger(__name__)
+logger_lentas = logging.getLogger(f"{__name__}.lentas")
+
+LIMITES_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+"""Límites superiores (ms) de los buckets del histograma; el último es +inf."""
+
+_OPERACIONES = {"select", "insert", "update", "upsert", "delete"}
+_ESCRITURAS = {"insert", "update", "upsert", "delete"}
+# Métodos cuya forma se anota sin argumentos (no tienen columna, o su
+# primer argumento incluye valores, como `or_`)
+_SIN_COLUMNA = {"range", "limit", "offset", "single", "maybe_single", "csv", "explain", "or_", "not_"}
+_MODULOS_PROPIOS = ("app.database", "app.repositories.shared")
+_MAX_LLAMADORES = 20
+_MAX_FRAMES = 40
+
+
+def _es_builder(valor: Any) -> bool:
+    return hasattr(valor, "execute")
+
+
+def _tamano_respuesta(data: Any) -> int:
+    """Bytes aproximados del JSON de la respuesta."""
+    if not data:
+        return 0
+    try:
+        return len(json.dumps(data, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _llamador() -> str:
+    """
+    Método que originó la consulta: el primer frame de `app.services`, o
+    en su defecto el primer frame de la app fuera de esta capa.
+    """
+    frame = sys._getframe(2)
+    respaldo = None
+    for _ in range(_MAX_FRAMES):
+        if frame is None:
+            break
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("app.") and not modulo.startswith(_MODULOS_PROPIOS):
+            codigo = frame.f_code
+            nombre = f"{modulo.rsplit('.', 1)[-1]}.{getattr(codigo, 'co_qualname', codigo.co_name)}"
+            if modulo.startswith("app.services"):
+                return nombre
+            respaldo = respaldo or nombre
+        frame = frame.f_back
+    return respaldo or "?"
+
+
+class _Estadistica:
+    """Acumulados de un par (tabla, operación)."""
+
+    __slots__ = (
+        "llamadas", "errores", "total_ms", "max_ms", "filas", "bytes", "buckets", "llamadores",
+        "filas_medidas", "bytes_medidos",
+    )
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.filas = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(LIMITES_MS) + 1)
+        self.llamadores: dict[str, list] = {}
+        self.filas_medidas = 0
+        self.bytes_medidos = 0
+
+    def registrar(
+        self, ms: float, filas: int, tamano: Optional[int], llamador: Optional[str], error: bool
+    ) -> int:
+        """Acumula una consulta; regresa sus bytes (estimados si `tamano` es None)."""
+        self.llamadas += 1
+        self.errores += int(error)
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.filas += filas
+        if tamano is None:
+            tamano = filas * self.bytes_medidos // self.filas_medidas if self.filas_medidas else 0
+        elif filas:
+            self.filas_medidas += filas
+            self.bytes_medidos += tamano
+        self.bytes += tamano
+        self.buckets[_bucket(ms)] += 1
+        if llamador is not None:
+            self._registrar_llamador(llamador, ms)
+        return tamano
+
+    def _registrar_llamador(self, llamador: str, ms: float) -> None:
+        acumulado = self.llamadores.get(llamador)
+        if acumulado is None:
+            if len(self.llamadores) >= _MAX_LLAMADORES:
+                llamador = "(otros)"
+                acumulado = self.llamadores.setdefault(llamador, [0, 0.0])
+            else:
+                acumulado = self.llamadores[llamador] = [0, 0.0]
+        acumulado[0] += 1
+        acumulado[1] += ms
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Límite superior (ms) del bucket donde cae el percentil `p`."""
+        if not self.llamadas:
+            return None
+        objetivo = p * self.llamadas
+        acumulado = 0
+        for i, cuenta in enumerate(self.buckets):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return float(LIMITES_MS[i]) if i < len(LIMITES_MS) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+
+    def a_dict(self) -> dict[str, Any]:
+        llamadores = sorted(self.llamadores.items(), key=lambda kv: kv[1][1], reverse=True)
+        return {
+            "llamadas": self.llamadas,
+            "errores": self.errores,
+            "total_ms": round(self.total_ms, 1),
+            "promedio_ms": round(self.total_ms / self.llamadas, 2) if self.llamadas else 0.0,
+            "p50_ms": self.percentil(0.50),
+            "p95_ms": self.percentil(0.95),
+            "p99_ms": self.percentil(0.99),
+            "max_ms": round(self.max_ms, 1),
+            "filas": self.filas,
+            "bytes": self.bytes,
+            "histograma": dict(zip([f"<={l}" for l in LIMITES_MS] + ["+inf"], self.buckets)),
+            "llamadores": [
+                {"metodo": metodo, "llamadas": n, "total_ms": round(ms, 1)}
+                for metodo, (n, ms) in llamadores[:5]
+            ],
+        }
+
+
+def _bucket(ms: float) -> int:
+    for i, limite in enumerate(LIMITES_MS):
+        if ms <= limite:
+            return i
+    return len(LIMITES_MS)
+
+
+class RegistroConsultas:
+    """
+    Histogramas en proceso de todas las consultas instrumentadas.
+
+    Thread-safe: las consultas pueden ejecutarse en el pool de I/O.
+    """
+
+    def __init__(self, umbral_lenta_ms: float = 500, max_lentas: int = 100):
+        self.umbral_lenta_ms = umbral_lenta_ms
+        self._lock = threading.Lock()
+        self._por_clave: dict[tuple[str, str], _Estadistica] = {}
+        self._lentas: deque = deque(maxlen=max_lentas)
+        self._observadores: list[list[dict]] = []
+        self._al_escribir: list[Callable[[str], None]] = []
+        self.desde = time.time()
+
+    @property
+    def observado(self) -> bool:
+        return bool(self._observadores)
+
+    @contextmanager
+    def observar(self) -> Iterator[list[dict]]:
+        """
+        Junta en una lista cada consulta registrada dentro del bloque
+        (tabla, operacion, forma, ms, filas, llamador, error), en orden.
+        """
+        consultas: list[dict] = []
+        with self._lock:
+            self._observadores.append(consultas)
+        try:
+            yield consultas
+        finally:
+            with self._lock:
+                self._observadores.remove(consultas)
+
+    def al_escribir(self, fn: Callable[[str], None]) -> None:
+        """
+        Llama `fn(tabla)` tras cada insert/update/upsert/delete exitoso.
+
+        Corre en el hilo que ejecutó la consulta (a menudo el pool de I/O):
+        `fn` debe ser rápida y thread-safe, p. ej. marcar una bandera.
+        """
+        with self._lock:
+            self._al_escribir.append(fn)
+
+    def registrar(
+        self,
+        tabla: str,
+        operacion: str,
+        forma: str,
+        ms: float,
+        filas: int = 0,
+        tamano: Optional[int] = 0,
+        llamador: Optional[str] = "?",
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        `tamano=None` estima los bytes con los bytes por fila medidos de la
+        misma tabla y operación; `llamador=None` (consulta fuera de la
+        muestra) no cuenta en los llamadores.
+        """
+        with self._lock:
+            estadistica = self._por_clave.get((tabla, operacion))
+            if estadistica is None:
+                estadistica = self._por_clave[(tabla, operacion)] = _Estadistica()
+            tamano = estadistica.registrar(ms, filas, tamano, llamador, error is not None)
+            llamador = llamador or "?"
+            if self._observadores:
+                consulta = {
+                    "tabla": tabla, "operacion": operacion, "forma": forma, "ms": ms,
+                    "filas": filas, "llamador": llamador, "error": error,
+                }
+                for observador in self._observadores:
+                    observador.append(consulta)
+            lenta = ms >= self.umbral_lenta_ms
+            if lenta:
+                self._lentas.append({
+                    "momento": time.time(),
+                    "tabla": tabla,
+                    "operacion": operacion,
+                    "forma": forma,
+                    "ms": round(ms, 1),
+                    "filas": filas,
+                    "bytes": tamano,
+                    "llamador": llamador,
+                    "error": error,
+                })
+        if lenta:
+            logger_lentas.warning(
+                "Consulta lenta %.0f ms: %s %s [%s] filas=%d bytes=%d desde %s",
+                ms, operacion, tabla, forma, filas, tamano, llamador,
+            )
+        if error is None and operacion in _ESCRITURAS:
+            self.notificar_escritura(tabla)
+
+    def notificar_escritura(self, tabla: str) -> None:
+        """Avisa a los suscriptores de `al_escribir` que se escribió en `tabla`."""
+        for fn in self._al_escribir:
+            fn(tabla)
+
+    def estadisticas(self) -> dict[str, Any]:
+        """Resumen por tabla/operación, ordenado por tiempo total."""
+        with self._lock:
+            claves = sorted(
+                self._por_clave.items(), key=lambda kv: kv[1].total_ms, reverse=True
+            )
+            return {
+                "desde": self.desde,
+                "umbral_lenta_ms": self.umbral_lenta_ms,
+                "consultas": [
+                    {"tabla": tabla, "operacion": operacion, **e.a_dict()}
+                    for (tabla, operacion), e in claves
+                ],
+                "lentas": list(self._lentas),
+            }
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._por_clave.clear()
+            self._lentas.clear()
+            self.desde = time.time()
+
+
+class _ConsultaInstrumentada:
+    """Envuelve un builder de postgrest y mide su `.execute()`."""
+
+    __slots__ = ("_builder", "_registro", "_tabla", "_operacion", "_forma", "_llamador")
+
+    def __init__(
+        self,
+        builder,
+        registro: RegistroConsultas,
+        tabla: str,
+        llamador: Optional[str],
+        operacion: str = "select",
+    ):
+        self._builder = builder
+        self._registro = registro
+        self._tabla = tabla
+        self._operacion = operacion
+        self._forma: list[str] = []
+        self._llamador = llamador
+
+    def __getattr__(self, nombre: str):
+        atributo = getattr(self._builder, nombre)
+        if not callable(atributo):
+            # Propiedades que regresan el builder (p. ej. `.not_`)
+            if _es_builder(atributo):
+                self._forma.append(nombre)
+                self._builder = atributo
+                return self
+            return atributo
+
+        def _envoltura(*args, **kwargs):
+            resultado = atributo(*args, **kwargs)
+            if not _es_builder(resultado):
+                return resultado
+            self._anotar(nombre, args)
+            self._builder = resultado
+            return self
+
+        return _envoltura
+
+    def _anotar(self, nombre: str, args: tuple) -> None:
+        if nombre in _OPERACIONES:
+            self._operacion = nombre
+            if nombre == "select" and args:
+                columnas = " ".join(str(args[0]).split())
+                self._forma.append(f"select({columnas[:60]})")
+            else:
+                self._forma.append(nombre)
+        elif nombre in _SIN_COLUMNA or not args or not isinstance(args[0], str):
+            self._forma.append(nombre)
+        else:
+            self._forma.append(f"{nombre}({args[0]})")
+
+    def execute(self):
+        inicio = time.perf_counter()
+        try:
+            respuesta = self._builder.execute()
+        except Exception as e:
+            self._registrar(inicio, None, error=type(e).__name__)
+            raise
+        self._registrar(inicio, respuesta)
+        return respuesta
+
+    def _registrar(self, inicio: float, respuesta, error: Optional[str] = None) -> None:
+        ms = (time.perf_counter() - inicio) * 1000
+        data = getattr(respuesta, "data", None)
+        filas = len(data) if isinstance(data, list) else int(data is not None)
+        # Bytes exactos sólo de las muestreadas y las lentas
+        medir = self._llamador is not None or ms >= self._registro.umbral_lenta_ms
+        try:
+            self._registro.registrar(
+                self._tabla,
+                self._operacion,
+                " ".join(self._forma),
+                ms,
+                filas=filas,
+                tamano=_tamano_respuesta(data) if medir else None,
+                llamador=self._llamador,
+                error=error,
+            )
+        except Exception as e:  # la instrumentación nunca rompe la consulta
+            logger.debug(f"No se pudo registrar la consulta a {self._tabla}: {e}")
+
+    def __repr__(self) -> str:
+        return f"<ConsultaInstrumentada {self._tabla} {' '.join(self._forma)}>"
+
+
+class _TablaNotificada:
+    """
+    Builder de tabla sin medir: las lecturas pasan al builder real tal
+    cual y las escrituras se envuelven para avisar a `al_escribir`.
+    """
+
+    __slots__ = ("_builder", "_registro", "_tabla")
+
+    def __init__(self, builder, registro: RegistroConsultas, tabla: str):
+        self._builder = builder
+        self._registro = registro
+        self._tabla = tabla
+
+    def __getattr__(self, nombre: str):
+        atributo = getattr(self._builder, nombre)
+        if nombre not in _ESCRITURAS:
+            return atributo
+
+        def _envoltura(*args, **kwargs):
+            return _EscrituraNotificada(atributo(*args, **kwargs), self._registro, self._tabla)
+
+        return _envoltura
+
+
+class _EscrituraNotificada:
+    """Envuelve un builder de escritura y avisa tras su `.execute()` exitoso."""
+
+    __slots__ = ("_builder", "_registro", "_tabla")
+
+    def __init__(self, builder, registro: RegistroConsultas, tabla: str):
+        self._builder = builder
+        self._registro = registro
+        self._tabla = tabla
+
+    def __getattr__(self, nombre: str):
+        atributo = getattr(self._builder, nombre)
+        if not callable(atributo):
+            if _es_builder(atributo):
+                self._builder = atributo
+                return self
+            return atributo
+
+        def _envoltura(*args, **kwargs):
+            resultado = atributo(*args, **kwargs)
+            if not _es_builder(resultado):
+                return resultado
+            self._builder = resultado
+            return self
+
+        return _envoltura
+
+    def execute(self):
+        respuesta = self._builder.execute()
+        try:
+            self._registro.notificar_escritura(self._tabla)
+        except Exception as e:  # el aviso nunca rompe la escritura
+            logger.debug(f"No se pudo notificar la escritura en {self._tabla}: {e}")
+        return respuesta
+
+    def __repr__(self) -> str:
+        return f"<EscrituraNotificada {self._tabla}>"
+
+
+class ClienteInstrumentado:
+    """
+    Proxy del cliente de Supabase que instrumenta tablas y RPCs.
+
+    Mide sólo con `Config.DB_INSTRUMENTACION` o mientras alguien observa
+    el registro (`presupuesto_queries` en los tests). Si no, las tablas
+    sólo avisan sus escrituras a `al_escribir` (los snapshots y catálogos
+    compartidos dependen de eso) y los RPCs van al cliente real tal cual.
+    `cliente` se puede reemplazar en caliente (ver
+    `DatabaseManager.usar_cliente`).
+    """
+
+    def __init__(self, cliente, registro: RegistroConsultas):
+        self.cliente = cliente
+        self._registro = registro
+
+    def _medir(self) -> bool:
+        return Config.DB_INSTRUMENTACION or self._registro.observado
+
+    def _llamador_muestreado(self) -> Optional[str]:
+        """El llamador si la consulta cae en la muestra (siempre si se observa)."""
+        if self._registro.observado or random.random() < Config.DB_INSTRUMENTACION_MUESTRA:
+            return _llamador()
+        return None
+
+    def table(self, nombre: str):
+        builder = self.cliente.table(nombre)
+        if not self._medir():
+            return _TablaNotificada(builder, self._registro, nombre)
+        return _ConsultaInstrumentada(builder, self._registro, nombre, self._llamador_muestreado())
+
+    def from_(self, nombre: str):
+        builder = self.cliente.from_(nombre)
+        if not self._medir():
+            return _TablaNotificada(builder, self._registro, nombre)
+        return _ConsultaInstrumentada(builder, self._registro, nombre, self._llamador_muestreado())
+
+    def rpc(self, funcion: str, params: Optional[dict] = None, *args, **kwargs):
+        builder = self.cliente.rpc(funcion, params, *args, **kwargs)
+        if not self._medir():
+            return builder
+        return _ConsultaInstrumentada(
+            builder, self._registro, funcion, self._llamador_muestreado(), operacion="rpc"
+        )
+
+    def __getattr__(self, nombre: str):
+        return getattr(self.cliente, nombre)
+
+
+registro_consultas = RegistroConsultas(
+    umbral_lenta_ms=Config.DB_SLOW_QUERY_MS,
+    max_lentas=Config.DB_SLOW_QUERY_BUFFER,
+)
@@ -0,0 +1,771 @@
+"""
+Cliente de Supabase en memoria (sustituto de PostgREST para tests,
+benchmarks y pruebas de carga).
+
+Implementa el subconjunto del query builder de supabase-py que usa el
+código:
+
+    client.table('t').select('*, empresas(nombre_comercial)', count='exact')
+        .eq/neq/gt/gte/lt/lte/in_/is_/like/ilike/or_/not_/filter/match
+        .order/range/limit/single/maybe_single
+    client.table('t').insert/upsert/update/delete(...)
+    client.rpc('funcion', params)
+    client.storage.from_('bucket').upload/update/download/remove/list
+        .create_signed_url/create_signed_urls/get_public_url
+
+Las filas viven en `tablas` (`{tabla: [fila, ...]}`); cada `.execute()`
+regresa copias, igual que la red. Los embebidos (`rel(cols)`,
+`alias:rel(cols)`, `rel!inner(...)`, `alias:fk_id(...)`) se resuelven por
+convención de nombres: `empresas(...)` sobre una fila con `empresa_id` es
+to-one; `cotizacion_partidas(...)` sobre `cotizaciones` es to-many por
+`cotizacion_id`.
+
+`latencia_ms` simula el viaje de red por llamada, así que los benchmarks
+miden también el costo de las queries que hace cada flujo.
+
+Uso:
+    with db_manager.usar_cliente(SupabaseEnMemoria({'empresas': [...]}, latencia_ms=2)):
+        await empresa_service.obtener_por_id(1)
+
+o para toda la app: `DB_BACKEND=memoria` (ver `DatabaseManager`).
+"""
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from postgrest import APIResponse
+from postgrest.base_request_builder import SingleAPIResponse
+from postgrest.exceptions import APIError
+from storage3.exceptions import StorageApiError
+from storage3.types import UploadResponse
+
+Fila = Dict[str, Any]
+
+
+# =============================================================================
+# PARSEO DE SELECT Y FILTROS
+# =============================================================================
+
+def _partir(texto: str, separador: str = ",") -> List[str]:
+    """Parte `texto` por `separador` respetando paréntesis y comillas."""
+    partes, actual, nivel, comillas = [], [], 0, False
+    for c in texto:
+        if c == '"':
+            comillas = not comillas
+        elif not comillas and c == "(":
+            nivel += 1
+        elif not comillas and c == ")":
+            nivel -= 1
+        if c == separador and nivel == 0 and not comillas:
+            partes.append("".join(actual).strip())
+            actual = []
+        else:
+            actual.append(c)
+    if "".join(actual).strip():
+        partes.append("".join(actual).strip())
+    return partes
+
+
+class _Columna:
+    __slots__ = ("nombre", "alias")
+
+    def __init__(self, nombre: str, alias: Optional[str]):
+        self.nombre = nombre
+        self.alias = alias or nombre
+
+
+class _Embebido:
+    __slots__ = ("recurso", "alias", "hint", "inner", "columnas")
+
+    def __init__(self, recurso: str, alias: Optional[str], hint: Optional[str], inner: bool, columnas: list):
+        self.recurso = recurso
+        self.alias = alias or recurso
+        self.hint = hint
+        self.inner = inner
+        self.columnas = columnas
+
+
+@lru_cache(maxsize=512)
+def _parsear_select(texto: str) -> list:
+    """'*, a, b:c, rel!inner(x, sub(y))' -> [_Columna | _Embebido]."""
+    items: list = []
+    for parte in _partir(" ".join((texto or "*").split())):
+        alias = None
+        cabeza = parte.split("(", 1)[0]
+        if ":" in cabeza and "::" not in cabeza:
+            alias, parte = (s.strip() for s in parte.split(":", 1))
+        if "(" in parte and parte.endswith(")"):
+            nombre, interior = parte.split("(", 1)
+            nombre, *modificadores = nombre.strip().split("!")
+            inner = "inner" in modificadores
+            hint = next((m for m in modificadores if m not in ("inner", "left")), None)
+            items.append(_Embebido(nombre, alias, hint, inner, _parsear_select(interior[:-1])))
+        else:
+            items.append(_Columna(parte.split("::", 1)[0].strip(), alias))
+    return items
+
+
+def _singulares(palabra: str) -> List[str]:
+    variantes = [palabra]
+    if palabra.endswith("es"):
+        variantes.append(palabra[:-2])
+    if palabra.endswith("s"):
+        variantes.append(palabra[:-1])
+    return variantes
+
+
+def _candidatos_fk(tabla: str) -> List[str]:
+    """'contrato_categorias' -> ['contrato_categorias_id', 'contrato_categoria_id', ..., 'contrato_id']."""
+    palabras = tabla.split("_")
+    completos = ["_".join(c) + "_id" for c in itertools.product(*(_singulares(p) for p in palabras))]
+    primera = [s + "_id" for s in _singulares(palabras[0])]
+    return list(dict.fromkeys(completos + primera))
+
+
+def _literal(texto: str) -> Any:
+    texto = texto.strip()
+    if len(texto) >= 2 and texto[0] == texto[-1] == '"':
+        return texto[1:-1]
+    return texto
+
+
+def _comparar(valor: Any, literal: Any) -> Optional[int]:
+    """-1/0/1 comparando un valor de la fila con un literal; None si no aplica."""
+    if valor is None or literal is None:
+        return None
+    if isinstance(valor, bool) or isinstance(literal, bool):
+        a = str(valor).lower() in ("true", "t", "1")
+        b = str(literal).lower() in ("true", "t", "1")
+        return (a > b) - (a < b)
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        try:
+            b = float(literal)
+        except (TypeError, ValueError):
+            return None
+        return (valor > b) - (valor < b)
+    a, b = str(valor), str(getattr(literal, "isoformat", lambda: literal)())
+    return (a > b) - (a < b)
+
+
+def _patron(patron: str, sensible: bool) -> re.Pattern:
+    regex = "".join(
+        ".*" if c in "%*" else "." if c == "_" else re.escape(c)
+        for c in str(patron)
+    )
+    return re.compile(f"^{regex}$", 0 if sensible else re.IGNORECASE | re.DOTALL)
+
+
+def _evaluar(fila: Fila, columna: str, op: str, valor: Any) -> bool:
+    """Evalúa un operador de PostgREST sobre una columna (admite 'rel.col')."""
+    actual = _valor_columna(fila, columna)
+    if op == "eq":
+        return _comparar(actual, valor) == 0
+    if op == "neq":
+        return _comparar(actual, valor) not in (0, None)
+    if op in ("gt", "gte", "lt", "lte"):
+        r = _comparar(actual, valor)
+        if r is None:
+            return False
+        return {"gt": r > 0, "gte": r >= 0, "lt": r < 0, "lte": r <= 0}[op]
+    if op == "in":
+        return any(_comparar(actual, v) == 0 for v in valor)
+    if op == "is":
+        objetivo = None if valor in (None, "null") else str(valor).lower() in ("true", "t")
+        return actual is None if objetivo is None else actual is not None and bool(actual) == objetivo
+    if op in ("like", "ilike"):
+        return actual is not None and bool(_patron(valor, op == "like").match(str(actual)))
+    if op == "cs":
+        if isinstance(actual, dict):
+            return all(actual.get(k) == v for k, v in dict(valor).items())
+        return actual is not None and all(v in actual for v in valor)
+    raise NotImplementedError(f"Operador no soportado en memoria: {op}")
+
+
+def _valor_columna(fila: Fila, columna: str) -> Any:
+    valor: Any = fila
+    for parte in columna.split("."):
+        if isinstance(valor, list):
+            valor = valor[0] if valor else None
+        if not isinstance(valor, dict):
+            return None
+        valor = valor.get(parte)
+    return valor
+
+
+def _parsear_logico(texto: str) -> Callable[[Fila], bool]:
+    """Convierte 'a.eq.1,and(b.gt.2,c.is.null)' en un predicado OR."""
+    condiciones = [_parsear_condicion(t) for t in _partir(texto)]
+    return lambda fila: any(c(fila) for c in condiciones)
+
+
+def _parsear_condicion(termino: str) -> Callable[[Fila], bool]:
+    for logico in ("and", "or", "not.and", "not.or"):
+        if termino.startswith(logico + "("):
+            hijos = [_parsear_condicion(t) for t in _partir(termino[len(logico) + 1:-1])]
+            combina = all if logico.endswith("and") else any
+            if logico.startswith("not."):
+                return lambda fila: not combina(h(fila) for h in hijos)
+            return lambda fila: combina(h(fila) for h in hijos)
+
+    columna, resto = termino.split(".", 1)
+    negar = resto.startswith("not.")
+    if negar:
+        resto = resto[4:]
+    op, _, valor = resto.partition(".")
+    if op == "in":
+        valor = [_literal(v) for v in _partir(valor.strip()[1:-1])]
+    else:
+        valor = _literal(valor)
+    if negar:
+        return lambda fila: not _evaluar(fila, columna, op, valor)
+    return lambda fila: _evaluar(fila, columna, op, valor)
+
+
+def _a_json(valor: Any) -> Any:
+    """Copia `valor` como lo haría el viaje por la red (falla si no es JSON)."""
+    return json.loads(json.dumps(valor))
+
+
+# =============================================================================
+# QUERY BUILDER
+# =============================================================================
+
+class ConsultaEnMemoria:
+    """Builder mutable con la interfaz del de postgrest (subset)."""
+
+    def __init__(self, db: "SupabaseEnMemoria", tabla: str):
+        self._db = db
+        self._tabla = tabla
+        self._operacion = "select"
+        self._select = "*"
+        self._count: Optional[str] = None
+        self._head = False
+        self._payload: Any = None
+        self._on_conflict: Optional[str] = None
+        self._ignorar_duplicados = False
+        self._filtros: List[Callable[[Fila], bool]] = []
+        self._orden: List[Tuple[str, bool, Optional[bool]]] = []
+        self._rango: Optional[Tuple[int, int]] = None
+        self._limite: Optional[int] = None
+        self._single: Optional[str] = None
+        self._negar_siguiente = False
+
+    # --- operaciones -------------------------------------------------------
+
+    def select(self, *columnas: str, count: Optional[str] = None, head: bool = False) -> "ConsultaEnMemoria":
+        self._select = ",".join(columnas) if columnas else "*"
+        self._count = count
+        self._head = head
+        return self
+
+    def insert(self, payload, *, count=None, returning=None, upsert: bool = False, default_to_null: bool = True):
+        self._operacion, self._payload, self._count = "insert", _a_json(payload), count
+        return self
+
+    def upsert(self, payload, *, on_conflict: str = "", ignore_duplicates: bool = False, count=None,
+               returning=None, default_to_null: bool = True):
+        self._operacion, self._payload, self._count = "upsert", _a_json(payload), count
+        self._on_conflict = on_conflict or None
+        self._ignorar_duplicados = ignore_duplicates
+        return self
+
+    def update(self, payload, *, count=None, returning=None):
+        self._operacion, self._payload, self._count = "update", _a_json(payload), count
+        return self
+
+    def delete(self, *, count=None, returning=None):
+        self._operacion, self._count = "delete", count
+        return self
+
+    # --- filtros -----------------------------------------------------------
+
+    def _filtro(self, columna: str, op: str, valor: Any) -> "ConsultaEnMemoria":
+        negar, self._negar_siguiente = self._negar_siguiente, False
+        if negar:
+            self._filtros.append(lambda fila: not _evaluar(fila, columna, op, valor))
+        else:
+            self._filtros.append(lambda fila: _evaluar(fila, columna, op, valor))
+        return self
+
+    def eq(self, columna, valor):
+        return self._filtro(columna, "eq", valor)
+
+    def neq(self, columna, valor):
+        return self._filtro(columna, "neq", valor)
+
+    def gt(self, columna, valor):
+        return self._filtro(columna, "gt", valor)
+
+    def gte(self, columna, valor):
+        return self._filtro(columna, "gte", valor)
+
+    def lt(self, columna, valor):
+        return self._filtro(columna, "lt", valor)
+
+    def lte(self, columna, valor):
+        return self._filtro(columna, "lte", valor)
+
+    def in_(self, columna, valores):
+        return self._filtro(columna, "in", list(valores))
+
+    def is_(self, columna, valor):
+        return self._filtro(columna, "is", valor)
+
+    def like(self, columna, patron):
+        return self._filtro(columna, "like", patron)
+
+    def ilike(self, columna, patron):
+        return self._filtro(columna, "ilike", patron)
+
+    def contains(self, columna, valor):
+        return self._filtro(columna, "cs", valor)
+
+    def filter(self, columna, operador, criterio):
+        if operador.startswith("not."):
+            self._negar_siguiente = True
+            operador = operador[4:]
+        if operador == "in" and isinstance(criterio, str):
+            criterio = [_literal(v) for v in _partir(criterio.strip()[1:-1])]
+        return self._filtro(columna, operador, criterio)
+
+    def match(self, valores: dict):
+        for columna, valor in valores.items():
+            self.eq(columna, valor)
+        return self
+
+    def or_(self, filtros: str, reference_table: Optional[str] = None):
+        predicado = _parsear_logico(filtros)
+        negar, self._negar_siguiente = self._negar_siguiente, False
+        self._filtros.append((lambda fila: not predicado(fila)) if negar else predicado)
+        return self
+
+    @property
+    def not_(self) -> "ConsultaEnMemoria":
+        self._negar_siguiente = True
+        return self
+
+    # --- modificadores -----------------------------------------------------
+
+    def order(self, columna: str, *, desc: bool = False, nullsfirst: Optional[bool] = None, foreign_table=None):
+        self._orden.append((columna, desc, nullsfirst))
+        return self
+
+    def range(self, inicio: int, fin: int, foreign_table=None):
+        self._rango = (inicio, fin)
+        return self
+
+    def limit(self, tamano: int, *, foreign_table=None):
+        self._limite = tamano
+        return self
+
+    def single(self):
+        self._single = "single"
+        return self
+
+    def maybe_single(self):
+        self._single = "maybe_single"
+        return self
+
+    # --- ejecución ---------------------------------------------------------
+
+    def execute(self):
+        self._db._antes_de_ejecutar(self._tabla, self._operacion)
+        with self._db._lock:
+            filas, total = getattr(self, f"_ejecutar_{self._operacion}")()
+        if self._single:
+            if len(filas) == 1:
+                return SingleAPIResponse(data=filas[0], count=total)
+            if not filas and self._single == "maybe_single":
+                return None
+            raise APIError({
+                "code": "PGRST116",
+                "message": "JSON object requested, multiple (or no) rows returned",
+                "details": f"The result contains {len(filas)} rows",
+                "hint": None,
+            })
+        return APIResponse(data=[] if self._head else filas, count=total)
+
+    def _coinciden(self) -> List[Fila]:
+        filas = self._db._tabla(self._tabla)
+        if not self._filtros:
+            return list(filas)
+        # Los filtros sobre columnas embebidas ('rel.col') ven la fila con embebidos
+        items = _parsear_select(self._select)
+        embebidos = self._operacion == "select" and any(isinstance(i, _Embebido) for i in items)
+        resultado = []
+        for fila in filas:
+            vista = fila
+            if embebidos:
+                proyectada = self._db._proyectar(self._tabla, fila, items)
+                vista = None if proyectada is None else {**fila, **proyectada}
+            if vista is not None and all(f(vista) for f in self._filtros):
+                resultado.append(fila)
+        return resultado
+
+    def _ordenar(self, filas: List[Fila]) -> List[Fila]:
+        for columna, desc, nullsfirst in reversed(self._orden):
+            nulos_primero = desc if nullsfirst is None else nullsfirst
+            con_valor = [f for f in filas if f.get(columna) is not None]
+            sin_valor = [f for f in filas if f.get(columna) is None]
+            con_valor.sort(key=lambda f: _clave_orden(f.get(columna)), reverse=desc)
+            filas = sin_valor + con_valor if nulos_primero else con_valor + sin_valor
+        return filas
+
+    def _paginar(self, filas: List[Fila]) -> List[Fila]:
+        if self._rango is not None:
+            filas = filas[self._rango[0]:self._rango[1] + 1]
+        if self._limite is not None:
+            filas = filas[:self._limite]
+        return filas
+
+    def _salida(self, filas: Iterable[Fila]) -> List[Fila]:
+        items = _parsear_select(self._select)
+        salida = []
+        for fila in filas:
+            proyectada = self._db._proyectar(self._tabla, fila, items)
+            if proyectada is not None:
+                salida.append(proyectada)
+        return salida
+
+    def _ejecutar_select(self):
+        filas = self._ordenar(self._coinciden())
+        total = len(filas) if self._count else None
+        return self._salida(self._paginar(filas)), total
+
+    def _ejecutar_insert(self):
+        payloads = self._payload if isinstance(self._payload, list) else [self._payload]
+        nuevas: List[Fila] = []
+        try:
+            for payload in payloads:
+                nuevas.append(self._db._insertar(self._tabla, payload))
+        except APIError:
+            # Una sentencia es atómica: si una fila falla no queda ninguna
+            self._db._descartar(self._tabla, nuevas)
+            raise
+        return self._salida(nuevas), len(nuevas) if self._count else None
+
+    def _ejecutar_upsert(self):
+        payloads = self._payload if isinstance(self._payload, list) else [self._payload]
+        columnas = [c.strip() for c in (self._on_conflict or "id").split(",")]
+        escritas = []
+        for payload in payloads:
+            existente = None
+            if columnas == ["id"] and payload.get("id") is not None:
+                existente = self._db._indice_id(self._tabla).get(payload["id"])
+            elif all(payload.get(c) is not None for c in columnas):
+                existente = next(
+                    (f for f in self._db._tabla(self._tabla)
+                     if all(_comparar(f.get(c), payload[c]) == 0 for c in columnas)),
+                    None,
+                )
+            if existente is None:
+                escritas.append(self._db._insertar(self._tabla, payload))
+            elif not self._ignorar_duplicados:
+                self._db._actualizar(self._tabla, existente, payload)
+                escritas.append(existente)
+        return self._salida(escritas), len(escritas) if self._count else None
+
+    def _ejecutar_update(self):
+        filas = self._coinciden()
+        for fila in filas:
+            self._db._actualizar(self._tabla, fila, self._payload)
+        return self._salida(filas), len(filas) if self._count else None
+
+    def _ejecutar_delete(self):
+        filas = self._coinciden()
+        ids = {id(f) for f in filas}
+        self._db.tablas[self._tabla] = [f for f in self._db._tabla(self._tabla) if id(f) not in ids]
+        self._db._indices.pop(self._tabla, None)
+        return self._salida(filas), len(filas) if self._count else None
+
+
+def _clave_orden(valor: Any):
+    if isinstance(valor, bool):
+        return (0, int(valor))
+    if isinstance(valor, (int, float)):
+        return (0, valor)
+    return (1, str(valor))
+
+
+class _RpcEnMemoria:
+    def __init__(self, db: "SupabaseEnMemoria", funcion: str, params: dict):
+        self._db = db
+        self._funcion = funcion
+        self._params = params or {}
+
+    def execute(self):
+        self._db._antes_de_ejecutar(self._funcion, "rpc")
+        manejador = self._db.rpcs.get(self._funcion)
+        if manejador is None:
+            raise APIError({
+                "code": "PGRST202",
+                "message": f"Could not find the function public.{self._funcion}",
+                "details": None,
+                "hint": None,
+            })
+        with self._db._lock:
+            data = manejador(self._db, **self._params)
+        return APIResponse(data=_a_json(data), count=None)
+
+
+# =============================================================================
+# STORAGE
+# =============================================================================
+
+class _BucketEnMemoria:
+    """Subset de `storage3.SyncBucketProxy`: upload/update/download/remove/URLs."""
+
+    def __init__(self, db: "SupabaseEnMemoria", bucket: str):
+        self._db = db
+        self._bucket = bucket
+        self._archivos = db.archivos.setdefault(bucket, {})
+
+    def _leer(self, file) -> bytes:
+        if isinstance(file, (bytes, bytearray)):
+            return bytes(file)
+        if hasattr(file, "read"):
+            return file.read()
+        with open(file, "rb") as f:
+            return f.read()
+
+    def _no_encontrado(self, path: str) -> StorageApiError:
+        return StorageApiError(f"Object not found: {path}", "not_found", 404)
+
+    def upload(self, path: str, file, file_options: Optional[dict] = None) -> UploadResponse:
+        self._db._antes_de_ejecutar(f"storage:{self._bucket}", "upload")
+        opciones = file_options or {}
+        upsert = str(opciones.get("upsert", opciones.get("x-upsert", ""))).lower() == "true"
+        with self._db._lock:
+            if path in self._archivos and not upsert:
+                raise StorageApiError("The resource already exists", "Duplicate", 409)
+            self._archivos[path] = (self._leer(file), opciones.get("content-type", "text/plain;charset=UTF-8"))
+        return UploadResponse(path=path, Key=f"{self._bucket}/{path}")
+
+    def update(self, path: str, file, file_options: Optional[dict] = None) -> UploadResponse:
+        self._db._antes_de_ejecutar(f"storage:{self._bucket}", "update")
+        with self._db._lock:
+            if path not in self._archivos:
+                raise self._no_encontrado(path)
+            tipo = (file_options or {}).get("content-type", self._archivos[path][1])
+            self._archivos[path] = (self._leer(file), tipo)
+        return UploadResponse(path=path, Key=f"{self._bucket}/{path}")
+
+    def download(self, path: str, options: Optional[dict] = None, query_params=None) -> bytes:
+        self._db._antes_de_ejecutar(f"storage:{self._bucket}", "download")
+        with self._db._lock:
+            if path not in self._archivos:
+                raise self._no_encontrado(path)
+            return self._archivos[path][0]
+
+    def remove(self, paths: List[str]) -> List[dict]:
+        self._db._antes_de_ejecutar(f"storage:{self._bucket}", "remove")
+        with self._db._lock:
+            eliminados = [p for p in paths if self._archivos.pop(p, None) is not None]
+        return [{"name": p, "bucket_id": self._bucket} for p in eliminados]
+
+    def list(self, path: Optional[str] = None, options: Optional[dict] = None) -> List[dict]:
+        prefijo = f"{path.rstrip('/')}/" if path else ""
+        with self._db._lock:
+            return [
+                {"name": p[len(prefijo):], "metadata": {"size": len(d), "mimetype": t}}
+                for p, (d, t) in sorted(self._archivos.items())
+                if p.startswith(prefijo)
+            ]
+
+    def create_signed_url(self, path: str, expires_in: int, options: Optional[dict] = None) -> dict:
+        self._db._antes_de_ejecutar(f"storage:{self._bucket}", "sign")
+        with self._db._lock:
+            if path not in self._archivos:
+                raise self._no_encontrado(path)
+        url = f"memoria://storage/v1/object/sign/{self._bucket}/{path}?token=local&expires_in={int(expires_in)}"
+        return {"signedURL": url, "signedUrl": url}
+
+    def create_signed_urls(self, paths: List[str], expires_in: int, options: Optional[dict] = None) -> List[dict]:
+        return [
+            {"path": p, "error": None, **self.create_signed_url(p, expires_in)}
+            for p in paths
+        ]
+
+    def get_public_url(self, path: str, options: Optional[dict] = None) -> str:
+        return f"memoria://storage/v1/object/public/{self._bucket}/{path}"
+
+
+class StorageEnMemoria:
+    """`client.storage` en memoria: un dict `{ruta: (bytes, content_type)}` por bucket."""
+
+    def __init__(self, db: "SupabaseEnMemoria"):
+        self._db = db
+
+    def from_(self, bucket: str) -> _BucketEnMemoria:
+        return _BucketEnMemoria(self._db, bucket)
+
+
+# =============================================================================
+# CLIENTE
+# =============================================================================
+
+class SupabaseEnMemoria:
+    """
+    Sustituto en memoria del cliente de Supabase.
+
+    Args:
+        tablas: Filas iniciales por tabla (se copian).
+        rpcs: Funciones RPC `{nombre: fn(db, **params) -> data}`.
+        unicos: Restricciones de unicidad por tabla, p. ej.
+            `{'empleados': [('curp',), ('clave',)]}`. Al violarse se lanza
+            el mismo `APIError` 23505 que PostgREST.
+        latencia_ms: Latencia simulada por llamada (query, RPC o Storage).
+            Un número fijo o `fn(tabla, operacion) -> ms`; se duerme el hilo
+            que ejecuta, igual que el cliente HTTP real.
+    """
+
+    def __init__(
+        self,
+        tablas: Optional[Dict[str, List[Fila]]] = None,
+        rpcs: Optional[Dict[str, Callable[..., Any]]] = None,
+        unicos: Optional[Dict[str, List[Tuple[str, ...]]]] = None,
+        latencia_ms: Union[float, Callable[[str, str], float]] = 0,
+    ):
+        self.tablas: Dict[str, List[Fila]] = {
+            nombre: [dict(f) for f in filas] for nombre, filas in (tablas or {}).items()
+        }
+        self.rpcs = dict(rpcs or {})
+        self.unicos = {t: [tuple(u) for u in us] for t, us in (unicos or {}).items()}
+        self.latencia_ms = latencia_ms
+        self.archivos: Dict[str, Dict[str, Tuple[bytes, str]]] = {}
+        self.storage = StorageEnMemoria(self)
+        self.llamadas = 0
+        self._secuencias: Dict[str, int] = {}
+        self._indices: Dict[str, Dict[Any, Fila]] = {}
+        self._lock = threading.RLock()
+
+    # --- interfaz de supabase-py -------------------------------------------
+
+    def table(self, nombre: str) -> ConsultaEnMemoria:
+        return ConsultaEnMemoria(self, nombre)
+
+    def from_(self, nombre: str) -> ConsultaEnMemoria:
+        return self.table(nombre)
+
+    def rpc(self, funcion: str, params: Optional[dict] = None, *args, **kwargs) -> _RpcEnMemoria:
+        return _RpcEnMemoria(self, funcion, params or {})
+
+    # --- almacenamiento ----------------------------------------------------
+
+    def _antes_de_ejecutar(self, tabla: str, operacion: str) -> None:
+        """Gancho por llamada: cuenta y aplica la latencia simulada (fuera del lock)."""
+        self.llamadas += 1
+        latencia = self.latencia_ms(tabla, operacion) if callable(self.latencia_ms) else self.latencia_ms
+        if latencia > 0:
+            time.sleep(latencia / 1000)
+
+    def _tabla(self, nombre: str) -> List[Fila]:
+        return self.tablas.setdefault(nombre, [])
+
+    def _indice_id(self, nombre: str) -> Dict[Any, Fila]:
+        """Índice `{id: fila}` de la tabla (se reconstruye tras un delete)."""
+        indice = self._indices.get(nombre)
+        if indice is None:
+            indice = self._indices[nombre] = {
+                f["id"]: f for f in self._tabla(nombre) if f.get("id") is not None
+            }
+        return indice
+
+    def _siguiente_id(self, tabla: str) -> int:
+        if tabla not in self._secuencias:
+            self._secuencias[tabla] = max(
+                (f["id"] for f in self._tabla(tabla) if isinstance(f.get("id"), int)),
+                default=0,
+            )
+        self._secuencias[tabla] += 1
+        return self._secuencias[tabla]
+
+    def _validar_unicos(self, tabla: str, fila: Fila, excluir: Optional[Fila] = None) -> None:
+        for columnas in self.unicos.get(tabla, []):
+            valores = [fila.get(c) for c in columnas]
+            if any(v is None for v in valores):
+                continue
+            for otra in self._tabla(tabla):
+                if otra is excluir or otra is fila:
+                    continue
+                if all(_comparar(otra.get(c), v) == 0 for c, v in zip(columnas, valores)):
+                    raise APIError({
+                        "code": "23505",
+                        "message": f'duplicate key value violates unique constraint "{tabla}_{"_".join(columnas)}_key"',
+                        "details": f"Key ({', '.join(columnas)})=({', '.join(str(v) for v in valores)}) already exists.",
+                        "hint": None,
+                    })
+
+    def _insertar(self, tabla: str, payload: Fila) -> Fila:
+        fila = dict(payload)
+        if fila.get("id") is None:
+            fila["id"] = self._siguiente_id(tabla)
+        self._validar_unicos(tabla, fila)
+        self._tabla(tabla).append(fila)
+        if tabla in self._indices:
+            self._indices[tabla][fila["id"]] = fila
+        return fila
+
+    def _descartar(self, tabla: str, filas: List[Fila]) -> None:
+        ids = {id(f) for f in filas}
+        self.tablas[tabla] = [f for f in self._tabla(tabla) if id(f) not in ids]
+        self._indices.pop(tabla, None)
+
+    def _actualizar(self, tabla: str, fila: Fila, cambios: Fila) -> None:
+        nueva = {**fila, **cambios}
+        self._validar_unicos(tabla, nueva, excluir=fila)
+        if "id" in cambios and cambios["id"] != fila.get("id"):
+            self._indices.pop(tabla, None)
+        fila.update(cambios)
+
+    # --- embebidos ---------------------------------------------------------
+
+    def _proyectar(self, tabla: str, fila: Fila, items: list) -> Optional[Fila]:
+        """Aplica el select a una fila; None si un embebido `!inner` no existe."""
+        salida: Fila = {}
+        for item in items:
+            if isinstance(item, _Columna):
+                if item.nombre == "*":
+                    salida.update(copy.deepcopy(fila))
+                else:
+                    salida[item.alias] = copy.deepcopy(fila.get(item.nombre))
+                continue
+            valor = self._embebido(tabla, fila, item)
+            if item.inner and not valor:
+                return None
+            salida[item.alias] = valor
+        return salida
+
+    def _embebido(self, tabla: str, fila: Fila, item: _Embebido):
+        destino, fk = item.recurso, item.hint
+        if destino.endswith("_id") and destino not in self.tablas:
+            # 'sedes:sede_id(...)': el recurso es la columna FK
+            fk, destino = destino, item.alias if item.alias in self.tablas else destino[:-3] + "s"
+        if fk is None:
+            fk = next((c for c in _candidatos_fk(destino) if c in fila), None)
+
+        if fk is not None and fk in fila:
+            relacionada = self._indice_id(destino).get(fila[fk]) if fila[fk] is not None else None
+            return None if relacionada is None else self._proyectar(destino, relacionada, item.columnas)
+
+        hijas = self._tabla(destino)
+        fk_padre = next(
+            (c for c in _candidatos_fk(tabla) if any(c in h for h in hijas)),
+            None,
+        )
+        if fk_padre is None:
+            return []
+        resultado = []
+        for hija in hijas:
+            if hija.get(fk_padre) == fila.get("id"):
+                proyectada = self._proyectar(destino, hija, item.columnas)
+                if proyectada is not None:
+                    resultado.append(proyectada)
+        return resultado
@@ -233,6 +233,8 @@ from app.entities.alta_masiva import (
     ResultadoValidacion,
     ResultadoProcesamiento,
     DetalleResultado,
+    EstatusImportacion,
+    ImportacionAltaMasiva,
 )
 
 # Dashboard
@@ -539,6 +541,8 @@ __all__ = [
     "ResultadoValidacion",
     "ResultadoProcesamiento",
     "DetalleResultado",
+    "EstatusImportacion",
+    "ImportacionAltaMasiva",
     # Entregables
     "Entregable",
     "EntregableCreate",
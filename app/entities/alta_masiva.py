@@ -4,6 +4,7 @@ Entidades para Alta Masiva de Personal.
 Modelos de dominio para el proceso de carga masiva de empleados
 via archivos CSV/Excel.
 """
+from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
@@ -95,3 +96,61 @@ class ResultadoProcesamiento(BaseModel):
     @property
     def total_intentados(self) -> int:
         return self.creados + self.reingresados + self.errores
+
+
+class EstatusImportacion(str, Enum):
+    """Estado de una importacion de alta masiva en segundo plano"""
+    PENDIENTE = 'PENDIENTE'
+    PROCESANDO = 'PROCESANDO'
+    COMPLETADA = 'COMPLETADA'
+    FALLIDA = 'FALLIDA'
+
+
+class ImportacionAltaMasiva(BaseModel):
+    """
+    Importacion de alta masiva persistida (tabla importaciones_alta_masiva).
+
+    Guarda los registros validados por procesar (validos y reingresos, en
+    ese orden) y un cursor: los registros antes de `cursor` ya se
+    confirmaron y sus resultados estan en `detalles`. `intentos` cuenta
+    cuantas veces un proceso la ha tomado; `latido` es la ultima senal
+    de vida del proceso que la ejecuta.
+    """
+    model_config = ConfigDict(use_enum_values=True)
+
+    id: Optional[int] = None
+    empresa_id: int
+    clave_idempotencia: str
+    nombre_archivo: str = ""
+    estatus: EstatusImportacion = EstatusImportacion.PENDIENTE
+    total_filas: int = 0
+    registros: List[RegistroValidado] = []
+    total_registros: int = 0
+    cursor: int = 0
+    creados: int = 0
+    reingresados: int = 0
+    errores: int = 0
+    detalles: List[DetalleResultado] = []
+    error: Optional[str] = None
+    intentos: int = 0
+    latido: Optional[datetime] = None
+    fecha_creacion: Optional[datetime] = None
+    fecha_actualizacion: Optional[datetime] = None
+
+    @property
+    def terminada(self) -> bool:
+        return self.estatus in (EstatusImportacion.COMPLETADA, EstatusImportacion.FALLIDA)
+
+    @property
+    def porcentaje(self) -> int:
+        if not self.total_registros:
+            return 100
+        return int(self.cursor * 100 / self.total_registros)
+
+    def a_resultado(self) -> ResultadoProcesamiento:
+        return ResultadoProcesamiento(
+            creados=self.creados,
+            reingresados=self.reingresados,
+            errores=self.errores,
+            detalles=self.detalles,
+        )
@@ -16,6 +16,9 @@ Uso:
     )
 """
 
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -43,3 +46,9 @@ class DashboardMetricas(BaseModel):
         default=0,
         description="Contratos activos que vencen en los próximos 30 días",
     )
+
+    # Frescura del snapshot
+    calculado_en: Optional[datetime] = Field(
+        default=None,
+        description="Momento en que se calcularon las métricas",
+    )
@@ -55,6 +55,9 @@ class NominaEmpleado(BaseModel):
     total_otros_pagos: Decimal = Field(default=Decimal('0'), ge=0)
     total_neto: Decimal = Field(default=Decimal('0'), ge=0)
 
+    # Huella de las entradas del último cálculo (modo incremental)
+    huella_calculo: Optional[str] = None
+
     # Datos bancarios (snapshot)
     banco_destino: Optional[str] = Field(None, max_length=100)
     clabe_destino: Optional[str] = Field(None, max_length=18)
@@ -5,6 +5,9 @@ DTO (Value Object) con métricas agregadas para el panel /admin.
 No persiste en base de datos.
 """
 
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -25,3 +28,5 @@ class SuperAdminDashboard(BaseModel):
 
     requisiciones_pendientes: int = Field(default=0)
     contratos_por_vencer: int = Field(default=0)
+
+    calculado_en: Optional[datetime] = Field(default=None)
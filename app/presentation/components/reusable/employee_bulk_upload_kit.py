@@ -412,7 +412,7 @@ def _paso_preview(state) -> rx.Component:
             gap=Spacing.SM,
         ),
         rx.cond(
-            ~state.alta_masiva_puede_procesar,
+            ~state.alta_masiva_puede_procesar & ~state.alta_masiva_procesando,
             rx.callout(
                 "No hay registros validos para procesar. Corrija el archivo y vuelva a cargarlo.",
                 icon="triangle-alert",
@@ -439,6 +439,30 @@ def _paso_preview(state) -> rx.Component:
             font_size=Typography.SIZE_SM,
             color=Colors.TEXT_SECONDARY,
         ),
+        rx.cond(
+            state.alta_masiva_procesando,
+            rx.vstack(
+                rx.progress(
+                    value=state.alta_masiva_progreso_porcentaje,
+                    max=100,
+                    width="100%",
+                    color_scheme="teal",
+                ),
+                rx.text(
+                    "Confirmados ",
+                    state.alta_masiva_progreso_confirmados,
+                    " de ",
+                    state.alta_masiva_progreso_total,
+                    " | Errores: ",
+                    state.alta_masiva_resultado_errores_count,
+                    font_size=Typography.SIZE_SM,
+                    color=Colors.TEXT_SECONDARY,
+                ),
+                width="100%",
+                spacing="2",
+            ),
+            rx.fragment(),
+        ),
         rx.hstack(
             rx.button(
                 rx.icon("arrow-left", size=16),
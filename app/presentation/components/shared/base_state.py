@@ -6,11 +6,14 @@ Incluye helpers para:
 - Carga de catálogos genérica
 - Limpieza de formularios
 - Manejo de filtros y paginación
+- Búsqueda mientras se escribe (debounce + cancelación)
 - Reducir código repetitivo en los states de Reflex
 
 Nota: Los setters deben definirse explícitamente en cada state.
 Reflex no reconoce funciones asignadas dinámicamente como event handlers.
 """
+import asyncio
+import inspect
 import logging
 import reflex as rx
 from typing import Optional, List, Dict, Any, Callable, Awaitable
@@ -32,9 +35,18 @@ from app.core.exceptions import (
     DatabaseError,
     BusinessRuleError,
 )
+from app.repositories.shared import alcance_loaders
 
 logger = logging.getLogger(__name__)
 
+# Espera desde la última tecla antes de consultar
+DEBOUNCE_BUSQUEDA_MS = 300
+
+# Búsqueda pendiente por (cliente, state, campo), para cancelarla cuando
+# llega texto nuevo. Es por proceso; entre workers la versión guardada en
+# el state sigue descartando respuestas viejas.
+_busquedas_en_curso: Dict[tuple, asyncio.Task] = {}
+
 
 # ============================================================================
 # ESTADO BASE
@@ -57,6 +69,9 @@ class BaseState(rx.State):
     # ========================
     filtro_busqueda: str = ""
 
+    # Versión del texto por campo de búsqueda (ver _buscar_con_debounce)
+    _versiones_busqueda: Dict[str, int] = {}
+
     # ========================
     # MENSAJES
     # ========================
@@ -439,9 +454,11 @@ class BaseState(rx.State):
             self.loading = True
             yield  # UI muestra skeleton
 
-        # Ejecutar operaciones de carga
-        for op in operaciones:
-            await op()
+        # Ejecutar operaciones de carga (un alcance de loaders para todas;
+        # se cierra antes del yield)
+        with alcance_loaders():
+            for op in operaciones:
+                await op()
 
         # Finalizar carga
         self.loading = False
@@ -466,12 +483,93 @@ class BaseState(rx.State):
         self.loading = True
         yield
 
-        for op in operaciones:
-            await op()
+        with alcance_loaders():
+            for op in operaciones:
+                await op()
 
         self.loading = False
         yield
 
+    # ========================
+    # BÚSQUEDA CON DEBOUNCE
+    # ========================
+
+    async def _buscar_con_debounce(
+        self,
+        valor: str,
+        buscar: Optional[Callable[[str], Awaitable[Any]]] = None,
+        aplicar: Optional[Callable[..., Any]] = None,
+        *,
+        campo: str = "filtro_busqueda",
+        espera_ms: int = DEBOUNCE_BUSQUEDA_MS,
+        contexto_error: str = "buscando",
+    ):
+        """
+        Búsqueda mientras se escribe.
+
+        Asigna `valor` a `campo` de inmediato, espera `espera_ms` sin texto
+        nuevo, cancela la búsqueda anterior del mismo cliente que siga en
+        espera o consultando, y descarta el resultado si llegó texto más
+        nuevo mientras se consultaba.
+
+        Debe llamarse desde un handler `@rx.event(background=True)`: un
+        handler normal bloquea el state y los eventos de las teclas
+        siguientes se formarían detrás de él.
+
+        Uso:
+            @rx.event(background=True)
+            async def on_change_busqueda(self, value: str):
+                await self._buscar_con_debounce(value, aplicar=self._fetch_datos)
+
+        Args:
+            valor: Texto del input.
+            buscar: Corrutina `valor -> resultado` que NO modifica el state.
+                Corre sin bloquear el state, así que se puede cancelar.
+            aplicar: Recibe el resultado de `buscar` (o nada si no hay
+                `buscar`) y corre con el state bloqueado, sólo si el texto
+                sigue vigente. Puede ser async (p. ej. un `_fetch_*`).
+            campo: Variable de filtro a asignar.
+            espera_ms: Debounce.
+            contexto_error: Contexto para `manejar_error`.
+        """
+        clave = (self.router.session.client_token, self.get_full_name(), campo)
+        tarea = asyncio.current_task()
+        anterior = _busquedas_en_curso.get(clave)
+        if anterior is not None and anterior is not tarea and not anterior.done():
+            anterior.cancel()
+        _busquedas_en_curso[clave] = tarea
+
+        version = None
+        try:
+            async with self:
+                setattr(self, campo, valor)
+                version = self._versiones_busqueda.get(campo, 0) + 1
+                self._versiones_busqueda = {**self._versiones_busqueda, campo: version}
+
+            await asyncio.sleep(espera_ms / 1000)
+            resultado = await buscar(valor) if buscar is not None else None
+
+            # Ya no se cancela: una búsqueda más nueva espera el lock del state
+            if _busquedas_en_curso.get(clave) is tarea:
+                del _busquedas_en_curso[clave]
+            async with self:
+                if self._versiones_busqueda.get(campo) != version:
+                    return
+                if aplicar is not None:
+                    aplicado = aplicar(resultado) if buscar is not None else aplicar()
+                    if inspect.isawaitable(aplicado):
+                        await aplicado
+
+        except asyncio.CancelledError:
+            logger.debug("Búsqueda '%s' reemplazada por texto más nuevo", valor)
+        except Exception as e:
+            async with self:
+                if self._versiones_busqueda.get(campo) == version:
+                    self.manejar_error(e, contexto_error)
+        finally:
+            if _busquedas_en_curso.get(clave) is tarea:
+                del _busquedas_en_curso[clave]
+
     # ========================
     # CONVERSIÓN DE IDS
     # ========================
@@ -595,6 +693,15 @@ class BaseState(rx.State):
                 empresa_service.obtener_todas,
                 incluir_inactivas=False
             )
+
+        Los catálogos que todas las sesiones leen igual (empresas activas,
+        sedes, tipos de servicio...) conviene pedirlos a
+        `catalogos_compartidos`, que los comparte entre sesiones:
+            await self.cargar_catalogo(
+                "empresas",
+                catalogos_compartidos.obtener,
+                nombre="empresas_activas",
+            )
         """
         try:
             items = await servicio_metodo(**kwargs)
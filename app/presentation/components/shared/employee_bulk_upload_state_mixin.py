@@ -1,27 +1,60 @@
 """Mixin reusable para alta masiva de empleados en pantallas del portal."""
 
+import asyncio
 import base64
+import logging
+import time
 from typing import List
 
 import reflex as rx
+from reflex.utils.prerequisites import get_and_validate_app
 
 from app.entities.alta_masiva import (
     DetalleResultado,
+    EstatusImportacion,
+    ImportacionAltaMasiva,
     RegistroValidado,
     ResultadoProcesamiento,
     ResultadoValidacion,
 )
 from app.services import (
     alta_masiva_service,
+    importacion_alta_masiva_service,
     plantilla_service,
     reporte_alta_masiva_service,
 )
+from app.services.importacion_alta_masiva_service import LATIDO_VENCIDO_SEGUNDOS
+
+logger = logging.getLogger(__name__)
 
 EMPLOYEE_BULK_UPLOAD_ID = "employee_bulk_upload"
+SONDEO_IMPORTACION_SEGUNDOS = 1
+
+
+def _sesion_activa(client_token: str, session_id: str) -> bool:
+    """
+    True si el socket de `session_id` sigue siendo el del cliente en este
+    proceso. Si se desconectó o recargó la página (otro socket), no hay a
+    quién mostrarle el avance.
+    """
+    try:
+        namespace = get_and_validate_app().app.event_namespace
+    except Exception:
+        return True
+    if namespace is None:
+        return True
+    return namespace.token_to_sid.get(client_token) == session_id
 
 
 class EmployeeBulkUploadStateMixin:
-    """Contrato compartido para flujos inline de alta masiva de empleados."""
+    """
+    Contrato compartido para flujos inline de alta masiva de empleados.
+
+    El procesamiento corre en segundo plano (`importacion_alta_masiva_service`);
+    el state concreto debe exponer `seguir_importacion_alta_masiva` como
+    handler `@rx.event(background=True)` que delegue en
+    `_seguir_importacion_alta_masiva`.
+    """
 
     mostrar_panel_alta_masiva: bool = False
     alta_masiva_paso_actual: int = 1
@@ -37,8 +70,12 @@ class EmployeeBulkUploadStateMixin:
     alta_masiva_resultado_reingresados: int = 0
     alta_masiva_resultado_errores_count: int = 0
     alta_masiva_resultado_detalles: List[dict] = []
+    alta_masiva_importacion_id: int = 0
+    alta_masiva_progreso_confirmados: int = 0
+    alta_masiva_progreso_total: int = 0
     _alta_masiva_cache_validos: List[dict] = []
     _alta_masiva_cache_reingresos: List[dict] = []
+    _alta_masiva_clave_idempotencia: str = ""
 
     @staticmethod
     def _descargar_bytes(data: bytes, media_type: str, filename: str):
@@ -78,8 +115,12 @@ class EmployeeBulkUploadStateMixin:
             "alta_masiva_resultado_reingresados": 0,
             "alta_masiva_resultado_errores_count": 0,
             "alta_masiva_resultado_detalles": [],
+            "alta_masiva_importacion_id": 0,
+            "alta_masiva_progreso_confirmados": 0,
+            "alta_masiva_progreso_total": 0,
             "_alta_masiva_cache_validos": [],
             "_alta_masiva_cache_reingresos": [],
+            "_alta_masiva_clave_idempotencia": "",
         }
 
     async def handle_upload_alta_masiva(self, files: list[rx.UploadFile]):
@@ -120,6 +161,11 @@ class EmployeeBulkUploadStateMixin:
             )
             self._alta_masiva_cache_validos = self.alta_masiva_validacion_validos
             self._alta_masiva_cache_reingresos = self.alta_masiva_validacion_reingresos
+            self._alta_masiva_clave_idempotencia = (
+                importacion_alta_masiva_service.clave_idempotencia(
+                    contenido, self.id_empresa_actual
+                )
+            )
             self.alta_masiva_paso_actual = 2
         except Exception as e:
             self.alta_masiva_archivo_error = f"Error procesando archivo: {str(e)}"
@@ -142,31 +188,140 @@ class EmployeeBulkUploadStateMixin:
         return None
 
     async def confirmar_alta_masiva(self):
-        """Procesa el archivo validado y muestra resultados inline."""
+        """Lanza la importacion en segundo plano y empieza a seguir su avance."""
         self.alta_masiva_procesando = True
         yield
 
         try:
-            resultado = await alta_masiva_service.procesar(
-                resultado_validacion=self._reconstruir_validacion_alta_masiva(),
+            importacion = await importacion_alta_masiva_service.iniciar(
+                validacion=self._reconstruir_validacion_alta_masiva(),
                 empresa_id=self.id_empresa_actual,
+                clave_idempotencia=self._alta_masiva_clave_idempotencia,
+                nombre_archivo=self.alta_masiva_archivo_nombre,
+            )
+            self._asignar_avance_alta_masiva(importacion)
+            yield type(self).seguir_importacion_alta_masiva
+        except Exception as e:
+            self.alta_masiva_procesando = False
+            yield rx.toast.error(
+                f"Error al procesar: {str(e)}",
+                position="top-center",
+            )
+
+    def _asignar_avance_alta_masiva(self, importacion: ImportacionAltaMasiva):
+        """Refleja en el state el avance guardado de la importacion."""
+        self.alta_masiva_importacion_id = importacion.id
+        self.alta_masiva_progreso_confirmados = importacion.cursor
+        self.alta_masiva_progreso_total = importacion.total_registros
+        self.alta_masiva_resultado_creados = importacion.creados
+        self.alta_masiva_resultado_reingresados = importacion.reingresados
+        self.alta_masiva_resultado_errores_count = importacion.errores
+
+    async def _seguir_importacion_alta_masiva(self):
+        """
+        Sondea el avance de la importacion hasta que termina y muestra el
+        resultado. Corre en background: sólo bloquea el state para asignar.
+
+        Se detiene si el panel se reinicia (cambia `alta_masiva_importacion_id`),
+        si el cliente se desconecta o recarga la página, o si el cursor no
+        avanza en `LATIDO_VENCIDO_SEGUNDOS` (la importacion sigue y la retoma
+        la tarea de reanudación; aquí sólo se deja de sondear).
+        """
+        client_token = self.router.session.client_token
+        session_id = self.router.session.session_id
+        async with self:
+            importacion_id = self.alta_masiva_importacion_id
+        if not importacion_id:
+            return
+
+        cursor = -1
+        ultimo_avance = time.monotonic()
+        try:
+            while True:
+                if not _sesion_activa(client_token, session_id):
+                    logger.info(
+                        "Cliente desconectado; se deja de seguir la importacion %s", importacion_id
+                    )
+                    return
+                importacion = await importacion_alta_masiva_service.obtener(importacion_id)
+                if importacion.terminada:
+                    break
+                if importacion.cursor != cursor:
+                    cursor = importacion.cursor
+                    ultimo_avance = time.monotonic()
+                elif time.monotonic() - ultimo_avance > LATIDO_VENCIDO_SEGUNDOS:
+                    async with self:
+                        if self.alta_masiva_importacion_id != importacion_id:
+                            return
+                        self.alta_masiva_procesando = False
+                    yield rx.toast.warning(
+                        "La importacion no ha avanzado en los últimos "
+                        f"{LATIDO_VENCIDO_SEGUNDOS // 60} minutos. Se reanudará "
+                        "automáticamente; recargue la página más tarde para ver su avance.",
+                        position="top-center",
+                    )
+                    return
+                async with self:
+                    if self.alta_masiva_importacion_id != importacion_id:
+                        return
+                    self._asignar_avance_alta_masiva(importacion)
+                await asyncio.sleep(SONDEO_IMPORTACION_SEGUNDOS)
+
+            importacion = await importacion_alta_masiva_service.obtener(
+                importacion_id, con_detalle=True
+            )
+        except Exception as e:
+            async with self:
+                self.alta_masiva_procesando = False
+            yield rx.toast.error(
+                f"Error al consultar el avance: {str(e)}",
+                position="top-center",
             )
+            return
 
-            self.alta_masiva_resultado_creados = resultado.creados
-            self.alta_masiva_resultado_reingresados = resultado.reingresados
-            self.alta_masiva_resultado_errores_count = resultado.errores
+        async with self:
+            if self.alta_masiva_importacion_id != importacion_id:
+                return
+            self._asignar_avance_alta_masiva(importacion)
             self.alta_masiva_resultado_detalles = self._serializar_registros(
-                resultado.detalles
+                importacion.detalles
             )
             await self._post_procesamiento_alta_masiva()
             self.alta_masiva_paso_actual = 3
-        except Exception as e:
+            self.alta_masiva_procesando = False
+
+        if importacion.estatus == EstatusImportacion.FALLIDA:
             yield rx.toast.error(
-                f"Error al procesar: {str(e)}",
+                f"La importacion se detuvo: {importacion.error}. "
+                "Vuelva a cargar el archivo para reanudarla.",
                 position="top-center",
             )
-        finally:
-            self.alta_masiva_procesando = False
+
+    async def _reanudar_seguimiento_alta_masiva(self) -> bool:
+        """
+        Si la empresa tiene una importacion en curso (p. ej. se recargó la
+        página), abre el panel mostrando su avance. Regresa True si hay.
+        """
+        try:
+            importacion = await importacion_alta_masiva_service.obtener_activa(
+                self.id_empresa_actual
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo consultar la importacion en curso: {e}")
+            return False
+        if importacion is None:
+            return False
+
+        for attr, value in EmployeeBulkUploadStateMixin.build_alta_masiva_reset_values(
+            mantener_panel_abierto=True,
+        ).items():
+            setattr(self, attr, value)
+        self.alta_masiva_archivo_nombre = importacion.nombre_archivo
+        self.alta_masiva_validacion_total = importacion.total_filas
+        self.alta_masiva_paso_actual = 2
+        self.alta_masiva_procesando = True
+        self._asignar_avance_alta_masiva(importacion)
+        return True
 
     def descargar_plantilla_excel_alta_masiva(self):
         """Descarga la plantilla Excel para la carga masiva."""
@@ -241,6 +396,14 @@ class EmployeeBulkUploadStateMixin:
             or len(self.alta_masiva_validacion_reingresos) > 0
         )
 
+    @rx.var
+    def alta_masiva_progreso_porcentaje(self) -> int:
+        if not self.alta_masiva_progreso_total:
+            return 0
+        return int(
+            self.alta_masiva_progreso_confirmados * 100 / self.alta_masiva_progreso_total
+        )
+
     @rx.var
     def alta_masiva_registros_preview(self) -> List[dict]:
         """Lista combinada y ordenada para la tabla de preview."""
@@ -22,7 +22,7 @@ def _boton_actualizar() -> rx.Component:
             size="2",
             cursor="pointer",
         ),
-        content="Actualizar métricas",
+        content=SuperAdminDashboardState.texto_actualizado,
     )
 
 
@@ -57,10 +57,19 @@ class SuperAdminDashboardState(AuthState):
             return 0
         return self.metricas.instituciones_sin_empresas
 
-    async def _cargar_metricas_core(self):
+    @rx.var
+    def texto_actualizado(self) -> str:
+        """Antigüedad del snapshot de métricas, para el botón de actualizar."""
+        if self.metricas is None or self.metricas.calculado_en is None:
+            return "Actualizar métricas"
+        return f"Actualizado {self.metricas.calculado_en:%H:%M}. Clic para recalcular"
+
+    async def _cargar_metricas_core(self, forzar: bool = False):
         """Carga métricas sin manejar flags de loading (reutilizable)."""
         try:
-            metricas, advertencias = await super_admin_dashboard_service.obtener_metricas_super_admin()
+            metricas, advertencias = await super_admin_dashboard_service.obtener_metricas_super_admin(
+                forzar=forzar,
+            )
             self.metricas = metricas
             self.advertencias = advertencias
         except Exception as e:
@@ -88,7 +97,7 @@ class SuperAdminDashboardState(AuthState):
         async for _ in self._montar_pagina(self._cargar_metricas_core):
             yield
 
-    async def cargar_metricas(self):
+    async def cargar_metricas(self, forzar: bool = False):
         """Carga métricas del panel con tolerancia a fallos parciales."""
         self.cargando = True
         self.loading = True
@@ -96,13 +105,13 @@ class SuperAdminDashboardState(AuthState):
         yield
 
         try:
-            await self._cargar_metricas_core()
+            await self._cargar_metricas_core(forzar=forzar)
         finally:
             self.cargando = False
             self.loading = False
             yield
 
     async def refrescar(self):
-        """Refresca las métricas del panel."""
-        async for _ in self.cargar_metricas():
+        """Recalcula las métricas del panel (sin servir el snapshot)."""
+        async for _ in self.cargar_metricas(forzar=True):
             yield
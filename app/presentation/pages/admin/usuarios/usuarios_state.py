@@ -11,7 +11,7 @@ from app.entities import (
     UserProfileUpdate,
     UserCompanyAsignacionInicial,
 )
-from app.services import user_service, empresa_service, institucion_service
+from app.services import catalogos_compartidos, user_service
 from app.presentation.components.shared.auth_state import AuthState
 from app.presentation.pages.admin.usuarios.usuarios_validators import (
     validar_email,
@@ -732,7 +732,7 @@ class UsuariosAdminState(AuthState):
         if self._actor_es_institucion_local():
             return
         try:
-            empresas = await empresa_service.obtener_todas(incluir_inactivas=False)
+            empresas = await catalogos_compartidos.obtener("empresas_activas")
             self.todas_empresas = [
                 {
                     "id": str(e.id),
@@ -750,7 +750,7 @@ class UsuariosAdminState(AuthState):
             self.todas_instituciones = []
             return
         try:
-            instituciones = await institucion_service.obtener_todas(solo_activas=True)
+            instituciones = await catalogos_compartidos.obtener("instituciones_activas")
             self.todas_instituciones = [
                 {
                     "id": i.id,
@@ -11,7 +11,7 @@ from app.entities.categoria_puesto import (
     CategoriaPuestoCreate,
     CategoriaPuestoUpdate,
 )
-from app.services import categoria_puesto_service, tipo_servicio_service
+from app.services import catalogos_compartidos, categoria_puesto_service
 from app.core.exceptions import NotFoundError, DuplicateError, DatabaseError, BusinessRuleError
 from app.presentation.components.shared.base_state import BaseState
 from app.presentation.pages.categorias_puesto.categorias_puesto_validators import (
@@ -80,10 +80,15 @@ class CategoriasPuestoState(BaseState):
     # ========================
     # set_filtro_busqueda viene de BaseState
 
+    @rx.event(background=True)
     async def on_change_busqueda(self, value: str):
-        """Actualizar filtro y buscar automáticamente"""
-        self.filtro_busqueda = value
-        await self._fetch_categorias()
+        """Actualizar filtro y buscar al dejar de escribir"""
+        await self._buscar_con_debounce(
+            value,
+            self._buscar_categorias,
+            self._aplicar_categorias,
+            contexto_error="al cargar categorías",
+        )
 
     def set_filtro_tipo_servicio_id(self, value: str):
         self.filtro_tipo_servicio_id = value if value else "0"
@@ -230,7 +235,7 @@ class CategoriasPuestoState(BaseState):
     async def cargar_tipos_servicio(self):
         """Cargar tipos de servicio para el dropdown"""
         try:
-            tipos = await tipo_servicio_service.obtener_activas()
+            tipos = await catalogos_compartidos.obtener("tipos_servicio_activos")
             self.tipos_servicio = [t.model_dump() for t in tipos]
         except Exception as e:
             self.mostrar_mensaje(f"Error al cargar tipos de servicio: {str(e)}", "error")
@@ -239,28 +244,7 @@ class CategoriasPuestoState(BaseState):
     async def _fetch_categorias(self):
         """Carga categorías desde BD (sin manejo de loading)."""
         try:
-            # Si hay filtro de tipo (distinto de "0"), obtener solo de ese tipo
-            if self.filtro_tipo_servicio_id and self.filtro_tipo_servicio_id != "0":
-                categorias = await categoria_puesto_service.obtener_por_tipo_servicio(
-                    int(self.filtro_tipo_servicio_id),
-                    incluir_inactivas=self.incluir_inactivas
-                )
-            else:
-                categorias = await categoria_puesto_service.obtener_todas(
-                    incluir_inactivas=self.incluir_inactivas
-                )
-
-            # Filtrar por búsqueda si hay término
-            if self.filtro_busqueda:
-                termino = self.filtro_busqueda.upper()
-                categorias = [
-                    c for c in categorias
-                    if termino in c.clave.upper() or termino in c.nombre.upper()
-                ]
-
-            self.categorias = [cat.model_dump() for cat in categorias]
-            self.total_categorias = len(self.categorias)
-
+            self._aplicar_categorias(await self._buscar_categorias(self.filtro_busqueda))
         except DatabaseError as e:
             self.mostrar_mensaje(f"Error al cargar categorías: {str(e)}", "error")
             self.categorias = []
@@ -268,6 +252,33 @@ class CategoriasPuestoState(BaseState):
             self.mostrar_mensaje(f"Error inesperado: {str(e)}", "error")
             self.categorias = []
 
+    async def _buscar_categorias(self, busqueda: str) -> list:
+        """Consulta y filtra categorías sin modificar el state."""
+        # Si hay filtro de tipo (distinto de "0"), obtener solo de ese tipo
+        if self.filtro_tipo_servicio_id and self.filtro_tipo_servicio_id != "0":
+            categorias = await categoria_puesto_service.obtener_por_tipo_servicio(
+                int(self.filtro_tipo_servicio_id),
+                incluir_inactivas=self.incluir_inactivas
+            )
+        else:
+            categorias = await categoria_puesto_service.obtener_todas(
+                incluir_inactivas=self.incluir_inactivas
+            )
+
+        # Filtrar por búsqueda si hay término
+        if busqueda:
+            termino = busqueda.upper()
+            categorias = [
+                c for c in categorias
+                if termino in c.clave.upper() or termino in c.nombre.upper()
+            ]
+
+        return [cat.model_dump() for cat in categorias]
+
+    def _aplicar_categorias(self, categorias: list):
+        self.categorias = categorias
+        self.total_categorias = len(categorias)
+
     async def cargar_categorias(self):
         """Carga categorías con skeleton loading (público)."""
         async for _ in self._recargar_datos(self._fetch_categorias):
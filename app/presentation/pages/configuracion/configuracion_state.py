@@ -18,7 +18,7 @@ from app.core.validation.constants import (
 )
 from app.core.validation.custom_validators import limpiar_telefono
 from app.presentation.components.shared.base_state import BaseState
-from app.services import requisicion_service
+from app.services import catalogos_compartidos, requisicion_service
 
 
 # =============================================================================
@@ -127,7 +127,7 @@ class ConfiguracionState(BaseState):
     async def _fetch_lugares_entrega(self):
         """Carga los lugares de entrega desde la BD (sin manejo de loading)."""
         try:
-            lugares = await requisicion_service.obtener_lugares_entrega()
+            lugares = await catalogos_compartidos.obtener("lugares_entrega")
             self.lugares_entrega = [
                 {"id": str(l.id), "nombre": l.nombre}
                 for l in lugares
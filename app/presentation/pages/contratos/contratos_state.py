@@ -18,7 +18,7 @@ from app.core.ui_helpers import (
     FILTRO_SIN_SELECCION,
     opciones_desde_enum,
 )
-from app.services import contrato_service, empresa_service, tipo_servicio_service, categoria_puesto_service, entregable_service, requisicion_service, contrato_categoria_service
+from app.services import catalogos_compartidos, contrato_service, entregable_service, requisicion_service, contrato_categoria_service
 from app.core.text_utils import normalizar_mayusculas, formatear_moneda, formatear_fecha
 
 from app.entities import (
@@ -840,11 +840,9 @@ class ContratosState(AuthState, CRUDStateMixin):
             await self._cargar_empresa_actual_portal()
             return
 
-        from app.services import empresa_service
-
         self.empresas = await self.cargar_y_asignar_lista(
             "empresas",
-            lambda: empresa_service.obtener_todas(incluir_inactivas=False),
+            lambda: catalogos_compartidos.obtener("empresas_activas"),
             contexto_error="al cargar empresas",
         )
 
@@ -863,7 +861,7 @@ class ContratosState(AuthState, CRUDStateMixin):
         """Cargar tipos de servicio para el dropdown"""
         self.tipos_servicio = await self.cargar_y_asignar_lista(
             "tipos_servicio",
-            tipo_servicio_service.obtener_activas,
+            lambda: catalogos_compartidos.obtener("tipos_servicio_activos"),
             contexto_error="al cargar tipos de servicio",
         )
 
@@ -877,10 +875,7 @@ class ContratosState(AuthState, CRUDStateMixin):
             tipo_servicio_id = self.parse_id(self.form_tipo_servicio_id)
             self.categorias_puesto = await self.cargar_y_asignar_lista(
                 "categorias_puesto",
-                lambda: categoria_puesto_service.obtener_por_tipo_servicio(
-                    tipo_servicio_id,
-                    incluir_inactivas=False,
-                ),
+                lambda: catalogos_compartidos.obtener("categorias_puesto_por_tipo", tipo_servicio_id),
                 contexto_error="al cargar categorías",
             )
         finally:
@@ -889,80 +884,86 @@ class ContratosState(AuthState, CRUDStateMixin):
     async def _fetch_contratos(self):
         """Carga la lista de contratos con filtros (sin manejo de loading)."""
         try:
-            # Preparar filtros
-            empresa_id = int(self.filtro_empresa_id) if self.filtro_empresa_id != FILTRO_SIN_SELECCION else None
-            tipo_servicio_id = int(self.filtro_tipo_servicio_id) if self.filtro_tipo_servicio_id != FILTRO_SIN_SELECCION else None
-
-            # Preparar filtros de fecha
-            fecha_desde = None
-            fecha_hasta = None
-            if self.filtro_fecha_desde:
-                fecha_desde = date.fromisoformat(self.filtro_fecha_desde)
-            if self.filtro_fecha_hasta:
-                fecha_hasta = date.fromisoformat(self.filtro_fecha_hasta)
-
-            contratos = await contrato_service.buscar_con_filtros(
-                texto=self.filtro_busqueda or None,
-                empresa_id=empresa_id,
-                tipo_servicio_id=tipo_servicio_id,
-                estatus=None if self.filtro_estatus == FILTRO_TODOS else (self.filtro_estatus or None),
-                modalidad=self.filtro_modalidad or None,
-                fecha_inicio_desde=fecha_desde,
-                fecha_inicio_hasta=fecha_hasta,
-                incluir_inactivos=self.incluir_inactivos,
-                limite=100,
-                offset=0
-            )
+            self._aplicar_contratos(await self._buscar_contratos(self.filtro_busqueda))
+        except Exception as e:
+            self.manejar_error(e, "al cargar contratos")
+            self.contratos = []
 
-            # Obtener saldos pendientes en batch (1 query en lugar de N)
-            contratos_info = [
-                {"id": c.id, "monto_maximo": c.monto_maximo}
-                for c in contratos
-            ]
-            try:
-                saldos_pendientes = await pago_service.obtener_saldos_pendientes_batch(contratos_info)
-            except Exception:
-                saldos_pendientes = {}
+    async def _buscar_contratos(self, busqueda: str) -> list:
+        """Consulta y enriquece contratos con los filtros, sin modificar el state."""
+        # Preparar filtros
+        empresa_id = int(self.filtro_empresa_id) if self.filtro_empresa_id != FILTRO_SIN_SELECCION else None
+        tipo_servicio_id = int(self.filtro_tipo_servicio_id) if self.filtro_tipo_servicio_id != FILTRO_SIN_SELECCION else None
+
+        # Preparar filtros de fecha
+        fecha_desde = None
+        fecha_hasta = None
+        if self.filtro_fecha_desde:
+            fecha_desde = date.fromisoformat(self.filtro_fecha_desde)
+        if self.filtro_fecha_hasta:
+            fecha_hasta = date.fromisoformat(self.filtro_fecha_hasta)
+
+        contratos = await contrato_service.buscar_con_filtros(
+            texto=busqueda or None,
+            empresa_id=empresa_id,
+            tipo_servicio_id=tipo_servicio_id,
+            estatus=None if self.filtro_estatus == FILTRO_TODOS else (self.filtro_estatus or None),
+            modalidad=self.filtro_modalidad or None,
+            fecha_inicio_desde=fecha_desde,
+            fecha_inicio_hasta=fecha_hasta,
+            incluir_inactivos=self.incluir_inactivos,
+            limite=100,
+            offset=0
+        )
 
-            # Enriquecer con nombres de empresa, tipo de servicio y saldos
-            self.contratos = []
-            for c in contratos:
-                self.contratos.append(
-                    self._enriquecer_contrato_dict(
-                        c,
-                        saldo_pendiente=saldos_pendientes.get(c.id),
-                    )
-                )
+        # Obtener saldos pendientes en batch (1 query en lugar de N)
+        contratos_info = [
+            {"id": c.id, "monto_maximo": c.monto_maximo}
+            for c in contratos
+        ]
+        try:
+            saldos_pendientes = await pago_service.obtener_saldos_pendientes_batch(contratos_info)
+        except Exception:
+            saldos_pendientes = {}
 
-            # Filtro adicional por nombre de empresa (búsqueda in-memory)
-            if self.filtro_busqueda and self.filtro_busqueda.strip():
-                termino = self.filtro_busqueda.strip().lower()
-                self.contratos = [
-                    c for c in self.contratos
-                    if (
-                        termino in c.get("codigo", "").lower() or
-                        termino in (c.get("numero_folio_buap") or "").lower() or
-                        termino in (c.get("descripcion_objeto") or "").lower() or
-                        termino in (c.get("nombre_empresa") or "").lower()
-                    )
-                ]
-
-            self.total_contratos = len(self.contratos)
+        # Enriquecer con nombres de empresa, tipo de servicio y saldos
+        resultado = [
+            self._enriquecer_contrato_dict(c, saldo_pendiente=saldos_pendientes.get(c.id))
+            for c in contratos
+        ]
 
-        except Exception as e:
-            self.manejar_error(e, "al cargar contratos")
-            self.contratos = []
+        # Filtro adicional por nombre de empresa (búsqueda in-memory)
+        if busqueda and busqueda.strip():
+            termino = busqueda.strip().lower()
+            resultado = [
+                c for c in resultado
+                if (
+                    termino in c.get("codigo", "").lower() or
+                    termino in (c.get("numero_folio_buap") or "").lower() or
+                    termino in (c.get("descripcion_objeto") or "").lower() or
+                    termino in (c.get("nombre_empresa") or "").lower()
+                )
+            ]
+        return resultado
+
+    def _aplicar_contratos(self, contratos: list):
+        self.contratos = contratos
+        self.total_contratos = len(contratos)
 
     async def cargar_contratos(self):
         """Carga contratos con skeleton loading (público)."""
         async for _ in self._recargar_datos(self._fetch_contratos):
             yield
 
+    @rx.event(background=True)
     async def on_change_busqueda(self, value: str):
-        """Actualizar filtro y buscar automáticamente"""
-        self.filtro_busqueda = value
-        async for _ in self._recargar_datos(self._fetch_contratos):
-            yield
+        """Actualizar filtro y buscar al dejar de escribir"""
+        await self._buscar_con_debounce(
+            value,
+            self._buscar_contratos,
+            self._aplicar_contratos,
+            contexto_error="al cargar contratos",
+        )
 
     async def aplicar_filtros(self):
         """Aplicar filtros y recargar"""
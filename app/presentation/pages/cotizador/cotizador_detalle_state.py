@@ -330,7 +330,7 @@ class CotizadorDetalleState(PortalState):
         self.loading_detalle = True
 
         try:
-            from app.services import cotizacion_service, categoria_puesto_service
+            from app.services import catalogos_compartidos, cotizacion_service
 
             codigo = self.cotizacion_id or ""
             if not codigo:
@@ -342,7 +342,7 @@ class CotizadorDetalleState(PortalState):
                     codigo,
                     empresa_id=self.id_empresa_actual,
                 ),
-                categoria_puesto_service.obtener_todas(),
+                catalogos_compartidos.obtener("categorias_puesto_activas"),
             )
             partidas = await cotizacion_service.obtener_partidas(
                 cotizacion.id,
@@ -237,10 +237,8 @@ class CotizadorState(PortalState):
 
         if tipo == "PERSONAL":
             try:
-                from app.services import categoria_puesto_service
-                cats = await categoria_puesto_service.obtener_todas(
-                    incluir_inactivas=False
-                )
+                from app.services import catalogos_compartidos
+                cats = await catalogos_compartidos.obtener("categorias_puesto_activas")
                 self.categorias_puesto_opciones = [
                     {"id": c.id, "nombre": c.nombre, "clave": getattr(c, "clave", "")}
                     for c in cats
@@ -19,7 +19,7 @@ from app.core.ui_helpers import (
     FILTRO_TODAS,
     opciones_desde_enum,
 )
-from app.services import empleado_service, empresa_service
+from app.services import catalogos_compartidos, empleado_service, empresa_service
 from app.core.text_utils import formatear_fecha
 from app.core.enums import EstatusEmpleado, GeneroEmpleado, MotivoBaja
 
@@ -45,6 +45,15 @@ from .empleados_validators import (
     validar_motivo_restriccion,
 )
 
+# Columnas que usa `_convertir_a_dicts` (tabla, detalle y edición desde la fila)
+CAMPOS_LISTA = (
+    "id", "clave", "curp", "rfc", "nss", "nombre", "apellido_paterno",
+    "apellido_materno", "empresa_id", "estatus", "fecha_ingreso", "fecha_nacimiento",
+    "genero", "telefono", "email", "direccion", "contacto_emergencia", "notas",
+    "fecha_baja", "motivo_baja", "estatus_onboarding", "is_restricted",
+    "restriction_reason", "restricted_at", "restricted_by",
+)
+
 
 class EmpleadosState(AuthState, CRUDStateMixin, EmployeeFormStateMixin):
     """Estado para el módulo de Empleados"""
@@ -92,10 +101,11 @@ class EmpleadosState(AuthState, CRUDStateMixin, EmployeeFormStateMixin):
     empleado_seleccionado: Optional[dict] = None
     total_empleados: int = 0
 
-    # Paginación
+    # Paginación (keyset: cursor opaco de la siguiente página)
     pagina: int = 1
     por_pagina: int = 50
     hay_mas: bool = False
+    cursor_siguiente: str = ""
     cargando_mas: bool = False
 
     # Catálogos
@@ -177,23 +187,37 @@ class EmpleadosState(AuthState, CRUDStateMixin, EmployeeFormStateMixin):
     def set_filtro_estatus(self, value: str):
         self.filtro_estatus = value if value else FILTRO_TODOS
 
+    @rx.event(background=True)
     async def on_busqueda_change(self, value: str):
-        """Actualiza busqueda. 3+ caracteres consulta la base de datos."""
-        self.filtro_busqueda = value
-        if len(value) >= 3:
+        """
+        Actualiza busqueda. 3+ caracteres consulta el índice en memoria de
+        la empresa y lee de la BD sólo las filas de los resultados.
+        """
+        await self._buscar_con_debounce(
+            value,
+            self._buscar_empleados,
+            self._aplicar_busqueda,
+            contexto_error="buscando empleados",
+        )
+
+    async def _buscar_empleados(self, value: str) -> Optional[list]:
+        if len(value) < 3:
+            return None
+        empleados = await empleado_service.buscar_indexado(
+            texto=value,
+            empresa_id=self._empresa_id_filtro_actual(),
+            limite=200
+        )
+        return await self._convertir_a_dicts(empleados)
+
+    async def _aplicar_busqueda(self, empleados: Optional[list]):
+        if empleados is not None:
             self.pagina = 1
             self.hay_mas = False
-            try:
-                empleados = await empleado_service.buscar(
-                    texto=value,
-                    empresa_id=self._empresa_id_filtro_actual(),
-                    limite=200
-                )
-                self.empleados = await self._convertir_a_dicts(empleados)
-                self.total_empleados = len(self.empleados)
-            except Exception:
-                pass  # Mantener lista actual si falla la busqueda
-        elif not value:
+            self.cursor_siguiente = ""
+            self.empleados = empleados
+            self.total_empleados = len(empleados)
+        elif not self.filtro_busqueda:
             self.pagina = 1
             await self._fetch_empleados()
 
@@ -500,27 +524,23 @@ class EmpleadosState(AuthState, CRUDStateMixin, EmployeeFormStateMixin):
 
             # Buscar empleados
             if self.filtro_busqueda and len(self.filtro_busqueda) >= 2:
-                empleados = await empleado_service.buscar(
+                empleados = await empleado_service.buscar_indexado(
                     texto=self.filtro_busqueda,
                     empresa_id=empresa_id,
                     limite=200
                 )
                 self.hay_mas = False
-            elif empresa_id:
-                empleados = await empleado_service.obtener_por_empresa(
-                    empresa_id=empresa_id,
-                    incluir_inactivos=incluir_inactivos,
-                    limite=self.por_pagina,
-                    offset=0
-                )
-                self.hay_mas = len(empleados) >= self.por_pagina
+                self.cursor_siguiente = ""
             else:
-                empleados = await empleado_service.obtener_todos(
+                pagina = await empleado_service.obtener_pagina(
+                    empresa_id=empresa_id,
                     incluir_inactivos=incluir_inactivos,
                     limite=self.por_pagina,
-                    offset=0
+                    campos=CAMPOS_LISTA,
                 )
-                self.hay_mas = len(empleados) >= self.por_pagina
+                empleados = pagina.items
+                self.cursor_siguiente = pagina.siguiente_cursor or ""
+                self.hay_mas = pagina.hay_mas
 
             # Convertir a diccionarios para la UI
             self.empleados = await self._convertir_a_dicts(empleados)
@@ -534,7 +554,7 @@ class EmpleadosState(AuthState, CRUDStateMixin, EmployeeFormStateMixin):
         """Carga el catálogo de empresas para el select"""
         empresas = await self.cargar_y_asignar_lista(
             "empresas",
-            lambda: empresa_service.obtener_todas(incluir_inactivas=False),
+            lambda: catalogos_compartidos.obtener("empresas_activas"),
             contexto_error="cargando empresas",
             transformar=lambda e: {
                 "id": e.id,
@@ -991,35 +1011,29 @@ class EmpleadosState(AuthState, CRUDStateMixin, EmployeeFormStateMixin):
 
     async def cargar_mas(self):
         """Carga la siguiente pagina de empleados (ver mas)."""
-        if not self.hay_mas:
+        if not self.hay_mas or not self.cursor_siguiente:
             return
 
         self.cargando_mas = True
         try:
             self.pagina += 1
-            offset = (self.pagina - 1) * self.por_pagina
 
             empresa_id = self._empresa_id_filtro_actual()
 
             incluir_inactivos = self.filtro_estatus == FILTRO_TODOS
 
-            if empresa_id:
-                nuevos = await empleado_service.obtener_por_empresa(
-                    empresa_id=empresa_id,
-                    incluir_inactivos=incluir_inactivos,
-                    limite=self.por_pagina,
-                    offset=offset
-                )
-            else:
-                nuevos = await empleado_service.obtener_todos(
-                    incluir_inactivos=incluir_inactivos,
-                    limite=self.por_pagina,
-                    offset=offset
-                )
+            pagina = await empleado_service.obtener_pagina(
+                empresa_id=empresa_id,
+                incluir_inactivos=incluir_inactivos,
+                cursor=self.cursor_siguiente,
+                limite=self.por_pagina,
+                campos=CAMPOS_LISTA,
+            )
 
-            self.hay_mas = len(nuevos) >= self.por_pagina
+            self.cursor_siguiente = pagina.siguiente_cursor or ""
+            self.hay_mas = pagina.hay_mas
 
-            nuevos_dicts = await self._convertir_a_dicts(nuevos)
+            nuevos_dicts = await self._convertir_a_dicts(pagina.items)
             self.empleados = self.empleados + nuevos_dicts
             self.total_empleados = len(self.empleados)
 
@@ -13,6 +13,7 @@ from app.services import entregable_service, archivo_service
 from app.entities.archivo import EntidadArchivo
 from app.core.exceptions import NotFoundError, BusinessRuleError
 from app.core.text_utils import formatear_moneda
+from app.repositories.shared import con_alcance_loaders
 
 
 class EntregableDetalleState(AuthState):
@@ -389,6 +390,7 @@ class EntregableDetalleState(AuthState):
             error_attr="error_monto",
         )
 
+    @con_alcance_loaders
     async def confirmar_aprobacion(self):
         self.validar_monto()
         if self.error_monto:
@@ -435,6 +437,7 @@ class EntregableDetalleState(AuthState):
             error_attr="error_observaciones",
         )
 
+    @con_alcance_loaders
     async def confirmar_rechazo(self):
         self.validar_observaciones()
         if self.error_observaciones:
@@ -460,6 +463,7 @@ class EntregableDetalleState(AuthState):
     # =========================================================================
     # FLUJO DE PREFACTURA (ADMIN)
     # =========================================================================
+    @con_alcance_loaders
     async def aprobar_prefactura(self):
         """Aprueba la prefactura del entregable."""
         self.procesando = True
@@ -498,6 +502,7 @@ class EntregableDetalleState(AuthState):
             error_attr="error_observaciones_prefactura",
         )
 
+    @con_alcance_loaders
     async def confirmar_rechazo_prefactura(self):
         self.validar_observaciones_prefactura()
         if self.error_observaciones_prefactura:
@@ -545,6 +550,7 @@ class EntregableDetalleState(AuthState):
             error_attr="error_fecha_pago",
         )
 
+    @con_alcance_loaders
     async def confirmar_registrar_pago(self):
         self.validar_fecha_pago()
         if self.error_fecha_pago:
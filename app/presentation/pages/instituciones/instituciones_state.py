@@ -63,10 +63,15 @@ class InstitucionesState(AuthState):
     # ========================
     # SETTERS EXPLICITOS
     # ========================
+    @rx.event(background=True)
     async def on_change_busqueda(self, value: str):
-        """Actualizar filtro y buscar automaticamente"""
-        self.filtro_busqueda = value
-        await self._fetch_instituciones()
+        """Actualizar filtro y buscar al dejar de escribir"""
+        await self._buscar_con_debounce(
+            value,
+            self._buscar_instituciones,
+            self._aplicar_instituciones,
+            contexto_error="al cargar instituciones",
+        )
 
     def set_incluir_inactivas(self, value: bool):
         self.incluir_inactivas = value
@@ -150,35 +155,41 @@ class InstitucionesState(AuthState):
     async def _fetch_instituciones(self):
         """Carga instituciones desde BD (sin manejo de loading)."""
         try:
-            instituciones = await institucion_service.obtener_todas(
-                solo_activas=not self.incluir_inactivas
-            )
+            self._aplicar_instituciones(await self._buscar_instituciones(self.filtro_busqueda))
+        except Exception as e:
+            self.manejar_error(e, "al cargar instituciones")
+            self.instituciones = []
 
-            # Filtrar por busqueda si hay termino
-            if self.filtro_busqueda:
-                termino = self.filtro_busqueda.upper()
-                instituciones = [
-                    i for i in instituciones
-                    if termino in i.codigo.upper()
-                    or termino in i.nombre.upper()
-                ]
+    async def _buscar_instituciones(self, busqueda: str) -> list:
+        """Consulta y filtra instituciones sin modificar el state."""
+        instituciones = await institucion_service.obtener_todas(
+            solo_activas=not self.incluir_inactivas
+        )
 
-            self.instituciones = [
-                {
-                    "id": i.id,
-                    "nombre": i.nombre,
-                    "codigo": i.codigo,
-                    "activo": i.activo,
-                    "cantidad_empresas": i.cantidad_empresas,
-                    "estatus": "ACTIVO" if i.activo else "INACTIVO",
-                }
-                for i in instituciones
+        # Filtrar por busqueda si hay termino
+        if busqueda:
+            termino = busqueda.upper()
+            instituciones = [
+                i for i in instituciones
+                if termino in i.codigo.upper()
+                or termino in i.nombre.upper()
             ]
-            self.total_instituciones = len(self.instituciones)
 
-        except Exception as e:
-            self.manejar_error(e, "al cargar instituciones")
-            self.instituciones = []
+        return [
+            {
+                "id": i.id,
+                "nombre": i.nombre,
+                "codigo": i.codigo,
+                "activo": i.activo,
+                "cantidad_empresas": i.cantidad_empresas,
+                "estatus": "ACTIVO" if i.activo else "INACTIVO",
+            }
+            for i in instituciones
+        ]
+
+    def _aplicar_instituciones(self, instituciones: list):
+        self.instituciones = instituciones
+        self.total_instituciones = len(instituciones)
 
     async def on_mount_instituciones(self):
         """Montaje de la pagina."""
@@ -401,7 +401,9 @@ class NominaContabilidadState(NominaBaseState):
         self.mostrar_dialog_ejecutar = False
         self.calculando = True
         try:
-            resumen = await nomina_calculo_service.calcular_periodo(periodo_id)
+            resumen = await nomina_calculo_service.calcular_periodo(
+                periodo_id, modo='incremental'
+            )
             # Refrescar período y empleados con totales actualizados
             self.periodo_actual = await nomina_periodo_service.obtener_periodo(periodo_id)
             await self._cargar_empleados(periodo_id)
@@ -182,7 +182,8 @@ class PagosPageState(BaseState):
     async def _cargar_contratos(self):
         """Carga el catalogo de contratos para filtros."""
         try:
-            contratos = await contrato_service.obtener_todos(limite=500)
+            # El filtro sólo muestra el código
+            contratos = await contrato_service.obtener_todos(limite=500, campos=('id', 'codigo'))
             self.contratos_opciones = [
                 {"label": "Todos", "value": FILTRO_TODOS}
             ]
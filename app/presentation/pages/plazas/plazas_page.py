@@ -170,6 +170,24 @@ def tabla_plazas() -> rx.Component:
     )
 
 
+def boton_ver_mas_plazas() -> rx.Component:
+    """Botón para cargar la siguiente página de plazas."""
+    return rx.cond(
+        PlazasState.hay_mas_plazas,
+        rx.center(
+            rx.button(
+                rx.icon("chevrons-down", size=16),
+                "Ver más",
+                on_click=PlazasState.cargar_mas_plazas,
+                variant="soft",
+                size="2",
+                loading=PlazasState.cargando_mas_plazas,
+            ),
+            width="100%",
+        ),
+    )
+
+
 # =============================================================================
 # VISTA DE CARDS
 # =============================================================================
@@ -736,6 +754,7 @@ def plazas_page() -> rx.Component:
                             tabla_plazas(),
                             grid_plazas(),
                         ),
+                        boton_ver_mas_plazas(),
 
                         spacing="4",
                         width="100%",
@@ -56,6 +56,12 @@ class PlazasState(AuthState):
     plaza_seleccionada: Optional[dict] = None
     total_plazas: int = 0
 
+    # Paginación por cursor (vista por categoría)
+    por_pagina_plazas: int = 200
+    cursor_plazas: str = ""
+    hay_mas_plazas: bool = False
+    cargando_mas_plazas: bool = False
+
     # Contexto del contrato/categoría
     contrato_id: int = 0
     contrato_codigo: str = ""
@@ -479,6 +485,8 @@ class PlazasState(AuthState):
             # Obtener resumen de plazas con datos enriquecidos
             plazas_resumen = await plaza_service.obtener_resumen_de_contrato(contrato_id)
             self._asignar_plazas_cargadas(plazas_resumen)
+            self.cursor_plazas = ""
+            self.hay_mas_plazas = False
             self.contrato_codigo = contrato.codigo
             self.categoria_nombre = ""
 
@@ -499,12 +507,15 @@ class PlazasState(AuthState):
             contrato_categoria, contrato = await self._asegurar_acceso_contrato_categoria(
                 contrato_categoria_id
             )
-            # Usar obtener_resumen_de_categoria que incluye datos del empleado
-            plazas_resumen = await plaza_service.obtener_resumen_de_categoria(
+            # Primera página del resumen (incluye datos del empleado)
+            pagina = await plaza_service.obtener_resumen_pagina_de_categoria(
                 contrato_categoria_id,
-                incluir_canceladas=True
+                incluir_canceladas=True,
+                limite=self.por_pagina_plazas,
             )
-            self._asignar_plazas_cargadas(plazas_resumen)
+            self._asignar_plazas_cargadas(pagina.items)
+            self.cursor_plazas = pagina.siguiente_cursor or ""
+            self.hay_mas_plazas = pagina.hay_mas
             self.contrato_id = int(contrato.id or 0)
             self.contrato_codigo = contrato.codigo
             if not self.categoria_nombre:
@@ -536,6 +547,31 @@ class PlazasState(AuthState):
         finally:
             self.loading = False
 
+    async def cargar_mas_plazas(self):
+        """Carga la siguiente página de plazas de la categoría actual."""
+        if not self.hay_mas_plazas or not self.contrato_categoria_id:
+            return
+
+        self.cargando_mas_plazas = True
+        try:
+            pagina = await plaza_service.obtener_resumen_pagina_de_categoria(
+                self.contrato_categoria_id,
+                incluir_canceladas=True,
+                cursor=self.cursor_plazas,
+                limite=self.por_pagina_plazas,
+            )
+            self.plazas = self.plazas + [
+                self._serializar_plaza_resumen(plaza) for plaza in pagina.items
+            ]
+            self.total_plazas = len(self.plazas)
+            self._actualizar_contadores()
+            self.cursor_plazas = pagina.siguiente_cursor or ""
+            self.hay_mas_plazas = pagina.hay_mas
+        except Exception as e:
+            self.manejar_error(e, "cargar más plazas")
+        finally:
+            self.cargando_mas_plazas = False
+
     def _actualizar_contadores(self):
         """Actualiza los contadores de plazas por estatus"""
         self.plazas_vacantes = len([p for p in self.plazas if p.get("estatus") == "VACANTE"])
@@ -11,7 +11,7 @@ from app.presentation.components.shared.auth_state import AuthState
 from app.presentation.constants import FILTRO_TODOS
 from app.services.requisicion_service import requisicion_service
 from app.services.requisicion_pdf_service import requisicion_pdf_service
-from app.services.empresa_service import empresa_service
+from app.services.catalogos_compartidos import catalogos_compartidos
 from app.services.archivo_service import archivo_service, ArchivoValidationError
 from app.entities.archivo import EntidadArchivo, TipoArchivo
 
@@ -579,7 +579,7 @@ class RequisicionesState(AuthState):
     async def cargar_empresas(self):
         """Carga lista de empresas para dropdowns."""
         try:
-            empresas = await empresa_service.obtener_todas(incluir_inactivas=False)
+            empresas = await catalogos_compartidos.obtener("empresas_activas")
             self.empresas_opciones = [
                 {"value": str(e.id), "label": e.nombre_comercial}
                 for e in empresas
@@ -590,7 +590,7 @@ class RequisicionesState(AuthState):
     async def cargar_lugares_entrega(self):
         """Carga lista de lugares de entrega para dropdown."""
         try:
-            lugares = await requisicion_service.obtener_lugares_entrega()
+            lugares = await catalogos_compartidos.obtener("lugares_entrega")
             self.lugares_entrega_opciones = [
                 {"value": l.nombre, "label": l.nombre}
                 for l in lugares
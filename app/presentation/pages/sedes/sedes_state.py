@@ -8,7 +8,7 @@ from typing import List, Optional
 from app.core.enums import TipoSede
 from app.core.text_utils import normalizar_mayusculas
 from app.entities import SedeCreate, SedeUpdate
-from app.services import sede_service
+from app.services import catalogos_compartidos, sede_service
 from app.presentation.components.shared.base_state import BaseState
 from app.presentation.pages.sedes.sedes_validators import (
     validar_codigo,
@@ -82,10 +82,15 @@ class SedesState(BaseState):
     # SETTERS EXPLICITOS (Reflex 0.8.9+)
     # ========================
 
+    @rx.event(background=True)
     async def on_change_busqueda(self, value: str):
-        """Actualizar filtro y buscar automaticamente"""
-        self.filtro_busqueda = value
-        await self._fetch_sedes()
+        """Actualizar filtro y buscar al dejar de escribir"""
+        await self._buscar_con_debounce(
+            value,
+            self._buscar_sedes,
+            self._aplicar_sedes,
+            contexto_error="al cargar sedes",
+        )
 
     def set_incluir_inactivas(self, value: bool):
         self.incluir_inactivas = value
@@ -187,48 +192,54 @@ class SedesState(BaseState):
     async def _fetch_sedes(self):
         """Carga sedes desde BD (sin manejo de loading)."""
         try:
-            sedes = await sede_service.obtener_todas(
-                incluir_inactivas=self.incluir_inactivas
-            )
+            self._aplicar_sedes(await self._buscar_sedes(self.filtro_busqueda))
+        except Exception as e:
+            self.manejar_error(e, "al cargar sedes")
+            self.sedes = []
 
-            # Filtrar por busqueda si hay termino
-            if self.filtro_busqueda:
-                termino = self.filtro_busqueda.upper()
-                sedes = [
-                    s for s in sedes
-                    if termino in s.codigo.upper()
-                    or termino in s.nombre.upper()
-                    or (s.nombre_corto and termino in s.nombre_corto.upper())
-                ]
+    async def _buscar_sedes(self, busqueda: str) -> list:
+        """Consulta, filtra y enriquece sedes sin modificar el state."""
+        sedes = await sede_service.obtener_todas(
+            incluir_inactivas=self.incluir_inactivas
+        )
 
-            # Crear mapa de nombres para resolver padre/ubicacion
-            mapa_nombres = {s.id: s.nombre_corto or s.nombre for s in sedes}
+        # Filtrar por busqueda si hay termino
+        if busqueda:
+            termino = busqueda.upper()
+            sedes = [
+                s for s in sedes
+                if termino in s.codigo.upper()
+                or termino in s.nombre.upper()
+                or (s.nombre_corto and termino in s.nombre_corto.upper())
+            ]
 
-            # Convertir a dict con campos enriquecidos
-            self.sedes = []
-            for s in sedes:
-                d = s.model_dump(mode='json')
-                # Resolver nombres de relaciones
-                if s.sede_padre_id and s.sede_padre_id in mapa_nombres:
-                    d["sede_padre_nombre"] = mapa_nombres[s.sede_padre_id]
-                else:
-                    d["sede_padre_nombre"] = ""
-                if s.ubicacion_fisica_id and s.ubicacion_fisica_id in mapa_nombres:
-                    d["ubicacion_fisica_nombre"] = mapa_nombres[s.ubicacion_fisica_id]
-                else:
-                    d["ubicacion_fisica_nombre"] = ""
-                # Descripcion del tipo
-                try:
-                    d["tipo_descripcion"] = TipoSede(d["tipo_sede"]).descripcion
-                except (ValueError, KeyError):
-                    d["tipo_descripcion"] = d.get("tipo_sede", "")
-                self.sedes.append(d)
-
-            self.total_sedes = len(self.sedes)
+        # Crear mapa de nombres para resolver padre/ubicacion
+        mapa_nombres = {s.id: s.nombre_corto or s.nombre for s in sedes}
 
-        except Exception as e:
-            self.manejar_error(e, "al cargar sedes")
-            self.sedes = []
+        # Convertir a dict con campos enriquecidos
+        resultado = []
+        for s in sedes:
+            d = s.model_dump(mode='json')
+            # Resolver nombres de relaciones
+            if s.sede_padre_id and s.sede_padre_id in mapa_nombres:
+                d["sede_padre_nombre"] = mapa_nombres[s.sede_padre_id]
+            else:
+                d["sede_padre_nombre"] = ""
+            if s.ubicacion_fisica_id and s.ubicacion_fisica_id in mapa_nombres:
+                d["ubicacion_fisica_nombre"] = mapa_nombres[s.ubicacion_fisica_id]
+            else:
+                d["ubicacion_fisica_nombre"] = ""
+            # Descripcion del tipo
+            try:
+                d["tipo_descripcion"] = TipoSede(d["tipo_sede"]).descripcion
+            except (ValueError, KeyError):
+                d["tipo_descripcion"] = d.get("tipo_sede", "")
+            resultado.append(d)
+        return resultado
+
+    def _aplicar_sedes(self, sedes: list):
+        self.sedes = sedes
+        self.total_sedes = len(sedes)
 
     async def on_mount_sedes(self):
         """Montaje de la página: skeleton en primera visita, silencioso en revisitas."""
@@ -250,7 +261,7 @@ class SedesState(BaseState):
 
         # Opciones de sedes activas para padre/ubicacion
         try:
-            sedes_activas = await sede_service.obtener_todas(incluir_inactivas=False)
+            sedes_activas = await catalogos_compartidos.obtener("sedes_activas")
             self.opciones_sedes_padre = [
                 {"label": f"{s.codigo} - {s.nombre_corto or s.nombre}", "value": str(s.id)}
                 for s in sedes_activas
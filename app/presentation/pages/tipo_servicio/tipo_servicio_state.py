@@ -68,10 +68,15 @@ class TipoServicioState(BaseState):
     # ========================
     # set_filtro_busqueda viene de BaseState
 
+    @rx.event(background=True)
     async def on_change_busqueda(self, value: str):
-        """Actualizar filtro y buscar automáticamente"""
-        self.filtro_busqueda = value
-        await self._fetch_tipos()
+        """Actualizar filtro y buscar al dejar de escribir"""
+        await self._buscar_con_debounce(
+            value,
+            self._buscar_tipos,
+            self._aplicar_tipos,
+            contexto_error="al cargar tipos",
+        )
 
     def set_incluir_inactivas(self, value: bool):
         self.incluir_inactivas = value
@@ -165,26 +170,32 @@ class TipoServicioState(BaseState):
     async def _fetch_tipos(self):
         """Carga tipos de servicio desde BD (sin manejo de loading)."""
         try:
-            tipos = await tipo_servicio_service.obtener_todas(
-                incluir_inactivas=self.incluir_inactivas
-            )
-
-            # Filtrar por búsqueda si hay término
-            if self.filtro_busqueda:
-                termino = self.filtro_busqueda.upper()
-                tipos = [
-                    t for t in tipos
-                    if termino in t.clave.upper() or termino in t.nombre.upper()
-                ]
-
-            # Convertir a dict para Reflex
-            self.tipos = [tipo.model_dump() for tipo in tipos]
-            self.total_tipos = len(self.tipos)
-
+            self._aplicar_tipos(await self._buscar_tipos(self.filtro_busqueda))
         except Exception as e:
             self.manejar_error(e, "al cargar tipos")
             self.tipos = []
 
+    async def _buscar_tipos(self, busqueda: str) -> list:
+        """Consulta y filtra tipos sin modificar el state."""
+        tipos = await tipo_servicio_service.obtener_todas(
+            incluir_inactivas=self.incluir_inactivas
+        )
+
+        # Filtrar por búsqueda si hay término
+        if busqueda:
+            termino = busqueda.upper()
+            tipos = [
+                t for t in tipos
+                if termino in t.clave.upper() or termino in t.nombre.upper()
+            ]
+
+        # Convertir a dict para Reflex
+        return [tipo.model_dump() for tipo in tipos]
+
+    def _aplicar_tipos(self, tipos: list):
+        self.tipos = tipos
+        self.total_tipos = len(tipos)
+
     async def on_mount_tipos(self):
         """Montaje de la página: skeleton en primera visita, silencioso en revisitas."""
         async for _ in self._montar_pagina(self._fetch_tipos):
@@ -100,8 +100,12 @@ class MisEmpleadosState(
     alta_masiva_resultado_reingresados: int = 0
     alta_masiva_resultado_errores_count: int = 0
     alta_masiva_resultado_detalles: List[dict] = []
+    alta_masiva_importacion_id: int = 0
+    alta_masiva_progreso_confirmados: int = 0
+    alta_masiva_progreso_total: int = 0
     _alta_masiva_cache_validos: List[dict] = []
     _alta_masiva_cache_reingresos: List[dict] = []
+    _alta_masiva_clave_idempotencia: str = ""
 
     # ========================
     # FORMULARIO
@@ -604,7 +608,9 @@ class MisEmpleadosState(
             return
         async for _ in self._montar_pagina(self._fetch_empleados):
             yield
-        if self._query_solicita_alta_masiva():
+        if await self._reanudar_seguimiento_alta_masiva():
+            yield MisEmpleadosState.seguir_importacion_alta_masiva
+        elif self._query_solicita_alta_masiva():
             self.abrir_panel_alta_masiva()
 
     # ========================
@@ -689,6 +695,14 @@ class MisEmpleadosState(
         async for event in EmployeeBulkUploadStateMixin.confirmar_alta_masiva(self):
             yield event
 
+    @rx.event(background=True)
+    async def seguir_importacion_alta_masiva(self):
+        """Wrapper de Reflex para seguir el avance de la importacion."""
+        async for event in EmployeeBulkUploadStateMixin._seguir_importacion_alta_masiva(
+            self,
+        ):
+            yield event
+
     def descargar_plantilla_excel_alta_masiva(self):
         """Wrapper de Reflex para descarga de plantilla Excel."""
         return EmployeeBulkUploadStateMixin.descargar_plantilla_excel_alta_masiva(
@@ -210,21 +210,19 @@ class PortalState(AuthState):
                 for contrato in contratos
             )
 
-            # Plazas: sumar de todos los contratos
+            # Plazas: sumar de todos los contratos (una consulta agrupada)
             from app.services import plaza_service
             ocupadas = 0
             vacantes = 0
-            for contrato in contratos:
+            if contratos:
                 try:
-                    resumen = await plaza_service.calcular_totales_contrato(contrato.id)
-                    ocupadas += resumen.plazas_ocupadas
-                    vacantes += resumen.plazas_vacantes
-                except Exception as e:
-                    logger.debug(
-                        "Error calculando métricas de plazas para contrato %s: %s",
-                        contrato.id,
-                        e,
+                    totales = await plaza_service.calcular_totales_contratos(
+                        [contrato.id for contrato in contratos]
                     )
+                    ocupadas = sum(t.plazas_ocupadas for t in totales.values())
+                    vacantes = sum(t.plazas_vacantes for t in totales.values())
+                except Exception as e:
+                    logger.debug("Error calculando métricas de plazas del portal: %s", e)
             self.total_plazas_ocupadas = ocupadas
             self.total_plazas_vacantes = vacantes
 
@@ -41,6 +41,9 @@ from app.repositories.archivo_repository import SupabaseArchivoRepository
 # Entregable
 from app.repositories.entregable_repository import SupabaseEntregableRepository
 
+# Importaciones de alta masiva
+from app.repositories.importacion_repository import SupabaseImportacionAltaMasivaRepository
+
 
 __all__ = [
     "SupabaseEmpresaRepository",
@@ -55,4 +58,5 @@ __all__ = [
     "SupabaseHistorialLaboralRepository",
     "SupabaseArchivoRepository",
     "SupabaseEntregableRepository",
+    "SupabaseImportacionAltaMasivaRepository",
 ]
@@ -12,13 +12,43 @@ Uso:
         tabla = 'mi_tabla'
         entidad_class = MiEntidad
         entidad_nombre = 'MiEntidad'
+        usar_executor = False  # opcional: queries en el event loop (no recomendado)
+        cache_ttl = 300        # opcional: cache read-through (segundos)
+        hidratacion_confiable = True  # opcional: listados sin validadores
 """
 import logging
-from typing import TypeVar, Generic, Type, List, Optional, Any, Dict
+from typing import TypeVar, Generic, Type, List, Optional, Any, Dict, AsyncIterator, Iterable, Sequence
 from abc import ABC
 
 from app.database import db_manager
 from app.core.exceptions import NotFoundError, DuplicateError, DatabaseError
+from app.repositories.shared.bulk import (
+    CONCURRENCIA_LOTES,
+    TAMANO_LOTE_ESCRITURA,
+    escribir_en_lotes,
+    partir_en_lotes,
+)
+from app.repositories.shared.cache import (
+    AUSENTE,
+    OPERACION_POR_ID,
+    cache_consultas,
+    normalizar_filtros,
+)
+from app.repositories.shared.hidratacion import columnas_select, hidratar
+from app.repositories.shared.data_loader import (
+    DataLoader,
+    TAMANO_LOTE_IDS,
+    limpiar_loader,
+    obtener_loader,
+)
+from app.repositories.shared.query_helpers import (
+    Pagina,
+    apply_eq_filters,
+    apply_keyset,
+    cerrar_pagina,
+    iterar,
+    TAMANO_PAGINA_ITERAR,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +65,27 @@ class BaseRepository(Generic[T], ABC):
     - tabla: nombre de la tabla en Supabase
     - entidad_class: clase Pydantic de la entidad
     - entidad_nombre: nombre legible para mensajes de error
+
+    Las queries lanzadas desde `_ejecutar_query` corren en el pool de I/O
+    del DatabaseManager para no bloquear el event loop; un repositorio
+    puede desactivarlo con `usar_executor = False`.
+
+    Con `cache_ttl` (segundos) las lecturas por ID, listados y conteos
+    pasan por una cache LRU por tabla (ver `shared/cache.py`); crear,
+    actualizar y eliminar invalidan las entradas afectadas.
+
+    Con `hidratacion_confiable` los listados construyen las entidades sin
+    correr validadores (ver `shared/hidratacion.py`); las proyecciones
+    (`campos=`) siempre se hidratan así.
     """
 
     tabla: str = ""
     entidad_class: Type[T] = None
     entidad_nombre: str = "Entidad"
+    usar_executor: bool = True
+    cache_ttl: Optional[float] = None
+    cache_max_entradas: int = 256
+    hidratacion_confiable: bool = False
 
     def __init__(self, db=None):
         """
@@ -50,8 +96,13 @@ class BaseRepository(Generic[T], ABC):
         """
         if db is None:
             db = db_manager
+        self._db = db
         self.supabase = db.get_client()
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._cache = (
+            cache_consultas.tabla(self.tabla, self.cache_ttl, self.cache_max_entradas)
+            if self.cache_ttl else None
+        )
 
     # =========================================================================
     # OPERACIONES DE LECTURA
@@ -71,12 +122,47 @@ class BaseRepository(Generic[T], ABC):
             NotFoundError: Si no existe
             DatabaseError: Si hay error de BD
         """
-        return await self._ejecutar_query(
+        return await self._ejecutar_cacheado(
+            (OPERACION_POR_ID, id),
             f"obtener {self.entidad_nombre} por ID",
             lambda: self._query_por_id(id),
             not_found_msg=f"{self.entidad_nombre} con ID {id} no encontrado"
         )
 
+    async def obtener_por_ids(self, ids: Iterable[int]) -> Dict[int, T]:
+        """
+        Obtiene varias entidades por ID con `.in_()` (lotes de TAMANO_LOTE_IDS).
+
+        Returns:
+            Dict {id: entidad}; los IDs inexistentes no aparecen
+
+        Raises:
+            DatabaseError: Si hay error de BD
+        """
+        unicos = list(dict.fromkeys(i for i in ids if i is not None))
+        encontrados: Dict[int, T] = {}
+        for inicio in range(0, len(unicos), TAMANO_LOTE_IDS):
+            lote = unicos[inicio:inicio + TAMANO_LOTE_IDS]
+            encontrados.update(await self._ejecutar_query(
+                f"obtener {self.entidad_nombre} por IDs",
+                lambda lote=lote: self._query_por_ids(lote),
+            ))
+        return encontrados
+
+    def _query_por_ids(self, ids: List[int]) -> Dict[int, T]:
+        """Ejecuta query por lote de IDs. Override junto con `_query_por_id`."""
+        result = self.supabase.table(self.tabla).select('*').in_('id', ids).execute()
+        return {data['id']: self.entidad_class(**data) for data in result.data or []}
+
+    def loader(self) -> DataLoader[int, T]:
+        """
+        DataLoader por ID de la petición en curso (ver `alcance_loaders`).
+
+        `await repo.loader().cargar(id)` concurrentes se resuelven con una
+        sola llamada a `obtener_por_ids`.
+        """
+        return obtener_loader(f"{self.tabla}:por_id", self.obtener_por_ids)
+
     def _query_por_id(self, id: int) -> T:
         """Ejecuta query por ID. Override para JOINs personalizados."""
         result = self.supabase.table(self.tabla).select('*').eq('id', id).execute()
@@ -90,7 +176,8 @@ class BaseRepository(Generic[T], ABC):
         offset: int = 0,
         orden_campo: str = 'id',
         orden_desc: bool = True,
-        filtros: Optional[Dict[str, Any]] = None
+        filtros: Optional[Dict[str, Any]] = None,
+        campos: Optional[Sequence[str]] = None
     ) -> List[T]:
         """
         Obtiene todas las entidades con paginación.
@@ -101,6 +188,9 @@ class BaseRepository(Generic[T], ABC):
             orden_campo: Campo para ordenar
             orden_desc: True para DESC, False para ASC
             filtros: Dict de {campo: valor} para filtrar
+            campos: Columnas a leer (None = todas). Con proyección las
+                entidades se hidratan sin validadores y los campos no
+                leídos quedan en su default.
 
         Returns:
             Lista de entidades
@@ -108,9 +198,11 @@ class BaseRepository(Generic[T], ABC):
         Raises:
             DatabaseError: Si hay error de BD
         """
-        return await self._ejecutar_query(
+        return await self._ejecutar_cacheado(
+            ('todos', limite, offset, orden_campo, orden_desc, normalizar_filtros(filtros),
+             tuple(campos) if campos else None),
             f"obtener todos {self.entidad_nombre}",
-            lambda: self._query_todos(limite, offset, orden_campo, orden_desc, filtros),
+            lambda: self._query_todos(limite, offset, orden_campo, orden_desc, filtros, campos),
             return_list=True
         )
 
@@ -120,10 +212,11 @@ class BaseRepository(Generic[T], ABC):
         offset: int,
         orden_campo: str,
         orden_desc: bool,
-        filtros: Optional[Dict[str, Any]]
+        filtros: Optional[Dict[str, Any]],
+        campos: Optional[Sequence[str]] = None
     ) -> List[T]:
         """Ejecuta query de listado. Override para filtros personalizados."""
-        query = self.supabase.table(self.tabla).select('*')
+        query = self.supabase.table(self.tabla).select(columnas_select(campos, ('id', orden_campo)))
 
         # Aplicar filtros
         if filtros:
@@ -139,7 +232,52 @@ class BaseRepository(Generic[T], ABC):
             query = query.range(offset, offset + limite - 1)
 
         result = query.execute()
-        return [self.entidad_class(**data) for data in result.data]
+        return hidratar(
+            self.entidad_class,
+            result.data,
+            confiable=self.hidratacion_confiable or bool(campos),
+        )
+
+    async def obtener_pagina(
+        self,
+        cursor: Optional[str] = None,
+        limite: int = 50,
+        orden_campo: str = 'id',
+        orden_desc: bool = False,
+        filtros: Optional[Dict[str, Any]] = None
+    ) -> Pagina[T]:
+        """
+        Obtiene una página por cursor (keyset) en lugar de offset.
+
+        El costo no crece con la profundidad de la página. El cursor es
+        opaco: se obtiene de `Pagina.siguiente_cursor` de la página previa.
+
+        Args:
+            cursor: Cursor de la página anterior (None = primera página)
+            limite: Máximo de resultados
+            orden_campo: Campo NOT NULL para ordenar (desempate por id)
+            orden_desc: True para DESC, False para ASC
+            filtros: Dict de {campo: valor} para filtrar
+
+        Returns:
+            Pagina con entidades y siguiente_cursor (None si es la última)
+
+        Raises:
+            ValidationError: Si el cursor es inválido
+            DatabaseError: Si hay error de BD
+        """
+        query = apply_keyset(
+            apply_eq_filters(self.supabase.table(self.tabla).select('*'), filtros),
+            cursor, limite, orden_campo, desc=orden_desc,
+        )
+
+        def _query_pagina() -> Pagina[T]:
+            filas, siguiente = cerrar_pagina(query.execute().data, limite, orden_campo)
+            return Pagina([self.entidad_class(**data) for data in filas], siguiente)
+
+        return await self._ejecutar_query(
+            f"obtener página de {self.entidad_nombre}", _query_pagina
+        )
 
     async def contar(self, filtros: Optional[Dict[str, Any]] = None) -> int:
         """
@@ -154,7 +292,8 @@ class BaseRepository(Generic[T], ABC):
         Raises:
             DatabaseError: Si hay error de BD
         """
-        return await self._ejecutar_query(
+        return await self._ejecutar_cacheado(
+            ('contar', normalizar_filtros(filtros)),
             f"contar {self.entidad_nombre}",
             lambda: self._query_contar(filtros),
             return_count=True
@@ -172,10 +311,50 @@ class BaseRepository(Generic[T], ABC):
         result = query.execute()
         return result.count or 0
 
+    async def iterar(
+        self,
+        filtros: Optional[Dict[str, Any]] = None,
+        page_size: int = TAMANO_PAGINA_ITERAR,
+        columnas: str = '*',
+    ) -> AsyncIterator[List[T]]:
+        """
+        Recorre todas las entidades de la tabla en páginas (keyset por id).
+
+        Útil para agregaciones sobre tablas grandes: no se trunca en el
+        max-rows de PostgREST y solo mantiene una página en memoria.
+
+        Args:
+            filtros: Dict de {campo: valor} para filtrar (eq)
+            page_size: Entidades por página
+            columnas: Select de PostgREST (debe incluir 'id')
+
+        Yields:
+            Listas de entidades
+
+        Raises:
+            DatabaseError: Si hay error de BD
+        """
+        def _query():
+            query = self.supabase.table(self.tabla).select(columnas)
+            return apply_eq_filters(query, filtros)
+
+        async def _ejecutar(builder):
+            return await self._ejecutar(builder.execute)
+
+        try:
+            async for pagina in iterar(_query, page_size, ejecutar=_ejecutar):
+                yield [self.entidad_class(**data) for data in pagina]
+        except Exception as e:
+            self._logger.error(f"Error iterando {self.entidad_nombre}: {e}")
+            raise DatabaseError(
+                f"Error de base de datos al iterar {self.entidad_nombre}: {str(e)}"
+            )
+
     async def existe(self, id: int) -> bool:
         """Verifica si existe una entidad por ID."""
         try:
-            result = self.supabase.table(self.tabla).select('id').eq('id', id).execute()
+            query = self.supabase.table(self.tabla).select('id').eq('id', id)
+            result = await self._ejecutar(query.execute)
             return len(result.data) > 0
         except Exception:
             return False
@@ -198,18 +377,116 @@ class BaseRepository(Generic[T], ABC):
             DuplicateError: Si viola constraint único
             DatabaseError: Si hay error de BD
         """
-        return await self._ejecutar_query(
-            f"crear {self.entidad_nombre}",
-            lambda: self._insertar(entidad),
-            check_duplicate=True
-        )
+        try:
+            return await self._ejecutar_query(
+                f"crear {self.entidad_nombre}",
+                lambda: self._insertar(entidad),
+                check_duplicate=True
+            )
+        finally:
+            if self._cache is not None:
+                self._cache.invalidar_listados()
 
     def _insertar(self, entidad: T) -> T:
-        """Ejecuta INSERT. Override para excluir campos específicos."""
-        datos = entidad.model_dump(mode='json', exclude={'id', 'fecha_creacion'})
-        result = self.supabase.table(self.tabla).insert(datos).execute()
+        """Ejecuta INSERT."""
+        result = self.supabase.table(self.tabla).insert(self._datos_insert(entidad)).execute()
         return self.entidad_class(**result.data[0])
 
+    def _datos_insert(self, entidad: T) -> Dict[str, Any]:
+        """Payload de INSERT. Override para excluir campos específicos."""
+        return entidad.model_dump(mode='json', exclude={'id', 'fecha_creacion'})
+
+    async def crear_lote(
+        self,
+        entidades: Sequence[T],
+        tamano_lote: int = TAMANO_LOTE_ESCRITURA,
+        concurrencia: int = CONCURRENCIA_LOTES,
+    ) -> List[T]:
+        """
+        Crea varias entidades con un INSERT por lote.
+
+        Cada lote es atómico; el conjunto no: si un lote falla, los que ya
+        terminaron quedan creados y el error trae sus índices de entrada en
+        `details['escritas']` (y las filas en `details['filas_escritas']`).
+
+        Args:
+            entidades: Entidades a crear
+            tamano_lote: Filas por INSERT
+            concurrencia: Lotes en vuelo a la vez (con `usar_executor`)
+
+        Returns:
+            Entidades creadas (con ID), en el orden de entrada
+
+        Raises:
+            DuplicateError: Si viola unicidad; `details['filas']` trae los
+                índices de entrada en conflicto
+            DatabaseError: Si hay error de BD
+        """
+        payloads = [self._datos_insert(e) for e in entidades]
+        try:
+            filas = await self._escribir_lotes(
+                f"crear lote de {self.entidad_nombre}",
+                payloads,
+                lambda lote: self.supabase.table(self.tabla).insert(lote).execute().data,
+                tamano_lote, concurrencia,
+            )
+        finally:
+            if self._cache is not None:
+                self._cache.invalidar_listados()
+        return [self.entidad_class(**data) for data in filas]
+
+    async def upsert_lote(
+        self,
+        entidades: Sequence[T],
+        on_conflict: str,
+        ignorar_duplicados: bool = False,
+        tamano_lote: int = TAMANO_LOTE_ESCRITURA,
+        concurrencia: int = CONCURRENCIA_LOTES,
+    ) -> List[T]:
+        """
+        INSERT ... ON CONFLICT por lotes.
+
+        Args:
+            entidades: Entidades a insertar o actualizar
+            on_conflict: Columnas de la llave única (ej: 'contrato_id,numero_periodo').
+                Con 'id' se envía el ID de cada entidad.
+            ignorar_duplicados: True = DO NOTHING (sólo regresa las insertadas);
+                False = DO UPDATE con los valores nuevos
+            tamano_lote: Filas por sentencia
+            concurrencia: Lotes en vuelo a la vez (con `usar_executor`)
+
+        Returns:
+            Entidades resultantes en el orden de entrada. Con
+            `ignorar_duplicados=True` sólo las insertadas (las que chocaron
+            con una existente no vienen), así que no se alinean por índice
+            con `entidades`.
+
+        Raises:
+            DatabaseError: Si hay error de BD; como en `crear_lote`,
+                `details['escritas']` trae los índices de los lotes que sí
+                se escribieron
+        """
+        columnas_llave = {c.strip() for c in on_conflict.split(',')}
+        payloads = []
+        for entidad in entidades:
+            datos = self._datos_insert(entidad)
+            if 'id' in columnas_llave:
+                datos['id'] = entidad.id
+            payloads.append(datos)
+
+        try:
+            filas = await self._escribir_lotes(
+                f"upsert lote de {self.entidad_nombre}",
+                payloads,
+                lambda lote: self.supabase.table(self.tabla).upsert(
+                    lote, on_conflict=on_conflict, ignore_duplicates=ignorar_duplicados
+                ).execute().data,
+                tamano_lote, concurrencia,
+            )
+        finally:
+            self._invalidar_cache()
+        return [self.entidad_class(**data) for data in filas]
+
     async def actualizar(self, id: int, datos: Dict[str, Any]) -> T:
         """
         Actualiza una entidad existente.
@@ -226,24 +503,97 @@ class BaseRepository(Generic[T], ABC):
             DuplicateError: Si viola constraint único
             DatabaseError: Si hay error de BD
         """
-        return await self._ejecutar_query(
-            f"actualizar {self.entidad_nombre}",
-            lambda: self._update(id, datos),
-            not_found_msg=f"{self.entidad_nombre} con ID {id} no encontrado",
-            check_duplicate=True
-        )
+        try:
+            return await self._ejecutar_query(
+                f"actualizar {self.entidad_nombre}",
+                lambda: self._update(id, datos),
+                not_found_msg=f"{self.entidad_nombre} con ID {id} no encontrado",
+                check_duplicate=True
+            )
+        finally:
+            self._invalidar_cache(id)
 
     def _update(self, id: int, datos: Dict[str, Any]) -> T:
         """Ejecuta UPDATE."""
-        # Excluir campos que no deben actualizarse
-        datos_limpios = {k: v for k, v in datos.items()
-                        if k not in ('id', 'fecha_creacion') and v is not None}
-
-        result = self.supabase.table(self.tabla).update(datos_limpios).eq('id', id).execute()
+        result = self.supabase.table(self.tabla).update(
+            self._datos_update(datos)
+        ).eq('id', id).execute()
         if not result.data:
             return None
         return self.entidad_class(**result.data[0])
 
+    @staticmethod
+    def _datos_update(datos: Dict[str, Any]) -> Dict[str, Any]:
+        """Excluye campos que no deben actualizarse."""
+        return {k: v for k, v in datos.items()
+                if k not in ('id', 'fecha_creacion') and v is not None}
+
+    async def actualizar_lote(
+        self,
+        cambios: Dict[int, Dict[str, Any]],
+        tamano_lote: int = TAMANO_LOTE_ESCRITURA,
+        concurrencia: int = CONCURRENCIA_LOTES,
+    ) -> List[T]:
+        """
+        Actualiza varias entidades agrupando las que reciben los mismos datos.
+
+        PostgREST no admite valores distintos por fila en un UPDATE, así
+        que se emite un `UPDATE ... WHERE id IN (...)` por cada payload
+        distinto (y por lote de IDs). Cambios homogéneos, como un cambio de
+        estatus masivo, cuestan una sentencia por `tamano_lote` filas.
+
+        Args:
+            cambios: {id: {campo: valor}}
+            tamano_lote: IDs por UPDATE
+            concurrencia: Sentencias en vuelo a la vez (con `usar_executor`)
+
+        Returns:
+            Entidades actualizadas en el orden de `cambios`; los IDs
+            inexistentes se omiten
+
+        Raises:
+            DuplicateError: Si viola unicidad
+            DatabaseError: Si hay error de BD
+        """
+        grupos: Dict[tuple, List[int]] = {}
+        datos_por_grupo: Dict[tuple, Dict[str, Any]] = {}
+        for id, datos in cambios.items():
+            limpios = self._datos_update(datos)
+            if not limpios:
+                continue
+            clave = tuple(sorted((k, repr(v)) for k, v in limpios.items()))
+            grupos.setdefault(clave, []).append(id)
+            datos_por_grupo[clave] = limpios
+
+        # Un "payload" por (grupo, lote de IDs): escribir_en_lotes no vuelve a partir
+        sentencias = [
+            {'datos': datos_por_grupo[clave], 'ids': ids_lote}
+            for clave, ids in grupos.items()
+            for ids_lote in partir_en_lotes(ids, tamano_lote)
+        ]
+
+        def _actualizar(lote: List[Dict[str, Any]]) -> List[dict]:
+            filas = []
+            for sentencia in lote:
+                filas.extend(
+                    self.supabase.table(self.tabla)
+                    .update(sentencia['datos'])
+                    .in_('id', sentencia['ids'])
+                    .execute().data or []
+                )
+            return filas
+
+        try:
+            filas = await self._escribir_lotes(
+                f"actualizar lote de {self.entidad_nombre}",
+                sentencias, _actualizar, 1, concurrencia,
+            )
+        finally:
+            self._invalidar_cache()
+
+        por_id = {data['id']: data for data in filas}
+        return [self.entidad_class(**por_id[id]) for id in cambios if id in por_id]
+
     async def eliminar(self, id: int) -> bool:
         """
         Elimina una entidad (soft delete si tiene estatus, hard delete si no).
@@ -258,11 +608,14 @@ class BaseRepository(Generic[T], ABC):
             NotFoundError: Si no existe
             DatabaseError: Si hay error de BD
         """
-        return await self._ejecutar_query(
-            f"eliminar {self.entidad_nombre}",
-            lambda: self._delete(id),
-            not_found_msg=f"{self.entidad_nombre} con ID {id} no encontrado"
-        )
+        try:
+            return await self._ejecutar_query(
+                f"eliminar {self.entidad_nombre}",
+                lambda: self._delete(id),
+                not_found_msg=f"{self.entidad_nombre} con ID {id} no encontrado"
+            )
+        finally:
+            self._invalidar_cache(id)
 
     def _delete(self, id: int) -> bool:
         """Ejecuta DELETE. Override para soft delete."""
@@ -350,7 +703,7 @@ class BaseRepository(Generic[T], ABC):
             DatabaseError: Para otros errores de BD
         """
         try:
-            result = query_fn()
+            result = await self._ejecutar(query_fn)
 
             # Verificar not found
             if result is None and not_found_msg:
@@ -380,6 +733,67 @@ class BaseRepository(Generic[T], ABC):
 
             raise DatabaseError(f"Error de base de datos al {operacion}: {str(e)}")
 
+    async def _ejecutar_cacheado(self, clave: tuple, operacion: str, query_fn, **kwargs):
+        """
+        `_ejecutar_query` con read-through sobre la cache de la tabla.
+
+        `clave` identifica la forma de la consulta (operación + argumentos).
+        Un hit no toca la BD ni el pool de I/O. Los errores y los `None`
+        (no encontrado) nunca se cachean.
+        """
+        if self._cache is None:
+            return await self._ejecutar_query(operacion, query_fn, **kwargs)
+
+        valor = self._cache.obtener(clave)
+        if valor is not AUSENTE:
+            return valor
+
+        generacion = self._cache.generacion
+
+        def _cargar():
+            resultado = query_fn()
+            if resultado is not None:
+                self._cache.guardar(clave, resultado, generacion)
+            return resultado
+
+        return await self._ejecutar_query(operacion, _cargar, **kwargs)
+
+    def _invalidar_cache(self, id: Any = None) -> None:
+        """Invalida lo afectado por escribir `id` (None = toda la tabla)."""
+        if self._cache is not None:
+            self._cache.invalidar(id)
+        limpiar_loader(f"{self.tabla}:por_id", id)
+
+    async def _escribir_lotes(
+        self,
+        operacion: str,
+        payloads: List[Dict[str, Any]],
+        escribir_lote,
+        tamano_lote: int,
+        concurrencia: int,
+    ) -> List[dict]:
+        """`escribir_en_lotes` con el manejo de errores del repositorio."""
+        try:
+            return await escribir_en_lotes(
+                payloads, escribir_lote, self._ejecutar,
+                tamano_lote=tamano_lote, concurrencia=concurrencia,
+            )
+        except DuplicateError as e:
+            self._logger.warning(f"Duplicado en {operacion}: {e}")
+            raise
+        except Exception as e:
+            self._logger.error(f"Error en {operacion}: {e}")
+            # Conserva `escritas` / `filas_escritas` de escribir_en_lotes
+            raise DatabaseError(
+                f"Error de base de datos al {operacion}: {str(e)}", getattr(e, 'details', None)
+            )
+
+    async def _ejecutar(self, fn):
+        """Corre `fn` en el pool de I/O si el repositorio lo tiene activado."""
+        if self.usar_executor:
+            return await self._db.ejecutar(fn)
+        return fn()
+
     # =========================================================================
     # HELPERS
     # =========================================================================
@@ -439,12 +853,15 @@ class BaseRepository(Generic[T], ABC):
         Returns:
             Entidad actualizada desde BD
         """
-        return await self._ejecutar_query(
-            f"actualizar {self.entidad_nombre}",
-            lambda: self._update_entidad(entidad),
-            not_found_msg=f"{self.entidad_nombre} con ID {entidad.id} no encontrado",
-            check_duplicate=True
-        )
+        try:
+            return await self._ejecutar_query(
+                f"actualizar {self.entidad_nombre}",
+                lambda: self._update_entidad(entidad),
+                not_found_msg=f"{self.entidad_nombre} con ID {entidad.id} no encontrado",
+                check_duplicate=True
+            )
+        finally:
+            self._invalidar_cache(entidad.id)
 
     def _update_entidad(self, entidad: T) -> T:
         """Ejecuta UPDATE desde entidad completa."""
@@ -20,6 +20,7 @@ class SupabaseCategoriaPuestoRepository(BaseRepository[CategoriaPuesto]):
     tabla = 'categorias_puesto'
     entidad_class = CategoriaPuesto
     entidad_nombre = 'Categoria de puesto'
+    cache_ttl = 600
 
     # =========================================================================
     # QUERIES CUSTOM
@@ -31,7 +32,8 @@ class SupabaseCategoriaPuestoRepository(BaseRepository[CategoriaPuesto]):
         incluir_inactivas: bool = False
     ) -> List[CategoriaPuesto]:
         """Obtiene todas las categorias de un tipo de servicio."""
-        return await self._ejecutar_query(
+        return await self._ejecutar_cacheado(
+            ('por_tipo', tipo_servicio_id, incluir_inactivas),
             "obtener categorias por tipo",
             lambda: self._query_por_tipo(tipo_servicio_id, incluir_inactivas),
             return_list=True
@@ -51,7 +53,8 @@ class SupabaseCategoriaPuestoRepository(BaseRepository[CategoriaPuesto]):
         offset: int = 0
     ) -> List[CategoriaPuesto]:
         """Obtiene todas las categorias con paginacion."""
-        return await self._ejecutar_query(
+        return await self._ejecutar_cacheado(
+            ('todas', incluir_inactivas, limite, offset),
             "obtener todas las categorias",
             lambda: self._query_obtener_todas(incluir_inactivas, limite, offset),
             return_list=True
@@ -106,13 +109,9 @@ class SupabaseCategoriaPuestoRepository(BaseRepository[CategoriaPuesto]):
             )
         return await super().crear(entidad)
 
-    def _insertar(self, entidad: CategoriaPuesto) -> CategoriaPuesto:
+    def _datos_insert(self, entidad: CategoriaPuesto) -> dict:
         """Override: excluir fecha_actualizacion tambien."""
-        datos = entidad.model_dump(exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
-        result = self.supabase.table(self.tabla).insert(datos).execute()
-        if not result.data:
-            return None
-        return CategoriaPuesto(**result.data[0])
+        return entidad.model_dump(exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
 
     def _delete(self, id: int) -> bool:
         """Soft delete: marca como INACTIVO en lugar de borrar."""
@@ -7,7 +7,7 @@ Patrón de manejo de errores:
 - DatabaseError: Errores de conexión o infraestructura
 - Propagar otras excepciones hacia arriba
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence
 from datetime import date
 import logging
 
@@ -17,6 +17,14 @@ from app.entities import (
 )
 from app.entities.contrato_item import ContratoItem
 from app.core.exceptions import NotFoundError, DuplicateError, DatabaseError
+from app.repositories.shared import (
+    DataLoader,
+    TAMANO_LOTE_IDS,
+    columnas_select,
+    hidratar_confiable,
+    limpiar_loader,
+    obtener_loader,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +44,7 @@ class SupabaseContratoRepository:
             db_manager = default_db
 
         self.supabase = db_manager.get_client()
+        self._db = db_manager
         self.tabla = 'contratos'
 
     async def obtener_por_id(self, contrato_id: int) -> Contrato:
@@ -53,7 +62,9 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla).select('*').eq('id', contrato_id).execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla).select('*').eq('id', contrato_id)
+            )
             if not result.data:
                 raise NotFoundError(f"Contrato con ID {contrato_id} no encontrado")
             return Contrato(**result.data[0])
@@ -63,6 +74,36 @@ class SupabaseContratoRepository:
             logger.error(f"Error obteniendo contrato {contrato_id}: {e}")
             raise DatabaseError(f"Error de base de datos al obtener contrato: {str(e)}")
 
+    async def obtener_por_ids(self, contrato_ids: Iterable[int]) -> Dict[int, Contrato]:
+        """
+        Obtiene varios contratos por ID con `.in_()`.
+
+        Returns:
+            Dict {id: contrato}; los IDs inexistentes no aparecen
+
+        Raises:
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        unicos = list(dict.fromkeys(i for i in contrato_ids if i is not None))
+        contratos: Dict[int, Contrato] = {}
+        try:
+            for inicio in range(0, len(unicos), TAMANO_LOTE_IDS):
+                result = await self._db.ejecutar_query(
+                    self.supabase.table(self.tabla)
+                    .select('*')
+                    .in_('id', unicos[inicio:inicio + TAMANO_LOTE_IDS])
+                )
+                for data in result.data or []:
+                    contratos[data['id']] = Contrato(**data)
+            return contratos
+        except Exception as e:
+            logger.error(f"Error obteniendo contratos por IDs: {e}")
+            raise DatabaseError(f"Error de base de datos al obtener contratos: {str(e)}")
+
+    def loader(self) -> DataLoader[int, Contrato]:
+        """DataLoader por ID de la petición en curso (ver `alcance_loaders`)."""
+        return obtener_loader(f"{self.tabla}:por_id", self.obtener_por_ids)
+
     async def obtener_por_codigo(self, codigo: str) -> Optional[Contrato]:
         """
         Obtiene un contrato por su código único.
@@ -77,10 +118,11 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('codigo', codigo.upper())\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('codigo', codigo.upper())
+            )
             if not result.data:
                 return None
             return Contrato(**result.data[0])
@@ -92,15 +134,19 @@ class SupabaseContratoRepository:
         self,
         incluir_inactivos: bool = False,
         limite: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        campos: Optional[Sequence[str]] = None
     ) -> List[Contrato]:
         """
         Obtiene todos los contratos con soporte de paginación.
 
+        Las filas se hidratan sin validadores (vienen de nuestra BD).
+
         Args:
             incluir_inactivos: Si True, incluye contratos cancelados/vencidos
             limite: Número máximo de resultados (None = 100 por defecto)
             offset: Número de registros a saltar
+            campos: Columnas a leer (None = todas); el resto queda en su default
 
         Returns:
             Lista de contratos
@@ -109,7 +155,8 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            query = self.supabase.table(self.tabla).select('*')
+            query = self.supabase.table(self.tabla)\
+                .select(columnas_select(campos, ('id', 'fecha_creacion')))
 
             # Filtro de estatus (excluir cancelados, vencidos y cerrados por defecto)
             if not incluir_inactivos:
@@ -128,8 +175,8 @@ class SupabaseContratoRepository:
                 limite = 100
             query = query.range(offset, offset + limite - 1)
 
-            result = query.execute()
-            return [Contrato(**data) for data in result.data]
+            result = await self._db.ejecutar_query(query)
+            return hidratar_confiable(Contrato, result.data)
         except Exception as e:
             logger.error(f"Error obteniendo contratos: {e}")
             raise DatabaseError(f"Error de base de datos al obtener contratos: {str(e)}")
@@ -166,7 +213,7 @@ class SupabaseContratoRepository:
                 ])
 
             query = query.order('fecha_creacion', desc=True)
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return [Contrato(**data) for data in result.data]
         except Exception as e:
             logger.error(f"Error obteniendo contratos de empresa {empresa_id}: {e}")
@@ -204,7 +251,7 @@ class SupabaseContratoRepository:
                 ])
 
             query = query.order('fecha_creacion', desc=True)
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return [Contrato(**data) for data in result.data]
         except Exception as e:
             logger.error(f"Error obteniendo contratos de tipo servicio {tipo_servicio_id}: {e}")
@@ -236,7 +283,7 @@ class SupabaseContratoRepository:
             # Preparar datos excluyendo campos autogenerados
             # mode='json' convierte dates a ISO strings para serialización
             datos = contrato.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
-            result = self.supabase.table(self.tabla).insert(datos).execute()
+            result = await self._db.ejecutar_query(self.supabase.table(self.tabla).insert(datos))
 
             if not result.data:
                 raise DatabaseError("No se pudo crear el contrato (sin respuesta de BD)")
@@ -265,10 +312,12 @@ class SupabaseContratoRepository:
         try:
             # mode='json' convierte dates a ISO strings para serialización
             datos = contrato.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
-            result = self.supabase.table(self.tabla)\
-                .update(datos)\
-                .eq('id', contrato.id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update(datos)
+                .eq('id', contrato.id)
+            )
+            limpiar_loader(f"{self.tabla}:por_id", contrato.id)
 
             if not result.data:
                 raise NotFoundError(f"Contrato con ID {contrato.id} no encontrado")
@@ -294,10 +343,12 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .update({'estatus': EstatusContrato.CANCELADO.value})\
-                .eq('id', contrato_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update({'estatus': EstatusContrato.CANCELADO.value})
+                .eq('id', contrato_id)
+            )
+            limpiar_loader(f"{self.tabla}:por_id", contrato_id)
             return bool(result.data)
         except Exception as e:
             logger.error(f"Error eliminando contrato {contrato_id}: {e}")
@@ -320,7 +371,7 @@ class SupabaseContratoRepository:
                 .eq('codigo', codigo.upper())
             if excluir_id:
                 query = query.neq('id', excluir_id)
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return len(result.data) > 0
         except Exception as e:
             logger.error(f"Error verificando código: {e}")
@@ -351,12 +402,13 @@ class SupabaseContratoRepository:
             anio_corto = str(anio)[-2:]
             patron = f"{codigo_empresa.upper()}-{clave_servicio.upper()}-{anio_corto}%"
 
-            result = self.supabase.table(self.tabla)\
-                .select('codigo')\
-                .ilike('codigo', patron)\
-                .order('codigo', desc=True)\
-                .limit(1)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('codigo')
+                .ilike('codigo', patron)
+                .order('codigo', desc=True)
+                .limit(1)
+            )
 
             if not result.data:
                 return 1
@@ -385,14 +437,15 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
                 .or_(
                     f"codigo.ilike.%{termino}%,"
                     f"numero_folio_buap.ilike.%{termino}%"
-                )\
-                .limit(limite)\
-                .execute()
+                )
+                .limit(limite)
+            )
 
             return [Contrato(**data) for data in result.data]
         except Exception as e:
@@ -474,7 +527,7 @@ class SupabaseContratoRepository:
             if limite > 0:
                 query = query.range(offset, offset + limite - 1)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return [Contrato(**data) for data in result.data]
         except Exception as e:
             logger.error(f"Error buscando contratos con filtros: {e}")
@@ -492,13 +545,14 @@ class SupabaseContratoRepository:
         """
         try:
             hoy = date.today().isoformat()
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('estatus', EstatusContrato.ACTIVO.value)\
-                .lte('fecha_inicio', hoy)\
-                .or_(f"fecha_fin.is.null,fecha_fin.gte.{hoy}")\
-                .order('fecha_fin', desc=False, nullsfirst=False)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('estatus', EstatusContrato.ACTIVO.value)
+                .lte('fecha_inicio', hoy)
+                .or_(f"fecha_fin.is.null,fecha_fin.gte.{hoy}")
+                .order('fecha_fin', desc=False, nullsfirst=False)
+            )
 
             return [Contrato(**data) for data in result.data]
         except Exception as e:
@@ -523,14 +577,15 @@ class SupabaseContratoRepository:
             hoy = date.today()
             fecha_limite = (hoy + timedelta(days=dias)).isoformat()
 
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('estatus', EstatusContrato.ACTIVO.value)\
-                .not_.is_('fecha_fin', 'null')\
-                .gte('fecha_fin', hoy.isoformat())\
-                .lte('fecha_fin', fecha_limite)\
-                .order('fecha_fin', desc=False)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('estatus', EstatusContrato.ACTIVO.value)
+                .not_.is_('fecha_fin', 'null')
+                .gte('fecha_fin', hoy.isoformat())
+                .lte('fecha_fin', fecha_limite)
+                .order('fecha_fin', desc=False)
+            )
 
             return [Contrato(**data) for data in result.data]
         except Exception as e:
@@ -555,11 +610,12 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table('contrato_item')\
-                .select('*')\
-                .eq('contrato_id', contrato_id)\
-                .order('numero_item')\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table('contrato_item')
+                .select('*')
+                .eq('contrato_id', contrato_id)
+                .order('numero_item')
+            )
             return [ContratoItem(**data) for data in result.data]
         except Exception as e:
             logger.error(f"Error obteniendo items de contrato {contrato_id}: {e}")
@@ -584,7 +640,9 @@ class SupabaseContratoRepository:
             datos['contrato_id'] = contrato_id
             # Calcular subtotal
             datos['subtotal'] = str(item.cantidad * item.precio_unitario)
-            result = self.supabase.table('contrato_item').insert(datos).execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table('contrato_item').insert(datos)
+            )
             if not result.data:
                 raise DatabaseError("No se pudo crear el item de contrato")
             return ContratoItem(**result.data[0])
@@ -619,7 +677,9 @@ class SupabaseContratoRepository:
             if not registros:
                 return []
 
-            result = self.supabase.table('contrato_item').insert(registros).execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table('contrato_item').insert(registros)
+            )
             return [ContratoItem(**data) for data in result.data]
         except Exception as e:
             logger.error(f"Error creando items batch de contrato {contrato_id}: {e}")
@@ -639,10 +699,11 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            self.supabase.table('contrato_item')\
-                .delete()\
-                .eq('contrato_id', contrato_id)\
-                .execute()
+            await self._db.ejecutar_query(
+                self.supabase.table('contrato_item')
+                .delete()
+                .eq('contrato_id', contrato_id)
+            )
             return True
         except Exception as e:
             logger.error(f"Error eliminando items de contrato {contrato_id}: {e}")
@@ -664,10 +725,12 @@ class SupabaseContratoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .update({'estatus': nuevo_estatus.value})\
-                .eq('id', contrato_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update({'estatus': nuevo_estatus.value})
+                .eq('id', contrato_id)
+            )
+            limpiar_loader(f"{self.tabla}:por_id", contrato_id)
 
             if not result.data:
                 raise NotFoundError(f"Contrato con ID {contrato_id} no encontrado")
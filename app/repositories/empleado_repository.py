@@ -7,15 +7,37 @@ Patrón de manejo de errores:
 - DatabaseError: Errores de conexión o infraestructura
 - Propagar otras excepciones hacia arriba
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 from datetime import date
 import logging
+import re
 
 from app.entities.empleado import Empleado, EmpleadoResumen
 from app.core.exceptions import NotFoundError, DuplicateError, DatabaseError
+from app.core.validation import CLAVE_EMPLEADO_PATTERN, CURP_PATTERN, RFC_PERSONA_PATTERN
+from app.repositories.shared import (
+    TAMANO_LOTE_IDS,
+    Pagina,
+    apply_keyset,
+    cerrar_pagina,
+    columnas_select,
+    es_funcion_inexistente,
+    escribir_en_lotes,
+    hidratar_confiable,
+    iterar,
+    normalizar_busqueda,
+    partir_en_lotes,
+)
 
 logger = logging.getLogger(__name__)
 
+# Texto de búsqueda con forma de identificador -> columna con índice exacto
+_BUSQUEDA_EXACTA = (
+    ('curp', re.compile(CURP_PATTERN)),
+    ('rfc', re.compile(RFC_PERSONA_PATTERN)),
+    ('clave', re.compile(CLAVE_EMPLEADO_PATTERN)),
+)
+
 
 class SupabaseEmpleadoRepository:
     """Implementación del repositorio usando Supabase"""
@@ -32,6 +54,7 @@ class SupabaseEmpleadoRepository:
             db_manager = default_db
 
         self.supabase = db_manager.get_client()
+        self._db = db_manager
         self.tabla = 'empleados'
 
     # =========================================================================
@@ -47,10 +70,11 @@ class SupabaseEmpleadoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('id', empleado_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('id', empleado_id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Empleado con ID {empleado_id} no encontrado")
@@ -63,6 +87,33 @@ class SupabaseEmpleadoRepository:
             logger.error(f"Error obteniendo empleado {empleado_id}: {e}")
             raise DatabaseError(f"Error de base de datos al obtener empleado: {str(e)}")
 
+    async def obtener_por_ids(self, empleado_ids: Sequence[int]) -> List[Empleado]:
+        """
+        Obtiene varios empleados con `.in_()` (lotes de TAMANO_LOTE_IDS),
+        en el orden de `empleado_ids`.
+
+        Los ids inexistentes se omiten.
+
+        Raises:
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        if not empleado_ids:
+            return []
+        try:
+            por_id: Dict[int, Empleado] = {}
+            for lote in partir_en_lotes(list(dict.fromkeys(empleado_ids)), TAMANO_LOTE_IDS):
+                result = await self._db.ejecutar_query(
+                    self.supabase.table(self.tabla)
+                    .select('*')
+                    .in_('id', lote)
+                )
+                por_id.update((e.id, e) for e in hidratar_confiable(Empleado, result.data))
+            return [por_id[i] for i in empleado_ids if i in por_id]
+
+        except Exception as e:
+            logger.error(f"Error obteniendo empleados por ids: {e}")
+            raise DatabaseError(f"Error de base de datos al obtener empleados: {str(e)}")
+
     async def obtener_por_clave(self, clave: str) -> Optional[Empleado]:
         """
         Obtiene un empleado por su clave (B25-00001).
@@ -74,10 +125,11 @@ class SupabaseEmpleadoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('clave', clave.upper())\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('clave', clave.upper())
+            )
 
             if not result.data:
                 return None
@@ -99,10 +151,11 @@ class SupabaseEmpleadoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('curp', curp.upper())\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('curp', curp.upper())
+            )
 
             if not result.data:
                 return None
@@ -113,6 +166,33 @@ class SupabaseEmpleadoRepository:
             logger.error(f"Error obteniendo empleado por CURP {curp}: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
 
+    async def obtener_por_curps(self, curps: Sequence[str]) -> Dict[str, Empleado]:
+        """
+        Obtiene los empleados de varias CURPs con `.in_()` (lotes de
+        TAMANO_LOTE_IDS), p. ej. para validar un archivo de alta masiva.
+
+        Returns:
+            Dict {CURP: empleado}; las CURPs inexistentes no aparecen
+
+        Raises:
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        unicas = list(dict.fromkeys(curp.upper() for curp in curps if curp))
+        por_curp: Dict[str, Empleado] = {}
+        try:
+            for lote in partir_en_lotes(unicas, TAMANO_LOTE_IDS):
+                result = await self._db.ejecutar_query(
+                    self.supabase.table(self.tabla)
+                    .select('*')
+                    .in_('curp', lote)
+                )
+                por_curp.update((e.curp, e) for e in hidratar_confiable(Empleado, result.data))
+            return por_curp
+
+        except Exception as e:
+            logger.error(f"Error obteniendo empleados por CURP ({len(unicas)}): {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
     async def crear(self, empleado: Empleado) -> Empleado:
         """
         Crea un nuevo empleado.
@@ -144,7 +224,7 @@ class SupabaseEmpleadoRepository:
                 exclude={'id', 'fecha_creacion', 'fecha_actualizacion'}
             )
 
-            result = self.supabase.table(self.tabla).insert(datos).execute()
+            result = await self._db.ejecutar_query(self.supabase.table(self.tabla).insert(datos))
 
             if not result.data:
                 raise DatabaseError("No se pudo crear el empleado (sin respuesta de BD)")
@@ -157,6 +237,73 @@ class SupabaseEmpleadoRepository:
             logger.error(f"Error creando empleado: {e}")
             raise DatabaseError(f"Error de base de datos al crear empleado: {str(e)}")
 
+    async def crear_lote(self, empleados: List[Empleado]) -> List[Empleado]:
+        """
+        Crea varios empleados con un INSERT por lote (ver `shared/bulk.py`).
+
+        No pre-verifica CURP ni clave: uk_empleados_curp y uk_empleados_clave
+        lo hacen en la misma sentencia.
+
+        Returns:
+            Empleados creados en el orden de entrada
+
+        Raises:
+            DuplicateError: Si un CURP o clave ya existe (`field` con la
+                columna y `details['filas']` con los índices en conflicto)
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        payloads = [
+            empleado.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
+            for empleado in empleados
+        ]
+        try:
+            filas = await escribir_en_lotes(
+                payloads,
+                lambda lote: self.supabase.table(self.tabla).insert(lote).execute().data,
+                self._db.ejecutar,
+            )
+            return [Empleado(**data) for data in filas]
+        except DuplicateError:
+            raise
+        except Exception as e:
+            logger.error(f"Error creando lote de empleados: {e}")
+            raise DatabaseError(
+                f"Error de base de datos al crear empleados: {str(e)}", getattr(e, 'details', None)
+            )
+
+    async def actualizar_lote(self, empleados: List[Empleado]) -> List[Empleado]:
+        """
+        Actualiza varios empleados con un UPSERT por id por lote.
+
+        Se envía la fila completa (clave y CURP sin cambios) para que el
+        INSERT ... ON CONFLICT sea válido.
+
+        Returns:
+            Empleados actualizados en el orden de entrada
+
+        Raises:
+            DuplicateError: Si algún cambio viola unicidad
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        payloads = [
+            empleado.model_dump(mode='json', exclude={'fecha_creacion', 'fecha_actualizacion'})
+            for empleado in empleados
+        ]
+        try:
+            filas = await escribir_en_lotes(
+                payloads,
+                lambda lote: self.supabase.table(self.tabla).upsert(lote, on_conflict='id').execute().data,
+                self._db.ejecutar,
+            )
+            return [Empleado(**data) for data in filas]
+        except DuplicateError:
+            raise
+        except Exception as e:
+            logger.error(f"Error actualizando lote de empleados: {e}")
+            raise DatabaseError(
+                f"Error de base de datos al actualizar empleados: {str(e)}", getattr(e, 'details', None)
+            )
+
     async def actualizar(self, empleado: Empleado) -> Empleado:
         """
         Actualiza un empleado existente.
@@ -172,10 +319,11 @@ class SupabaseEmpleadoRepository:
                 exclude={'id', 'clave', 'curp', 'fecha_creacion', 'fecha_actualizacion'}
             )
 
-            result = self.supabase.table(self.tabla)\
-                .update(datos)\
-                .eq('id', empleado.id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update(datos)
+                .eq('id', empleado.id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Empleado con ID {empleado.id} no encontrado")
@@ -196,13 +344,14 @@ class SupabaseEmpleadoRepository:
             True si se eliminó correctamente, False si falló
         """
         try:
-            result = self.supabase.table(self.tabla)\
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
                 .update({
                     'estatus': 'INACTIVO',
                     'fecha_baja': date.today().isoformat()
-                })\
-                .eq('id', empleado_id)\
-                .execute()
+                })
+                .eq('id', empleado_id)
+            )
 
             return bool(result.data)
 
@@ -239,7 +388,7 @@ class SupabaseEmpleadoRepository:
 
             query = query.range(offset, offset + limite - 1)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return [Empleado(**data) for data in result.data]
 
         except Exception as e:
@@ -256,6 +405,8 @@ class SupabaseEmpleadoRepository:
         """
         Obtiene empleados de una empresa específica.
 
+        Las filas se hidratan sin validadores (vienen de nuestra BD).
+
         Raises:
             DatabaseError: Si hay error de conexión/infraestructura
         """
@@ -274,13 +425,57 @@ class SupabaseEmpleadoRepository:
 
             query = query.range(offset, offset + limite - 1)
 
-            result = query.execute()
-            return [Empleado(**data) for data in result.data]
+            result = await self._db.ejecutar_query(query)
+            return hidratar_confiable(Empleado, result.data)
 
         except Exception as e:
             logger.error(f"Error obteniendo empleados de empresa {empresa_id}: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
 
+    async def obtener_pagina(
+        self,
+        empresa_id: Optional[int] = None,
+        incluir_inactivos: bool = False,
+        cursor: Optional[str] = None,
+        limite: int = 50,
+        campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Empleado]:
+        """
+        Obtiene una página de empleados por cursor (keyset).
+
+        Conserva el orden de `obtener_por_empresa` (apellido paterno) y de
+        `obtener_todos` (más recientes primero), desempatando por id. El
+        costo de la página N es el mismo que el de la primera.
+
+        Las filas se hidratan sin validadores (vienen de nuestra BD). Con
+        `campos` sólo se leen esas columnas; el resto queda en su default.
+
+        Raises:
+            ValidationError: Si el cursor es inválido
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        if empresa_id:
+            orden_campo, desc = 'apellido_paterno', False
+        else:
+            orden_campo, desc = 'fecha_creacion', True
+
+        query = self.supabase.table(self.tabla)\
+            .select(columnas_select(campos, ('id', orden_campo)))
+        if empresa_id:
+            query = query.eq('empresa_id', empresa_id)
+        if not incluir_inactivos:
+            query = query.eq('estatus', 'ACTIVO')
+        query = apply_keyset(query, cursor, limite, orden_campo, desc=desc)
+
+        try:
+            result = await self._db.ejecutar_query(query)
+            filas, siguiente = cerrar_pagina(result.data, limite, orden_campo)
+            return Pagina(hidratar_confiable(Empleado, filas), siguiente)
+
+        except Exception as e:
+            logger.error(f"Error obteniendo página de empleados: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
     async def buscar(
         self,
         texto: str,
@@ -310,13 +505,102 @@ class SupabaseEmpleadoRepository:
 
             query = query.range(offset, offset + limite - 1)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return [Empleado(**data) for data in result.data]
 
         except Exception as e:
             logger.error(f"Error buscando empleados con texto '{texto}': {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
 
+    async def buscar_rankeado(
+        self,
+        texto: str,
+        empresa_id: Optional[int] = None,
+        limite: int = 20,
+        offset: int = 0
+    ) -> List[Empleado]:
+        """
+        Busca empleados ordenados por relevancia (migración 050).
+
+        Un CURP, RFC o clave completos se resuelven con un `eq` sobre su
+        índice. Cualquier otro texto va a `buscar_empleados_rankeado`:
+        insensible a acentos, por subcadena o prefijo de palabra, con los
+        prefijos primero y luego por similitud de trigramas. Si la función
+        aún no existe en la BD, cae a `buscar`.
+
+        Raises:
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        identificador = texto.strip().upper()
+        for columna, patron in _BUSQUEDA_EXACTA:
+            if patron.match(identificador):
+                return await self._buscar_exacto(columna, identificador, empresa_id, limite, offset)
+
+        termino = normalizar_busqueda(texto)
+        if not termino:
+            return []
+
+        try:
+            result = await self._db.ejecutar_query(
+                self.supabase.rpc('buscar_empleados_rankeado', {
+                    'p_texto': termino,
+                    'p_empresa_id': empresa_id,
+                    'p_limite': limite,
+                    'p_offset': offset,
+                })
+            )
+            return hidratar_confiable(Empleado, result.data or [])
+
+        except Exception as e:
+            if es_funcion_inexistente(e):
+                logger.warning("buscar_empleados_rankeado no existe (migración 050); usando ilike")
+                return await self.buscar(texto, empresa_id, limite, offset)
+            logger.error(f"Error en búsqueda rankeada de empleados '{texto}': {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def _buscar_exacto(
+        self,
+        columna: str,
+        valor: str,
+        empresa_id: Optional[int],
+        limite: int,
+        offset: int
+    ) -> List[Empleado]:
+        try:
+            query = self.supabase.table(self.tabla)\
+                .select('*')\
+                .eq(columna, valor)
+            if empresa_id:
+                query = query.eq('empresa_id', empresa_id)
+            result = await self._db.ejecutar_query(query.range(offset, offset + limite - 1))
+            return hidratar_confiable(Empleado, result.data)
+
+        except Exception as e:
+            logger.error(f"Error buscando empleado por {columna} '{valor}': {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def obtener_campos_busqueda(self, empresa_id: int) -> List[dict]:
+        """
+        Campos de búsqueda de todos los empleados de una empresa (sin límite),
+        para construir el índice en memoria de `EmpleadoService.buscar_indexado`.
+
+        Raises:
+            DatabaseError: Si hay error de conexión/infraestructura
+        """
+        filas: List[dict] = []
+        try:
+            async for pagina in iterar(
+                lambda: self.supabase.table(self.tabla)
+                .select('id, nombre, apellido_paterno, apellido_materno, curp, rfc, clave')
+                .eq('empresa_id', empresa_id)
+            ):
+                filas.extend(pagina)
+            return filas
+
+        except Exception as e:
+            logger.error(f"Error cargando campos de búsqueda de empresa {empresa_id}: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
     async def contar(
         self,
         empresa_id: Optional[int] = None,
@@ -338,7 +622,7 @@ class SupabaseEmpleadoRepository:
             if estatus:
                 query = query.eq('estatus', estatus)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return result.count or 0
 
         except Exception as e:
@@ -368,12 +652,13 @@ class SupabaseEmpleadoRepository:
             anio_corto = str(anio)[-2:]
             prefijo = f"B{anio_corto}-"
 
-            result = self.supabase.table(self.tabla)\
-                .select('clave')\
-                .ilike('clave', f'{prefijo}%')\
-                .order('clave', desc=True)\
-                .limit(1)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('clave')
+                .ilike('clave', f'{prefijo}%')
+                .order('clave', desc=True)
+                .limit(1)
+            )
 
             if not result.data:
                 return 1  # Primer empleado del año
@@ -414,7 +699,7 @@ class SupabaseEmpleadoRepository:
             if excluir_id:
                 query = query.neq('id', excluir_id)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return len(result.data) > 0
 
         except Exception as e:
@@ -432,10 +717,11 @@ class SupabaseEmpleadoRepository:
             DatabaseError: Si hay error de conexión/infraestructura
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('id')\
-                .eq('clave', clave.upper())\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('id')
+                .eq('clave', clave.upper())
+            )
 
             return len(result.data) > 0
 
@@ -471,7 +757,7 @@ class SupabaseEmpleadoRepository:
             query = query.order('apellido_paterno')\
                 .range(offset, offset + limite - 1)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             resumenes = []
             for data in result.data:
@@ -524,10 +810,11 @@ class SupabaseEmpleadoRepository:
         """
         try:
             # Obtener IDs de empleados con asignación vigente a una plaza.
-            result_historial = self.supabase.table('historial_laboral')\
-                .select('empleado_id, plaza_id')\
-                .is_('fecha_fin', 'null')\
-                .execute()
+            result_historial = await self._db.ejecutar_query(
+                self.supabase.table('historial_laboral')
+                .select('empleado_id, plaza_id')
+                .is_('fecha_fin', 'null')
+            )
 
             empleados_asignados = set(
                 h['empleado_id'] for h in result_historial.data
@@ -541,7 +828,7 @@ class SupabaseEmpleadoRepository:
                 .order('apellido_paterno')\
                 .limit(limite)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             # Filtrar empleados que no están asignados
             empleados_disponibles = []
@@ -16,14 +16,23 @@ from app.entities import (
 )
 from app.core.exceptions import NotFoundError, DuplicateError, DatabaseError
 from app.repositories.shared import (
+    OPERACION_POR_ID,
+    Pagina,
     apply_eq_filters,
+    apply_keyset,
     apply_order,
     apply_pagination,
     build_ilike_or,
+    cache_consultas,
+    cerrar_pagina,
 )
 
 logger = logging.getLogger(__name__)
 
+# Las empresas se leen en casi cada montaje de página y en cada archivo de
+# alta masiva, pero cambian muy poco.
+CACHE_TTL_EMPRESAS = 300
+
 
 class SupabaseEmpresaRepository:
     """Implementacion del repositorio de empresas usando Supabase."""
@@ -35,6 +44,7 @@ class SupabaseEmpresaRepository:
 
         self.supabase = db_manager.get_client()
         self.tabla = 'empresas'
+        self._cache = cache_consultas.tabla(self.tabla, CACHE_TTL_EMPRESAS)
 
     async def obtener_por_id(self, empresa_id: int) -> Empresa:
         """
@@ -45,16 +55,25 @@ class SupabaseEmpresaRepository:
             DatabaseError: Si hay error de BD
         """
         try:
-            result = self.supabase.table(self.tabla).select('*').eq('id', empresa_id).execute()
-            if not result.data:
+            empresa = self._cache.leer_o_cargar(
+                (OPERACION_POR_ID, empresa_id),
+                lambda: self._query_por_id(empresa_id),
+            )
+            if empresa is None:
                 raise NotFoundError(f"Empresa con ID {empresa_id} no encontrada")
-            return Empresa(**result.data[0])
+            return empresa
         except NotFoundError:
             raise
         except Exception as e:
             logger.error(f"Error obteniendo empresa {empresa_id}: {e}")
             raise DatabaseError(f"Error de base de datos al obtener empresa: {str(e)}")
 
+    def _query_por_id(self, empresa_id: int) -> Optional[Empresa]:
+        result = self.supabase.table(self.tabla).select('*').eq('id', empresa_id).execute()
+        if not result.data:
+            return None
+        return Empresa(**result.data[0])
+
     async def obtener_todas(
         self,
         incluir_inactivas: bool = False,
@@ -86,6 +105,35 @@ class SupabaseEmpresaRepository:
             logger.error(f"Error obteniendo empresas: {e}")
             raise DatabaseError(f"Error de base de datos al obtener empresas: {str(e)}")
 
+    async def obtener_pagina(
+        self,
+        incluir_inactivas: bool = False,
+        cursor: Optional[str] = None,
+        limite: int = 100
+    ) -> Pagina[Empresa]:
+        """
+        Obtiene una pagina de empresas por cursor (keyset).
+
+        Mismo orden que `obtener_todas` (mas recientes primero), con
+        desempate por id.
+
+        Raises:
+            ValidationError: Si el cursor es invalido
+            DatabaseError: Si hay error de BD
+        """
+        query = self.supabase.table(self.tabla).select('*')
+        if not incluir_inactivas:
+            query = query.eq('estatus', EstatusEmpresa.ACTIVO.value)
+        query = apply_keyset(query, cursor, limite, 'fecha_creacion', desc=True)
+
+        try:
+            result = query.execute()
+            filas, siguiente = cerrar_pagina(result.data, limite, 'fecha_creacion')
+            return Pagina([Empresa(**data) for data in filas], siguiente)
+        except Exception as e:
+            logger.error(f"Error obteniendo pagina de empresas: {e}")
+            raise DatabaseError(f"Error de base de datos al obtener empresas: {str(e)}")
+
     async def buscar_por_texto(self, termino: str, limite: int = 10) -> List[Empresa]:
         """
         Busca empresas por nombre comercial o razon social.
@@ -167,6 +215,7 @@ class SupabaseEmpresaRepository:
 
             datos = empresa.model_dump(exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
             result = self.supabase.table(self.tabla).insert(datos).execute()
+            self._cache.invalidar_listados()
 
             if not result.data:
                 raise DatabaseError("No se pudo crear la empresa (sin respuesta de BD)")
@@ -189,6 +238,7 @@ class SupabaseEmpresaRepository:
         try:
             datos = empresa.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
             result = self.supabase.table(self.tabla).update(datos).eq('id', empresa.id).execute()
+            self._cache.invalidar(empresa.id)
 
             if not result.data:
                 raise NotFoundError(f"Empresa con ID {empresa.id} no encontrada")
@@ -211,6 +261,7 @@ class SupabaseEmpresaRepository:
             result = self.supabase.table(self.tabla).update(
                 {'estatus': 'INACTIVO'}
             ).eq('id', empresa_id).execute()
+            self._cache.invalidar(empresa_id)
             return bool(result.data)
         except Exception as e:
             logger.error(f"Error eliminando empresa {empresa_id}: {e}")
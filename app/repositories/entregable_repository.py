@@ -18,7 +18,10 @@ from uuid import UUID
 
 from app.database import db_manager
 from app.core.exceptions import DatabaseError, NotFoundError
-from app.core.enums import EstatusEntregable, EstatusContrato
+from app.core.enums import EstatusEntregable, EstatusContrato, EstatusPago
+from app.repositories.pago_repository import SupabasePagoRepository
+from app.repositories.shared.bulk import escribir_en_lotes
+from app.repositories.shared.query_helpers import es_funcion_inexistente, iterar
 from app.entities.entregable import (
     Entregable,
     EntregableResumen,
@@ -30,6 +33,52 @@ from app.entities.entregable import (
 
 logger = logging.getLogger(__name__)
 
+# Contador de `obtener_estadisticas_*` por estatus; APROBADO y
+# PREFACTURA_RECHAZADA además cuentan como por prefacturar, y
+# PREFACTURA_APROBADA como por facturar.
+_CLAVE_ESTADISTICA = {
+    EstatusEntregable.PENDIENTE.value: "pendientes",
+    EstatusEntregable.EN_REVISION.value: "en_revision",
+    EstatusEntregable.APROBADO.value: "aprobados",
+    EstatusEntregable.RECHAZADO.value: "rechazados",
+    EstatusEntregable.PREFACTURA_ENVIADA.value: "prefactura_enviada",
+    EstatusEntregable.PREFACTURA_RECHAZADA.value: "prefactura_rechazada",
+    EstatusEntregable.PREFACTURA_APROBADA.value: "prefactura_aprobada",
+    EstatusEntregable.FACTURADO.value: "facturados",
+    EstatusEntregable.PAGADO.value: "pagados",
+}
+_POR_PREFACTURAR = {EstatusEntregable.APROBADO.value, EstatusEntregable.PREFACTURA_RECHAZADA.value}
+_POR_FACTURAR = {EstatusEntregable.PREFACTURA_APROBADA.value}
+# Estatus cuyo monto aprobado suma en el resumen del contrato
+_ESTATUS_CON_MONTO = {
+    EstatusEntregable.APROBADO.value,
+    EstatusEntregable.PREFACTURA_ENVIADA.value,
+    EstatusEntregable.PREFACTURA_RECHAZADA.value,
+    EstatusEntregable.PREFACTURA_APROBADA.value,
+    EstatusEntregable.FACTURADO.value,
+    EstatusEntregable.PAGADO.value,
+}
+
+
+def _estadisticas(grupos: List[dict]) -> dict:
+    """Dict de contadores a partir de grupos `{estatus, total}`."""
+    stats = {
+        "total": 0,
+        **{clave: 0 for clave in _CLAVE_ESTADISTICA.values()},
+        "por_prefacturar": 0,
+        "por_facturar": 0,
+    }
+    for grupo in grupos:
+        estatus, total = grupo['estatus'], grupo['total']
+        stats["total"] += total
+        if estatus in _CLAVE_ESTADISTICA:
+            stats[_CLAVE_ESTADISTICA[estatus]] += total
+        if estatus in _POR_PREFACTURAR:
+            stats["por_prefacturar"] += total
+        elif estatus in _POR_FACTURAR:
+            stats["por_facturar"] += total
+    return stats
+
 
 class SupabaseEntregableRepository:
     """
@@ -42,10 +91,8 @@ class SupabaseEntregableRepository:
     """
     
     def __init__(self, db_manager_override=None):
-        if db_manager_override is None:
-            self.supabase = db_manager.get_client()
-        else:
-            self.supabase = db_manager_override.get_client()
+        self._db = db_manager if db_manager_override is None else db_manager_override
+        self.supabase = self._db.get_client()
         
         self.tabla = "entregables"
         self.tabla_detalle = "entregable_detalle_personal"
@@ -64,10 +111,11 @@ class SupabaseEntregableRepository:
             DatabaseError: Si hay error de BD
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('id', entregable_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('id', entregable_id)
+            )
             
             if not result.data:
                 raise NotFoundError(f"Entregable con ID {entregable_id} no encontrado")
@@ -101,7 +149,7 @@ class SupabaseEntregableRepository:
                 .eq('contrato_id', contrato_id)\
                 .order('numero_periodo', desc=False)
             
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return [Entregable(**data) for data in result.data]
         
         except Exception as e:
@@ -117,11 +165,12 @@ class SupabaseEntregableRepository:
         Obtiene un entregable específico por contrato y número de período.
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('contrato_id', contrato_id)\
-                .eq('numero_periodo', numero_periodo)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('contrato_id', contrato_id)
+                .eq('numero_periodo', numero_periodo)
+            )
             
             if not result.data:
                 return None
@@ -145,9 +194,10 @@ class SupabaseEntregableRepository:
                 exclude={'id', 'fecha_creacion', 'fecha_actualizacion'}
             )
             
-            result = self.supabase.table(self.tabla)\
-                .insert(datos)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .insert(datos)
+            )
             
             if not result.data:
                 raise DatabaseError("No se pudo crear el entregable")
@@ -160,6 +210,38 @@ class SupabaseEntregableRepository:
             logger.error(f"Error creando entregable: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
     
+    async def crear_periodos(self, entregables: List[Entregable]) -> List[Entregable]:
+        """
+        Crea entregables por lote, omitiendo los períodos que ya existen.
+
+        Usa ON CONFLICT (contrato_id, numero_periodo) DO NOTHING, así que es
+        idempotente aunque dos sincronizaciones corran a la vez.
+
+        Returns:
+            Entregables realmente creados
+
+        Raises:
+            DatabaseError: Si hay error de BD
+        """
+        payloads = [
+            e.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
+            for e in entregables
+        ]
+        try:
+            filas = await escribir_en_lotes(
+                payloads,
+                lambda lote: self.supabase.table(self.tabla).upsert(
+                    lote,
+                    on_conflict='contrato_id,numero_periodo',
+                    ignore_duplicates=True,
+                ).execute().data,
+                self._db.ejecutar,
+            )
+            return [Entregable(**data) for data in filas]
+        except Exception as e:
+            logger.error(f"Error creando períodos de entregable: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}", getattr(e, 'details', None))
+
     async def actualizar(self, entregable: Entregable) -> Entregable:
         """
         Actualiza un entregable existente.
@@ -174,10 +256,11 @@ class SupabaseEntregableRepository:
                 exclude={'id', 'fecha_creacion', 'fecha_actualizacion'}
             )
             
-            result = self.supabase.table(self.tabla)\
-                .update(datos)\
-                .eq('id', entregable.id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update(datos)
+                .eq('id', entregable.id)
+            )
             
             if not result.data:
                 raise NotFoundError(f"Entregable con ID {entregable.id} no encontrado")
@@ -199,10 +282,11 @@ class SupabaseEntregableRepository:
             DatabaseError: Si hay error de BD
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .delete()\
-                .eq('id', entregable_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .delete()
+                .eq('id', entregable_id)
+            )
             
             if not result.data:
                 raise NotFoundError(f"Entregable con ID {entregable_id} no encontrado")
@@ -227,14 +311,15 @@ class SupabaseEntregableRepository:
         Obtiene resumen de entregables con datos del contrato y empresa.
         """
         try:
-            result = self.supabase.table(self.tabla)\
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
                 .select(
                     '*, '
                     'contratos!inner(codigo, empresa_id, empresas!inner(nombre_comercial))'
-                )\
-                .eq('contrato_id', contrato_id)\
-                .order('numero_periodo', desc=False)\
-                .execute()
+                )
+                .eq('contrato_id', contrato_id)
+                .order('numero_periodo', desc=False)
+            )
 
             resumenes = []
             for data in result.data:
@@ -288,7 +373,7 @@ class SupabaseEntregableRepository:
                 query = query.eq('contratos.empresa_id', empresa_id)
 
             query = query.order('fecha_entrega', desc=True).limit(limite)
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             resumenes = []
             for data in result.data:
@@ -353,7 +438,7 @@ class SupabaseEntregableRepository:
                 .order('numero_periodo', desc=True)\
                 .limit(limite)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             resumenes = []
             for data in result.data:
@@ -395,51 +480,7 @@ class SupabaseEntregableRepository:
             Dict con contadores por estatus
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('estatus')\
-                .execute()
-
-            stats = {
-                "total": 0,
-                "pendientes": 0,
-                "en_revision": 0,
-                "aprobados": 0,
-                "rechazados": 0,
-                "prefactura_enviada": 0,
-                "prefactura_rechazada": 0,
-                "prefactura_aprobada": 0,
-                "facturados": 0,
-                "pagados": 0,
-                "por_prefacturar": 0,
-                "por_facturar": 0,
-            }
-
-            for ent in result.data:
-                stats["total"] += 1
-                estatus = ent['estatus']
-                if estatus == EstatusEntregable.PENDIENTE.value:
-                    stats["pendientes"] += 1
-                elif estatus == EstatusEntregable.EN_REVISION.value:
-                    stats["en_revision"] += 1
-                elif estatus == EstatusEntregable.APROBADO.value:
-                    stats["aprobados"] += 1
-                    stats["por_prefacturar"] += 1
-                elif estatus == EstatusEntregable.RECHAZADO.value:
-                    stats["rechazados"] += 1
-                elif estatus == EstatusEntregable.PREFACTURA_ENVIADA.value:
-                    stats["prefactura_enviada"] += 1
-                elif estatus == EstatusEntregable.PREFACTURA_RECHAZADA.value:
-                    stats["prefactura_rechazada"] += 1
-                    stats["por_prefacturar"] += 1
-                elif estatus == EstatusEntregable.PREFACTURA_APROBADA.value:
-                    stats["prefactura_aprobada"] += 1
-                    stats["por_facturar"] += 1
-                elif estatus == EstatusEntregable.FACTURADO.value:
-                    stats["facturados"] += 1
-                elif estatus == EstatusEntregable.PAGADO.value:
-                    stats["pagados"] += 1
-
-            return stats
+            return _estadisticas(await self._conteos_por_estatus(por_contrato=False))
 
         except Exception as e:
             logger.error(f"Error obteniendo estadísticas globales: {e}")
@@ -484,7 +525,7 @@ class SupabaseEntregableRepository:
                 .order('periodo_fin', desc=True)\
                 .limit(limite)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             resumenes = []
             for data in result.data:
@@ -544,76 +585,9 @@ class SupabaseEntregableRepository:
             Dict con contadores por estatus
         """
         try:
-            # Primero obtener los IDs de contratos de la empresa
-            contratos_result = self.supabase.table('contratos')\
-                .select('id')\
-                .eq('empresa_id', empresa_id)\
-                .execute()
-
-            contrato_ids = [c['id'] for c in contratos_result.data]
-
-            if not contrato_ids:
-                return {
-                    "total": 0,
-                    "pendientes": 0,
-                    "en_revision": 0,
-                    "aprobados": 0,
-                    "rechazados": 0,
-                    "prefactura_enviada": 0,
-                    "prefactura_rechazada": 0,
-                    "prefactura_aprobada": 0,
-                    "facturados": 0,
-                    "pagados": 0,
-                    "por_prefacturar": 0,
-                    "por_facturar": 0,
-                }
-
-            result = self.supabase.table(self.tabla)\
-                .select('estatus')\
-                .in_('contrato_id', contrato_ids)\
-                .execute()
-
-            stats = {
-                "total": 0,
-                "pendientes": 0,
-                "en_revision": 0,
-                "aprobados": 0,
-                "rechazados": 0,
-                "prefactura_enviada": 0,
-                "prefactura_rechazada": 0,
-                "prefactura_aprobada": 0,
-                "facturados": 0,
-                "pagados": 0,
-                "por_prefacturar": 0,
-                "por_facturar": 0,
-            }
-
-            for ent in result.data:
-                stats["total"] += 1
-                estatus = ent['estatus']
-                if estatus == EstatusEntregable.PENDIENTE.value:
-                    stats["pendientes"] += 1
-                elif estatus == EstatusEntregable.EN_REVISION.value:
-                    stats["en_revision"] += 1
-                elif estatus == EstatusEntregable.APROBADO.value:
-                    stats["aprobados"] += 1
-                    stats["por_prefacturar"] += 1
-                elif estatus == EstatusEntregable.RECHAZADO.value:
-                    stats["rechazados"] += 1
-                elif estatus == EstatusEntregable.PREFACTURA_ENVIADA.value:
-                    stats["prefactura_enviada"] += 1
-                elif estatus == EstatusEntregable.PREFACTURA_RECHAZADA.value:
-                    stats["prefactura_rechazada"] += 1
-                    stats["por_prefacturar"] += 1
-                elif estatus == EstatusEntregable.PREFACTURA_APROBADA.value:
-                    stats["prefactura_aprobada"] += 1
-                    stats["por_facturar"] += 1
-                elif estatus == EstatusEntregable.FACTURADO.value:
-                    stats["facturados"] += 1
-                elif estatus == EstatusEntregable.PAGADO.value:
-                    stats["pagados"] += 1
-
-            return stats
+            return _estadisticas(
+                await self._conteos_por_estatus(empresa_id=empresa_id, por_contrato=False)
+            )
 
         except Exception as e:
             logger.error(f"Error obteniendo estadísticas de empresa {empresa_id}: {e}")
@@ -627,10 +601,11 @@ class SupabaseEntregableRepository:
                 .eq('estatus', EstatusEntregable.EN_REVISION.value)
             
             if empresa_id:
-                contratos_result = self.supabase.table('contratos')\
-                    .select('id')\
-                    .eq('empresa_id', empresa_id)\
-                    .execute()
+                contratos_result = await self._db.ejecutar_query(
+                    self.supabase.table('contratos')
+                    .select('id')
+                    .eq('empresa_id', empresa_id)
+                )
                 
                 contrato_ids = [c['id'] for c in contratos_result.data]
                 if contrato_ids:
@@ -638,7 +613,7 @@ class SupabaseEntregableRepository:
                 else:
                     return 0
             
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return result.count or 0
         
         except Exception as e:
@@ -674,100 +649,113 @@ class SupabaseEntregableRepository:
     ) -> ResumenEntregablesContrato:
         """Obtiene estadísticas de entregables para un contrato."""
         try:
-            contrato_result = self.supabase.table('contratos')\
-                .select('codigo')\
-                .eq('id', contrato_id)\
-                .execute()
+            contrato_result = await self._db.ejecutar_query(
+                self.supabase.table('contratos')
+                .select('codigo')
+                .eq('id', contrato_id)
+            )
 
             codigo_contrato = contrato_result.data[0]['codigo'] if contrato_result.data else ''
 
-            result = self.supabase.table(self.tabla)\
-                .select('estatus, monto_aprobado')\
-                .eq('contrato_id', contrato_id)\
-                .execute()
-
-            pendientes = en_revision = aprobados = rechazados = 0
-            prefactura_enviada = prefactura_rechazada = prefactura_aprobada = 0
-            facturados = pagados = por_prefacturar = por_facturar = 0
-            monto_total = Decimal("0")
-
-            for ent in result.data:
-                estatus = ent['estatus']
-                if estatus == EstatusEntregable.PENDIENTE.value:
-                    pendientes += 1
-                elif estatus == EstatusEntregable.EN_REVISION.value:
-                    en_revision += 1
-                elif estatus == EstatusEntregable.APROBADO.value:
-                    aprobados += 1
-                    por_prefacturar += 1
-                    if ent['monto_aprobado']:
-                        monto_total += Decimal(str(ent['monto_aprobado']))
-                elif estatus == EstatusEntregable.RECHAZADO.value:
-                    rechazados += 1
-                elif estatus == EstatusEntregable.PREFACTURA_ENVIADA.value:
-                    prefactura_enviada += 1
-                    if ent['monto_aprobado']:
-                        monto_total += Decimal(str(ent['monto_aprobado']))
-                elif estatus == EstatusEntregable.PREFACTURA_RECHAZADA.value:
-                    prefactura_rechazada += 1
-                    por_prefacturar += 1
-                    if ent['monto_aprobado']:
-                        monto_total += Decimal(str(ent['monto_aprobado']))
-                elif estatus == EstatusEntregable.PREFACTURA_APROBADA.value:
-                    prefactura_aprobada += 1
-                    por_facturar += 1
-                    if ent['monto_aprobado']:
-                        monto_total += Decimal(str(ent['monto_aprobado']))
-                elif estatus == EstatusEntregable.FACTURADO.value:
-                    facturados += 1
-                    if ent['monto_aprobado']:
-                        monto_total += Decimal(str(ent['monto_aprobado']))
-                elif estatus == EstatusEntregable.PAGADO.value:
-                    pagados += 1
-                    if ent['monto_aprobado']:
-                        monto_total += Decimal(str(ent['monto_aprobado']))
-
-            pagos_result = self.supabase.table('pagos')\
-                .select('monto')\
-                .eq('contrato_id', contrato_id)\
-                .eq('estatus', 'PAGADO')\
-                .execute()
+            grupos = await self._conteos_por_estatus(contrato_ids=[contrato_id])
+            stats = _estadisticas(grupos)
+            # Monto aprobado de los que ya pasaron la revisión
+            monto_total = sum(
+                (Decimal(str(g['monto_aprobado'] or 0)) for g in grupos if g['estatus'] in _ESTATUS_CON_MONTO),
+                Decimal("0"),
+            )
 
-            monto_pagado = sum(
-                Decimal(str(p['monto'])) for p in pagos_result.data
-            ) if pagos_result.data else Decimal("0")
+            pagados = await SupabasePagoRepository(self._db).obtener_totales_por_contratos(
+                [contrato_id], estatus=EstatusPago.PAGADO.value,
+            )
 
             return ResumenEntregablesContrato(
                 contrato_id=contrato_id,
                 codigo_contrato=codigo_contrato,
-                total_periodos=len(result.data),
-                pendientes=pendientes,
-                en_revision=en_revision,
-                aprobados=aprobados,
-                rechazados=rechazados,
-                por_prefacturar=por_prefacturar,
-                prefactura_enviada=prefactura_enviada,
-                prefactura_rechazada=prefactura_rechazada,
-                por_facturar=por_facturar,
-                facturados=facturados,
-                pagados=pagados,
+                total_periodos=stats["total"],
+                pendientes=stats["pendientes"],
+                en_revision=stats["en_revision"],
+                aprobados=stats["aprobados"],
+                rechazados=stats["rechazados"],
+                por_prefacturar=stats["por_prefacturar"],
+                prefactura_enviada=stats["prefactura_enviada"],
+                prefactura_rechazada=stats["prefactura_rechazada"],
+                por_facturar=stats["por_facturar"],
+                facturados=stats["facturados"],
+                pagados=stats["pagados"],
                 monto_total_aprobado=monto_total,
-                monto_total_pagado=monto_pagado,
+                monto_total_pagado=pagados.get(contrato_id, Decimal("0")),
             )
 
         except Exception as e:
             logger.error(f"Error obteniendo estadísticas del contrato {contrato_id}: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def _conteos_por_estatus(
+        self,
+        contrato_ids: Optional[List[int]] = None,
+        empresa_id: Optional[int] = None,
+        por_contrato: bool = True,
+    ) -> List[dict]:
+        """
+        Grupos `{contrato_id, estatus, total, monto_aprobado}` de entregables.
+
+        Agrupa en la BD con `conteo_entregables_por_estatus` (migración
+        051); si la función no existe, lee estatus y monto de cada
+        entregable (paginado) y agrupa aquí. Con `por_contrato=False`
+        `contrato_id` es None y hay un grupo por estatus.
+        """
+        try:
+            result = await self._db.ejecutar_query(
+                self.supabase.rpc('conteo_entregables_por_estatus', {
+                    'p_contrato_ids': contrato_ids,
+                    'p_empresa_id': empresa_id,
+                    'p_por_contrato': por_contrato,
+                })
+            )
+            return result.data or []
+        except Exception as e:
+            if not es_funcion_inexistente(e):
+                raise
+            logger.warning("conteo_entregables_por_estatus no existe (migración 051); agrupando en Python")
+
+        if empresa_id is not None:
+            contratos_result = await self._db.ejecutar_query(
+                self.supabase.table('contratos')
+                .select('id')
+                .eq('empresa_id', empresa_id)
+            )
+            de_empresa = [c['id'] for c in contratos_result.data]
+            contrato_ids = [c for c in de_empresa if contrato_ids is None or c in contrato_ids]
+            if not contrato_ids:
+                return []
+
+        def _entregables():
+            query = self.supabase.table(self.tabla).select('id, contrato_id, estatus, monto_aprobado')
+            return query.in_('contrato_id', contrato_ids) if contrato_ids is not None else query
+
+        grupos: dict[tuple, dict] = {}
+        async for pagina in iterar(_entregables):
+            for ent in pagina:
+                clave = (ent['contrato_id'] if por_contrato else None, ent['estatus'])
+                grupo = grupos.setdefault(clave, {
+                    'contrato_id': clave[0], 'estatus': clave[1], 'total': 0, 'monto_aprobado': Decimal("0"),
+                })
+                grupo['total'] += 1
+                if ent.get('monto_aprobado'):
+                    grupo['monto_aprobado'] += Decimal(str(ent['monto_aprobado']))
+        return list(grupos.values())
     
     async def obtener_ultimo_numero_periodo(self, contrato_id: int) -> int:
         """Obtiene el último número de período usado para un contrato."""
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('numero_periodo')\
-                .eq('contrato_id', contrato_id)\
-                .order('numero_periodo', desc=True)\
-                .limit(1)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('numero_periodo')
+                .eq('contrato_id', contrato_id)
+                .order('numero_periodo', desc=True)
+                .limit(1)
+            )
             
             if not result.data:
                 return 0
@@ -788,16 +776,17 @@ class SupabaseEntregableRepository:
     ) -> List[EntregableDetallePersonalResumen]:
         """Obtiene el detalle de personal con datos de categoría."""
         try:
-            result = self.supabase.table(self.tabla_detalle)\
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla_detalle)
                 .select(
                     '*, '
                     'contrato_categorias!inner('
                     '   categoria_puesto_id, cantidad_minima, cantidad_maxima, '
                     '   categorias_puesto!inner(clave, nombre)'
                     ')'
-                )\
-                .eq('entregable_id', entregable_id)\
-                .execute()
+                )
+                .eq('entregable_id', entregable_id)
+            )
             
             detalles = []
             for data in result.data:
@@ -836,9 +825,10 @@ class SupabaseEntregableRepository:
                 exclude={'id', 'fecha_creacion'}
             )
             
-            result = self.supabase.table(self.tabla_detalle)\
-                .insert(datos)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla_detalle)
+                .insert(datos)
+            )
             
             if not result.data:
                 raise DatabaseError("No se pudo crear el detalle de personal")
@@ -852,10 +842,11 @@ class SupabaseEntregableRepository:
     async def eliminar_detalle_personal(self, entregable_id: int) -> int:
         """Elimina todos los detalles de personal de un entregable."""
         try:
-            result = self.supabase.table(self.tabla_detalle)\
-                .delete()\
-                .eq('entregable_id', entregable_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla_detalle)
+                .delete()
+                .eq('entregable_id', entregable_id)
+            )
             
             return len(result.data) if result.data else 0
         
@@ -873,10 +864,11 @@ class SupabaseEntregableRepository:
     ) -> List[dict]:
         """Obtiene la configuración de tipos de entregable de un contrato."""
         try:
-            result = self.supabase.table(self.tabla_config)\
-                .select('*')\
-                .eq('contrato_id', contrato_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla_config)
+                .select('*')
+                .eq('contrato_id', contrato_id)
+            )
             
             return result.data or []
         
@@ -890,11 +882,12 @@ class SupabaseEntregableRepository:
     ) -> Optional[str]:
         """Obtiene la periodicidad configurada para un contrato."""
         try:
-            result = self.supabase.table(self.tabla_config)\
-                .select('periodicidad')\
-                .eq('contrato_id', contrato_id)\
-                .limit(1)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla_config)
+                .select('periodicidad')
+                .eq('contrato_id', contrato_id)
+                .limit(1)
+            )
             
             if not result.data:
                 return None
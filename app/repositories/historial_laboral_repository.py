@@ -9,10 +9,17 @@ Patron de manejo de errores:
 - DatabaseError: Errores de conexion o infraestructura
 """
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 from datetime import date
 
 from app.core.exceptions import NotFoundError, DatabaseError
+from app.repositories.shared import (
+    DataLoader,
+    TAMANO_LOTE_IDS,
+    escribir_en_lotes,
+    obtener_loader,
+    partir_en_lotes,
+)
 from app.entities.historial_laboral import (
     HistorialLaboral,
     HistorialLaboralInterno,
@@ -30,6 +37,7 @@ class SupabaseHistorialLaboralRepository:
             db_manager = default_db
 
         self.supabase = db_manager.get_client()
+        self._db = db_manager
         self.tabla = 'historial_laboral'
 
     # ==========================================
@@ -45,10 +53,11 @@ class SupabaseHistorialLaboralRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('id', historial_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('id', historial_id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Historial con ID {historial_id} no encontrado")
@@ -76,15 +85,16 @@ class SupabaseHistorialLaboralRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
                 .select('''
                     *,
                     empleados!inner(id, clave, nombre, apellido_paterno, apellido_materno, empresas(nombre_comercial))
-                ''')\
-                .eq('empleado_id', empleado_id)\
-                .order('fecha_inicio', desc=True)\
-                .limit(limite)\
-                .execute()
+                ''')
+                .eq('empleado_id', empleado_id)
+                .order('fecha_inicio', desc=True)
+                .limit(limite)
+            )
 
             return result.data
 
@@ -120,7 +130,7 @@ class SupabaseHistorialLaboralRepository:
             query = query.order('fecha_inicio', desc=True)\
                 .range(offset, offset + limite - 1)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return result.data
 
         except Exception as e:
@@ -141,7 +151,7 @@ class SupabaseHistorialLaboralRepository:
             if empleado_id:
                 query = query.eq('empleado_id', empleado_id)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return result.count or 0
 
         except Exception as e:
@@ -156,11 +166,12 @@ class SupabaseHistorialLaboralRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('empleado_id', empleado_id)\
-                .is_('fecha_fin', 'null')\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('empleado_id', empleado_id)
+                .is_('fecha_fin', 'null')
+            )
 
             if not result.data:
                 return None
@@ -174,37 +185,71 @@ class SupabaseHistorialLaboralRepository:
     async def obtener_datos_plaza(self, plaza_id: int) -> Optional[dict]:
         """Obtiene datos enriquecidos de una plaza via Supabase JOIN."""
         try:
-            result = self.supabase.table('plazas')\
-                .select('''
-                    id, numero_plaza,
-                    contrato_categorias!inner(
-                        id,
-                        categorias_puesto!inner(nombre),
-                        contratos!inner(codigo, empresas!inner(nombre_comercial))
-                    )
-                ''')\
-                .eq('id', plaza_id)\
-                .execute()
+            datos = await self.obtener_datos_plazas([plaza_id])
+            return datos.get(plaza_id)
+        except DatabaseError as e:
+            logger.error(f"Error obteniendo datos de plaza {plaza_id}: {e}")
+            return None
 
-            if not result.data:
-                return None
+    async def obtener_datos_plazas(self, plaza_ids: List[int]) -> Dict[int, dict]:
+        """
+        Obtiene datos enriquecidos de varias plazas en una sola query por lote.
 
-            data = result.data[0]
-            cc = data.get('contrato_categorias', {})
-            cat = cc.get('categorias_puesto', {})
-            contrato = cc.get('contratos', {})
-            empresa = contrato.get('empresas', {})
+        Returns:
+            Dict {plaza_id: datos}; las plazas inexistentes no aparecen
 
-            return {
-                'numero_plaza': data.get('numero_plaza'),
-                'categoria_nombre': cat.get('nombre'),
-                'contrato_codigo': contrato.get('codigo'),
-                'empresa_nombre': empresa.get('nombre_comercial'),
-            }
+        Raises:
+            DatabaseError: Si hay error de BD
+        """
+        unicos = list(dict.fromkeys(i for i in plaza_ids if i is not None))
+        datos: Dict[int, dict] = {}
+        try:
+            for inicio in range(0, len(unicos), TAMANO_LOTE_IDS):
+                result = await self._db.ejecutar_query(
+                    self.supabase.table('plazas')
+                    .select('''
+                        id, numero_plaza,
+                        contrato_categorias!inner(
+                            id,
+                            categorias_puesto!inner(nombre),
+                            contratos!inner(codigo, empresas!inner(nombre_comercial))
+                        )
+                    ''')
+                    .in_('id', unicos[inicio:inicio + TAMANO_LOTE_IDS])
+                )
+
+                for data in result.data or []:
+                    cc = data.get('contrato_categorias', {})
+                    cat = cc.get('categorias_puesto', {})
+                    contrato = cc.get('contratos', {})
+                    empresa = contrato.get('empresas', {})
+
+                    datos[data['id']] = {
+                        'numero_plaza': data.get('numero_plaza'),
+                        'categoria_nombre': cat.get('nombre'),
+                        'contrato_codigo': contrato.get('codigo'),
+                        'empresa_nombre': empresa.get('nombre_comercial'),
+                    }
+            return datos
 
         except Exception as e:
-            logger.error(f"Error obteniendo datos de plaza {plaza_id}: {e}")
-            return None
+            logger.error(f"Error obteniendo datos de plazas: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    def loader_datos_plaza(self) -> DataLoader[int, dict]:
+        """
+        DataLoader de datos de plaza para la petición en curso.
+
+        Como `obtener_datos_plaza`, un error de BD no rompe el listado: las
+        plazas del lote fallido resuelven a None.
+        """
+        async def _cargar_lote(plaza_ids: List[int]) -> Dict[int, dict]:
+            try:
+                return await self.obtener_datos_plazas(plaza_ids)
+            except DatabaseError:
+                return {}
+
+        return obtener_loader('historial:datos_plaza', _cargar_lote)
 
     # ==========================================
     # OPERACIONES DE ESCRITURA
@@ -220,9 +265,10 @@ class SupabaseHistorialLaboralRepository:
         try:
             data_dict = datos.model_dump(mode='json')
 
-            result = self.supabase.table(self.tabla)\
-                .insert(data_dict)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .insert(data_dict)
+            )
 
             if not result.data:
                 raise DatabaseError("No se pudo crear el registro")
@@ -248,10 +294,11 @@ class SupabaseHistorialLaboralRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .update({'fecha_fin': fecha_fin.isoformat()})\
-                .eq('id', historial_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update({'fecha_fin': fecha_fin.isoformat()})
+                .eq('id', historial_id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Historial {historial_id} no encontrado")
@@ -263,3 +310,53 @@ class SupabaseHistorialLaboralRepository:
         except Exception as e:
             logger.error(f"Error cerrando registro: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def crear_lote(self, datos: Sequence[HistorialLaboralInterno]) -> List[HistorialLaboral]:
+        """
+        Crea varios registros con un INSERT por lote.
+
+        Raises:
+            DatabaseError: Si hay error de conexion
+        """
+        try:
+            filas = await escribir_en_lotes(
+                [d.model_dump(mode='json') for d in datos],
+                lambda lote: self.supabase.table(self.tabla).insert(lote).execute().data,
+                self._db.ejecutar,
+            )
+            return [HistorialLaboral(**data) for data in filas]
+
+        except Exception as e:
+            logger.error(f"Error creando lote de historial: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}", getattr(e, 'details', None))
+
+    async def cerrar_registros_activos(
+        self,
+        empleado_ids: Sequence[int],
+        fecha_fin: date
+    ) -> int:
+        """
+        Cierra los registros activos (sin fecha_fin) de varios empleados
+        con un UPDATE por lote de TAMANO_LOTE_IDS.
+
+        Returns:
+            Número de registros cerrados
+
+        Raises:
+            DatabaseError: Si hay error de conexion
+        """
+        cerrados = 0
+        try:
+            for lote in partir_en_lotes(list(dict.fromkeys(empleado_ids)), TAMANO_LOTE_IDS):
+                result = await self._db.ejecutar_query(
+                    self.supabase.table(self.tabla)
+                    .update({'fecha_fin': fecha_fin.isoformat()})
+                    .in_('empleado_id', lote)
+                    .is_('fecha_fin', 'null')
+                )
+                cerrados += len(result.data or [])
+            return cerrados
+
+        except Exception as e:
+            logger.error(f"Error cerrando registros activos: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
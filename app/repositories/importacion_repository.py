@@ -0,0 +1,215 @@
+"""
+Repositorio de importaciones de alta masiva (migración 052).
+
+Patron de manejo de errores:
+- NotFoundError: Cuando no se encuentra un registro
+- DuplicateError: Si la clave de idempotencia ya existe
+- DatabaseError: Errores de conexion o infraestructura
+"""
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.exceptions import DatabaseError, DuplicateError, NotFoundError
+from app.entities.alta_masiva import EstatusImportacion, ImportacionAltaMasiva
+from app.repositories.shared.bulk import es_error_unicidad
+
+logger = logging.getLogger(__name__)
+
+# Sin registros ni detalles: lo que la página consulta mientras sondea
+COLUMNAS_AVANCE = (
+    'id, empresa_id, clave_idempotencia, nombre_archivo, estatus, total_filas, '
+    'total_registros, cursor, creados, reingresados, errores, error, intentos, latido, '
+    'fecha_creacion, fecha_actualizacion'
+)
+
+_ACTIVAS = [EstatusImportacion.PENDIENTE.value, EstatusImportacion.PROCESANDO.value]
+
+
+class SupabaseImportacionAltaMasivaRepository:
+    """Implementacion del repositorio de importaciones usando Supabase."""
+
+    def __init__(self, db_manager=None):
+        if db_manager is None:
+            from app.database import db_manager as default_db
+            db_manager = default_db
+
+        self.supabase = db_manager.get_client()
+        self._db = db_manager
+        self.tabla = 'importaciones_alta_masiva'
+
+    async def obtener_por_id(self, importacion_id: int, con_detalle: bool = True) -> ImportacionAltaMasiva:
+        """
+        Obtiene una importacion. Sin `con_detalle` omite registros y detalles.
+
+        Raises:
+            NotFoundError: Si no existe
+            DatabaseError: Si hay error de conexion
+        """
+        try:
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*' if con_detalle else COLUMNAS_AVANCE)
+                .eq('id', importacion_id)
+            )
+
+            if not result.data:
+                raise NotFoundError(f"Importacion con ID {importacion_id} no encontrada")
+
+            return ImportacionAltaMasiva(**result.data[0])
+
+        except NotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Error obteniendo importacion {importacion_id}: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def obtener_por_clave(self, clave_idempotencia: str) -> Optional[ImportacionAltaMasiva]:
+        """
+        Obtiene la importacion de un archivo (None si no existe).
+
+        Raises:
+            DatabaseError: Si hay error de conexion
+        """
+        try:
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select(COLUMNAS_AVANCE)
+                .eq('clave_idempotencia', clave_idempotencia)
+            )
+
+            if not result.data:
+                return None
+
+            return ImportacionAltaMasiva(**result.data[0])
+
+        except Exception as e:
+            logger.error(f"Error obteniendo importacion por clave: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def obtener_activas(self, empresa_id: Optional[int] = None) -> List[ImportacionAltaMasiva]:
+        """
+        Importaciones pendientes o en proceso (sin registros ni detalles),
+        de la más reciente a la más antigua.
+
+        Raises:
+            DatabaseError: Si hay error de conexion
+        """
+        try:
+            query = self.supabase.table(self.tabla)\
+                .select(COLUMNAS_AVANCE)\
+                .in_('estatus', _ACTIVAS)
+
+            if empresa_id is not None:
+                query = query.eq('empresa_id', empresa_id)
+
+            result = await self._db.ejecutar_query(query.order('fecha_creacion', desc=True))
+            return [ImportacionAltaMasiva(**data) for data in result.data]
+
+        except Exception as e:
+            logger.error(f"Error obteniendo importaciones activas: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def crear(self, importacion: ImportacionAltaMasiva) -> ImportacionAltaMasiva:
+        """
+        Crea una importacion.
+
+        Raises:
+            DuplicateError: Si ya hay una importacion con la misma clave
+            DatabaseError: Si hay error de conexion
+        """
+        try:
+            datos = importacion.model_dump(
+                mode='json',
+                exclude={'id', 'latido', 'fecha_creacion', 'fecha_actualizacion'},
+            )
+            result = await self._db.ejecutar_query(self.supabase.table(self.tabla).insert(datos))
+
+            if not result.data:
+                raise DatabaseError("No se pudo crear la importacion (sin respuesta de BD)")
+
+            return ImportacionAltaMasiva(**result.data[0])
+
+        except DatabaseError:
+            raise
+        except Exception as e:
+            if es_error_unicidad(e):
+                raise DuplicateError(
+                    "Ya existe una importacion de este archivo",
+                    field="clave_idempotencia",
+                    value=importacion.clave_idempotencia,
+                )
+            logger.error(f"Error creando importacion: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def tomar(self, importacion: ImportacionAltaMasiva) -> bool:
+        """
+        Marca la importacion como PROCESANDO por este proceso: incrementa
+        `intentos` sólo si sigue con el valor leído (si otro proceso la
+        tomó antes, no cambia nada). Actualiza la entidad.
+
+        Returns:
+            True si este proceso la tomó
+
+        Raises:
+            DatabaseError: Si hay error de conexion
+        """
+        latido = datetime.now(timezone.utc)
+        try:
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update({
+                    'estatus': EstatusImportacion.PROCESANDO.value,
+                    'intentos': importacion.intentos + 1,
+                    'latido': latido.isoformat(),
+                    'error': None,
+                })
+                .eq('id', importacion.id)
+                .eq('intentos', importacion.intentos)
+            )
+
+            if not result.data:
+                return False
+
+            importacion.estatus = EstatusImportacion.PROCESANDO
+            importacion.intentos += 1
+            importacion.latido = latido
+            importacion.error = None
+            return True
+
+        except Exception as e:
+            logger.error(f"Error tomando importacion {importacion.id}: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
+
+    async def guardar_avance(self, importacion: ImportacionAltaMasiva) -> bool:
+        """
+        Guarda cursor, contadores, detalles y estatus, y renueva el latido,
+        sólo si ningún otro proceso la tomó desde entonces (mismo `intentos`).
+
+        Returns:
+            False si otro proceso la tomó (este debe dejar de procesarla)
+
+        Raises:
+            DatabaseError: Si hay error de conexion
+        """
+        importacion.latido = datetime.now(timezone.utc)
+        datos = importacion.model_dump(
+            mode='json',
+            include={
+                'estatus', 'cursor', 'creados', 'reingresados', 'errores',
+                'detalles', 'error', 'latido',
+            },
+        )
+        try:
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update(datos)
+                .eq('id', importacion.id)
+                .eq('intentos', importacion.intentos)
+            )
+
+            return bool(result.data)
+
+        except Exception as e:
+            logger.error(f"Error guardando avance de importacion {importacion.id}: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
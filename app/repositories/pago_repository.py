@@ -12,10 +12,14 @@ from decimal import Decimal
 from app.entities import Pago
 from app.core.exceptions import NotFoundError, DatabaseError
 from app.repositories.shared import (
+    TAMANO_LOTE_IDS,
     apply_date_range_filter,
     apply_eq_filters,
     apply_order,
     apply_pagination,
+    es_funcion_inexistente,
+    iterar,
+    partir_en_lotes,
 )
 
 logger = logging.getLogger(__name__)
@@ -30,6 +34,7 @@ class SupabasePagoRepository:
             db_manager = default_db
 
         self.supabase = db_manager.get_client()
+        self._db = db_manager
         self.tabla = 'pagos'
 
     async def obtener_todos(
@@ -55,7 +60,7 @@ class SupabasePagoRepository:
             query = apply_eq_filters(query, {'contrato_id': contrato_id})
             query = apply_date_range_filter(query, 'fecha_pago', fecha_desde, fecha_hasta)
             query = apply_pagination(query, limite, offset)
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             # Transformar datos para incluir info del contrato
             pagos = []
@@ -90,7 +95,7 @@ class SupabasePagoRepository:
             query = apply_eq_filters(query, {'contrato_id': contrato_id})
             query = apply_date_range_filter(query, 'fecha_pago', fecha_desde, fecha_hasta)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return result.count or 0
         except Exception as e:
             logger.error(f"Error contando pagos: {e}")
@@ -105,7 +110,9 @@ class SupabasePagoRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla).select('*').eq('id', pago_id).execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla).select('*').eq('id', pago_id)
+            )
             if not result.data:
                 raise NotFoundError(f"Pago con ID {pago_id} no encontrado")
             return Pago(**result.data[0])
@@ -135,7 +142,7 @@ class SupabasePagoRepository:
             if limite:
                 query = apply_pagination(query, limite, offset)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return [Pago(**data) for data in result.data]
         except Exception as e:
             logger.error(f"Error obteniendo pagos del contrato {contrato_id}: {e}")
@@ -150,7 +157,7 @@ class SupabasePagoRepository:
         """
         try:
             datos = pago.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
-            result = self.supabase.table(self.tabla).insert(datos).execute()
+            result = await self._db.ejecutar_query(self.supabase.table(self.tabla).insert(datos))
 
             if not result.data:
                 raise DatabaseError("No se pudo crear el pago (sin respuesta de BD)")
@@ -172,10 +179,11 @@ class SupabasePagoRepository:
         """
         try:
             datos = pago.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
-            result = self.supabase.table(self.tabla)\
-                .update(datos)\
-                .eq('id', pago.id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update(datos)
+                .eq('id', pago.id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Pago con ID {pago.id} no encontrado")
@@ -195,10 +203,11 @@ class SupabasePagoRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .delete()\
-                .eq('id', pago_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .delete()
+                .eq('id', pago_id)
+            )
             return bool(result.data)
         except Exception as e:
             logger.error(f"Error eliminando pago {pago_id}: {e}")
@@ -212,10 +221,11 @@ class SupabasePagoRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('monto')\
-                .eq('contrato_id', contrato_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('monto')
+                .eq('contrato_id', contrato_id)
+            )
 
             if not result.data:
                 return Decimal("0")
@@ -234,12 +244,13 @@ class SupabasePagoRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('contrato_id', contrato_id)\
-                .order('fecha_pago', desc=True)\
-                .limit(1)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('contrato_id', contrato_id)
+                .order('fecha_pago', desc=True)
+                .limit(1)
+            )
 
             if not result.data:
                 return None
@@ -257,10 +268,11 @@ class SupabasePagoRepository:
             DatabaseError: Si hay error de conexion
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('id', count='exact')\
-                .eq('contrato_id', contrato_id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('id', count='exact')
+                .eq('contrato_id', contrato_id)
+            )
 
             return result.count or 0
         except Exception as e:
@@ -269,11 +281,19 @@ class SupabasePagoRepository:
 
     async def obtener_totales_por_contratos(
         self,
-        contrato_ids: List[int]
+        contrato_ids: List[int],
+        estatus: Optional[str] = None,
     ) -> dict[int, Decimal]:
         """
         Obtiene el total pagado para multiples contratos en una sola query.
 
+        Suma en la BD con `totales_pagos_por_contrato` (migracion 051); si
+        la funcion no existe, lee los montos y suma aqui.
+
+        Args:
+            contrato_ids: Contratos a totalizar
+            estatus: Solo pagos con este estatus (None = todos)
+
         Returns:
             Diccionario {contrato_id: total_pagado}
 
@@ -284,16 +304,35 @@ class SupabasePagoRepository:
             return {}
 
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('contrato_id, monto')\
-                .in_('contrato_id', contrato_ids)\
-                .execute()
-
             totales: dict[int, Decimal] = {cid: Decimal("0") for cid in contrato_ids}
-            for pago in result.data:
-                cid = pago['contrato_id']
-                if cid in totales:
-                    totales[cid] += Decimal(str(pago['monto']))
+            try:
+                result = await self._db.ejecutar_query(
+                    self.supabase.rpc('totales_pagos_por_contrato', {
+                        'p_contrato_ids': list(contrato_ids),
+                        'p_estatus': estatus,
+                    })
+                )
+                for fila in result.data or []:
+                    if fila['contrato_id'] in totales:
+                        totales[fila['contrato_id']] = Decimal(str(fila['total']))
+                return totales
+            except Exception as e:
+                if not es_funcion_inexistente(e):
+                    raise
+                logger.warning("totales_pagos_por_contrato no existe (migracion 051); sumando en Python")
+
+            def _pagos(lote: list):
+                query = self.supabase.table(self.tabla)\
+                    .select('id, contrato_id, monto')\
+                    .in_('contrato_id', lote)
+                return query.eq('estatus', estatus) if estatus else query
+
+            for lote in partir_en_lotes(list(totales), TAMANO_LOTE_IDS):
+                async for pagina in iterar(lambda: _pagos(lote)):
+                    for pago in pagina:
+                        cid = pago['contrato_id']
+                        if cid in totales:
+                            totales[cid] += Decimal(str(pago['monto']))
 
             return totales
         except Exception as e:
@@ -9,16 +9,56 @@ Patrón de manejo de errores:
 - DuplicateError: Cuando se viola unicidad (contrato_categoria_id + numero_plaza)
 - DatabaseError: Errores de conexión o infraestructura
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from decimal import Decimal
 import logging
 
 from app.entities.plaza import Plaza
 from app.core.enums import EstatusPlaza
 from app.core.exceptions import NotFoundError, DuplicateError, DatabaseError
+from app.repositories.shared import (
+    TAMANO_LOTE_IDS,
+    Pagina,
+    apply_keyset,
+    cerrar_pagina,
+    es_funcion_inexistente,
+    escribir_en_lotes,
+    hidratar_confiable,
+    iterar,
+    partir_en_lotes,
+)
 
 logger = logging.getLogger(__name__)
 
+_CLAVE_TOTAL_POR_ESTATUS = {
+    EstatusPlaza.VACANTE.value: 'plazas_vacantes',
+    EstatusPlaza.OCUPADA.value: 'plazas_ocupadas',
+    EstatusPlaza.SUSPENDIDA.value: 'plazas_suspendidas',
+    EstatusPlaza.CANCELADA.value: 'plazas_canceladas',
+}
+
+
+def _totales_vacios() -> dict:
+    return {
+        'total_plazas': 0,
+        'plazas_vacantes': 0,
+        'plazas_ocupadas': 0,
+        'plazas_suspendidas': 0,
+        'plazas_canceladas': 0,
+        'costo_total_mensual': Decimal('0'),
+    }
+
+
+def _sumar_estatus(totales: dict, estatus: str, cantidad: int, salario_total) -> None:
+    """Acumula un grupo (estatus, COUNT, SUM(salario)) en `totales`."""
+    totales['total_plazas'] += cantidad
+    clave = _CLAVE_TOTAL_POR_ESTATUS.get(estatus)
+    if clave:
+        totales[clave] += cantidad
+    # El costo mensual sólo cuenta plazas ocupadas
+    if estatus == EstatusPlaza.OCUPADA.value:
+        totales['costo_total_mensual'] += Decimal(str(salario_total or 0))
+
 
 class SupabasePlazaRepository:
     """Implementación del repositorio usando Supabase"""
@@ -28,6 +68,7 @@ class SupabasePlazaRepository:
             from app.database import db_manager as default_db
             db_manager = default_db
 
+        self._db = db_manager
         self.supabase = db_manager.get_client()
         self.tabla = 'plazas'
 
@@ -40,7 +81,9 @@ class SupabasePlazaRepository:
             DatabaseError: Si hay error de conexión
         """
         try:
-            result = self.supabase.table(self.tabla).select('*').eq('id', id).execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla).select('*').eq('id', id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Plaza con ID {id} no encontrada")
@@ -85,7 +128,7 @@ class SupabasePlazaRepository:
             if limite is not None:
                 query = query.range(offset, offset + limite - 1)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             return [Plaza(**data) for data in result.data]
 
@@ -104,6 +147,7 @@ class SupabasePlazaRepository:
         Obtiene las plazas de un contrato.
 
         Hace JOIN con contrato_categorias para obtener las plazas del contrato.
+        Las filas se hidratan sin validadores (vienen de nuestra BD).
 
         Args:
             contrato_id: ID del contrato
@@ -113,10 +157,11 @@ class SupabasePlazaRepository:
         """
         try:
             # Primero obtenemos los IDs de contrato_categorias del contrato
-            result_cc = self.supabase.table('contrato_categorias')\
-                .select('id')\
-                .eq('contrato_id', contrato_id)\
-                .execute()
+            result_cc = await self._db.ejecutar_query(
+                self.supabase.table('contrato_categorias')
+                .select('id')
+                .eq('contrato_id', contrato_id)
+            )
 
             if not result_cc.data:
                 return []
@@ -137,9 +182,9 @@ class SupabasePlazaRepository:
             if limite is not None:
                 query = query.range(offset, offset + limite - 1)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
-            return [Plaza(**data) for data in result.data]
+            return hidratar_confiable(Plaza, result.data)
 
         except Exception as e:
             logger.error(f"Error obteniendo plazas del contrato {contrato_id}: {e}")
@@ -153,12 +198,13 @@ class SupabasePlazaRepository:
         Obtiene las plazas vacantes de una ContratoCategoria.
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('contrato_categoria_id', contrato_categoria_id)\
-                .eq('estatus', EstatusPlaza.VACANTE.value)\
-                .order('numero_plaza', desc=False)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('contrato_categoria_id', contrato_categoria_id)
+                .eq('estatus', EstatusPlaza.VACANTE.value)
+                .order('numero_plaza', desc=False)
+            )
 
             return [Plaza(**data) for data in result.data]
 
@@ -191,7 +237,7 @@ class SupabasePlazaRepository:
                 exclude={'id', 'fecha_creacion', 'fecha_actualizacion'}
             )
 
-            result = self.supabase.table(self.tabla).insert(datos).execute()
+            result = await self._db.ejecutar_query(self.supabase.table(self.tabla).insert(datos))
 
             if not result.data:
                 raise DatabaseError("No se pudo crear la plaza")
@@ -204,6 +250,38 @@ class SupabasePlazaRepository:
             logger.error(f"Error creando plaza: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
 
+    async def crear_lote(self, plazas: List[Plaza]) -> List[Plaza]:
+        """
+        Crea varias plazas con un INSERT por lote (ver `shared/bulk.py`).
+
+        No pre-verifica numero_plaza: la llave única uk_plaza_numero lo
+        hace en la misma sentencia.
+
+        Returns:
+            Plazas creadas en el orden de entrada
+
+        Raises:
+            DuplicateError: Si un numero_plaza ya existe en la categoría
+                (`details['filas']` con los índices en conflicto)
+            DatabaseError: Si hay error de conexión
+        """
+        payloads = [
+            plaza.model_dump(mode='json', exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
+            for plaza in plazas
+        ]
+        try:
+            filas = await escribir_en_lotes(
+                payloads,
+                lambda lote: self.supabase.table(self.tabla).insert(lote).execute().data,
+                self._db.ejecutar,
+            )
+            return [Plaza(**data) for data in filas]
+        except DuplicateError:
+            raise
+        except Exception as e:
+            logger.error(f"Error creando lote de plazas: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}", getattr(e, 'details', None))
+
     async def actualizar(self, plaza: Plaza) -> Plaza:
         """
         Actualiza una plaza existente.
@@ -221,10 +299,11 @@ class SupabasePlazaRepository:
                 exclude={'id', 'contrato_categoria_id', 'numero_plaza', 'fecha_creacion', 'fecha_actualizacion'}
             )
 
-            result = self.supabase.table(self.tabla)\
-                .update(datos)\
-                .eq('id', plaza.id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update(datos)
+                .eq('id', plaza.id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Plaza con ID {plaza.id} no encontrada")
@@ -248,10 +327,11 @@ class SupabasePlazaRepository:
         try:
             plaza = await self.obtener_por_id(id)
 
-            result = self.supabase.table(self.tabla)\
-                .update({'estatus': EstatusPlaza.CANCELADA.value, 'empleado_id': None})\
-                .eq('id', id)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .update({'estatus': EstatusPlaza.CANCELADA.value, 'empleado_id': None})
+                .eq('id', id)
+            )
 
             if not result.data:
                 raise NotFoundError(f"Plaza con ID {id} no encontrada")
@@ -282,7 +362,7 @@ class SupabasePlazaRepository:
             if excluir_id:
                 query = query.neq('id', excluir_id)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
             return len(result.data) > 0
 
         except Exception as e:
@@ -305,7 +385,7 @@ class SupabasePlazaRepository:
             if estatus:
                 query = query.eq('estatus', estatus.value)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             return result.count if result.count is not None else 0
 
@@ -323,10 +403,11 @@ class SupabasePlazaRepository:
         """
         try:
             # Primero obtenemos los IDs de contrato_categorias del contrato
-            result_cc = self.supabase.table('contrato_categorias')\
-                .select('id')\
-                .eq('contrato_id', contrato_id)\
-                .execute()
+            result_cc = await self._db.ejecutar_query(
+                self.supabase.table('contrato_categorias')
+                .select('id')
+                .eq('contrato_id', contrato_id)
+            )
 
             if not result_cc.data:
                 return 0
@@ -340,7 +421,7 @@ class SupabasePlazaRepository:
             if estatus:
                 query = query.eq('estatus', estatus.value)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             return result.count if result.count is not None else 0
 
@@ -356,12 +437,13 @@ class SupabasePlazaRepository:
         Obtiene el siguiente número de plaza disponible.
         """
         try:
-            result = self.supabase.table(self.tabla)\
-                .select('numero_plaza')\
-                .eq('contrato_categoria_id', contrato_categoria_id)\
-                .order('numero_plaza', desc=True)\
-                .limit(1)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('numero_plaza')
+                .eq('contrato_categoria_id', contrato_categoria_id)
+                .order('numero_plaza', desc=True)
+                .limit(1)
+            )
 
             if not result.data:
                 return 1
@@ -381,13 +463,14 @@ class SupabasePlazaRepository:
         """
         try:
             # Primero obtenemos los contrato_categorias con sus categorías
-            result_cc = self.supabase.table('contrato_categorias')\
+            result_cc = await self._db.ejecutar_query(
+                self.supabase.table('contrato_categorias')
                 .select(
                     'id, contrato_id, categoria_puesto_id, '
                     'categorias_puesto:categoria_puesto_id(id, clave, nombre)'
-                )\
-                .eq('contrato_id', contrato_id)\
-                .execute()
+                )
+                .eq('contrato_id', contrato_id)
+            )
 
             if not result_cc.data:
                 return []
@@ -406,19 +489,21 @@ class SupabasePlazaRepository:
             cc_ids = list(cc_map.keys())
 
             # Obtener las plazas
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .in_('contrato_categoria_id', cc_ids)\
-                .neq('estatus', EstatusPlaza.CANCELADA.value)\
-                .order('contrato_categoria_id', desc=False)\
-                .order('numero_plaza', desc=False)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .in_('contrato_categoria_id', cc_ids)
+                .neq('estatus', EstatusPlaza.CANCELADA.value)
+                .order('contrato_categoria_id', desc=False)
+                .order('numero_plaza', desc=False)
+            )
 
             # Obtener el código del contrato
-            result_contrato = self.supabase.table('contratos')\
-                .select('codigo')\
-                .eq('id', contrato_id)\
-                .execute()
+            result_contrato = await self._db.ejecutar_query(
+                self.supabase.table('contratos')
+                .select('codigo')
+                .eq('id', contrato_id)
+            )
 
             contrato_codigo = result_contrato.data[0]['codigo'] if result_contrato.data else ''
 
@@ -431,10 +516,11 @@ class SupabasePlazaRepository:
             # Obtener datos de empleados en una sola consulta
             empleados_map = {}
             if empleado_ids:
-                result_emp = self.supabase.table('empleados')\
-                    .select('id, nombre, apellido_paterno, apellido_materno, curp')\
-                    .in_('id', empleado_ids)\
-                    .execute()
+                result_emp = await self._db.ejecutar_query(
+                    self.supabase.table('empleados')
+                    .select('id, nombre, apellido_paterno, apellido_materno, curp')
+                    .in_('id', empleado_ids)
+                )
 
                 for emp in result_emp.data:
                     nombre = emp.get('nombre', '')
@@ -491,53 +577,96 @@ class SupabasePlazaRepository:
 
             query = query.order('numero_plaza', desc=False)
 
-            result = query.execute()
+            result = await self._db.ejecutar_query(query)
 
             if not result.data:
                 return []
 
-            # Obtener IDs de empleados únicos (no nulos)
-            empleado_ids = list(set(
-                p['empleado_id'] for p in result.data
-                if p.get('empleado_id') is not None
-            ))
+            return await self._enriquecer_con_empleado(result.data)
 
-            # Obtener datos de empleados en una sola consulta
-            empleados_map = {}
-            if empleado_ids:
-                result_emp = self.supabase.table('empleados')\
-                    .select('id, nombre, apellido_paterno, apellido_materno, curp')\
-                    .in_('id', empleado_ids)\
-                    .execute()
+        except Exception as e:
+            logger.error(f"Error obteniendo resumen de contrato_categoria {contrato_categoria_id}: {e}")
+            raise DatabaseError(f"Error de base de datos: {str(e)}")
 
-                for emp in result_emp.data:
-                    nombre = emp.get('nombre', '')
-                    apellido_p = emp.get('apellido_paterno', '')
-                    apellido_m = emp.get('apellido_materno', '')
-                    empleados_map[emp['id']] = {
-                        'nombre': f"{nombre} {apellido_p} {apellido_m}".strip(),
-                        'curp': emp.get('curp', ''),
-                    }
+    async def obtener_resumen_pagina_por_contrato_categoria(
+        self,
+        contrato_categoria_id: int,
+        incluir_canceladas: bool = False,
+        cursor: Optional[str] = None,
+        limite: int = 50,
+    ) -> Pagina[dict]:
+        """
+        Versión por cursor (keyset) de `obtener_resumen_por_contrato_categoria`.
 
-            # Construir resumen con datos de empleado
-            resumen = []
-            for data in result.data:
-                empleado_id = data.get('empleado_id')
-                empleado_data = empleados_map.get(empleado_id, {}) if empleado_id else {}
+        Ordena por numero_plaza (desempate por id); el costo de cada página
+        no depende de su profundidad.
 
-                item = {
-                    **data,
-                    'empleado_nombre': empleado_data.get('nombre', ''),
-                    'empleado_curp': empleado_data.get('curp', ''),
-                }
-                resumen.append(item)
+        Raises:
+            ValidationError: Si el cursor es inválido
+            DatabaseError: Si hay error de BD
+        """
+        query = self.supabase.table(self.tabla)\
+            .select('*')\
+            .eq('contrato_categoria_id', contrato_categoria_id)
 
-            return resumen
+        if not incluir_canceladas:
+            query = query.neq('estatus', EstatusPlaza.CANCELADA.value)
+
+        query = apply_keyset(query, cursor, limite, 'numero_plaza')
+
+        try:
+            result = await self._db.ejecutar_query(query)
+            filas, siguiente = cerrar_pagina(result.data, limite, 'numero_plaza')
+            return Pagina(await self._enriquecer_con_empleado(filas), siguiente)
 
         except Exception as e:
-            logger.error(f"Error obteniendo resumen de contrato_categoria {contrato_categoria_id}: {e}")
+            logger.error(f"Error obteniendo página de plazas de contrato_categoria {contrato_categoria_id}: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
 
+    async def _enriquecer_con_empleado(self, plazas: List[dict]) -> List[dict]:
+        """Agrega nombre y CURP del empleado asignado (una sola consulta)."""
+        if not plazas:
+            return []
+
+        # Obtener IDs de empleados únicos (no nulos)
+        empleado_ids = list(set(
+            p['empleado_id'] for p in plazas
+            if p.get('empleado_id') is not None
+        ))
+
+        # Obtener datos de empleados en una sola consulta
+        empleados_map = {}
+        if empleado_ids:
+            result_emp = await self._db.ejecutar_query(
+                self.supabase.table('empleados')
+                .select('id, nombre, apellido_paterno, apellido_materno, curp')
+                .in_('id', empleado_ids)
+            )
+
+            for emp in result_emp.data:
+                nombre = emp.get('nombre', '')
+                apellido_p = emp.get('apellido_paterno', '')
+                apellido_m = emp.get('apellido_materno', '')
+                empleados_map[emp['id']] = {
+                    'nombre': f"{nombre} {apellido_p} {apellido_m}".strip(),
+                    'curp': emp.get('curp', ''),
+                }
+
+        # Construir resumen con datos de empleado
+        resumen = []
+        for data in plazas:
+            empleado_id = data.get('empleado_id')
+            empleado_data = empleados_map.get(empleado_id, {}) if empleado_id else {}
+
+            item = {
+                **data,
+                'empleado_nombre': empleado_data.get('nombre', ''),
+                'empleado_curp': empleado_data.get('curp', ''),
+            }
+            resumen.append(item)
+
+        return resumen
+
     async def obtener_totales_por_contrato(self, contrato_id: int) -> dict:
         """
         Calcula totales de plazas por estatus para un contrato.
@@ -545,35 +674,94 @@ class SupabasePlazaRepository:
         Returns:
             Dict con totales por estatus y costo total mensual
         """
-        try:
-            plazas = await self.obtener_por_contrato(contrato_id, incluir_canceladas=True)
+        totales = await self.obtener_totales_por_contratos([contrato_id])
+        return totales.get(contrato_id) or _totales_vacios()
 
-            totales = {
-                'total_plazas': len(plazas),
-                'plazas_vacantes': 0,
-                'plazas_ocupadas': 0,
-                'plazas_suspendidas': 0,
-                'plazas_canceladas': 0,
-                'costo_total_mensual': Decimal('0'),
-            }
+    async def obtener_totales_por_contratos(
+        self,
+        contrato_ids: Optional[Sequence[int]] = None,
+    ) -> dict[int, dict]:
+        """
+        Totales de plazas por estatus de varios contratos en una sola llamada.
 
-            for plaza in plazas:
-                if plaza.estatus == EstatusPlaza.VACANTE:
-                    totales['plazas_vacantes'] += 1
-                elif plaza.estatus == EstatusPlaza.OCUPADA:
-                    totales['plazas_ocupadas'] += 1
-                    totales['costo_total_mensual'] += plaza.salario_mensual
-                elif plaza.estatus == EstatusPlaza.SUSPENDIDA:
-                    totales['plazas_suspendidas'] += 1
-                elif plaza.estatus == EstatusPlaza.CANCELADA:
-                    totales['plazas_canceladas'] += 1
+        Usa `totales_plazas_por_contrato` (migración 051), que agrupa en la
+        BD; si la función no existe, lee sólo `estatus` y salario de las
+        plazas y agrupa aquí.
+
+        Args:
+            contrato_ids: Contratos a totalizar (None = todos)
+
+        Returns:
+            {contrato_id: totales}; los contratos sin plazas no aparecen
+
+        Raises:
+            DatabaseError: Si hay error de conexión
+        """
+        if contrato_ids is not None and not contrato_ids:
+            return {}
 
+        try:
+            try:
+                result = await self._db.ejecutar_query(
+                    self.supabase.rpc('totales_plazas_por_contrato', {
+                        'p_contrato_ids': list(contrato_ids) if contrato_ids is not None else None,
+                    })
+                )
+                filas = result.data or []
+            except Exception as e:
+                if not es_funcion_inexistente(e):
+                    raise
+                logger.warning("totales_plazas_por_contrato no existe (migración 051); agrupando en Python")
+                filas = await self._agrupar_plazas_por_contrato(contrato_ids)
+
+            totales: dict[int, dict] = {}
+            for fila in filas:
+                actual = totales.setdefault(fila['contrato_id'], _totales_vacios())
+                _sumar_estatus(actual, fila['estatus'], fila['total'], fila['salario_total'])
             return totales
 
         except Exception as e:
-            logger.error(f"Error calculando totales del contrato {contrato_id}: {e}")
+            logger.error(f"Error calculando totales de plazas por contrato: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
 
+    async def _agrupar_plazas_por_contrato(
+        self,
+        contrato_ids: Optional[Sequence[int]],
+    ) -> List[dict]:
+        """Equivalente en Python de `totales_plazas_por_contrato`."""
+        def _categorias(lote: Optional[list]):
+            query = self.supabase.table('contrato_categorias').select('id, contrato_id')
+            if lote is not None:
+                query = query.in_('contrato_id', lote)
+            return query
+
+        lotes_contratos = (
+            [None] if contrato_ids is None
+            else partir_en_lotes(list(contrato_ids), TAMANO_LOTE_IDS)
+        )
+        contrato_por_categoria: dict[int, int] = {}
+        for lote_contratos in lotes_contratos:
+            async for pagina in iterar(lambda: _categorias(lote_contratos)):
+                contrato_por_categoria.update((cc['id'], cc['contrato_id']) for cc in pagina)
+
+        grupos: dict[tuple, list] = {}
+        for lote in partir_en_lotes(list(contrato_por_categoria), TAMANO_LOTE_IDS):
+            async for pagina in iterar(
+                lambda: self.supabase.table(self.tabla)
+                .select('id, contrato_categoria_id, estatus, salario_mensual')
+                .in_('contrato_categoria_id', lote)
+            ):
+                for plaza in pagina:
+                    clave = (contrato_por_categoria[plaza['contrato_categoria_id']], plaza['estatus'])
+                    grupo = grupos.setdefault(clave, [0, Decimal('0')])
+                    grupo[0] += 1
+                    grupo[1] += Decimal(str(plaza.get('salario_mensual') or 0))
+
+        return [
+            {'contrato_id': cid, 'estatus': estatus, 'total': total, 'salario_total': salario}
+            for (cid, estatus), (total, salario) in grupos.items()
+        ]
+
     async def obtener_totales_por_contrato_categoria(
         self,
         contrato_categoria_id: int
@@ -636,23 +824,25 @@ class SupabasePlazaRepository:
         """
         try:
             # Obtener contrato_categorias con datos relacionados
-            result_cc = self.supabase.table('contrato_categorias')\
+            result_cc = await self._db.ejecutar_query(
+                self.supabase.table('contrato_categorias')
                 .select(
                     'id, contrato_id, '
                     'contratos:contrato_id(id, codigo, empresa_id, '
                     'empresas:empresa_id(id, nombre_comercial)), '
                     'categorias_puesto:categoria_puesto_id(id, clave, nombre)'
-                )\
-                .execute()
+                )
+            )
 
             if not result_cc.data:
                 return []
 
             # Obtener todas las plazas no canceladas
-            result_plazas = self.supabase.table(self.tabla)\
-                .select('contrato_categoria_id, estatus')\
-                .neq('estatus', EstatusPlaza.CANCELADA.value)\
-                .execute()
+            result_plazas = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('contrato_categoria_id, estatus')
+                .neq('estatus', EstatusPlaza.CANCELADA.value)
+            )
 
             # Contar plazas por contrato_categoria
             conteo_plazas = {}
@@ -717,22 +907,24 @@ class SupabasePlazaRepository:
         """
         try:
             # Obtener contrato_categorias con datos relacionados
-            result_cc = self.supabase.table('contrato_categorias')\
+            result_cc = await self._db.ejecutar_query(
+                self.supabase.table('contrato_categorias')
                 .select(
                     'id, contrato_id, cantidad_maxima, '
                     'contratos:contrato_id(id, codigo, empresa_id, tiene_personal, estatus, '
                     'empresas:empresa_id(id, nombre_comercial))'
-                )\
-                .execute()
+                )
+            )
 
             if not result_cc.data:
                 return []
 
             # Obtener conteo de plazas por contrato_categoria (no canceladas)
-            result_plazas = self.supabase.table(self.tabla)\
-                .select('contrato_categoria_id')\
-                .neq('estatus', EstatusPlaza.CANCELADA.value)\
-                .execute()
+            result_plazas = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('contrato_categoria_id')
+                .neq('estatus', EstatusPlaza.CANCELADA.value)
+            )
 
             # Contar plazas por contrato_categoria
             conteo_plazas = {}
@@ -794,36 +986,40 @@ class SupabasePlazaRepository:
         """
         try:
             if empresa_id:
-                result_contratos = self.supabase.table('contratos')\
-                    .select('id')\
-                    .eq('empresa_id', empresa_id)\
-                    .execute()
+                result_contratos = await self._db.ejecutar_query(
+                    self.supabase.table('contratos')
+                    .select('id')
+                    .eq('empresa_id', empresa_id)
+                )
 
                 contrato_ids = [item['id'] for item in (result_contratos.data or [])]
                 if not contrato_ids:
                     return []
 
-                result_cc = self.supabase.table('contrato_categorias')\
-                    .select('id')\
-                    .in_('contrato_id', contrato_ids)\
-                    .execute()
+                result_cc = await self._db.ejecutar_query(
+                    self.supabase.table('contrato_categorias')
+                    .select('id')
+                    .in_('contrato_id', contrato_ids)
+                )
 
                 contrato_categoria_ids = [item['id'] for item in (result_cc.data or [])]
                 if not contrato_categoria_ids:
                     return []
 
-                result = self.supabase.table(self.tabla)\
-                    .select('empleado_id')\
-                    .in_('contrato_categoria_id', contrato_categoria_ids)\
-                    .eq('estatus', EstatusPlaza.OCUPADA.value)\
-                    .not_.is_('empleado_id', 'null')\
-                    .execute()
+                result = await self._db.ejecutar_query(
+                    self.supabase.table(self.tabla)
+                    .select('empleado_id')
+                    .in_('contrato_categoria_id', contrato_categoria_ids)
+                    .eq('estatus', EstatusPlaza.OCUPADA.value)
+                    .not_.is_('empleado_id', 'null')
+                )
             else:
-                result = self.supabase.table(self.tabla)\
-                    .select('empleado_id')\
-                    .eq('estatus', EstatusPlaza.OCUPADA.value)\
-                    .not_.is_('empleado_id', 'null')\
-                    .execute()
+                result = await self._db.ejecutar_query(
+                    self.supabase.table(self.tabla)
+                    .select('empleado_id')
+                    .eq('estatus', EstatusPlaza.OCUPADA.value)
+                    .not_.is_('empleado_id', 'null')
+                )
 
             # Extraer IDs únicos
             empleado_ids = list(set(
@@ -854,11 +1050,12 @@ class SupabasePlazaRepository:
         """
         try:
             # Obtener plazas por estatus
-            result = self.supabase.table(self.tabla)\
-                .select('*')\
-                .eq('estatus', estatus.value)\
-                .limit(limite)\
-                .execute()
+            result = await self._db.ejecutar_query(
+                self.supabase.table(self.tabla)
+                .select('*')
+                .eq('estatus', estatus.value)
+                .limit(limite)
+            )
 
             if not result.data:
                 return []
@@ -867,14 +1064,15 @@ class SupabasePlazaRepository:
             cc_ids = list(set(p['contrato_categoria_id'] for p in result.data))
 
             # Obtener datos de contrato_categorias con sus relaciones
-            result_cc = self.supabase.table('contrato_categorias')\
+            result_cc = await self._db.ejecutar_query(
+                self.supabase.table('contrato_categorias')
                 .select(
                     'id, contrato_id, categoria_puesto_id, '
                     'contratos:contrato_id(id, codigo), '
                     'categorias_puesto:categoria_puesto_id(id, clave, nombre)'
-                )\
-                .in_('id', cc_ids)\
-                .execute()
+                )
+                .in_('id', cc_ids)
+            )
 
             # Crear mapa de contrato_categoria -> datos
             cc_map = {}
@@ -1,17 +1,81 @@
 """Helpers reutilizables para repositorios."""
 
+from .bulk import (
+    CONCURRENCIA_LOTES,
+    TAMANO_LOTE_ESCRITURA,
+    escribir_en_lotes,
+    filas_en_conflicto,
+    partir_en_lotes,
+)
+from .cache import (
+    OPERACION_POR_ID,
+    CacheTabla,
+    RegistroCache,
+    cache_consultas,
+    normalizar_filtros,
+)
+from .data_loader import (
+    DataLoader,
+    TAMANO_LOTE_IDS,
+    alcance_loaders,
+    con_alcance_loaders,
+    limpiar_loader,
+    obtener_loader,
+)
+from .hidratacion import (
+    columnas_select,
+    hidratar,
+    hidratar_confiable,
+)
 from .query_helpers import (
+    Pagina,
     apply_date_range_filter,
     apply_eq_filters,
+    apply_keyset,
     apply_order,
     apply_pagination,
     build_ilike_or,
+    cerrar_pagina,
+    decode_cursor,
+    encode_cursor,
+    es_funcion_inexistente,
+    iterar,
+    normalizar_busqueda,
+    TAMANO_PAGINA_ITERAR,
 )
 
 __all__ = [
+    "CONCURRENCIA_LOTES",
+    "TAMANO_LOTE_ESCRITURA",
+    "escribir_en_lotes",
+    "filas_en_conflicto",
+    "partir_en_lotes",
+    "OPERACION_POR_ID",
+    "CacheTabla",
+    "RegistroCache",
+    "cache_consultas",
+    "normalizar_filtros",
+    "DataLoader",
+    "TAMANO_LOTE_IDS",
+    "alcance_loaders",
+    "con_alcance_loaders",
+    "limpiar_loader",
+    "obtener_loader",
+    "columnas_select",
+    "hidratar",
+    "hidratar_confiable",
+    "Pagina",
     "apply_date_range_filter",
     "apply_eq_filters",
+    "apply_keyset",
     "apply_order",
     "apply_pagination",
     "build_ilike_or",
+    "cerrar_pagina",
+    "decode_cursor",
+    "encode_cursor",
+    "es_funcion_inexistente",
+    "iterar",
+    "normalizar_busqueda",
+    "TAMANO_PAGINA_ITERAR",
 ]
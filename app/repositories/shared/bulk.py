@@ -0,0 +1,154 @@
+"""
+Escritura por lotes (INSERT / UPSERT / UPDATE) para repositorios.
+
+Parte los payloads en lotes de `tamano_lote` filas y ejecuta los lotes con
+concurrencia acotada. Cada lote es una sola sentencia (atómica); el
+conjunto NO lo es: si un lote falla, los que ya terminaron quedan
+escritos, y el error lo dice en `error.details`:
+
+- `escritas`: índices (en el orden de entrada) de las filas de los lotes
+  que sí se confirmaron
+- `filas_escritas`: lo que la BD regresó para esos lotes
+
+Así quien reintente o caiga a fila por fila puede saltarse lo escrito.
+Los errores de unicidad se traducen a `DuplicateError` con los índices de
+las filas que chocan en `error.details['filas']`; los demás a
+`DatabaseError`.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Sequence
+
+from app.core.exceptions import ApplicationError, DatabaseError, DuplicateError
+
+TAMANO_LOTE_ESCRITURA = 500
+CONCURRENCIA_LOTES = 4
+
+# Detalle de Postgres: "Key (curp)=(ABC...) already exists." (o multi-columna)
+_PATRON_LLAVE_DUPLICADA = re.compile(r"Key \((?P<campos>[^)]*)\)=\((?P<valores>.*?)\) already exists")
+
+
+def partir_en_lotes(items: Sequence[Any], tamano: int) -> list[list[Any]]:
+    """Parte `items` en listas de a lo más `tamano` elementos."""
+    if tamano < 1:
+        raise ValueError("tamano debe ser >= 1")
+    return [list(items[i:i + tamano]) for i in range(0, len(items), tamano)]
+
+
+def es_error_unicidad(error: Exception) -> bool:
+    texto = str(error).lower()
+    return "23505" in texto or "unique" in texto or "duplicate" in texto
+
+
+def filas_en_conflicto(error: Exception, payloads: Sequence[dict]) -> tuple[str | None, str | None, list[int]]:
+    """
+    Ubica las filas de `payloads` que causaron una violación de unicidad.
+
+    Returns:
+        (campos, valores, índices). Si el detalle de Postgres no trae la
+        llave, regresa (None, None, []).
+    """
+    match = _PATRON_LLAVE_DUPLICADA.search(str(error))
+    if not match:
+        return None, None, []
+
+    campos = [c.strip() for c in match.group("campos").split(",")]
+    valores = [v.strip() for v in match.group("valores").split(",")]
+    if len(campos) != len(valores):
+        return match.group("campos"), match.group("valores"), []
+
+    indices = [
+        i for i, fila in enumerate(payloads)
+        if all(str(fila.get(c)) == v for c, v in zip(campos, valores))
+    ]
+    return match.group("campos"), match.group("valores"), indices
+
+
+async def escribir_en_lotes(
+    payloads: Sequence[dict],
+    escribir_lote: Callable[[list[dict]], list[dict]],
+    ejecutar: Callable[[Callable[[], Any]], Awaitable[Any]],
+    *,
+    tamano_lote: int = TAMANO_LOTE_ESCRITURA,
+    concurrencia: int = CONCURRENCIA_LOTES,
+) -> list[dict]:
+    """
+    Ejecuta `escribir_lote` sobre cada lote y concatena las filas devueltas.
+
+    Args:
+        payloads: Filas a escribir (dicts listos para PostgREST).
+        escribir_lote: Función síncrona que escribe un lote y retorna las
+            filas resultantes (p. ej. `.insert(lote).execute().data`).
+        ejecutar: Corrutina que corre una función síncrona (el pool de I/O
+            del repositorio, o inline).
+        tamano_lote: Filas por sentencia.
+        concurrencia: Lotes en vuelo a la vez.
+
+    Returns:
+        Filas devueltas por la BD, en el orden de los lotes (y por tanto
+        de la entrada).
+
+    Raises:
+        DuplicateError: Si algún lote viola unicidad (con las filas en
+            `details['filas']`).
+        DatabaseError: El primer error de otro tipo (los ApplicationError
+            se propagan tal cual).
+        Ambos traen `details['escritas']` y `details['filas_escritas']`
+        con lo que sí quedó escrito.
+    """
+    if not payloads:
+        return []
+
+    lotes = partir_en_lotes(payloads, tamano_lote)
+    semaforo = asyncio.Semaphore(max(1, concurrencia))
+
+    async def _correr(lote: list[dict]) -> list[dict]:
+        async with semaforo:
+            return await ejecutar(lambda: escribir_lote(lote)) or []
+
+    resultados = await asyncio.gather(*(_correr(lote) for lote in lotes), return_exceptions=True)
+
+    filas: list[dict] = []
+    escritas: list[int] = []
+    fallido = None
+    for numero, resultado in enumerate(resultados):
+        if isinstance(resultado, BaseException):
+            fallido = fallido or (numero, resultado)
+            continue
+        filas.extend(resultado)
+        inicio = numero * tamano_lote
+        escritas.extend(range(inicio, inicio + len(lotes[numero])))
+
+    if fallido is None:
+        return filas
+
+    numero, error = fallido
+    if not isinstance(error, Exception):  # p. ej. CancelledError
+        raise error
+    if es_error_unicidad(error):
+        excepcion = _duplicado_de_lote(error, lotes[numero], numero * tamano_lote)
+    elif isinstance(error, ApplicationError):
+        excepcion = error
+    else:
+        excepcion = DatabaseError(str(error))
+    excepcion.details["escritas"] = escritas
+    excepcion.details["filas_escritas"] = filas
+    if excepcion is error:
+        raise excepcion
+    raise excepcion from error
+
+
+def _duplicado_de_lote(error: Exception, lote: list[dict], desplazamiento: int) -> DuplicateError:
+    campos, valores, indices = filas_en_conflicto(error, lote)
+    filas = [desplazamiento + i for i in indices]
+    if campos:
+        mensaje = f"Ya existe un registro con {campos} = {valores}"
+        if filas:
+            mensaje += f" (filas {', '.join(str(f + 1) for f in filas)})"
+    else:
+        mensaje = "Ya existe un registro con esos datos"
+    duplicado = DuplicateError(mensaje, field=campos, value=valores)
+    duplicado.details["filas"] = filas
+    return duplicado
@@ -0,0 +1,200 @@
+"""
+Cache read-through por tabla para repositorios y servicios directos.
+
+Cada tabla tiene su propia `CacheTabla` (LRU acotado + TTL). Las entradas
+se identifican por la "forma" de la consulta: una tupla con el nombre de
+la operación y sus argumentos, p. ej. `('por_id', 5)` o
+`('todos', 100, 0, 'id', True, (('estatus', 'ACTIVO'),))`.
+
+Las escrituras invalidan sólo lo que puede haber cambiado:
+- `invalidar(tabla, id)`: la entrada `('por_id', id)` y todas las
+  consultas que no son por ID (listados, conteos, búsquedas).
+- `invalidar(tabla)`: toda la tabla.
+
+El registro es por proceso: otro worker sólo ve los cambios cuando expira
+el TTL, por eso se usa para catálogos que cambian pocas veces al mes.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from pydantic import BaseModel
+
+OPERACION_POR_ID = "por_id"
+
+AUSENTE = object()
+
+
+@dataclass
+class EstadisticasCache:
+    """Contadores de una tabla cacheada."""
+
+    hits: int = 0
+    misses: int = 0
+    expiradas: int = 0
+    desalojadas: int = 0
+    invalidadas: int = 0
+
+    @property
+    def tasa_hits(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _copiar(valor: Any) -> Any:
+    """Copia superficial para que el llamador no mute la entrada cacheada."""
+    if isinstance(valor, BaseModel):
+        return valor.model_copy()
+    if isinstance(valor, list):
+        return [_copiar(v) for v in valor]
+    if isinstance(valor, dict):
+        return dict(valor)
+    return valor
+
+
+def _es_por_id(clave: Hashable) -> bool:
+    return isinstance(clave, tuple) and bool(clave) and clave[0] == OPERACION_POR_ID
+
+
+def normalizar_filtros(filtros: dict[str, Any] | None) -> tuple:
+    """Convierte un dict de filtros en una parte hashable de la clave."""
+    return tuple(sorted((filtros or {}).items()))
+
+
+class CacheTabla:
+    """Cache LRU con TTL para las consultas de una tabla."""
+
+    def __init__(self, tabla: str, ttl_segundos: float, max_entradas: int = 256):
+        self.tabla = tabla
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self.stats = EstadisticasCache()
+        self.generacion = 0
+        self._entradas: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obtener(self, clave: Hashable) -> Any:
+        """Retorna una copia del valor, o `AUSENTE` si no está o expiró."""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.stats.misses += 1
+                return AUSENTE
+            expira, valor = entrada
+            if expira <= time.monotonic():
+                del self._entradas[clave]
+                self.stats.expiradas += 1
+                self.stats.misses += 1
+                return AUSENTE
+            self._entradas.move_to_end(clave)
+            self.stats.hits += 1
+        return _copiar(valor)
+
+    def guardar(self, clave: Hashable, valor: Any, generacion: int | None = None) -> None:
+        """
+        Guarda `valor` bajo `clave`.
+
+        Si se pasa la `generacion` leída antes de consultar la BD y hubo una
+        invalidación entre tanto, el valor puede estar viejo y no se guarda.
+        """
+        with self._lock:
+            if generacion is not None and generacion != self.generacion:
+                return
+            self._entradas[clave] = (time.monotonic() + self.ttl_segundos, _copiar(valor))
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.stats.desalojadas += 1
+
+    def invalidar(self, id: Any = None) -> None:
+        """Invalida la tabla completa, o sólo lo afectado por escribir `id`."""
+        if id is None:
+            self._eliminar(lambda clave: True)
+        else:
+            self._eliminar(lambda clave: not _es_por_id(clave) or clave == (OPERACION_POR_ID, id))
+
+    def invalidar_listados(self) -> None:
+        """Invalida listados, conteos y búsquedas (p. ej. tras un INSERT)."""
+        self._eliminar(lambda clave: not _es_por_id(clave))
+
+    def _eliminar(self, predicado: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            eliminadas = [clave for clave in self._entradas if predicado(clave)]
+            for clave in eliminadas:
+                del self._entradas[clave]
+            self.generacion += 1
+            self.stats.invalidadas += len(eliminadas)
+
+    def leer_o_cargar(self, clave: Hashable, cargar: Callable[[], Any]) -> Any:
+        """Versión síncrona de read-through (para servicios directos)."""
+        valor = self.obtener(clave)
+        if valor is not AUSENTE:
+            return valor
+        generacion = self.generacion
+        valor = cargar()
+        if valor is not None:
+            self.guardar(clave, valor, generacion)
+        return valor
+
+
+class RegistroCache:
+    """Registro de caches por nombre de tabla (uno por proceso)."""
+
+    def __init__(self):
+        self._tablas: dict[str, CacheTabla] = {}
+        self._lock = threading.Lock()
+
+    def tabla(self, tabla: str, ttl_segundos: float, max_entradas: int = 256) -> CacheTabla:
+        """
+        Retorna la cache de `tabla`, creándola si no existe.
+
+        Repositorio y servicio directo de una misma tabla comparten la
+        instancia, así una escritura en uno invalida las lecturas del otro.
+        Si ya existe, se conservan el TTL más corto y el límite más alto.
+        """
+        with self._lock:
+            cache = self._tablas.get(tabla)
+            if cache is None:
+                cache = CacheTabla(tabla, ttl_segundos, max_entradas)
+                self._tablas[tabla] = cache
+            else:
+                cache.ttl_segundos = min(cache.ttl_segundos, ttl_segundos)
+                cache.max_entradas = max(cache.max_entradas, max_entradas)
+            return cache
+
+    def invalidar(self, tabla: str, id: Any = None) -> None:
+        cache = self._tablas.get(tabla)
+        if cache is not None:
+            cache.invalidar(id)
+
+    def limpiar(self) -> None:
+        """Vacía todas las tablas (p. ej. tras una migración o en tests)."""
+        for cache in list(self._tablas.values()):
+            cache.invalidar()
+
+    def estadisticas(self) -> dict[str, dict[str, Any]]:
+        """Hits, misses y tamaño por tabla."""
+        return {
+            tabla: {
+                "entradas": len(cache),
+                "max_entradas": cache.max_entradas,
+                "ttl_segundos": cache.ttl_segundos,
+                "hits": cache.stats.hits,
+                "misses": cache.stats.misses,
+                "tasa_hits": round(cache.stats.tasa_hits, 4),
+                "expiradas": cache.stats.expiradas,
+                "desalojadas": cache.stats.desalojadas,
+                "invalidadas": cache.stats.invalidadas,
+            }
+            for tabla, cache in sorted(self._tablas.items())
+        }
+
+
+cache_consultas = RegistroCache()
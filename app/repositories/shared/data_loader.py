@@ -0,0 +1,167 @@
+"""
+DataLoader: agrupa y deduplica lecturas por ID dentro de una petición.
+
+Las llamadas concurrentes a `cargar(id)` sobre el mismo loader se juntan
+en una sola consulta `.in_('id', ids)` y cada ID queda memorizado para el
+resto de la petición:
+
+    loader = repo.loader()
+    contratos = await asyncio.gather(*(loader.cargar(i) for i in ids))  # 1 query
+
+El alcance se delimita con `alcance_loaders()`: el middleware de la API lo
+abre por request; en Reflex lo abren `_montar_pagina`/`_recargar_datos` de
+`BaseState` y los handlers decorados con `con_alcance_loaders`. Fuera de un
+alcance `obtener_loader` devuelve un loader nuevo, así que no hay
+memorización entre peticiones.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+TAMANO_LOTE_IDS = 200
+"""Máximo de IDs por `.in_()`: acota el largo de la URL de PostgREST."""
+
+_alcance: ContextVar[Optional[Dict[str, "DataLoader"]]] = ContextVar(
+    "alcance_loaders", default=None
+)
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Agrupa `cargar(clave)` concurrentes en llamadas a `cargar_lote`.
+
+    Args:
+        cargar_lote: Corrutina que recibe una lista de claves únicas y
+            retorna `{clave: valor}`; las claves ausentes resuelven a None.
+        max_lote: Máximo de claves por llamada a `cargar_lote`.
+    """
+
+    def __init__(
+        self,
+        cargar_lote: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_lote: int = TAMANO_LOTE_IDS,
+    ):
+        self._cargar_lote = cargar_lote
+        self.max_lote = max_lote
+        self._futuros: Dict[K, asyncio.Future] = {}
+        self._pendientes: List[K] = []
+        self._despacho_programado = False
+        self._tareas: set[asyncio.Task] = set()
+        self.lotes_ejecutados = 0
+
+    async def cargar(self, clave: K) -> Optional[V]:
+        """Retorna el valor de `clave` (None si no existe)."""
+        futuro = self._futuros.get(clave)
+        if futuro is None:
+            loop = asyncio.get_running_loop()
+            futuro = loop.create_future()
+            self._futuros[clave] = futuro
+            self._pendientes.append(clave)
+            if not self._despacho_programado:
+                self._despacho_programado = True
+                loop.call_soon(self._programar_despacho)
+        # shield: si se cancela quien espera, no se cancela el futuro compartido
+        return await asyncio.shield(futuro)
+
+    async def cargar_muchos(self, claves: Iterable[K]) -> List[Optional[V]]:
+        """Carga varias claves en el mismo lote, preservando el orden."""
+        return list(await asyncio.gather(*(self.cargar(c) for c in claves)))
+
+    def precargar(self, clave: K, valor: V) -> None:
+        """Siembra un valor ya conocido (p. ej. obtenido por otra consulta)."""
+        if clave not in self._futuros:
+            futuro = asyncio.get_running_loop().create_future()
+            futuro.set_result(valor)
+            self._futuros[clave] = futuro
+
+    def limpiar(self, clave: Optional[K] = None) -> None:
+        """Olvida una clave (o todas) para que la próxima carga vaya a BD."""
+        if clave is None:
+            self._futuros = {
+                k: f for k, f in self._futuros.items() if not f.done()
+            }
+        else:
+            futuro = self._futuros.get(clave)
+            if futuro is not None and futuro.done():
+                del self._futuros[clave]
+
+    def _programar_despacho(self) -> None:
+        tarea = asyncio.ensure_future(self._despachar())
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _despachar(self) -> None:
+        # Un ciclo extra para que las corrutinas hermanas de un gather()
+        # alcancen a encolar sus claves antes de consultar.
+        await asyncio.sleep(0)
+        pendientes, self._pendientes = self._pendientes, []
+        self._despacho_programado = False
+
+        for inicio in range(0, len(pendientes), self.max_lote):
+            lote = pendientes[inicio:inicio + self.max_lote]
+            self.lotes_ejecutados += 1
+            try:
+                resultados = await self._cargar_lote(lote)
+            except Exception as e:
+                for clave in lote:
+                    futuro = self._futuros.pop(clave, None)
+                    if futuro is not None and not futuro.done():
+                        futuro.set_exception(e)
+                continue
+            for clave in lote:
+                futuro = self._futuros.get(clave)
+                if futuro is not None and not futuro.done():
+                    futuro.set_result(resultados.get(clave))
+
+
+@contextmanager
+def alcance_loaders():
+    """Abre un alcance (request/event handler) para memorizar loaders."""
+    token = _alcance.set({})
+    try:
+        yield
+    finally:
+        _alcance.reset(token)
+
+
+def con_alcance_loaders(fn):
+    """
+    Decorador: corre la corrutina `fn` dentro de `alcance_loaders()`.
+
+    Para event handlers async que no son generadores (un `yield` dentro
+    del alcance lo dejaría abierto entre eventos).
+    """
+    @functools.wraps(fn)
+    async def envuelto(*args, **kwargs):
+        with alcance_loaders():
+            return await fn(*args, **kwargs)
+    return envuelto
+
+
+def obtener_loader(
+    nombre: str,
+    cargar_lote: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+    max_lote: int = TAMANO_LOTE_IDS,
+) -> DataLoader:
+    """Retorna el loader `nombre` del alcance actual (o uno nuevo si no hay)."""
+    loaders = _alcance.get()
+    if loaders is None:
+        return DataLoader(cargar_lote, max_lote)
+    loader = loaders.get(nombre)
+    if loader is None:
+        loader = loaders[nombre] = DataLoader(cargar_lote, max_lote)
+    return loader
+
+
+def limpiar_loader(nombre: str, clave: Any = None) -> None:
+    """Invalida `clave` (o todo) del loader `nombre` en el alcance actual."""
+    loaders = _alcance.get()
+    if loaders and nombre in loaders:
+        loaders[nombre].limpiar(clave)
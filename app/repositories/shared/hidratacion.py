@@ -0,0 +1,152 @@
+"""
+Hidratación "de confianza" de filas leídas de nuestra propia BD.
+
+`Entidad(**fila)` corre todos los validadores Python de la entidad (regex
+de CURP/RFC/NSS, normalización de nombres, etc.). Para filas que ya
+pasaron esas reglas al escribirse, basta con convertir tipos (fechas,
+Decimal, enums, UUID): `hidratar_confiable` lo hace en una sola pasada de
+pydantic-core sobre un TypedDict con las mismas anotaciones pero sin
+validadores ni restricciones, y arma la entidad como `model_construct`.
+
+Con proyección (`campos=`), los campos no seleccionados toman su default;
+los obligatorios sin default quedan ausentes, así que sólo deben leerse
+los campos pedidos.
+
+Benchmark: `python -m app.benchmarks.bench_hidratacion`.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Type, TypeVar, get_args
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _admite_nulo(anotacion: Any) -> bool:
+    return anotacion is Any or anotacion is None or type(None) in get_args(anotacion)
+
+
+class _Plan:
+    __slots__ = ("adaptador", "renombres", "nulos_a_default", "defaults", "fabricas")
+
+    def __init__(self, adaptador, renombres, nulos_a_default, defaults, fabricas):
+        self.adaptador = adaptador
+        self.renombres = renombres
+        self.nulos_a_default = nulos_a_default
+        self.defaults = defaults
+        self.fabricas = fabricas
+
+
+@lru_cache(maxsize=None)
+def _plan(modelo: Type[BaseModel]) -> _Plan:
+    """Precalcula lo necesario para hidratar `modelo` (una vez por clase)."""
+    anotaciones: dict[str, Any] = {}
+    renombres: dict[str, str] = {}
+    nulos_a_default: list[str] = []
+    defaults: dict[str, Any] = {}
+    fabricas: dict[str, Any] = {}
+    for nombre, campo in modelo.model_fields.items():
+        columna = campo.alias or nombre
+        # Todas las columnas aceptan NULL: los validadores 'before' que lo
+        # normalizan (p. ej. `codigo` None -> "") no corren aquí.
+        anotaciones[columna] = Optional[campo.annotation]
+        if columna != nombre:
+            renombres[columna] = nombre
+        if campo.is_required():
+            continue
+        if not _admite_nulo(campo.annotation):
+            nulos_a_default.append(nombre)
+        if campo.default_factory is not None:
+            fabricas[nombre] = (campo.default_factory, campo.default_factory_takes_validated_data)
+        else:
+            defaults[nombre] = campo.default
+
+    fila = TypedDict(f"_Fila{modelo.__name__}", anotaciones, total=False)
+    fila.__pydantic_config__ = ConfigDict(
+        use_enum_values=bool(modelo.model_config.get("use_enum_values", False)),
+        extra="ignore",
+    )
+    return _Plan(
+        adaptador=TypeAdapter(List[fila]),
+        renombres=renombres,
+        nulos_a_default=tuple(nulos_a_default),
+        defaults=defaults,
+        fabricas=fabricas,
+    )
+
+
+def hidratar_confiable(modelo: Type[M], filas: Iterable[dict]) -> List[M]:
+    """
+    Construye entidades sin correr validadores Python.
+
+    Equivale a `model_construct` sobre filas con tipos ya convertidos, pero
+    sin su costo por campo: los defaults se precalculan por clase y la
+    instancia se arma asignando `__dict__` directamente.
+
+    Sólo para filas leídas de la BD propia; datos capturados por el
+    usuario deben pasar por `modelo(**datos)`.
+    """
+    plan = _plan(modelo)
+    convertidas = plan.adaptador.validate_python(
+        filas if isinstance(filas, list) else list(filas)
+    )
+    if modelo.__private_attributes__:
+        return [modelo.model_construct(**_a_campos(plan, f)) for f in convertidas]
+
+    defaults, fabricas = plan.defaults, plan.fabricas
+    nuevo, asignar = modelo.__new__, object.__setattr__
+    entidades: List[M] = []
+    for fila in convertidas:
+        fila = _a_campos(plan, fila)
+        valores = dict(defaults)
+        valores.update(fila)
+        for nombre, (fabrica, toma_datos) in fabricas.items():
+            if nombre not in fila:
+                valores[nombre] = fabrica(valores) if toma_datos else fabrica()
+        entidad = nuevo(modelo)
+        asignar(entidad, "__dict__", valores)
+        asignar(entidad, "__pydantic_fields_set__", set(fila))
+        asignar(entidad, "__pydantic_extra__", None)
+        asignar(entidad, "__pydantic_private__", None)
+        entidades.append(entidad)
+    return entidades
+
+
+def _a_campos(plan: _Plan, fila: dict) -> dict:
+    """Renombra alias -> campo y descarta NULLs de campos no anulables."""
+    if plan.renombres:
+        fila = {plan.renombres.get(c, c): v for c, v in fila.items()}
+    for nombre in plan.nulos_a_default:
+        if nombre in fila and fila[nombre] is None:
+            del fila[nombre]
+    return fila
+
+
+def hidratar(
+    modelo: Type[M],
+    filas: Iterable[dict],
+    confiable: bool = False,
+) -> List[M]:
+    """`hidratar_confiable` si `confiable`, si no validación completa."""
+    if confiable:
+        return hidratar_confiable(modelo, filas)
+    return [modelo(**fila) for fila in filas]
+
+
+def columnas_select(campos: Optional[Sequence[str]], obligatorios: Sequence[str] = ("id",)) -> str:
+    """
+    Arma el select de PostgREST para una proyección.
+
+    `campos=None` equivale a '*'. Los `obligatorios` (p. ej. 'id' o la
+    columna de orden de un cursor) se agregan si faltan.
+    """
+    if not campos:
+        return "*"
+    seleccion = list(dict.fromkeys(campos))
+    for campo in obligatorios:
+        if campo not in seleccion:
+            seleccion.append(campo)
+    return ", ".join(seleccion)
@@ -1,5 +1,21 @@
 """Helpers reutilizables para componer queries de Supabase."""
 
+import base64
+import binascii
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field as campo_dc
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, TypeVar
+
+from app.core.exceptions import ValidationError
+
+T = TypeVar("T")
+
+# Filas por página al iterar. Debe ser <= max-rows de PostgREST (1000 en
+# Supabase por defecto): una página corta se interpreta como la última.
+TAMANO_PAGINA_ITERAR = 1000
+
 
 def apply_eq_filters(query, filters: dict | None):
     """Aplica filtros eq cuando el valor no es None/empty."""
@@ -27,6 +43,92 @@ def apply_pagination(query, limit: int | None, offset: int = 0):
     return query.range(offset, offset + limit - 1)
 
 
+@dataclass
+class Pagina(Generic[T]):
+    """Página de resultados con cursor opaco hacia la siguiente."""
+
+    items: list[T] = campo_dc(default_factory=list)
+    siguiente_cursor: str | None = None
+
+    @property
+    def hay_mas(self) -> bool:
+        return self.siguiente_cursor is not None
+
+
+def encode_cursor(orden_campo: str, valor: Any, id: int) -> str:
+    """Serializa la posición (valor de orden, id) como cursor opaco."""
+    crudo = json.dumps({"o": orden_campo, "v": valor, "id": id}, default=str)
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, orden_campo: str) -> tuple[Any, int]:
+    """
+    Recupera (valor, id) de un cursor emitido por `encode_cursor`.
+
+    Raises:
+        ValidationError: Si el cursor está corrupto o pertenece a otro orden.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if datos["o"] != orden_campo:
+            raise ValueError("orden distinto")
+        return datos["v"], int(datos["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise ValidationError(f"Cursor de paginación inválido: {e}")
+
+
+def _literal_postgrest(valor: Any) -> str:
+    """Entrecomilla un valor para usarlo dentro de un filtro `or=(...)`."""
+    texto = str(valor).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{texto}"'
+
+
+def apply_keyset(
+    query,
+    cursor: str | None,
+    limite: int,
+    orden_campo: str = "id",
+    *,
+    desc: bool = False,
+):
+    """
+    Aplica paginación por cursor (keyset) ordenando por (orden_campo, id).
+
+    A diferencia de `apply_pagination`, el costo no crece con la
+    profundidad: la BD salta directo a la posición del cursor usando el
+    índice en vez de recorrer y descartar `offset` filas. `orden_campo`
+    debe ser NOT NULL. Pide `limite + 1` filas para saber si hay más;
+    usar `cerrar_pagina` sobre el resultado.
+    """
+    op = "lt" if desc else "gt"
+    if cursor:
+        valor, ultimo_id = decode_cursor(cursor, orden_campo)
+        if orden_campo == "id":
+            query = query.filter("id", op, ultimo_id)
+        else:
+            literal = _literal_postgrest(valor)
+            query = query.or_(
+                f"{orden_campo}.{op}.{literal},"
+                f"and({orden_campo}.eq.{literal},id.{op}.{ultimo_id})"
+            )
+    query = query.order(orden_campo, desc=desc)
+    if orden_campo != "id":
+        query = query.order("id", desc=desc)
+    return query.limit(limite + 1)
+
+
+def cerrar_pagina(
+    filas: list[dict], limite: int, orden_campo: str = "id"
+) -> tuple[list[dict], str | None]:
+    """Recorta el resultado de `apply_keyset` y genera el siguiente cursor."""
+    if len(filas) <= limite:
+        return filas, None
+    filas = filas[:limite]
+    ultima = filas[-1]
+    return filas, encode_cursor(orden_campo, ultima[orden_campo], ultima["id"])
+
+
 def apply_date_range_filter(query, field: str, start: str | None = None, end: str | None = None):
     """Aplica filtros de rango de fecha opcionales."""
     if start:
@@ -40,3 +142,72 @@ def build_ilike_or(term: str, fields: list[str]) -> str:
     """Construye OR para búsquedas ILIKE en múltiples campos."""
     term = term.strip()
     return ",".join([f"{field}.ilike.%{term}%" for field in fields if field])
+
+
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def normalizar_busqueda(texto: str | None) -> str:
+    """
+    Minúsculas, sin acentos y con la puntuación colapsada a un espacio.
+
+    Equivale a `public.normalizar_busqueda` (migración 050): "Peña-Núñez"
+    y "PENA NUNEZ" producen "pena nunez".
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", sin_acentos.lower()).strip()
+
+
+def es_funcion_inexistente(error: Exception) -> bool:
+    """
+    True si PostgREST no encontró la función RPC (PGRST202), p.ej. porque
+    su migración aún no se aplicó; el llamador puede usar su alternativa.
+    """
+    return getattr(error, "code", None) == "PGRST202"
+
+
+async def iterar(
+    query: Callable[[], Any],
+    page_size: int = TAMANO_PAGINA_ITERAR,
+    *,
+    columna: str = "id",
+    ejecutar: Callable[[Any], Awaitable[Any]] | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    Recorre todas las filas de una query en páginas (keyset sobre `columna`).
+
+    A diferencia de un solo `.execute()`, no se trunca en max-rows del
+    servidor ni carga todo el resultado en memoria: cada página se pide
+    con `columna > último valor visto`, ordenada y limitada a `page_size`.
+
+    Args:
+        query: Función sin argumentos que construye la query filtrada
+            (p. ej. `lambda: client.table('t').select('id, x').eq(...)`).
+            Se invoca una vez por página porque los builders de
+            postgrest-py se mutan al encadenar filtros. El select debe
+            incluir `columna` y la query no debe traer su propio order.
+        page_size: Filas por página.
+        columna: Columna única y ordenable usada como cursor.
+        ejecutar: Corrutina que ejecuta el builder y retorna el resultado
+            (default: `db_manager.ejecutar_query`, fuera del event loop).
+
+    Yields:
+        Listas de filas (dicts), nunca vacías.
+    """
+    if ejecutar is None:
+        from app.database import db_manager
+        ejecutar = db_manager.ejecutar_query
+
+    ultimo = None
+    while True:
+        builder = query()
+        if ultimo is not None:
+            builder = builder.gt(columna, ultimo)
+        result = await ejecutar(builder.order(columna).limit(page_size))
+        filas = result.data or []
+        if filas:
+            yield filas
+        if len(filas) < page_size:
+            return
+        ultimo = filas[-1][columna]
@@ -23,6 +23,7 @@ class SupabaseTipoServicioRepository(BaseRepository[TipoServicio]):
     tabla = 'tipos_servicio'
     entidad_class = TipoServicio
     entidad_nombre = 'Tipo de servicio'
+    cache_ttl = 600
 
     # =========================================================================
     # QUERIES CUSTOM
@@ -30,7 +31,8 @@ class SupabaseTipoServicioRepository(BaseRepository[TipoServicio]):
 
     async def obtener_por_clave(self, clave: str) -> Optional[TipoServicio]:
         """Obtiene un tipo de servicio por su clave."""
-        result = await self._ejecutar_query(
+        result = await self._ejecutar_cacheado(
+            ('por_clave', clave.upper()),
             "obtener tipo por clave",
             lambda: self._query_por_clave(clave),
         )
@@ -49,7 +51,8 @@ class SupabaseTipoServicioRepository(BaseRepository[TipoServicio]):
         offset: int = 0
     ) -> List[TipoServicio]:
         """Obtiene todos los tipos con filtro de estatus."""
-        return await self._ejecutar_query(
+        return await self._ejecutar_cacheado(
+            ('todas', incluir_inactivas, limite, offset),
             "obtener todos los tipos de servicio",
             lambda: self._query_obtener_todas(incluir_inactivas, limite, offset),
             return_list=True
@@ -102,13 +105,9 @@ class SupabaseTipoServicioRepository(BaseRepository[TipoServicio]):
             )
         return await super().crear(entidad)
 
-    def _insertar(self, entidad: TipoServicio) -> TipoServicio:
+    def _datos_insert(self, entidad: TipoServicio) -> dict:
         """Override: excluir fecha_actualizacion tambien."""
-        datos = entidad.model_dump(exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
-        result = self.supabase.table(self.tabla).insert(datos).execute()
-        if not result.data:
-            return None
-        return TipoServicio(**result.data[0])
+        return entidad.model_dump(exclude={'id', 'fecha_creacion', 'fecha_actualizacion'})
 
     def _delete(self, id: int) -> bool:
         """Soft delete: marca como INACTIVO en lugar de borrar."""
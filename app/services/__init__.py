@@ -135,6 +135,11 @@ from app.services.reporte_alta_masiva_service import (
     reporte_alta_masiva_service,
 )
 
+from app.services.importacion_alta_masiva_service import (
+    ImportacionAltaMasivaService,
+    importacion_alta_masiva_service,
+)
+
 # Entregable
 from app.services.entregable_service import (
     EntregableService,
@@ -147,6 +152,12 @@ from app.services.dashboard_service import (
     dashboard_service
 )
 
+# Catalogos compartidos entre sesiones
+from app.services.catalogos_compartidos import (
+    CatalogosCompartidos,
+    catalogos_compartidos,
+)
+
 # Notificacion
 from app.services.notificacion_service import (
     NotificacionService,
@@ -310,12 +321,17 @@ __all__ = [
     "plantilla_service",
     "ReporteAltaMasivaService",
     "reporte_alta_masiva_service",
+    "ImportacionAltaMasivaService",
+    "importacion_alta_masiva_service",
     # Entregable
     "EntregableService",
     "entregable_service",
     # Dasboard
     "DashboardService",
     "dashboard_service",
+    # Catalogos compartidos
+    "CatalogosCompartidos",
+    "catalogos_compartidos",
     # Notificacion
     "NotificacionService",
     "notificacion_service",
@@ -3,11 +3,19 @@ Servicio de parseo para Alta Masiva de Personal.
 
 Parsea archivos CSV y Excel, normaliza headers y extrae
 los registros como diccionarios listos para validacion.
+
+`iterar()` lee el archivo en streaming: resuelve el header una vez a un
+arreglo (indice de columna, campo), decodifica el CSV por bloques y lee
+el Excel en modo read_only fila por fila, y corta al pasar `MAX_FILAS`
+registros. Ni el texto completo ni la hoja completa se materializan.
 """
+import codecs
 import csv
 import io
 import logging
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+from app.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +23,11 @@ logger = logging.getLogger(__name__)
 MAX_FILAS = 500
 MAX_BYTES = 5 * 1024 * 1024  # 5MB
 
+ERROR_SIN_REGISTROS = "El archivo no contiene registros (solo headers o vacio)"
+
+# Bytes por bloque al verificar la codificacion del CSV
+_BLOQUE_DECODIFICACION = 64 * 1024
+
 # Columnas requeridas (nombre normalizado -> variaciones aceptadas)
 COLUMNAS_REQUERIDAS = {'curp', 'nombre', 'apellido_paterno'}
 
@@ -100,6 +113,10 @@ def _normalizar_header(header: str) -> str:
     return h
 
 
+# (indice de columna, campo del sistema) por cada columna reconocida
+Columnas = List[Tuple[int, str]]
+
+
 class AltaMasivaParser:
     """
     Parser de archivos CSV/Excel para alta masiva.
@@ -121,145 +138,146 @@ class AltaMasivaParser:
             Tupla (registros, errores_globales)
             - registros: Lista de dicts con claves normalizadas
             - errores_globales: Errores que afectan a todo el archivo
+        """
+        try:
+            registros = list(self.iterar(contenido, nombre_archivo))
+        except ValidationError as e:
+            return [], [str(e)]
 
-        Raises:
-            ValueError: Si el archivo excede los limites
+        if not registros:
+            return [], [ERROR_SIN_REGISTROS]
+
+        return registros, []
+
+    def iterar(
+        self,
+        contenido: bytes,
+        nombre_archivo: str,
+        max_filas: int = MAX_FILAS,
+    ) -> Iterator[dict]:
         """
-        errores = []
+        Abre el archivo y regresa un iterador perezoso de registros.
+
+        Tamano, formato y headers se verifican al llamar; las filas se leen
+        conforme se consumen. Las filas sin ningun dato se omiten.
 
-        # Validar tamano
+        Raises:
+            ValidationError: Al llamar, si el archivo no se puede leer o le
+                faltan columnas; al iterar, si una fila no se puede leer o
+                hay mas de `max_filas` registros (se corta ahi).
+        """
         if len(contenido) > MAX_BYTES:
             mb = len(contenido) / (1024 * 1024)
-            return [], [f"Archivo demasiado grande ({mb:.1f}MB). Maximo permitido: 5MB"]
+            raise ValidationError(f"Archivo demasiado grande ({mb:.1f}MB). Maximo permitido: 5MB")
 
         if len(contenido) == 0:
-            return [], ["Archivo vacio"]
+            raise ValidationError("Archivo vacio")
 
-        # Detectar tipo y parsear
         nombre_lower = nombre_archivo.lower()
         if nombre_lower.endswith('.csv'):
-            registros, errores = self._parsear_csv(contenido)
+            filas, columnas = self._abrir_csv(contenido)
         elif nombre_lower.endswith(('.xlsx', '.xls')):
-            registros, errores = self._parsear_excel(contenido)
+            filas, columnas = self._abrir_excel(contenido)
         else:
-            return [], [f"Formato no soportado: {nombre_archivo}. Use CSV o Excel (.xlsx)"]
-
-        if errores:
-            return [], errores
-
-        # Validar cantidad de filas
-        if len(registros) > MAX_FILAS:
-            return [], [f"Demasiadas filas ({len(registros)}). Maximo permitido: {MAX_FILAS}"]
-
-        if len(registros) == 0:
-            return [], ["El archivo no contiene registros (solo headers o vacio)"]
-
-        return registros, []
-
-    def _parsear_csv(self, contenido: bytes) -> Tuple[List[dict], List[str]]:
-        """Parsea un archivo CSV."""
-        # Detectar encoding (con/sin BOM)
-        if contenido[:3] == b'\xef\xbb\xbf':
-            texto = contenido[3:].decode('utf-8')
-        else:
-            try:
-                texto = contenido.decode('utf-8')
-            except UnicodeDecodeError:
-                try:
-                    texto = contenido.decode('latin-1')
-                except UnicodeDecodeError:
-                    return [], ["No se pudo decodificar el archivo. Use codificacion UTF-8"]
-
-        # Detectar delimitador
-        primera_linea = texto.split('\n')[0] if '\n' in texto else texto
-        delimitador = ';' if ';' in primera_linea else ','
-
+            raise ValidationError(f"Formato no soportado: {nombre_archivo}. Use CSV o Excel (.xlsx)")
+
+        return self._registros(filas, columnas, max_filas)
+
+    def _registros(
+        self,
+        filas: Iterator[Sequence],
+        columnas: Columnas,
+        max_filas: int,
+    ) -> Iterator[dict]:
+        """Convierte filas crudas en registros, con el tope de filas."""
+        total = 0
+        for fila in filas:
+            registro = {}
+            for idx, nombre_campo in columnas:
+                valor = fila[idx] if idx < len(fila) else None
+                registro[nombre_campo] = '' if valor is None else str(valor).strip()
+            # Solo agregar si tiene algun dato
+            if not any(registro.values()):
+                continue
+            total += 1
+            if total > max_filas:
+                raise ValidationError(
+                    f"Demasiadas filas (mas de {max_filas}). Maximo permitido: {max_filas}"
+                )
+            yield registro
+
+    def _abrir_csv(self, contenido: bytes) -> Tuple[Iterator[Sequence], Columnas]:
+        """Abre un CSV: regresa sus filas de datos (perezosas) y las columnas."""
+        encoding = _detectar_encoding(contenido)
+
+        # Detectar delimitador (';' y ',' son ASCII en ambas codificaciones)
+        fin_linea = contenido.find(b'\n')
+        primera_linea = contenido if fin_linea < 0 else contenido[:fin_linea]
+        delimitador = ';' if b';' in primera_linea else ','
+
+        texto = io.TextIOWrapper(io.BytesIO(contenido), encoding=encoding, newline='')
+        reader = csv.reader(texto, delimiter=delimitador)
         try:
-            reader = csv.DictReader(io.StringIO(texto), delimiter=delimitador)
-
-            if not reader.fieldnames:
-                return [], ["No se encontraron headers en el archivo CSV"]
-
-            # Normalizar headers
-            headers_normalizados, headers_desconocidos = self._normalizar_headers(
-                list(reader.fieldnames)
-            )
-
-            # Verificar columnas requeridas
-            error_columnas = self._verificar_columnas_requeridas(headers_normalizados)
-            if error_columnas:
-                return [], [error_columnas]
-
-            # Parsear filas
-            registros = []
-            for i, row in enumerate(reader):
-                registro = {}
-                for header_original, valor in row.items():
-                    header_norm = _normalizar_header(header_original)
-                    nombre_campo = HEADER_ALIASES.get(header_norm)
-                    if nombre_campo:
-                        registro[nombre_campo] = (valor or '').strip()
-                # Solo agregar si tiene algun dato
-                if any(v for v in registro.values()):
-                    registros.append(registro)
-
-            return registros, []
-
+            headers = next(reader, None)
         except csv.Error as e:
-            return [], [f"Error leyendo CSV: {str(e)}"]
+            raise ValidationError(f"Error leyendo CSV: {str(e)}")
+
+        if not headers:
+            raise ValidationError("No se encontraron headers en el archivo CSV")
 
-    def _parsear_excel(self, contenido: bytes) -> Tuple[List[dict], List[str]]:
-        """Parsea un archivo Excel (.xlsx/.xls)."""
+        return _filas_csv(reader), self._columnas(headers)
+
+    def _abrir_excel(self, contenido: bytes) -> Tuple[Iterator[Sequence], Columnas]:
+        """Abre un Excel: regresa sus filas de datos (perezosas) y las columnas."""
         try:
             import openpyxl
         except ImportError:
-            return [], ["Libreria openpyxl no instalada. Instale con: pip install openpyxl"]
+            raise ValidationError("Libreria openpyxl no instalada. Instale con: pip install openpyxl")
 
         try:
             wb = openpyxl.load_workbook(io.BytesIO(contenido), read_only=True, data_only=True)
             ws = wb.active
-
             if ws is None:
-                return [], ["El archivo Excel no tiene hojas activas"]
-
-            rows = list(ws.iter_rows(values_only=True))
-            if len(rows) < 2:
-                return [], ["El archivo Excel no contiene datos (solo headers o vacio)"]
-
-            # Primera fila = headers
-            headers_raw = [str(h).strip() if h else '' for h in rows[0]]
-
-            # Normalizar headers
-            headers_normalizados, headers_desconocidos = self._normalizar_headers(headers_raw)
-
-            # Verificar columnas requeridas
-            error_columnas = self._verificar_columnas_requeridas(headers_normalizados)
-            if error_columnas:
-                return [], [error_columnas]
-
-            # Parsear filas de datos
-            registros = []
-            for row in rows[1:]:
-                registro = {}
-                for idx, valor in enumerate(row):
-                    if idx < len(headers_raw):
-                        header_norm = _normalizar_header(headers_raw[idx])
-                        nombre_campo = HEADER_ALIASES.get(header_norm)
-                        if nombre_campo:
-                            # Convertir valor a string
-                            if valor is None:
-                                registro[nombre_campo] = ''
-                            else:
-                                registro[nombre_campo] = str(valor).strip()
-                # Solo agregar si tiene algun dato
-                if any(v for v in registro.values()):
-                    registros.append(registro)
+                wb.close()
+                raise ValidationError("El archivo Excel no tiene hojas activas")
 
+            filas = ws.iter_rows(values_only=True)
+            primera = next(filas, None)
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise ValidationError(f"Error leyendo Excel: {str(e)}")
+
+        if primera is None:
             wb.close()
-            return registros, []
+            raise ValidationError("El archivo Excel no contiene datos (solo headers o vacio)")
 
-        except Exception as e:
-            return [], [f"Error leyendo Excel: {str(e)}"]
+        # Primera fila = headers
+        headers = [str(h).strip() if h else '' for h in primera]
+        try:
+            columnas = self._columnas(headers)
+        except ValidationError:
+            wb.close()
+            raise
+        return _filas_excel(wb, filas), columnas
+
+    def _columnas(self, headers: List[str]) -> Columnas:
+        """
+        Resuelve una sola vez los headers a (indice, campo).
+
+        Raises:
+            ValidationError: Si faltan columnas requeridas
+        """
+        headers_normalizados, _ = self._normalizar_headers(headers)
+        error_columnas = self._verificar_columnas_requeridas(headers_normalizados)
+        if error_columnas:
+            raise ValidationError(error_columnas)
+
+        return [
+            (idx, HEADER_ALIASES[_normalizar_header(header)])
+            for idx, header in enumerate(headers)
+            if header in headers_normalizados
+        ]
 
     def _normalizar_headers(self, headers: List[str]) -> Tuple[dict, List[str]]:
         """
@@ -293,5 +311,37 @@ class AltaMasivaParser:
         return ""
 
 
+def _detectar_encoding(contenido: bytes) -> str:
+    """UTF-8 (con o sin BOM) si todo el archivo lo es; si no, latin-1."""
+    if contenido[:3] == codecs.BOM_UTF8:
+        return 'utf-8-sig'
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for inicio in range(0, len(contenido), _BLOQUE_DECODIFICACION):
+            decoder.decode(contenido[inicio:inicio + _BLOQUE_DECODIFICACION])
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return 'latin-1'
+    return 'utf-8'
+
+
+def _filas_csv(reader: Iterable[List[str]]) -> Iterator[List[str]]:
+    try:
+        yield from reader
+    except csv.Error as e:
+        raise ValidationError(f"Error leyendo CSV: {str(e)}")
+
+
+def _filas_excel(wb, filas: Iterator[tuple]) -> Iterator[tuple]:
+    """Filas de la hoja; cierra el libro al terminar o al abandonarse."""
+    try:
+        yield from filas
+    except Exception as e:
+        raise ValidationError(f"Error leyendo Excel: {str(e)}")
+    finally:
+        wb.close()
+
+
 # Singleton
 alta_masiva_parser = AltaMasivaParser()
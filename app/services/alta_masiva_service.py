@@ -5,10 +5,10 @@ Orquesta la validacion y procesamiento de archivos de carga masiva.
 Fase 1: Validar archivo -> ResultadoValidacion (preview)
 Fase 2: Procesar registros validados -> ResultadoProcesamiento (crear/reingresar)
 """
-import re
 import logging
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import Any, Awaitable, Callable, Optional
 
 from app.entities.alta_masiva import (
     ResultadoFila,
@@ -17,7 +17,7 @@ from app.entities.alta_masiva import (
     ResultadoProcesamiento,
     DetalleResultado,
 )
-from app.entities.empleado import EmpleadoCreate, EmpleadoUpdate
+from app.entities.empleado import Empleado, EmpleadoCreate, EmpleadoUpdate
 from app.core.enums import EstatusEmpleado, GeneroEmpleado
 from app.core.text_utils import limpiar_espacios, normalizar_email, normalizar_mayusculas
 from app.core.validation.custom_validators import limpiar_telefono
@@ -28,14 +28,17 @@ from app.core.validation import (
     RFC_PERSONA_LEN,
     NSS_PATTERN,
     NSS_LEN,
+    patron,
+    validar_lote,
 )
 from app.core.exceptions import (
     NotFoundError,
     DuplicateError,
     BusinessRuleError,
     DatabaseError,
+    ValidationError,
 )
-from app.services.alta_masiva_parser import alta_masiva_parser
+from app.services.alta_masiva_parser import ERROR_SIN_REGISTROS, alta_masiva_parser
 
 logger = logging.getLogger(__name__)
 
@@ -51,16 +54,28 @@ GENERO_ALIASES = {
     'mujer': GeneroEmpleado.FEMENINO,
 }
 
+_CURP = patron(CURP_PATTERN)
+_RFC_PERSONA = patron(RFC_PERSONA_PATTERN)
+_NSS = patron(NSS_PATTERN)
+_NO_DIGITOS = patron(r'[^0-9]')
+
+# Filas que se leen, validan y consultan en BD a la vez
+LOTE_VALIDACION = 500
+
 
 class AltaMasivaService:
     """
     Servicio principal de alta masiva.
 
     Flujo:
-    1. validar_archivo() -> Parsea, valida cada fila, detecta reingresos
+    1. validar_archivo() -> Lee el archivo en streaming, valida el formato de
+       cada fila y detecta reingresos con una consulta por lote de CURPs
     2. procesar() -> Crea empleados nuevos y reingresa existentes
     """
 
+    def __init__(self, tamano_lote: int = LOTE_VALIDACION):
+        self.tamano_lote = tamano_lote
+
     async def validar_archivo(
         self,
         contenido: bytes,
@@ -80,54 +95,71 @@ class AltaMasivaService:
         """
         resultado = ResultadoValidacion()
 
-        # Parsear archivo
-        registros, errores_globales = alta_masiva_parser.parsear(contenido, nombre_archivo)
-
-        if errores_globales:
-            # Error global -> todas las filas son error
-            for error in errores_globales:
-                resultado.errores.append(RegistroValidado(
-                    fila=0,
-                    resultado=ResultadoFila.ERROR,
-                    errores=[error],
-                    mensaje=error,
-                ))
-            return resultado
+        # El archivo se lee en streaming por lotes de `tamano_lote` filas;
+        # los validadores (y el registro de CURPs repetidos) son del archivo
+        try:
+            registros = alta_masiva_parser.iterar(contenido, nombre_archivo)
+            lote = list(islice(registros, self.tamano_lote))
+        except ValidationError as e:
+            # Error global -> el archivo completo es error
+            return self._error_global(resultado, str(e))
 
-        resultado.total_filas = len(registros)
+        if not lote:
+            return self._error_global(resultado, ERROR_SIN_REGISTROS)
 
         # Validar la empresa destino existe
         try:
             from app.services import empresa_service
-            empresa = await empresa_service.obtener_por_id(empresa_id)
+            await empresa_service.obtener_por_id(empresa_id)
         except NotFoundError:
-            resultado.errores.append(RegistroValidado(
-                fila=0,
-                resultado=ResultadoFila.ERROR,
-                errores=[f"Empresa con ID {empresa_id} no encontrada"],
-                mensaje=f"Empresa con ID {empresa_id} no encontrada",
-            ))
-            return resultado
+            # Mismo total de filas que reporta una validación completa: se
+            # cuentan las que faltan sin guardarlas
+            try:
+                resultado.total_filas = len(lote) + sum(1 for _ in registros)
+            except ValidationError as e:
+                return self._error_global(resultado, str(e))
+            return self._error_global(resultado, f"Empresa con ID {empresa_id} no encontrada")
 
-        # Validar cada registro
-        curps_en_archivo = set()
-        for i, registro in enumerate(registros):
-            fila = i + 2  # +2 porque fila 1 es header, i empieza en 0
-            validado = await self._validar_registro(
-                registro, fila, empresa_id, curps_en_archivo
+        from app.services import empleado_service
+        validadores = self._validadores()
+        fila = 2  # fila 1 es header
+
+        while lote:
+            formatos = list(zip(lote, self._validar_formato(lote, validadores)))
+
+            # Una consulta por lote de CURPs para clasificar
+            existentes = await empleado_service.obtener_por_curps(
+                [curp for _, (curp, errores) in formatos if not errores]
             )
 
-            if validado.resultado == ResultadoFila.VALIDO:
-                resultado.validos.append(validado)
-            elif validado.resultado == ResultadoFila.REINGRESO:
-                resultado.reingresos.append(validado)
-            else:
-                resultado.errores.append(validado)
+            for registro, (curp, errores) in formatos:
+                validado = self._clasificar_registro(
+                    registro, fila, curp, errores, existentes.get(curp), empresa_id
+                )
+                fila += 1
 
-            # Trackear CURPs para detectar duplicados dentro del archivo
-            if validado.curp:
-                curps_en_archivo.add(validado.curp)
+                if validado.resultado == ResultadoFila.VALIDO:
+                    resultado.validos.append(validado)
+                elif validado.resultado == ResultadoFila.REINGRESO:
+                    resultado.reingresos.append(validado)
+                else:
+                    resultado.errores.append(validado)
+
+            try:
+                lote = list(islice(registros, self.tamano_lote))
+            except ValidationError as e:
+                return self._error_global(ResultadoValidacion(), str(e))
+
+        resultado.total_filas = fila - 2
+        return resultado
 
+    def _error_global(self, resultado: ResultadoValidacion, error: str) -> ResultadoValidacion:
+        resultado.errores.append(RegistroValidado(
+            fila=0,
+            resultado=ResultadoFila.ERROR,
+            errores=[error],
+            mensaje=error,
+        ))
         return resultado
 
     async def procesar(
@@ -138,6 +170,10 @@ class AltaMasivaService:
         """
         Fase 2: Procesa los registros validados (crea y reingresa).
 
+        Las altas van por `empleado_service.crear_lote` (claves consecutivas
+        e INSERTs por lote) y los reingresos por `reingresar_lote`; si un
+        lote falla, cada fila conserva su propio resultado.
+
         Args:
             resultado_validacion: Resultado de validar_archivo()
             empresa_id: ID de la empresa destino
@@ -150,150 +186,178 @@ class AltaMasivaService:
         from app.services import empleado_service
 
         # Procesar altas nuevas
-        for registro in resultado_validacion.validos:
-            try:
-                empleado_create = self._crear_empleado_create(registro.datos, empresa_id)
-                empleado = await empleado_service.crear(empleado_create)
+        validos = resultado_validacion.validos
+        salidas = await self._en_lote(
+            validos,
+            lambda registro: self._crear_empleado_create(registro.datos, empresa_id),
+            empleado_service.crear_lote,
+        )
+        for registro, salida in zip(validos, salidas):
+            if isinstance(salida, Empleado):
                 resultado.creados += 1
                 resultado.detalles.append(DetalleResultado(
                     fila=registro.fila,
                     curp=registro.curp,
                     resultado=ResultadoFila.VALIDO,
-                    clave=empleado.clave,
-                    mensaje=f"Creado: {empleado.clave}",
-                ))
-            except (DuplicateError, BusinessRuleError, DatabaseError) as e:
-                resultado.errores += 1
-                resultado.detalles.append(DetalleResultado(
-                    fila=registro.fila,
-                    curp=registro.curp,
-                    resultado=ResultadoFila.ERROR,
-                    mensaje=f"Error al crear: {str(e)}",
-                ))
-            except Exception as e:
-                resultado.errores += 1
-                resultado.detalles.append(DetalleResultado(
-                    fila=registro.fila,
-                    curp=registro.curp,
-                    resultado=ResultadoFila.ERROR,
-                    mensaje=f"Error inesperado: {str(e)}",
+                    clave=salida.clave,
+                    mensaje=f"Creado: {salida.clave}",
                 ))
+            elif isinstance(salida, (DuplicateError, BusinessRuleError, DatabaseError)):
+                self._agregar_error(resultado, registro, f"Error al crear: {str(salida)}")
+            else:
+                self._agregar_error(resultado, registro, f"Error inesperado: {str(salida)}")
 
         # Procesar reingresos
-        for registro in resultado_validacion.reingresos:
-            try:
-                datos_update = self._crear_empleado_update(registro.datos)
-                empleado = await empleado_service.reingresar(
-                    empleado_id=registro.empleado_existente_id,
-                    nueva_empresa_id=empresa_id,
-                    datos_actualizados=datos_update,
-                )
+        reingresos = resultado_validacion.reingresos
+        salidas = await self._en_lote(
+            reingresos,
+            lambda registro: (
+                registro.empleado_existente_id,
+                self._crear_empleado_update(registro.datos),
+            ),
+            lambda datos: empleado_service.reingresar_lote(empresa_id, datos),
+        )
+        for registro, salida in zip(reingresos, salidas):
+            if isinstance(salida, Empleado):
                 resultado.reingresados += 1
                 resultado.detalles.append(DetalleResultado(
                     fila=registro.fila,
                     curp=registro.curp,
                     resultado=ResultadoFila.REINGRESO,
-                    clave=empleado.clave,
-                    mensaje=f"Reingresado: {empleado.clave}",
-                ))
-            except (BusinessRuleError, DatabaseError) as e:
-                resultado.errores += 1
-                resultado.detalles.append(DetalleResultado(
-                    fila=registro.fila,
-                    curp=registro.curp,
-                    resultado=ResultadoFila.ERROR,
-                    mensaje=f"Error al reingresar: {str(e)}",
-                ))
-            except Exception as e:
-                resultado.errores += 1
-                resultado.detalles.append(DetalleResultado(
-                    fila=registro.fila,
-                    curp=registro.curp,
-                    resultado=ResultadoFila.ERROR,
-                    mensaje=f"Error inesperado: {str(e)}",
+                    clave=salida.clave,
+                    mensaje=f"Reingresado: {salida.clave}",
                 ))
+            elif isinstance(salida, (BusinessRuleError, DatabaseError)):
+                self._agregar_error(resultado, registro, f"Error al reingresar: {str(salida)}")
+            else:
+                self._agregar_error(resultado, registro, f"Error inesperado: {str(salida)}")
 
         return resultado
 
+    async def _en_lote(
+        self,
+        registros: list[RegistroValidado],
+        preparar: Callable[[RegistroValidado], Any],
+        ejecutar_lote: Callable[[list], Awaitable[list]],
+    ) -> list:
+        """
+        Prepara cada registro y ejecuta los preparados en una sola llamada
+        por lote.
+
+        Returns:
+            Por registro, en orden, lo que regresó el lote para él o la
+            excepción al prepararlo (o del lote completo, si falló entero).
+        """
+        salidas: list = [None] * len(registros)
+        indices, datos = [], []
+        for i, registro in enumerate(registros):
+            try:
+                datos.append(preparar(registro))
+                indices.append(i)
+            except Exception as e:
+                salidas[i] = e
+
+        if datos:
+            try:
+                resultados = await ejecutar_lote(datos)
+            except Exception as e:
+                resultados = [e] * len(datos)
+            for i, salida in zip(indices, resultados):
+                salidas[i] = salida
+        return salidas
+
+    def _agregar_error(
+        self,
+        resultado: ResultadoProcesamiento,
+        registro: RegistroValidado,
+        mensaje: str,
+    ) -> None:
+        resultado.errores += 1
+        resultado.detalles.append(DetalleResultado(
+            fila=registro.fila,
+            curp=registro.curp,
+            resultado=ResultadoFila.ERROR,
+            mensaje=mensaje,
+        ))
+
     # =========================================================================
     # VALIDACION DE REGISTROS INDIVIDUALES
     # =========================================================================
 
-    async def _validar_registro(
+    def _validar_formato(
+        self,
+        registros: list[dict],
+        validadores: dict[str, Callable[[Optional[str]], str]],
+    ) -> list[tuple[str, list[str]]]:
+        """
+        Valida el formato de los registros (sin BD), columna por columna.
+
+        Returns:
+            (CURP normalizado, lista de errores de formato) por registro
+        """
+        errores = validar_lote(registros, validadores)
+        curps = [normalizar_mayusculas(registro.get('curp')) for registro in registros]
+        return list(zip(curps, errores))
+
+    def _validadores(self) -> dict[str, Callable[[Optional[str]], str]]:
+        """
+        Validadores de formato por columna para un archivo. Se crean una vez
+        por archivo: el de CURP recuerda los ya vistos entre lotes.
+        """
+        return {
+            'curp': self._validador_curp(),
+            'nombre': lambda valor: _error_obligatorio(valor, "Nombre"),
+            'apellido_paterno': lambda valor: _error_obligatorio(valor, "Apellido paterno"),
+            'rfc': _error_rfc,
+            'nss': _error_nss,
+            'fecha_nacimiento': self._error_fecha_nacimiento,
+            'genero': _error_genero,
+            'telefono': _error_telefono,
+            'email': _error_email,
+        }
+
+    @staticmethod
+    def _validador_curp() -> Callable[[Optional[str]], str]:
+        """CURP obligatorio y sin duplicados en el archivo (en orden de filas)."""
+        curps_en_archivo = set()
+
+        def validar(valor: Optional[str]) -> str:
+            curp = normalizar_mayusculas(valor)
+            if not curp:
+                return "CURP es obligatorio"
+
+            if len(curp) != CURP_LEN:
+                error = f"CURP debe tener {CURP_LEN} caracteres (tiene {len(curp)})"
+            elif not _CURP.match(curp):
+                error = "CURP con formato invalido"
+            elif curp in curps_en_archivo:
+                error = f"CURP {curp} duplicado en el archivo"
+            else:
+                error = ""
+
+            # Trackear CURPs para detectar duplicados dentro del archivo
+            curps_en_archivo.add(curp)
+            return error
+
+        return validar
+
+    def _error_fecha_nacimiento(self, valor: Optional[str]) -> str:
+        fecha_nacimiento = (valor or '').strip()
+        if fecha_nacimiento and not self._parsear_fecha(fecha_nacimiento):
+            return "Fecha de nacimiento invalida. Use formato DD/MM/AAAA o AAAA-MM-DD"
+        return ""
+
+    def _clasificar_registro(
         self,
         registro: dict,
         fila: int,
+        curp: Optional[str],
+        errores: list[str],
+        empleado_existente: Optional[Empleado],
         empresa_id: int,
-        curps_en_archivo: set
     ) -> RegistroValidado:
-        """Valida un registro individual y determina si es alta nueva o reingreso."""
-        errores = []
-
-        # --- Validar CURP (obligatorio) ---
-        curp = normalizar_mayusculas(registro.get('curp'))
-        if not curp:
-            errores.append("CURP es obligatorio")
-        elif len(curp) != CURP_LEN:
-            errores.append(f"CURP debe tener {CURP_LEN} caracteres (tiene {len(curp)})")
-        elif not re.match(CURP_PATTERN, curp):
-            errores.append("CURP con formato invalido")
-        elif curp in curps_en_archivo:
-            errores.append(f"CURP {curp} duplicado en el archivo")
-
-        # --- Validar nombre (obligatorio) ---
-        nombre = limpiar_espacios(registro.get('nombre'))
-        if not nombre:
-            errores.append("Nombre es obligatorio")
-        elif len(nombre) < 2:
-            errores.append("Nombre debe tener al menos 2 caracteres")
-
-        # --- Validar apellido paterno (obligatorio) ---
-        apellido_paterno = limpiar_espacios(registro.get('apellido_paterno'))
-        if not apellido_paterno:
-            errores.append("Apellido paterno es obligatorio")
-        elif len(apellido_paterno) < 2:
-            errores.append("Apellido paterno debe tener al menos 2 caracteres")
-
-        # --- Validar RFC (opcional) ---
-        rfc = normalizar_mayusculas(registro.get('rfc'))
-        if rfc:
-            if len(rfc) != RFC_PERSONA_LEN:
-                errores.append(f"RFC debe tener {RFC_PERSONA_LEN} caracteres (tiene {len(rfc)})")
-            elif not re.match(RFC_PERSONA_PATTERN, rfc):
-                errores.append("RFC con formato invalido")
-
-        # --- Validar NSS (opcional) ---
-        nss = limpiar_espacios(registro.get('nss'))
-        if nss:
-            nss_limpio = re.sub(r'[^0-9]', '', nss)
-            if not re.match(NSS_PATTERN, nss_limpio):
-                errores.append(f"NSS debe tener {NSS_LEN} digitos numericos")
-
-        # --- Validar fecha nacimiento (opcional) ---
-        fecha_nacimiento = (registro.get('fecha_nacimiento') or '').strip()
-        if fecha_nacimiento:
-            if not self._parsear_fecha(fecha_nacimiento):
-                errores.append("Fecha de nacimiento invalida. Use formato DD/MM/AAAA o AAAA-MM-DD")
-
-        # --- Validar genero (opcional) ---
-        genero_raw = (registro.get('genero') or '').strip().lower()
-        if genero_raw and genero_raw not in GENERO_ALIASES:
-            errores.append(f"Genero invalido: '{registro.get('genero')}'. Use: Masculino, Femenino, M, F")
-
-        # --- Validar telefono (opcional) ---
-        telefono = limpiar_espacios(registro.get('telefono'))
-        if telefono:
-            tel_limpio = limpiar_telefono(telefono)
-            if len(tel_limpio) != 10:
-                errores.append("Telefono debe tener 10 digitos")
-
-        # --- Validar email (opcional) ---
-        email = normalizar_email(registro.get('email'))
-        if email:
-            if '@' not in email or '.' not in email:
-                errores.append("Email con formato invalido")
-
-        # Si hay errores de formato, retornar error sin consultar BD
+        """Determina si el registro es error, alta nueva o reingreso."""
+        # Errores de formato: su CURP no se consultó en BD
         if errores:
             return RegistroValidado(
                 fila=fila,
@@ -304,10 +368,7 @@ class AltaMasivaService:
                 mensaje='; '.join(errores),
             )
 
-        # --- Verificar si el CURP ya existe en BD ---
-        from app.services import empleado_service
-        empleado_existente = await empleado_service.obtener_por_curp(curp)
-
+        # --- CURP ya existente en BD ---
         if empleado_existente:
             # Verificar restriccion
             if empleado_existente.is_restricted:
@@ -379,7 +440,7 @@ class AltaMasivaService:
 
         nss = limpiar_espacios(datos.get('nss'))
         if nss:
-            kwargs['nss'] = re.sub(r'[^0-9]', '', nss)
+            kwargs['nss'] = _NO_DIGITOS.sub('', nss)
 
         fecha_nac = (datos.get('fecha_nacimiento') or '').strip()
         if fecha_nac:
@@ -417,7 +478,7 @@ class AltaMasivaService:
 
         nss = limpiar_espacios(datos.get('nss'))
         if nss:
-            kwargs['nss'] = re.sub(r'[^0-9]', '', nss)
+            kwargs['nss'] = _NO_DIGITOS.sub('', nss)
 
         telefono = limpiar_espacios(datos.get('telefono'))
         if telefono:
@@ -459,5 +520,57 @@ class AltaMasivaService:
         return None
 
 
+# =============================================================================
+# VALIDADORES DE COLUMNA (formato del archivo)
+# =============================================================================
+
+def _error_obligatorio(valor: Optional[str], campo: str) -> str:
+    texto = limpiar_espacios(valor)
+    if not texto:
+        return f"{campo} es obligatorio"
+    if len(texto) < 2:
+        return f"{campo} debe tener al menos 2 caracteres"
+    return ""
+
+
+def _error_rfc(valor: Optional[str]) -> str:
+    rfc = normalizar_mayusculas(valor)
+    if not rfc:
+        return ""
+    if len(rfc) != RFC_PERSONA_LEN:
+        return f"RFC debe tener {RFC_PERSONA_LEN} caracteres (tiene {len(rfc)})"
+    if not _RFC_PERSONA.match(rfc):
+        return "RFC con formato invalido"
+    return ""
+
+
+def _error_nss(valor: Optional[str]) -> str:
+    nss = limpiar_espacios(valor)
+    if nss and not _NSS.match(_NO_DIGITOS.sub('', nss)):
+        return f"NSS debe tener {NSS_LEN} digitos numericos"
+    return ""
+
+
+def _error_genero(valor: Optional[str]) -> str:
+    genero_raw = (valor or '').strip().lower()
+    if genero_raw and genero_raw not in GENERO_ALIASES:
+        return f"Genero invalido: '{valor}'. Use: Masculino, Femenino, M, F"
+    return ""
+
+
+def _error_telefono(valor: Optional[str]) -> str:
+    telefono = limpiar_espacios(valor)
+    if telefono and len(limpiar_telefono(telefono)) != 10:
+        return "Telefono debe tener 10 digitos"
+    return ""
+
+
+def _error_email(valor: Optional[str]) -> str:
+    email = normalizar_email(valor)
+    if email and ('@' not in email or '.' not in email):
+        return "Email con formato invalido"
+    return ""
+
+
 # Singleton
 alta_masiva_service = AltaMasivaService()
@@ -0,0 +1,217 @@
+"""
+Catálogos compartidos entre sesiones.
+
+Cada sesión de Reflex cargaba los mismos catálogos (empresas, sedes,
+tipos de servicio, categorías de puesto, instituciones, lugares de
+entrega) al montar cada página. `CatalogosCompartidos` guarda en el
+proceso una entrada por catálogo (y argumentos) que todas las sesiones
+reutilizan.
+
+Cada entrada recuerda la versión de sus tablas al cargarse; revalidar es
+comparar esas versiones con las actuales (O(1), sin BD):
+
+- Las escrituras (insert/update/upsert/delete) en una tabla incrementan
+  su versión vía `registro_consultas.al_escribir`, así que cualquier
+  servicio que escriba con el cliente de `db_manager` invalida sus
+  catálogos sin código adicional. Para escrituras por otro camino, el
+  servicio llama `catalogos_compartidos.invalidar(tabla)`.
+- Otros procesos no ven esas versiones: la entrada además expira a los
+  `ttl_segundos`.
+
+Las entidades de la entrada se comparten entre sesiones: se regresa una
+lista nueva, pero los elementos no deben mutarse.
+
+Uso:
+    empresas = await catalogos_compartidos.obtener("empresas_activas")
+    categorias = await catalogos_compartidos.obtener("categorias_puesto_por_tipo", 3)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from app.database.instrumentacion import RegistroConsultas, registro_consultas
+
+logger = logging.getLogger(__name__)
+
+TTL_SEGUNDOS = 300
+
+
+@dataclass
+class _Catalogo:
+    cargar: Callable[..., Awaitable[List[Any]]]
+    tablas: Tuple[str, ...]
+    hits: int = 0
+    cargas: int = 0
+
+
+@dataclass
+class _Entrada:
+    versiones: Tuple[int, ...]
+    expira: float
+    valor: List[Any] = field(default_factory=list)
+
+
+class CatalogosCompartidos:
+    """Catálogos por nombre, versionados por las tablas de las que leen."""
+
+    def __init__(
+        self,
+        ttl_segundos: float = TTL_SEGUNDOS,
+        registro: RegistroConsultas = registro_consultas,
+    ):
+        self.ttl_segundos = ttl_segundos
+        self._catalogos: Dict[str, _Catalogo] = {}
+        self._entradas: Dict[Hashable, _Entrada] = {}
+        self._cargas: Dict[Hashable, asyncio.Future] = {}
+        self._versiones: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        registro.al_escribir(self.invalidar)
+
+    def registrar(
+        self,
+        nombre: str,
+        cargar: Callable[..., Awaitable[List[Any]]],
+        *,
+        tablas: Iterable[str],
+    ) -> None:
+        """
+        Define un catálogo.
+
+        Args:
+            cargar: Corrutina que regresa la lista; recibe los argumentos
+                extra de `obtener`.
+            tablas: Tablas que lee; escribir en ellas lo invalida.
+        """
+        self._catalogos[nombre] = _Catalogo(cargar, tuple(tablas))
+
+    async def obtener(self, nombre: str, *args: Hashable) -> List[Any]:
+        """
+        Lista del catálogo `nombre` (con `args`), de la entrada compartida
+        si sigue vigente; si no, la carga una sola vez para todas las
+        sesiones que la pidan a la vez.
+
+        Raises:
+            KeyError: Si el catálogo no está registrado
+            Las excepciones de la carga se propagan sin guardar nada.
+        """
+        catalogo = self._catalogos[nombre]
+        clave = (nombre, *args)
+
+        entrada = self._entradas.get(clave)
+        if entrada is not None and self._vigente(entrada, catalogo):
+            catalogo.hits += 1
+            return list(entrada.valor)
+
+        carga = self._cargas.get(clave)
+        if carga is None:
+            carga = asyncio.ensure_future(self._cargar(clave, catalogo, args))
+            self._cargas[clave] = carga
+            carga.add_done_callback(lambda _: self._cargas.pop(clave, None))
+        return list(await asyncio.shield(carga))
+
+    def version(self, tabla: str) -> int:
+        """Versión actual de `tabla` (cambia con cada escritura)."""
+        return self._versiones.get(tabla, 0)
+
+    def invalidar(self, tabla: str) -> None:
+        """Incrementa la versión de `tabla`; sus catálogos se recargan al leerse."""
+        with self._lock:
+            self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+
+    def limpiar(self) -> None:
+        """Descarta todas las entradas (tests)."""
+        self._entradas.clear()
+
+    def estadisticas(self) -> Dict[str, Dict[str, int]]:
+        """Hits y cargas por catálogo."""
+        return {
+            nombre: {
+                "hits": catalogo.hits,
+                "cargas": catalogo.cargas,
+                "entradas": sum(1 for clave in self._entradas if clave[0] == nombre),
+            }
+            for nombre, catalogo in sorted(self._catalogos.items())
+        }
+
+    def _versiones_de(self, catalogo: _Catalogo) -> Tuple[int, ...]:
+        return tuple(self.version(tabla) for tabla in catalogo.tablas)
+
+    def _vigente(self, entrada: _Entrada, catalogo: _Catalogo) -> bool:
+        return entrada.expira > time.monotonic() and entrada.versiones == self._versiones_de(catalogo)
+
+    async def _cargar(self, clave: Hashable, catalogo: _Catalogo, args: tuple) -> List[Any]:
+        # Versiones leídas antes de consultar: si alguien escribe mientras
+        # carga, la entrada nace vieja y la siguiente lectura recarga.
+        versiones = self._versiones_de(catalogo)
+        valor = list(await catalogo.cargar(*args))
+        catalogo.cargas += 1
+        self._entradas[clave] = _Entrada(versiones, time.monotonic() + self.ttl_segundos, valor)
+        logger.debug("Catálogo %s cargado (%s elementos)", clave, len(valor))
+        return valor
+
+
+catalogos_compartidos = CatalogosCompartidos()
+
+
+# =============================================================================
+# Catálogos de la aplicación (imports lazy para evitar circularidad)
+# =============================================================================
+
+async def _empresas_activas():
+    from app.services import empresa_service
+    return await empresa_service.obtener_todas(incluir_inactivas=False)
+
+
+async def _sedes_activas():
+    from app.services import sede_service
+    return await sede_service.obtener_todas(incluir_inactivas=False)
+
+
+async def _tipos_servicio_activos():
+    from app.services import tipo_servicio_service
+    return await tipo_servicio_service.obtener_activas()
+
+
+async def _categorias_puesto_activas():
+    from app.services import categoria_puesto_service
+    return await categoria_puesto_service.obtener_todas(incluir_inactivas=False)
+
+
+async def _categorias_puesto_por_tipo(tipo_servicio_id: int):
+    from app.services import categoria_puesto_service
+    return await categoria_puesto_service.obtener_por_tipo_servicio(
+        tipo_servicio_id, incluir_inactivas=False,
+    )
+
+
+async def _instituciones_activas():
+    from app.services import institucion_service
+    return await institucion_service.obtener_todas(solo_activas=True)
+
+
+async def _lugares_entrega():
+    from app.services import requisicion_service
+    return await requisicion_service.obtener_lugares_entrega()
+
+
+catalogos_compartidos.registrar("empresas_activas", _empresas_activas, tablas=("empresas",))
+catalogos_compartidos.registrar("sedes_activas", _sedes_activas, tablas=("sedes",))
+catalogos_compartidos.registrar(
+    "tipos_servicio_activos", _tipos_servicio_activos, tablas=("tipos_servicio",),
+)
+catalogos_compartidos.registrar(
+    "categorias_puesto_activas", _categorias_puesto_activas, tablas=("categorias_puesto",),
+)
+catalogos_compartidos.registrar(
+    "categorias_puesto_por_tipo", _categorias_puesto_por_tipo, tablas=("categorias_puesto",),
+)
+catalogos_compartidos.registrar(
+    "instituciones_activas", _instituciones_activas,
+    tablas=("instituciones", "instituciones_empresas"),
+)
+catalogos_compartidos.registrar("lugares_entrega", _lugares_entrega, tablas=("lugar_entrega",))
@@ -12,6 +12,7 @@ from uuid import UUID
 from app.database import db_manager
 from app.core.exceptions import DatabaseError, NotFoundError, BusinessRuleError
 from app.core.catalogs import CatalogoConceptosNomina
+from app.repositories.shared import cache_consultas
 from app.core.enums import TipoConcepto
 from app.entities.concepto_nomina import (
     ConceptoNomina,
@@ -23,6 +24,9 @@ from app.entities.concepto_nomina import (
 
 logger = logging.getLogger(__name__)
 
+# El catálogo global sólo cambia al sincronizar desde CatalogoConceptosNomina.
+CACHE_TTL_CONCEPTOS = 600
+
 
 class ConceptoNominaService:
     """
@@ -37,6 +41,7 @@ class ConceptoNominaService:
         self.supabase = db_manager.get_client()
         self.tabla = 'conceptos_nomina'
         self.tabla_empresa = 'conceptos_nomina_empresa'
+        self._cache = cache_consultas.tabla(self.tabla, CACHE_TTL_CONCEPTOS)
 
     # =========================================================================
     # SINCRONIZACIÓN DEL CATÁLOGO
@@ -84,11 +89,14 @@ class ConceptoNominaService:
                     'activo': True,
                 })
 
-            result = (
-                self.supabase.table(self.tabla)
-                .upsert(registros, on_conflict='clave')
-                .execute()
-            )
+            try:
+                result = (
+                    self.supabase.table(self.tabla)
+                    .upsert(registros, on_conflict='clave')
+                    .execute()
+                )
+            finally:
+                self._cache.invalidar()
 
             total = len(result.data) if result.data else 0
             logger.info(f"Catálogo nómina sincronizado: {total} conceptos")
@@ -112,12 +120,15 @@ class ConceptoNominaService:
         Returns:
             Lista de ConceptoNominaResumen ordenada por orden_default.
         """
-        try:
+        def _cargar():
             query = self.supabase.table(self.tabla).select('*').order('orden_default')
             if solo_activos:
                 query = query.eq('activo', True)
-            result = query.execute()
-            return [ConceptoNominaResumen(**r) for r in (result.data or [])]
+            return query.execute().data or []
+
+        try:
+            filas = self._cache.leer_o_cargar(('todos', solo_activos), _cargar)
+            return [ConceptoNominaResumen(**r) for r in filas]
 
         except Exception as e:
             logger.error(f"Error obteniendo conceptos nómina: {e}")
@@ -130,16 +141,20 @@ class ConceptoNominaService:
         Raises:
             NotFoundError: Si la clave no existe en BD.
         """
-        try:
+        def _cargar():
             result = (
                 self.supabase.table(self.tabla)
                 .select('*')
                 .eq('clave', clave)
                 .execute()
             )
-            if not result.data:
+            return result.data[0] if result.data else None
+
+        try:
+            fila = self._cache.leer_o_cargar(('por_clave', clave), _cargar)
+            if not fila:
                 raise NotFoundError(f"Concepto de nómina '{clave}' no encontrado")
-            return ConceptoNomina(**result.data[0])
+            return ConceptoNomina(**fila)
 
         except NotFoundError:
             raise
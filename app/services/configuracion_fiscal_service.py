@@ -25,6 +25,7 @@ class ConfiguracionFiscalService(
     create_cls = ConfiguracionFiscalEmpresaCreate
     update_cls = ConfiguracionFiscalEmpresaUpdate
     nombre_config = "fiscal"
+    cache_ttl = 300
 
     def __init__(self):
         super().__init__("configuracion_fiscal_empresa")
@@ -8,7 +8,7 @@ Patrón de manejo de errores:
 """
 import logging
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from datetime import date
 from app.entities import (
     Contrato,
@@ -86,7 +86,8 @@ class ContratoService:
         self,
         incluir_inactivos: bool = False,
         limite: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        campos: Optional[Sequence[str]] = None
     ) -> List[Contrato]:
         """
         Obtiene todos los contratos con paginación.
@@ -95,6 +96,7 @@ class ContratoService:
             incluir_inactivos: Si True, incluye contratos cancelados/vencidos
             limite: Número máximo de resultados (None = 100 por defecto)
             offset: Número de registros a saltar
+            campos: Columnas a leer (None = todas); el resto queda en su default
 
         Returns:
             Lista de contratos
@@ -102,7 +104,7 @@ class ContratoService:
         Raises:
             DatabaseError: Si hay error de BD
         """
-        return await self._query_service.obtener_todos(incluir_inactivos, limite, offset)
+        return await self._query_service.obtener_todos(incluir_inactivos, limite, offset, campos)
 
     async def obtener_resumen_contratos(
         self,
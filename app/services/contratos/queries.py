@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Sequence, TYPE_CHECKING
 
+from app.core.exceptions import NotFoundError
 from app.entities import Contrato, ContratoResumen, EstatusContrato
 
 if TYPE_CHECKING:
@@ -18,7 +19,12 @@ class ContratoQueryService:
         self.root = root
 
     async def obtener_por_id(self, contrato_id: int) -> Contrato:
-        return await self.root.repository.obtener_por_id(contrato_id)
+        # Vía DataLoader: lecturas repetidas o concurrentes del mismo
+        # contrato dentro de una petición comparten una sola query.
+        contrato = await self.root.repository.loader().cargar(contrato_id)
+        if contrato is None:
+            raise NotFoundError(f"Contrato con ID {contrato_id} no encontrado")
+        return contrato
 
     async def obtener_por_codigo(self, codigo: str) -> Optional[Contrato]:
         return await self.root.repository.obtener_por_codigo(codigo)
@@ -28,8 +34,9 @@ class ContratoQueryService:
         incluir_inactivos: bool = False,
         limite: Optional[int] = None,
         offset: int = 0,
+        campos: Optional[Sequence[str]] = None,
     ) -> list[Contrato]:
-        return await self.root.repository.obtener_todos(incluir_inactivos, limite, offset)
+        return await self.root.repository.obtener_todos(incluir_inactivos, limite, offset, campos)
 
     async def obtener_resumen_contratos(
         self,
@@ -1996,31 +1996,39 @@ class CotizacionService:
                     'id', concepto['id']
                 ).execute()
 
-        for orden, nombre, valor in conceptos_a_crear:
-            # Buscar o crear concepto
-            if orden in existing_conceptos:
-                concepto_id = existing_conceptos[orden]['id']
-            else:
-                nuevo_concepto = (
-                    self.supabase.table('cotizacion_conceptos').insert({
-                        'partida_id': partida_id,
-                        'nombre': nombre,
-                        'tipo_concepto': TipoConceptoCotizacion.PATRONAL.value,
-                        'tipo_valor': TipoValorConcepto.FIJO.value,
-                        'orden': orden,
-                        'es_autogenerado': True,
-                    }).execute()
-                )
-                if not nuevo_concepto.data:
-                    continue
-                concepto_id = nuevo_concepto.data[0]['id']
-
-            # Upsert valor
-            await self.actualizar_valor_concepto(
-                concepto_id,
-                partida_categoria_id,
-                Decimal(str(round(valor, 2))),
-            )
+        # Crear en un solo INSERT los conceptos que falten
+        faltantes = [
+            {
+                'partida_id': partida_id,
+                'nombre': nombre,
+                'tipo_concepto': TipoConceptoCotizacion.PATRONAL.value,
+                'tipo_valor': TipoValorConcepto.FIJO.value,
+                'orden': orden,
+                'es_autogenerado': True,
+            }
+            for orden, nombre, _ in conceptos_a_crear
+            if orden not in existing_conceptos
+        ]
+        if faltantes:
+            nuevos = self.supabase.table('cotizacion_conceptos').insert(faltantes).execute()
+            for concepto in nuevos.data or []:
+                existing_conceptos[concepto['orden']] = concepto
+
+        # Upsert de todos los valores en una sentencia (uq_valor_concepto_categoria).
+        # concepto y categoría son de la misma partida por construcción.
+        valores = [
+            {
+                'concepto_id': existing_conceptos[orden]['id'],
+                'partida_categoria_id': partida_categoria_id,
+                'valor_pesos': float(Decimal(str(round(valor, 2)))),
+            }
+            for orden, _, valor in conceptos_a_crear
+            if orden in existing_conceptos
+        ]
+        if valores:
+            self.supabase.table('cotizacion_concepto_valores').upsert(
+                valores, on_conflict='concepto_id,partida_categoria_id'
+            ).execute()
 
     async def _asegurar_partida_editable(
         self,
@@ -4,130 +4,137 @@ Servicio del Dashboard Administrativo.
 Fachada (Facade Pattern) que orquesta llamadas a servicios existentes
 para agregar métricas del sistema en una sola invocación.
 
-Patrón B (sin repository): No tiene tabla propia en BD.
-Solo consume servicios existentes y retorna DTOs agregados.
+Patrón B (sin repository): No tiene tabla propia en BD. Los KPIs que
+sólo son conteos se piden como `count='exact', head=True` (sin filas);
+el resto se delega a los servicios especializados.
+
+Las métricas se sirven desde un `SnapshotMetricas`: la página lee el
+último cálculo en O(1) con su hora (`calculado_en`), y se recalcula en
+segundo plano al vencer o al escribirse en las tablas involucradas.
+Un error en cualquier consulta se propaga: el snapshot conserva el valor
+anterior y queda sucio, en vez de guardar ceros como si fueran datos.
 
 Uso:
     from app.services import dashboard_service
-    
+
     metricas = await dashboard_service.obtener_metricas()
 """
 
 import asyncio
 import logging
 
+from app.core.enums import EstadoRequisicion, EstatusContrato, EstatusEmpresa
 from app.entities.dashboard import DashboardMetricas
+from app.repositories.shared import iterar
+from app.services.metricas_snapshot import SnapshotMetricas
 
 logger = logging.getLogger(__name__)
 
+_CONTRATOS_VIGENTES = [
+    EstatusContrato.BORRADOR.value,
+    EstatusContrato.ACTIVO.value,
+    EstatusContrato.SUSPENDIDO.value,
+    EstatusContrato.CERRADO.value,
+]
+_REQUISICIONES_PENDIENTES = [
+    EstadoRequisicion.BORRADOR.value,
+    EstadoRequisicion.EN_REVISION.value,
+]
+
 
 class DashboardService:
     """
     Servicio fachada para el dashboard administrativo.
 
     Agrega métricas de múltiples servicios sin duplicar lógica de negocio.
-    Cada método delega a los servicios especializados existentes.
     """
 
-    async def obtener_metricas(self) -> DashboardMetricas:
+    TABLAS = ("empresas", "empleados", "contratos", "plazas", "contrato_categorias", "requisicion")
+
+    def __init__(self):
+        self.snapshot = SnapshotMetricas(
+            "dashboard", self.calcular_metricas, tablas=self.TABLAS,
+        )
+
+    async def obtener_metricas(self, forzar: bool = False) -> DashboardMetricas:
+        """
+        Métricas KPI del último snapshot (calcula la primera vez).
+
+        Args:
+            forzar: Recalcular ahora en vez de servir el snapshot.
+
+        Returns:
+            DashboardMetricas con `calculado_en` del snapshot.
         """
-        Obtiene todas las métricas KPI del dashboard en una sola llamada.
+        metricas, calculado_en = await self.snapshot.obtener(forzar=forzar)
+        return metricas.model_copy(update={"calculado_en": calculado_en})
 
-        Orquesta llamadas a:
-        - empresa_service.obtener_todas()
+    async def calcular_metricas(self) -> DashboardMetricas:
+        """
+        Calcula todas las métricas KPI del dashboard.
+
+        Orquesta:
+        - conteos (head) de empresas, contratos y requisiciones
         - empleado_service.contar()
-        - contrato_service.obtener_todos() / obtener_por_vencer()
-        - plaza_service.calcular_totales_contrato()
-        - requisicion_service.buscar_con_filtros()
+        - contrato_service.obtener_por_vencer()
+        - plaza_service.calcular_totales_contratos() (agrupado en la BD)
 
         Returns:
             DashboardMetricas con todos los indicadores poblados.
 
         Raises:
-            DatabaseError: Si algún servicio subyacente falla.
+            Cualquier error de las consultas (no hay valores por defecto).
         """
         # Imports lazy para evitar circularidad en el singleton
+        from app.database import db_manager
         from app.services import (
-            empresa_service,
             empleado_service,
             contrato_service,
             plaza_service,
-            requisicion_service,
         )
 
-        async def _seguro(coro, default, label: str):
-            try:
-                return await coro
-            except Exception as e:
-                logger.error("Dashboard: Error %s: %s", label, e)
-                return default
-
-        empresas, empleados_activos, contratos, por_vencer, req_borrador, req_revision = await asyncio.gather(
-            _seguro(
-                empresa_service.obtener_todas(incluir_inactivas=False, limite=500),
-                [],
-                "obteniendo empresas",
-            ),
-            _seguro(
-                empleado_service.contar(estatus="ACTIVO"),
-                0,
-                "contando empleados",
-            ),
-            _seguro(
-                contrato_service.obtener_todos(incluir_inactivos=False, limite=500),
-                [],
-                "obteniendo contratos",
-            ),
-            _seguro(
-                contrato_service.obtener_por_vencer(dias=30),
-                [],
-                "obteniendo contratos por vencer",
-            ),
-            _seguro(
-                requisicion_service.buscar_con_filtros(estado="BORRADOR", limite=500),
-                [],
-                "contando requisiciones BORRADOR",
+        supabase = db_manager.get_client()
+
+        async def _contar(query) -> int:
+            return (await db_manager.ejecutar_query(query)).count or 0
+
+        async def _ids_contratos_vigentes() -> list:
+            ids = []
+            async for pagina in iterar(
+                lambda: supabase.table("contratos").select("id").in_("estatus", _CONTRATOS_VIGENTES)
+            ):
+                ids.extend(fila["id"] for fila in pagina)
+            return ids
+
+        empresas_activas, empleados_activos, contrato_ids, por_vencer, requisiciones_pendientes = await asyncio.gather(
+            _contar(
+                supabase.table("empresas").select("id", count="exact", head=True)
+                .eq("estatus", EstatusEmpresa.ACTIVO.value)
             ),
-            _seguro(
-                requisicion_service.buscar_con_filtros(estado="EN_REVISION", limite=500),
-                [],
-                "contando requisiciones EN_REVISION",
+            empleado_service.contar(estatus="ACTIVO"),
+            _ids_contratos_vigentes(),
+            contrato_service.obtener_por_vencer(dias=30),
+            _contar(
+                supabase.table("requisicion").select("id", count="exact", head=True)
+                .in_("estado", _REQUISICIONES_PENDIENTES)
             ),
         )
 
-        empresas_activas = len(empresas)
-        contratos_activos = len(contratos)
-        contratos_por_vencer = len(por_vencer)
-        requisiciones_pendientes = len(req_borrador) + len(req_revision)
-
-        plazas_ocupadas = 0
-        plazas_vacantes = 0
-
-        # --- Plazas (ocupadas y vacantes) ---
-        # Ejecutar cálculos por contrato en paralelo para reducir latencia.
-        if contratos:
-            resultados_plazas = await asyncio.gather(
-                *(
-                    plaza_service.calcular_totales_contrato(contrato.id)
-                    for contrato in contratos
-                ),
-                return_exceptions=True,
-            )
-            for resultado in resultados_plazas:
-                if isinstance(resultado, Exception):
-                    logger.debug("Dashboard: Error puntual calculando plazas: %s", resultado)
-                    continue
-                plazas_ocupadas += resultado.plazas_ocupadas
-                plazas_vacantes += resultado.plazas_vacantes
+        # --- Plazas (ocupadas y vacantes): una consulta agrupada ---
+        totales_plazas = {}
+        if contrato_ids:
+            totales_plazas = await plaza_service.calcular_totales_contratos(contrato_ids)
+        plazas_ocupadas = sum(t.plazas_ocupadas for t in totales_plazas.values())
+        plazas_vacantes = sum(t.plazas_vacantes for t in totales_plazas.values())
 
         return DashboardMetricas(
             empresas_activas=empresas_activas,
             empleados_activos=empleados_activos,
-            contratos_activos=contratos_activos,
+            contratos_activos=len(contrato_ids),
             plazas_ocupadas=plazas_ocupadas,
             plazas_vacantes=plazas_vacantes,
             requisiciones_pendientes=requisiciones_pendientes,
-            contratos_por_vencer=contratos_por_vencer,
+            contratos_por_vencer=len(por_vencer),
         )
 
 
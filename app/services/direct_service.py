@@ -5,6 +5,11 @@ from __future__ import annotations
 from typing import Any, Generic, Iterable, Optional, TypeVar
 
 from app.database import db_manager
+from app.repositories.shared.cache import (
+    OPERACION_POR_ID,
+    cache_consultas,
+    normalizar_filtros,
+)
 
 TEntity = TypeVar("TEntity")
 TCreate = TypeVar("TCreate")
@@ -12,11 +17,23 @@ TUpdate = TypeVar("TUpdate")
 
 
 class DirectSupabaseService:
-    """Base mínima para reducir repetición en servicios directos."""
+    """
+    Base mínima para reducir repetición en servicios directos.
+
+    Con `cache_ttl` (segundos) `_fetch_one` lee a través de la cache de la
+    tabla; `_insert_row` y `_update_rows` invalidan lo afectado.
+    """
+
+    cache_ttl: float | None = None
+    cache_max_entradas: int = 256
 
     def __init__(self, tabla: str):
         self.supabase = db_manager.get_client()
         self.tabla = tabla
+        self._cache = (
+            cache_consultas.tabla(tabla, self.cache_ttl, self.cache_max_entradas)
+            if self.cache_ttl else None
+        )
 
     def _query(self, select: str = "*"):
         return self.supabase.table(self.tabla).select(select)
@@ -41,12 +58,19 @@ class DirectSupabaseService:
         filters: dict[str, Any],
         not_found_message: str | None = None,
     ):
-        result = self._apply_filters(self._query(), filters).limit(1).execute()
-        if not result.data:
+        def _cargar():
+            result = self._apply_filters(self._query(), filters).limit(1).execute()
+            return result.data[0] if result.data else None
+
+        if self._cache is None:
+            row = _cargar()
+        else:
+            row = self._cache.leer_o_cargar(self._clave_filtros(filters), _cargar)
+        if not row:
             if not_found_message:
                 raise ValueError(not_found_message)
             return None
-        return self._build_entity(entity_cls, result.data[0])
+        return self._build_entity(entity_cls, row)
 
     def _fetch_many(self, entity_cls, query):
         result = query.execute()
@@ -60,12 +84,34 @@ class DirectSupabaseService:
         return entity
 
     def _insert_row(self, payload: dict[str, Any]):
-        return self.supabase.table(self.tabla).insert(payload).execute()
+        try:
+            return self.supabase.table(self.tabla).insert(payload).execute()
+        finally:
+            if self._cache is not None:
+                self._cache.invalidar_listados()
 
     def _update_rows(self, payload: dict[str, Any], *, filters: dict[str, Any]):
         query = self.supabase.table(self.tabla).update(payload)
         query = self._apply_filters(query, filters)
-        return query.execute()
+        try:
+            return query.execute()
+        finally:
+            self._invalidar_cache(filters)
+
+    @staticmethod
+    def _clave_filtros(filters: dict[str, Any]) -> tuple:
+        if set(filters) == {"id"}:
+            return (OPERACION_POR_ID, filters["id"])
+        return ("uno", normalizar_filtros(filters))
+
+    def _invalidar_cache(self, filters: dict[str, Any] | None = None) -> None:
+        """Invalida lo afectado por escribir filas que cumplen `filters`."""
+        if self._cache is None:
+            return
+        if filters and set(filters) == {"id"}:
+            self._cache.invalidar(filters["id"])
+        else:
+            self._cache.invalidar()
 
 
 class EmpresaConfigDirectService(
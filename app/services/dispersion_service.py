@@ -209,18 +209,17 @@ class DispersionService:
         Incluye URL de descarga (signed URL, válida 24h).
         """
         try:
-            result = (
+            result = await db_manager.ejecutar_query(
                 self.supabase.table('dispersion_layouts')
                 .select('*')
                 .eq('periodo_id', periodo_id)
                 .order('nombre_banco')
-                .execute()
             )
             layouts = result.data or []
             # Generar signed URLs frescas para descarga
             for layout in layouts:
-                layout['url_descarga'] = self._generar_url_descarga(
-                    layout.get('storage_path', '')
+                layout['url_descarga'] = await db_manager.ejecutar(
+                    self._generar_url_descarga, layout.get('storage_path', '')
                 )
             return layouts
         except Exception as e:
@@ -229,7 +228,7 @@ class DispersionService:
 
     async def generar_url_descarga(self, storage_path: str) -> str:
         """Genera una URL de descarga temporal (24h) para un layout almacenado."""
-        return self._generar_url_descarga(storage_path)
+        return await db_manager.ejecutar(self._generar_url_descarga, storage_path)
 
     # =========================================================================
     # HELPERS PRIVADOS
@@ -238,12 +237,11 @@ class DispersionService:
     async def _obtener_configuraciones(self, empresa_id: int) -> list[dict]:
         """Obtiene configuraciones de bancos activas de la empresa."""
         try:
-            result = (
+            result = await db_manager.ejecutar_query(
                 self.supabase.table('configuracion_bancos_empresa')
                 .select('*')
                 .eq('empresa_id', empresa_id)
                 .eq('activo', True)
-                .execute()
             )
             return result.data or []
         except Exception as e:
@@ -255,8 +253,15 @@ class DispersionService:
         Sube el archivo a Supabase Storage.
 
         Intenta upload primero; si el archivo existe (409), hace update.
-        Retorna la URL de descarga firmada.
+        Retorna la URL de descarga firmada. Todo el I/O corre en el pool
+        del DatabaseManager.
         """
+        return await db_manager.ejecutar(
+            self._subir_archivo_sync, storage_path, contenido
+        )
+
+    def _subir_archivo_sync(self, storage_path: str, contenido: bytes) -> str:
+        """Upload/update bloqueante a Storage (ver `_subir_archivo`)."""
         content_type = (
             'text/csv; charset=utf-8'
             if storage_path.endswith('.csv')
@@ -314,7 +319,7 @@ class DispersionService:
         """Upsert del registro en dispersion_layouts."""
         try:
             from datetime import datetime, timezone
-            self.supabase.table('dispersion_layouts').upsert({
+            query = self.supabase.table('dispersion_layouts').upsert({
                 'periodo_id': periodo_id,
                 'empresa_id': empresa_id,
                 'nombre_banco': nombre_banco,
@@ -325,7 +330,8 @@ class DispersionService:
                 'errores': errores,
                 'generado_por': generado_por,
                 'fecha_generacion': datetime.now(timezone.utc).isoformat(),
-            }, on_conflict='periodo_id,nombre_banco').execute()
+            }, on_conflict='periodo_id,nombre_banco')
+            await db_manager.ejecutar_query(query)
         except Exception as e:
             logger.error(f"Error registrando layout {nombre_banco} período {periodo_id}: {e}")
 
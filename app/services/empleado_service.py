@@ -13,7 +13,7 @@ IMPORTANTE: Este servicio registra automáticamente los movimientos en historial
 - suspender() -> registrar_suspension()
 """
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from datetime import date
 from uuid import UUID
 
@@ -26,11 +26,13 @@ from app.entities.empleado import (
 from app.entities.empleado_restriccion_log import EmpleadoRestriccionLogResumen
 from app.core.enums import AccionRestriccion, EstatusEmpleado, MotivoBaja
 from app.repositories.empleado_repository import SupabaseEmpleadoRepository
+from app.repositories.shared import Pagina
 from app.core.exceptions import (
     NotFoundError,
     DuplicateError,
     BusinessRuleError,
 )
+from app.services.empleados.indice_busqueda import indice_busqueda_empleados
 from app.services.empleados.mutations import EmpleadoMutationService
 from app.services.empleados.queries import EmpleadoQueryService
 from app.services.empleados.restrictions import EmpleadoRestrictionService
@@ -53,16 +55,21 @@ class EmpleadoService:
     La clave (B25-00001) es para uso operativo interno y nunca cambia.
     """
 
-    def __init__(self, repository=None):
+    def __init__(self, repository=None, indice_busqueda=None):
         """
         Inicializa el servicio con un repository.
 
         Args:
             repository: Implementación del repository. Si es None, usa Supabase.
+            indice_busqueda: Índice en memoria para `buscar_indexado`. Si es
+                None, usa el global del proceso.
         """
         if repository is None:
             repository = SupabaseEmpleadoRepository()
+        if indice_busqueda is None:
+            indice_busqueda = indice_busqueda_empleados
         self.repository = repository
+        self.indice_busqueda = indice_busqueda
         self._query_service = EmpleadoQueryService(self)
         self._mutation_service = EmpleadoMutationService(self)
         self._restriction_service = EmpleadoRestrictionService(self)
@@ -93,6 +100,18 @@ class EmpleadoService:
         """
         return await self._query_service.obtener_por_curp(curp)
 
+    async def obtener_por_curps(self, curps: Sequence[str]) -> Dict[str, Empleado]:
+        """
+        Obtiene los empleados de varias CURPs en consultas por lote.
+
+        Returns:
+            Dict {CURP: empleado}; las CURPs inexistentes no aparecen
+
+        Raises:
+            DatabaseError: Si hay error de BD
+        """
+        return await self._query_service.obtener_por_curps(curps)
+
     async def obtener_por_user_id(self, user_id: UUID) -> Optional[Empleado]:
         """
         Busca empleado por user_id (para autoservicio). None si no existe.
@@ -128,6 +147,23 @@ class EmpleadoService:
         """
         return await self._mutation_service.crear(empleado_create)
 
+    async def crear_lote(
+        self,
+        empleados_create: Sequence[EmpleadoCreate],
+    ) -> List[Union[Empleado, Exception]]:
+        """
+        Crea varios empleados con claves consecutivas, en INSERTs por lote
+        (p. ej. alta masiva). Mismas reglas que `crear`.
+
+        Returns:
+            Por cada entrada, en orden, el Empleado creado o la excepción
+            de esa fila (DuplicateError, BusinessRuleError, DatabaseError)
+
+        Raises:
+            DatabaseError: Si falla la lectura de CURPs o del consecutivo
+        """
+        return await self._mutation_service.crear_lote(empleados_create)
+
     async def actualizar(self, empleado_id: int, empleado_update: EmpleadoUpdate) -> Empleado:
         """
         Actualiza un empleado existente.
@@ -222,6 +258,28 @@ class EmpleadoService:
             datos_actualizados,
         )
 
+    async def reingresar_lote(
+        self,
+        nueva_empresa_id: int,
+        reingresos: Sequence[Tuple[int, Optional[EmpleadoUpdate]]],
+    ) -> List[Union[Empleado, Exception]]:
+        """
+        Reingresa varios empleados a una empresa con escrituras por lote
+        (p. ej. alta masiva). Mismas reglas que `reingresar`.
+
+        Args:
+            nueva_empresa_id: ID de la empresa destino
+            reingresos: (empleado_id, datos_actualizados) por empleado
+
+        Returns:
+            Por cada entrada, en orden, el Empleado actualizado o la
+            excepción de esa fila (NotFoundError, BusinessRuleError, DatabaseError)
+
+        Raises:
+            DatabaseError: Si falla la lectura de los empleados
+        """
+        return await self._mutation_service.reingresar_lote(nueva_empresa_id, reingresos)
+
     # =========================================================================
     # CONSULTAS
     # =========================================================================
@@ -260,6 +318,36 @@ class EmpleadoService:
             offset,
         )
 
+    async def obtener_pagina(
+        self,
+        empresa_id: Optional[int] = None,
+        incluir_inactivos: bool = False,
+        cursor: Optional[str] = None,
+        limite: int = 50,
+        campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Empleado]:
+        """
+        Obtiene una página de empleados por cursor (keyset).
+
+        Args:
+            empresa_id: Filtrar por empresa (None = todas)
+            incluir_inactivos: Incluir empleados no activos
+            cursor: `siguiente_cursor` de la página anterior (None = primera)
+            limite: Empleados por página
+            campos: Columnas a leer (None = todas); el resto queda en su default
+
+        Raises:
+            ValidationError: Si el cursor es inválido
+            DatabaseError: Si hay error de BD
+        """
+        return await self._query_service.obtener_pagina(
+            empresa_id,
+            incluir_inactivos,
+            cursor,
+            limite,
+            campos,
+        )
+
     async def obtener_resumen_empleados(
         self,
         incluir_inactivos: bool = False,
@@ -305,7 +393,10 @@ class EmpleadoService:
         limite: int = 20
     ) -> List[Empleado]:
         """
-        Busca empleados por nombre, CURP o clave.
+        Busca empleados por nombre, CURP, RFC o clave, ordenados por relevancia.
+
+        Insensible a acentos ("pena" encuentra "PEÑA"); un CURP, RFC o clave
+        completos se buscan de forma exacta.
 
         Args:
             texto: Término de búsqueda (mínimo 2 caracteres)
@@ -317,6 +408,29 @@ class EmpleadoService:
         """
         return await self._query_service.buscar(texto, empresa_id, limite)
 
+    async def buscar_indexado(
+        self,
+        texto: str,
+        empresa_id: Optional[int],
+        limite: int = 50
+    ) -> List[Empleado]:
+        """
+        Búsqueda mientras se escribe sobre el índice en memoria de la empresa.
+
+        El índice resuelve los ids (subcadena o prefijo de palabra,
+        insensible a acentos) y sólo las filas de esos ids se leen de la BD.
+        Sin empresa (vista de todas) usa `buscar`.
+
+        Args:
+            texto: Término de búsqueda (mínimo 2 caracteres)
+            empresa_id: Empresa cuyo índice se consulta
+            limite: Máximo de resultados
+
+        Raises:
+            DatabaseError: Si hay error de BD
+        """
+        return await self._query_service.buscar_indexado(texto, empresa_id, limite)
+
     async def contar(
         self,
         empresa_id: Optional[int] = None,
@@ -0,0 +1,203 @@
+"""
+Índice de búsqueda de empleados en memoria, por empresa.
+
+Para búsqueda mientras se escribe: en vez de una query por tecla, cada
+empresa tiene en el proceso un índice con sólo los campos de búsqueda
+(nombre, apellidos, CURP, RFC, clave) normalizados con
+`normalizar_busqueda`. El layout es compacto: un único `str` con un
+registro por línea, ordenados por apellidos, más dos `array('q')` con el
+id y el offset de inicio de cada registro. Buscar es `str.find` sobre ese
+texto (subcadena) y `bisect` para ubicar el registro; un empleado con una
+palabra que empieza con el término va antes que uno que sólo lo contiene.
+
+Frescura:
+- Las mutaciones de `EmpleadoService` llaman a `actualizar(empleado)`,
+  que deja el registro nuevo en un delta pequeño (sin reconstruir).
+- El delta se compacta al pasar `MAX_DELTA` registros.
+- Otros procesos no llaman los hooks: el índice se reconstruye al expirar
+  el TTL.
+
+El índice sólo resuelve ids; las filas completas de los resultados
+visibles se piden a la BD con `obtener_por_ids`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from array import array
+from bisect import bisect_right
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.repositories.shared import normalizar_busqueda
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_BUSQUEDA = ("nombre", "apellido_paterno", "apellido_materno", "curp", "rfc", "clave")
+TTL_SEGUNDOS = 300
+MAX_DELTA = 256
+
+Cargador = Callable[[int], Awaitable[List[dict]]]
+
+
+def texto_busqueda(fila) -> str:
+    """Registro normalizado de un empleado (dict o entidad)."""
+    obtener = fila.get if isinstance(fila, dict) else lambda campo: getattr(fila, campo, None)
+    return normalizar_busqueda(" ".join(str(obtener(campo) or "") for campo in CAMPOS_BUSQUEDA))
+
+
+def _clave_orden(fila: dict) -> tuple:
+    return (
+        fila.get("apellido_paterno") or "",
+        fila.get("apellido_materno") or "",
+        fila.get("nombre") or "",
+        fila["id"],
+    )
+
+
+class _IndiceEmpresa:
+    """Registros de una empresa: texto concatenado + arrays de ids y offsets."""
+
+    __slots__ = ("ids", "inicios", "texto", "delta", "creado_en")
+
+    def __init__(self, filas: Iterable[dict]):
+        ids = array("q")
+        inicios = array("q")
+        partes: List[str] = []
+        offset = 0
+        for fila in sorted(filas, key=_clave_orden):
+            registro = texto_busqueda(fila)
+            ids.append(fila["id"])
+            inicios.append(offset)
+            partes.append(registro)
+            offset += len(registro) + 1
+        self.ids = ids
+        self.inicios = inicios
+        self.texto = "\n".join(partes)
+        # id -> registro vigente, o None si el empleado salió de la empresa
+        self.delta: Dict[int, Optional[str]] = {}
+        self.creado_en = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def buscar(self, termino: str, limite: int) -> List[int]:
+        prefijos: List[int] = []
+        contienen: List[int] = []
+        palabra = " " + termino
+        texto, inicios, delta = self.texto, self.inicios, self.delta
+
+        pos = texto.find(termino)
+        while pos != -1 and len(prefijos) < limite:
+            i = bisect_right(inicios, pos) - 1
+            inicio = inicios[i]
+            fin = inicios[i + 1] - 1 if i + 1 < len(inicios) else len(texto)
+            empleado_id = self.ids[i]
+            if empleado_id not in delta:
+                registro = texto[inicio:fin]
+                if registro.startswith(termino) or palabra in registro:
+                    prefijos.append(empleado_id)
+                else:
+                    contienen.append(empleado_id)
+            pos = texto.find(termino, fin)
+
+        for empleado_id, registro in delta.items():
+            if registro is None or termino not in registro:
+                continue
+            if registro.startswith(termino) or palabra in registro:
+                prefijos.append(empleado_id)
+            else:
+                contienen.append(empleado_id)
+
+        return (prefijos + contienen)[:limite]
+
+
+class IndiceBusquedaEmpleados:
+    """Índices por `empresa_id`, construidos bajo demanda."""
+
+    def __init__(self, ttl_segundos: float = TTL_SEGUNDOS, max_delta: int = MAX_DELTA):
+        self.ttl_segundos = ttl_segundos
+        self.max_delta = max_delta
+        self._indices: Dict[int, _IndiceEmpresa] = {}
+        self._cargas: Dict[int, asyncio.Future] = {}
+
+    def __contains__(self, empresa_id: int) -> bool:
+        return empresa_id in self._indices
+
+    async def buscar(
+        self,
+        empresa_id: int,
+        texto: str,
+        cargador: Cargador,
+        limite: int = 50,
+    ) -> List[int]:
+        """
+        Ids de empleados de `empresa_id` cuyo registro contiene `texto`,
+        primero los que tienen una palabra que empieza con él.
+
+        Args:
+            cargador: Corrutina `empresa_id -> filas` con `CAMPOS_BUSQUEDA`
+                e `id`; se usa si el índice no existe o expiró.
+        """
+        termino = normalizar_busqueda(texto)
+        if not termino:
+            return []
+        indice = await self._obtener(empresa_id, cargador)
+        return indice.buscar(termino, limite)
+
+    async def _obtener(self, empresa_id: int, cargador: Cargador) -> _IndiceEmpresa:
+        indice = self._indices.get(empresa_id)
+        if indice is not None and time.monotonic() - indice.creado_en < self.ttl_segundos:
+            return indice
+
+        # Una sola carga por empresa aunque lleguen varias teclas a la vez
+        carga = self._cargas.get(empresa_id)
+        if carga is None:
+            carga = asyncio.ensure_future(self._construir(empresa_id, cargador))
+            self._cargas[empresa_id] = carga
+            carga.add_done_callback(lambda _: self._cargas.pop(empresa_id, None))
+        return await asyncio.shield(carga)
+
+    async def _construir(self, empresa_id: int, cargador: Cargador) -> _IndiceEmpresa:
+        inicio = time.perf_counter()
+        indice = _IndiceEmpresa(await cargador(empresa_id))
+        self._indices[empresa_id] = indice
+        logger.debug(
+            "Índice de búsqueda empresa %s: %s empleados en %.0f ms",
+            empresa_id, len(indice), (time.perf_counter() - inicio) * 1000,
+        )
+        return indice
+
+    # -------------------------------------------------------------------------
+    # Hooks de invalidación
+    # -------------------------------------------------------------------------
+
+    def actualizar(self, empleado, empresa_anterior_id: Optional[int] = None) -> None:
+        """Refleja un alta/edición/reingreso sin reconstruir el índice."""
+        if empresa_anterior_id is not None and empresa_anterior_id != empleado.empresa_id:
+            self._poner(empresa_anterior_id, empleado.id, None)
+        if empleado.empresa_id is not None:
+            self._poner(empleado.empresa_id, empleado.id, texto_busqueda(empleado))
+
+    def _poner(self, empresa_id: int, empleado_id: int, registro: Optional[str]) -> None:
+        indice = self._indices.get(empresa_id)
+        if indice is None:
+            return
+        indice.delta[empleado_id] = registro
+        if len(indice.delta) > self.max_delta:
+            # Reconstrucción perezosa en la siguiente búsqueda
+            self.invalidar(empresa_id)
+
+    def invalidar(self, empresa_id: Optional[int] = None) -> None:
+        """Descarta el índice de una empresa (o todos)."""
+        if empresa_id is None:
+            self._indices.clear()
+        else:
+            self._indices.pop(empresa_id, None)
+
+    def estadisticas(self) -> List[Tuple[int, int, int]]:
+        """[(empresa_id, registros, delta)] para diagnóstico."""
+        return [(e, len(i), len(i.delta)) for e, i in self._indices.items()]
+
+
+indice_busqueda_empleados = IndiceBusquedaEmpleados()
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import logging
 from datetime import date
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, Sequence, Tuple, TYPE_CHECKING, Union
 
 from app.core.enums import EstatusEmpleado, MotivoBaja
-from app.core.exceptions import BusinessRuleError, DuplicateError
+from app.core.exceptions import BusinessRuleError, DatabaseError, DuplicateError, NotFoundError
 from app.entities.empleado import Empleado, EmpleadoCreate, EmpleadoUpdate
+from app.repositories.shared import TAMANO_LOTE_ESCRITURA, partir_en_lotes
 
 
 def _get_historial_service():
@@ -22,6 +23,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Relecturas del consecutivo por lote cuando otra alta ocupa las claves
+MAX_REINTENTOS_CLAVE = 3
+
 
 class EmpleadoMutationService:
     """Encapsula altas, actualizaciones y cambios de estatus."""
@@ -32,46 +36,15 @@ class EmpleadoMutationService:
     async def crear(self, empleado_create: EmpleadoCreate) -> Empleado:
         empleado_existente = await self.root.repository.obtener_por_curp(empleado_create.curp)
         if empleado_existente:
-            if empleado_existente.is_restricted:
-                raise BusinessRuleError(
-                    f"El empleado con CURP {empleado_create.curp} tiene restricciones "
-                    "en el sistema. Contacte al administrador de BUAP para mas informacion."
-                )
-            raise DuplicateError(
-                f"Empleado con CURP {empleado_create.curp} ya existe",
-                field="curp",
-                value=empleado_create.curp,
-            )
+            raise _error_curp_existente(empleado_create.curp, empleado_existente)
 
         if empleado_create.empresa_id is not None:
             await self.root._validar_empresa(empleado_create.empresa_id)
 
         clave = await self.root.generar_clave(date.today().year)
 
-        empleado = Empleado(
-            clave=clave,
-            empresa_id=empleado_create.empresa_id,
-            curp=empleado_create.curp,
-            rfc=empleado_create.rfc,
-            nss=empleado_create.nss,
-            nombre=empleado_create.nombre,
-            apellido_paterno=empleado_create.apellido_paterno,
-            apellido_materno=empleado_create.apellido_materno,
-            fecha_nacimiento=empleado_create.fecha_nacimiento,
-            genero=empleado_create.genero,
-            telefono=empleado_create.telefono,
-            email=empleado_create.email,
-            direccion=empleado_create.direccion,
-            contacto_emergencia=empleado_create.contacto_emergencia,
-            fecha_ingreso=empleado_create.fecha_ingreso or date.today(),
-            notas=empleado_create.notas,
-            cuenta_bancaria=empleado_create.cuenta_bancaria,
-            banco=empleado_create.banco,
-            clabe_interbancaria=empleado_create.clabe_interbancaria,
-            estatus=EstatusEmpleado.ACTIVO,
-        )
-
-        empleado_creado = await self.root.repository.crear(empleado)
+        empleado_creado = await self.root.repository.crear(_construir_empleado(empleado_create, clave))
+        self.root.indice_busqueda.actualizar(empleado_creado)
 
         try:
             historial_service = _get_historial_service()
@@ -79,15 +52,154 @@ class EmpleadoMutationService:
                 empleado_id=empleado_creado.id,
                 plaza_id=None,
                 fecha=empleado_creado.fecha_ingreso,
-                notas=f"Alta de empleado: {empleado_creado.nombre_completo}",
+                notas=_notas_alta(empleado_creado),
             )
         except Exception as exc:
             logger.warning("Error registrando alta en historial: %s", exc)
 
         return empleado_creado
 
+    async def crear_lote(
+        self,
+        empleados_create: Sequence[EmpleadoCreate],
+    ) -> List[Union[Empleado, Exception]]:
+        """
+        Alta de varios empleados con las reglas de `crear`, en lotes.
+
+        Las CURPs se verifican con consultas por lote, cada empresa se valida
+        una vez y las claves salen de un bloque consecutivo que arranca en
+        una sola lectura de `obtener_siguiente_consecutivo`. Cada lote de
+        TAMANO_LOTE_ESCRITURA es un INSERT atómico; si choca:
+        - por CURP: esas filas quedan con DuplicateError y se reintenta el resto;
+        - por clave (otra alta tomó el bloque): se relee el consecutivo y se
+          reintenta con claves nuevas;
+        - por otra causa: el lote se da de alta fila por fila con `crear`.
+
+        Returns:
+            Por cada entrada, en orden, el Empleado creado o la excepción de
+            esa fila.
+        """
+        resultados: List[Union[Empleado, Exception, None]] = [None] * len(empleados_create)
+        existentes = await self.root.repository.obtener_por_curps(
+            [e.curp for e in empleados_create]
+        )
+
+        errores_empresa = {}
+        for empresa_id in {e.empresa_id for e in empleados_create if e.empresa_id is not None}:
+            try:
+                await self.root._validar_empresa(empresa_id)
+            except BusinessRuleError as exc:
+                errores_empresa[empresa_id] = exc
+
+        pendientes: List[int] = []
+        curps_vistas = set()
+        for i, empleado_create in enumerate(empleados_create):
+            if empleado_create.curp in existentes:
+                resultados[i] = _error_curp_existente(
+                    empleado_create.curp, existentes[empleado_create.curp]
+                )
+            elif empleado_create.curp in curps_vistas:
+                resultados[i] = _error_curp_existente(empleado_create.curp)
+            elif empleado_create.empresa_id in errores_empresa:
+                resultados[i] = errores_empresa[empleado_create.empresa_id]
+            else:
+                pendientes.append(i)
+            curps_vistas.add(empleado_create.curp)
+
+        creados: List[Empleado] = []
+        if pendientes:
+            anio = date.today().year
+            consecutivo = await self.root.repository.obtener_siguiente_consecutivo(anio)
+            for lote in partir_en_lotes(pendientes, TAMANO_LOTE_ESCRITURA):
+                consecutivo = await self._insertar_lote(
+                    empleados_create, lote, anio, consecutivo, resultados, creados
+                )
+
+        for empleado in creados:
+            self.root.indice_busqueda.actualizar(empleado)
+
+        if creados:
+            try:
+                historial_service = _get_historial_service()
+                await historial_service.registrar_altas(
+                    [(e.id, e.fecha_ingreso, _notas_alta(e)) for e in creados]
+                )
+            except Exception as exc:
+                logger.warning("Error registrando altas en historial: %s", exc)
+
+        return resultados
+
+    async def _insertar_lote(
+        self,
+        empleados_create: Sequence[EmpleadoCreate],
+        indices: List[int],
+        anio: int,
+        consecutivo: int,
+        resultados: list,
+        creados: List[Empleado],
+    ) -> int:
+        """
+        Inserta las filas `indices` desde `consecutivo` y deja el resultado de
+        cada una en `resultados`; las creadas aquí se agregan a `creados`
+        (las de la ruta fila por fila ya registraron índice e historial).
+
+        Returns:
+            Siguiente consecutivo libre
+        """
+        reintentos_clave = 0
+        while indices:
+            empleados = [
+                _construir_empleado(empleados_create[i], Empleado.generar_clave(anio, consecutivo + n))
+                for n, i in enumerate(indices)
+            ]
+            try:
+                insertados = await self.root.repository.crear_lote(empleados)
+            except DuplicateError as exc:
+                filas = set(exc.details.get('filas') or [])
+                escritas = _registrar_escritas(exc, indices, resultados, creados)
+                if exc.field == 'clave' and reintentos_clave < MAX_REINTENTOS_CLAVE:
+                    reintentos_clave += 1
+                    consecutivo = await self.root.repository.obtener_siguiente_consecutivo(anio)
+                    indices = [i for n, i in enumerate(indices) if n not in escritas]
+                    continue
+                if exc.field == 'curp' and filas:
+                    for n in filas:
+                        resultados[indices[n]] = _error_curp_existente(empleados[n].curp)
+                    indices = [i for n, i in enumerate(indices) if n not in filas | escritas]
+                    continue
+                pendientes = [i for n, i in enumerate(indices) if n not in escritas]
+                return await self._crear_uno_por_uno(empleados_create, pendientes, anio, resultados, exc)
+            except DatabaseError as exc:
+                escritas = _registrar_escritas(exc, indices, resultados, creados)
+                pendientes = [i for n, i in enumerate(indices) if n not in escritas]
+                return await self._crear_uno_por_uno(empleados_create, pendientes, anio, resultados, exc)
+
+            for i, empleado in zip(indices, insertados):
+                resultados[i] = empleado
+            creados.extend(insertados)
+            return consecutivo + len(indices)
+        return consecutivo
+
+    async def _crear_uno_por_uno(
+        self,
+        empleados_create: Sequence[EmpleadoCreate],
+        indices: List[int],
+        anio: int,
+        resultados: list,
+        causa: Exception,
+    ) -> int:
+        """Alternativa de `_insertar_lote` cuando no se puede ubicar la fila que falló."""
+        logger.warning("Lote de %s altas falló (%s); se crean fila por fila", len(indices), causa)
+        for i in indices:
+            try:
+                resultados[i] = await self.crear(empleados_create[i])
+            except Exception as exc:
+                resultados[i] = exc
+        return await self.root.repository.obtener_siguiente_consecutivo(anio)
+
     async def actualizar(self, empleado_id: int, empleado_update: EmpleadoUpdate) -> Empleado:
         empleado = await self.root.repository.obtener_por_id(empleado_id)
+        empresa_anterior_id = empleado.empresa_id
 
         if empleado_update.empresa_id and empleado_update.empresa_id != empleado.empresa_id:
             await self.root._validar_empresa(empleado_update.empresa_id)
@@ -97,7 +209,9 @@ class EmpleadoMutationService:
             if valor is not None:
                 setattr(empleado, campo, valor)
 
-        return await self.root.repository.actualizar(empleado)
+        empleado_actualizado = await self.root.repository.actualizar(empleado)
+        self.root.indice_busqueda.actualizar(empleado_actualizado, empresa_anterior_id)
+        return empleado_actualizado
 
     async def dar_de_baja(
         self,
@@ -170,34 +284,13 @@ class EmpleadoMutationService:
         datos_actualizados: Optional[EmpleadoUpdate] = None,
     ) -> Empleado:
         empleado = await self.root.repository.obtener_por_id(empleado_id)
-
-        if empleado.is_restricted:
-            raise BusinessRuleError(
-                f"El empleado con CURP {empleado.curp} tiene restricciones "
-                "en el sistema. Contacte al administrador de BUAP para mas informacion."
-            )
-
-        if empleado.estatus == EstatusEmpleado.ACTIVO and empleado.empresa_id == nueva_empresa_id:
-            raise BusinessRuleError(
-                f"El empleado {empleado.clave} ya esta activo en esta empresa"
-            )
+        _verificar_reingreso(empleado, nueva_empresa_id)
 
         await self.root._validar_empresa(nueva_empresa_id)
-        empresa_anterior_id = empleado.empresa_id
-        empleado.empresa_id = nueva_empresa_id
-
-        if datos_actualizados:
-            update_data = datos_actualizados.model_dump(exclude_unset=True)
-            for campo, valor in update_data.items():
-                if valor is not None:
-                    setattr(empleado, campo, valor)
-
-        if empleado.estatus != EstatusEmpleado.ACTIVO:
-            empleado.estatus = EstatusEmpleado.ACTIVO
-            empleado.fecha_baja = None
-            empleado.motivo_baja = None
+        empresa_anterior_id = _aplicar_reingreso(empleado, nueva_empresa_id, datos_actualizados)
 
         empleado_actualizado = await self.root.repository.actualizar(empleado)
+        self.root.indice_busqueda.actualizar(empleado_actualizado, empresa_anterior_id)
 
         try:
             historial_service = _get_historial_service()
@@ -205,12 +298,195 @@ class EmpleadoMutationService:
                 empleado_id=empleado_id,
                 empresa_anterior_id=empresa_anterior_id,
                 plaza_id=None,
-                notas=(
-                    f"Reingreso a empresa {nueva_empresa_id} "
-                    f"desde empresa {empresa_anterior_id}"
-                ),
+                notas=_notas_reingreso(nueva_empresa_id, empresa_anterior_id),
             )
         except Exception as exc:
             logger.warning("Error registrando reingreso en historial: %s", exc)
 
         return empleado_actualizado
+
+    async def reingresar_lote(
+        self,
+        nueva_empresa_id: int,
+        reingresos: Sequence[Tuple[int, Optional[EmpleadoUpdate]]],
+    ) -> List[Union[Empleado, Exception]]:
+        """
+        Reingreso de varios empleados a `nueva_empresa_id` con las reglas de
+        `reingresar`: una lectura por lote de ids, un UPSERT por lote de
+        TAMANO_LOTE_ESCRITURA y el historial (cierre + REINGRESO) en
+        sentencias por lote. Si un lote falla se actualiza fila por fila.
+
+        Args:
+            reingresos: (empleado_id, datos_actualizados) por empleado
+
+        Returns:
+            Por cada entrada, en orden, el Empleado actualizado o la
+            excepción de esa fila.
+        """
+        resultados: List[Union[Empleado, Exception, None]] = [None] * len(reingresos)
+        por_id = {
+            e.id: e for e in await self.root.repository.obtener_por_ids(
+                [empleado_id for empleado_id, _ in reingresos]
+            )
+        }
+
+        error_empresa = None
+        try:
+            await self.root._validar_empresa(nueva_empresa_id)
+        except BusinessRuleError as exc:
+            error_empresa = exc
+
+        # (índice, empleado, empresa_anterior_id) de las filas a escribir
+        pendientes: List[Tuple[int, Empleado, Optional[int]]] = []
+        for i, (empleado_id, datos_actualizados) in enumerate(reingresos):
+            empleado = por_id.get(empleado_id)
+            try:
+                if empleado is None:
+                    raise NotFoundError(f"Empleado con ID {empleado_id} no encontrado")
+                _verificar_reingreso(empleado, nueva_empresa_id)
+                if error_empresa:
+                    raise error_empresa
+            except (NotFoundError, BusinessRuleError) as exc:
+                resultados[i] = exc
+                continue
+            # Se modifica la instancia compartida: un id repetido ya la ve activa
+            empresa_anterior_id = _aplicar_reingreso(empleado, nueva_empresa_id, datos_actualizados)
+            pendientes.append((i, empleado, empresa_anterior_id))
+
+        actualizados: List[Tuple[Empleado, Optional[int]]] = []
+        for lote in partir_en_lotes(pendientes, TAMANO_LOTE_ESCRITURA):
+            try:
+                escritos = await self.root.repository.actualizar_lote([e for _, e, _ in lote])
+            except (DuplicateError, DatabaseError) as exc:
+                logger.warning("Lote de %s reingresos falló (%s); se actualizan fila por fila", len(lote), exc)
+                escritos = []
+                for i, empleado, _ in lote:
+                    try:
+                        escritos.append(await self.root.repository.actualizar(empleado))
+                    except Exception as exc_fila:
+                        escritos.append(exc_fila)
+
+            for (i, _, empresa_anterior_id), escrito in zip(lote, escritos):
+                resultados[i] = escrito
+                if isinstance(escrito, Empleado):
+                    actualizados.append((escrito, empresa_anterior_id))
+
+        for empleado, empresa_anterior_id in actualizados:
+            self.root.indice_busqueda.actualizar(empleado, empresa_anterior_id)
+
+        if actualizados:
+            try:
+                historial_service = _get_historial_service()
+                await historial_service.registrar_reingresos([
+                    (e.id, empresa_anterior_id, _notas_reingreso(nueva_empresa_id, empresa_anterior_id))
+                    for e, empresa_anterior_id in actualizados
+                ])
+            except Exception as exc:
+                logger.warning("Error registrando reingresos en historial: %s", exc)
+
+        return resultados
+
+
+def _error_curp_existente(curp: str, empleado: Optional[Empleado] = None) -> Exception:
+    if empleado is not None and empleado.is_restricted:
+        return BusinessRuleError(
+            f"El empleado con CURP {curp} tiene restricciones "
+            "en el sistema. Contacte al administrador de BUAP para mas informacion."
+        )
+    return DuplicateError(
+        f"Empleado con CURP {curp} ya existe",
+        field="curp",
+        value=curp,
+    )
+
+
+def _registrar_escritas(
+    error: Exception,
+    indices: List[int],
+    resultados: list,
+    creados: List[Empleado],
+) -> set:
+    """
+    Deja en `resultados` las filas que sí se insertaron antes de `error`
+    (`details['escritas']` de `escribir_en_lotes`) para no darlas de alta
+    otra vez. Regresa sus posiciones en `indices`.
+    """
+    detalles = getattr(error, 'details', None) or {}
+    escritas = detalles.get('escritas') or []
+    for n, fila in zip(escritas, detalles.get('filas_escritas') or []):
+        empleado = Empleado(**fila)
+        resultados[indices[n]] = empleado
+        creados.append(empleado)
+    return set(escritas)
+
+
+def _construir_empleado(empleado_create: EmpleadoCreate, clave: str) -> Empleado:
+    return Empleado(
+        clave=clave,
+        empresa_id=empleado_create.empresa_id,
+        curp=empleado_create.curp,
+        rfc=empleado_create.rfc,
+        nss=empleado_create.nss,
+        nombre=empleado_create.nombre,
+        apellido_paterno=empleado_create.apellido_paterno,
+        apellido_materno=empleado_create.apellido_materno,
+        fecha_nacimiento=empleado_create.fecha_nacimiento,
+        genero=empleado_create.genero,
+        telefono=empleado_create.telefono,
+        email=empleado_create.email,
+        direccion=empleado_create.direccion,
+        contacto_emergencia=empleado_create.contacto_emergencia,
+        fecha_ingreso=empleado_create.fecha_ingreso or date.today(),
+        notas=empleado_create.notas,
+        cuenta_bancaria=empleado_create.cuenta_bancaria,
+        banco=empleado_create.banco,
+        clabe_interbancaria=empleado_create.clabe_interbancaria,
+        estatus=EstatusEmpleado.ACTIVO,
+    )
+
+
+def _notas_alta(empleado: Empleado) -> str:
+    return f"Alta de empleado: {empleado.nombre_completo()}"
+
+
+def _verificar_reingreso(empleado: Empleado, nueva_empresa_id: int) -> None:
+    if empleado.is_restricted:
+        raise BusinessRuleError(
+            f"El empleado con CURP {empleado.curp} tiene restricciones "
+            "en el sistema. Contacte al administrador de BUAP para mas informacion."
+        )
+
+    if empleado.estatus == EstatusEmpleado.ACTIVO and empleado.empresa_id == nueva_empresa_id:
+        raise BusinessRuleError(
+            f"El empleado {empleado.clave} ya esta activo en esta empresa"
+        )
+
+
+def _aplicar_reingreso(
+    empleado: Empleado,
+    nueva_empresa_id: int,
+    datos_actualizados: Optional[EmpleadoUpdate],
+) -> Optional[int]:
+    """Mueve al empleado a la nueva empresa y lo reactiva; regresa la empresa anterior."""
+    empresa_anterior_id = empleado.empresa_id
+    empleado.empresa_id = nueva_empresa_id
+
+    if datos_actualizados:
+        update_data = datos_actualizados.model_dump(exclude_unset=True)
+        for campo, valor in update_data.items():
+            if valor is not None:
+                setattr(empleado, campo, valor)
+
+    if empleado.estatus != EstatusEmpleado.ACTIVO:
+        empleado.estatus = EstatusEmpleado.ACTIVO
+        empleado.fecha_baja = None
+        empleado.motivo_baja = None
+
+    return empresa_anterior_id
+
+
+def _notas_reingreso(nueva_empresa_id: int, empresa_anterior_id: Optional[int]) -> str:
+    return (
+        f"Reingreso a empresa {nueva_empresa_id} "
+        f"desde empresa {empresa_anterior_id}"
+    )
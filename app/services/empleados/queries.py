@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import logging
 from datetime import date
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, Sequence, TYPE_CHECKING
 from uuid import UUID
 
 from app.core.exceptions import NotFoundError
 from app.database import db_manager
 from app.entities.empleado import Empleado, EmpleadoResumen
+from app.repositories.shared import Pagina
 
 if TYPE_CHECKING:
     from app.services.empleado_service import EmpleadoService
@@ -30,6 +31,9 @@ class EmpleadoQueryService:
     async def obtener_por_curp(self, curp: str) -> Optional[Empleado]:
         return await self.root.repository.obtener_por_curp(curp.upper())
 
+    async def obtener_por_curps(self, curps: Sequence[str]) -> Dict[str, Empleado]:
+        return await self.root.repository.obtener_por_curps(curps)
+
     async def obtener_por_user_id(self, user_id: UUID) -> Optional[Empleado]:
         try:
             supabase = db_manager.get_client()
@@ -72,6 +76,22 @@ class EmpleadoQueryService:
             offset,
         )
 
+    async def obtener_pagina(
+        self,
+        empresa_id: Optional[int] = None,
+        incluir_inactivos: bool = False,
+        cursor: Optional[str] = None,
+        limite: int = 50,
+        campos: Optional[Sequence[str]] = None,
+    ) -> Pagina[Empleado]:
+        return await self.root.repository.obtener_pagina(
+            empresa_id,
+            incluir_inactivos,
+            cursor,
+            limite,
+            campos,
+        )
+
     async def obtener_resumen_empleados(
         self,
         incluir_inactivos: bool = False,
@@ -133,7 +153,27 @@ class EmpleadoQueryService:
     ) -> list[Empleado]:
         if not texto or len(texto) < 2:
             return []
-        return await self.root.repository.buscar(texto, empresa_id, limite)
+        return await self.root.repository.buscar_rankeado(texto, empresa_id, limite)
+
+    async def buscar_indexado(
+        self,
+        texto: str,
+        empresa_id: Optional[int],
+        limite: int = 50,
+    ) -> list[Empleado]:
+        if not texto or len(texto) < 2:
+            return []
+        if not empresa_id:
+            return await self.buscar(texto, empresa_id, limite)
+        ids = await self.root.indice_busqueda.buscar(
+            empresa_id,
+            texto,
+            self.root.repository.obtener_campos_busqueda,
+            limite,
+        )
+        empleados = await self.root.repository.obtener_por_ids(ids)
+        # El índice de otro proceso puede ir atrasado hasta su TTL
+        return [e for e in empleados if e.empresa_id == empresa_id]
 
     async def contar(
         self,
@@ -25,6 +25,7 @@ from app.repositories import (
     SupabaseEmpleadoRepository,
     SupabaseContratoRepository,
 )
+from app.repositories.shared import Pagina
 from app.core.exceptions import DatabaseError, BusinessRuleError
 from app.core.utils import generar_candidatos_codigo
 
@@ -70,6 +71,21 @@ class EmpresaService:
         """
         return await self.repository.obtener_todas(incluir_inactivas, limite, offset)
 
+    async def obtener_pagina(
+        self,
+        incluir_inactivas: bool = False,
+        cursor: Optional[str] = None,
+        limite: int = 100
+    ) -> Pagina[Empresa]:
+        """
+        Obtiene una pagina de empresas por cursor.
+
+        Raises:
+            ValidationError: Si el cursor es invalido
+            DatabaseError: Si hay error de BD
+        """
+        return await self.repository.obtener_pagina(incluir_inactivas, cursor, limite)
+
     async def buscar_por_nombre(self, termino: str, limite: int = 10) -> List[Empresa]:
         """
         Busca empresas por nombre comercial o razon social.
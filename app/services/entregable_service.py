@@ -177,33 +177,30 @@ class EntregableService:
         
         ultimo_periodo = await self.repository.obtener_ultimo_numero_periodo(contrato_id)
         
-        creados = 0
-        for p_inicio, p_fin, num_esperado in periodos_requeridos:
-            if num_esperado <= ultimo_periodo:
-                continue
-            
-            existente = await self.repository.obtener_por_contrato_y_periodo(
-                contrato_id, num_esperado
-            )
-            if existente:
-                continue
-            
-            entregable = Entregable(
+        nuevos = [
+            Entregable(
                 contrato_id=contrato_id,
                 periodo_inicio=p_inicio,
                 periodo_fin=p_fin,
                 numero_periodo=num_esperado,
                 estatus=EstatusEntregable.PENDIENTE,
             )
-            
-            await self.repository.crear(entregable)
-            creados += 1
+            for p_inicio, p_fin, num_esperado in periodos_requeridos
+            if num_esperado > ultimo_periodo
+        ]
+        if not nuevos:
+            return 0
+        
+        # Un INSERT ... ON CONFLICT DO NOTHING por lote en vez de
+        # SELECT + INSERT por período
+        creados = await self.repository.crear_periodos(nuevos)
+        if creados:
             logger.info(
-                f"Creado período {num_esperado} para contrato {contrato_id}: "
-                f"{p_inicio} - {p_fin}"
+                f"Creados {len(creados)} períodos para contrato {contrato_id}: "
+                f"{creados[0].numero_periodo} - {creados[-1].numero_periodo}"
             )
         
-        return creados
+        return len(creados)
     
     # =========================================================================
     # OPERACIONES CRUD
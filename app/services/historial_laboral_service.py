@@ -14,8 +14,9 @@ Los registros se crean automaticamente cuando:
 - Se reactiva un empleado (REACTIVACION)
 - Se da de baja un empleado (BAJA)
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from datetime import date
+import asyncio
 import logging
 
 from app.repositories import SupabaseHistorialLaboralRepository
@@ -69,12 +70,7 @@ class HistorialLaboralService:
         try:
             rows = await self.repository.obtener_por_empleado_con_join(empleado_id, limite)
 
-            resumenes = []
-            for data in rows:
-                resumen = await self._construir_resumen(data)
-                resumenes.append(resumen)
-
-            return resumenes
+            return await self._construir_resumenes(rows)
 
         except Exception as e:
             logger.error(f"Error obteniendo historial de empleado {empleado_id}: {e}")
@@ -95,12 +91,7 @@ class HistorialLaboralService:
         try:
             rows = await self.repository.obtener_todos_con_join(empleado_id, limite, offset)
 
-            resumenes = []
-            for data in rows:
-                resumen = await self._construir_resumen(data)
-                resumenes.append(resumen)
-
-            return resumenes
+            return await self._construir_resumenes(rows)
 
         except Exception as e:
             logger.error(f"Error obteniendo historial: {e}")
@@ -337,6 +328,66 @@ class HistorialLaboralService:
         )
         return historial
 
+    async def registrar_altas(
+        self,
+        altas: Sequence[Tuple[int, Optional[date], Optional[str]]],
+    ) -> List[HistorialLaboral]:
+        """
+        Registra el alta (sin plaza) de varios empleados con un INSERT por lote.
+
+        Args:
+            altas: (empleado_id, fecha, notas) por empleado, como en `registrar_alta`
+        """
+        datos = [
+            HistorialLaboralInterno(
+                empleado_id=empleado_id,
+                plaza_id=None,
+                tipo_movimiento=TipoMovimiento.ALTA,
+                fecha_inicio=fecha or date.today(),
+                notas=notas or "Alta en el sistema"
+            )
+            for empleado_id, fecha, notas in altas
+        ]
+        historial = await self.repository.crear_lote(datos)
+
+        logger.info(f"Registradas {len(historial)} ALTAS")
+        return historial
+
+    async def registrar_reingresos(
+        self,
+        reingresos: Sequence[Tuple[int, Optional[int], Optional[str]]],
+        fecha: Optional[date] = None,
+    ) -> List[HistorialLaboral]:
+        """
+        Registra el reingreso (sin plaza) de varios empleados: cierra sus
+        registros activos y crea los de REINGRESO, en sentencias por lote.
+
+        Args:
+            reingresos: (empleado_id, empresa_anterior_id, notas) por empleado,
+                como en `registrar_reingreso`
+        """
+        fecha_movimiento = fecha or date.today()
+
+        await self.repository.cerrar_registros_activos(
+            [empleado_id for empleado_id, _, _ in reingresos], fecha_movimiento
+        )
+
+        datos = [
+            HistorialLaboralInterno(
+                empleado_id=empleado_id,
+                plaza_id=None,
+                tipo_movimiento=TipoMovimiento.REINGRESO,
+                fecha_inicio=fecha_movimiento,
+                notas=notas or "Reingreso a otra empresa",
+                empresa_anterior_id=empresa_anterior_id,
+            )
+            for empleado_id, empresa_anterior_id, notas in reingresos
+        ]
+        historial = await self.repository.crear_lote(datos)
+
+        logger.info(f"Registrados {len(historial)} REINGRESOS")
+        return historial
+
     async def liberar_plaza_empleado(
         self,
         empleado_id: int,
@@ -391,7 +442,19 @@ class HistorialLaboralService:
             logger.error(f"Error cerrando registro activo: {e}")
             raise DatabaseError(f"Error de base de datos: {str(e)}")
 
-    async def _construir_resumen(self, data: dict) -> HistorialLaboralResumen:
+    async def _construir_resumenes(self, rows: List[dict]) -> List[HistorialLaboralResumen]:
+        """
+        Construye los resumenes de varios rows en paralelo.
+
+        Los datos de plaza se piden a un DataLoader, así que todas las
+        filas comparten una sola query de plazas en lugar de una por fila.
+        """
+        loader = self.repository.loader_datos_plaza()
+        return list(await asyncio.gather(
+            *(self._construir_resumen(data, loader) for data in rows)
+        ))
+
+    async def _construir_resumen(self, data: dict, loader) -> HistorialLaboralResumen:
         """
         Construye un HistorialLaboralResumen a partir de un row con JOIN de empleados.
 
@@ -410,7 +473,7 @@ class HistorialLaboralService:
         contrato_codigo = None
 
         if data.get('plaza_id'):
-            plaza_data = await self.repository.obtener_datos_plaza(data['plaza_id'])
+            plaza_data = await loader.cargar(data['plaza_id'])
             if plaza_data:
                 plaza_numero = plaza_data.get('numero_plaza')
                 categoria_nombre = plaza_data.get('categoria_nombre')
@@ -0,0 +1,281 @@
+"""
+Importaciones de alta masiva en segundo plano (reanudables).
+
+Validar el archivo sigue siendo síncrono (la vista previa la necesita).
+Al confirmar, los registros validados se guardan como una
+`ImportacionAltaMasiva` y se procesan aquí por lotes de
+`LOTE_IMPORTACION`, fuera del evento de la página:
+
+- Tras cada lote se guardan cursor, contadores y detalles (el avance que
+  la página muestra) y se renueva el latido.
+- Un proceso toma la importación incrementando `intentos` de forma
+  condicionada; si otro la toma, este deja de procesarla.
+- Si el proceso se cae, `reanudar_importaciones_periodicamente` (tarea de
+  lifespan de la app) la retoma desde el último lote confirmado cuando su
+  latido vence. Las filas de ese lote que sí alcanzaron a aplicarse se
+  concilian por CURP en lugar de repetirse.
+- La clave de idempotencia es el hash de empresa + archivo: confirmar dos
+  veces el mismo archivo regresa la misma importación.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.exceptions import DuplicateError
+from app.core.enums import EstatusEmpleado
+from app.entities.alta_masiva import (
+    DetalleResultado,
+    EstatusImportacion,
+    ImportacionAltaMasiva,
+    RegistroValidado,
+    ResultadoFila,
+    ResultadoProcesamiento,
+    ResultadoValidacion,
+)
+from app.repositories.importacion_repository import SupabaseImportacionAltaMasivaRepository
+from app.services.alta_masiva_service import alta_masiva_service
+
+logger = logging.getLogger(__name__)
+
+LOTE_IMPORTACION = 100
+LATIDO_VENCIDO_SEGUNDOS = 120
+REVISION_SEGUNDOS = 60
+
+
+class ImportacionAltaMasivaService:
+    """Crea, ejecuta y reanuda importaciones de alta masiva."""
+
+    def __init__(self, repository=None, tamano_lote: int = LOTE_IMPORTACION):
+        if repository is None:
+            repository = SupabaseImportacionAltaMasivaRepository()
+        self.repository = repository
+        self.tamano_lote = tamano_lote
+        self._tareas: Dict[int, asyncio.Task] = {}
+
+    @staticmethod
+    def clave_idempotencia(contenido: bytes, empresa_id: int) -> str:
+        """Hash de empresa + contenido del archivo."""
+        return hashlib.sha256(f"{empresa_id}:".encode() + contenido).hexdigest()
+
+    # =========================================================================
+    # CONSULTAS (para UI)
+    # =========================================================================
+
+    async def obtener(self, importacion_id: int, con_detalle: bool = False) -> ImportacionAltaMasiva:
+        return await self.repository.obtener_por_id(importacion_id, con_detalle=con_detalle)
+
+    async def obtener_activa(self, empresa_id: int) -> Optional[ImportacionAltaMasiva]:
+        """La importacion en curso más reciente de la empresa, si hay."""
+        activas = await self.repository.obtener_activas(empresa_id)
+        return activas[0] if activas else None
+
+    # =========================================================================
+    # EJECUCION
+    # =========================================================================
+
+    async def iniciar(
+        self,
+        validacion: ResultadoValidacion,
+        empresa_id: int,
+        clave_idempotencia: str,
+        nombre_archivo: str = "",
+    ) -> ImportacionAltaMasiva:
+        """
+        Guarda la importacion y la lanza en segundo plano.
+
+        Si ya existe una con la misma clave la regresa (y la relanza si
+        quedó fallida o huérfana) en lugar de procesar el archivo otra vez.
+
+        Raises:
+            DatabaseError: Si hay error de conexion
+        """
+        importacion = await self.repository.obtener_por_clave(clave_idempotencia)
+
+        if importacion is None:
+            registros = validacion.validos + validacion.reingresos
+            try:
+                importacion = await self.repository.crear(ImportacionAltaMasiva(
+                    empresa_id=empresa_id,
+                    clave_idempotencia=clave_idempotencia,
+                    nombre_archivo=nombre_archivo,
+                    total_filas=validacion.total_filas,
+                    registros=registros,
+                    total_registros=len(registros),
+                ))
+            except DuplicateError:
+                # Otra sesión confirmó el mismo archivo al mismo tiempo
+                importacion = await self.repository.obtener_por_clave(clave_idempotencia)
+        else:
+            logger.info(
+                "Importacion %s ya existe para este archivo (%s)", importacion.id, importacion.estatus
+            )
+
+        if self._huerfana(importacion):
+            self.lanzar(importacion.id)
+        return importacion
+
+    def lanzar(self, importacion_id: int) -> None:
+        """Ejecuta la importacion en una tarea de este proceso (una a la vez)."""
+        tarea = self._tareas.get(importacion_id)
+        if tarea is not None and not tarea.done():
+            return
+        tarea = asyncio.create_task(self._correr(importacion_id))
+        self._tareas[importacion_id] = tarea
+        tarea.add_done_callback(lambda _: self._tareas.pop(importacion_id, None))
+
+    async def reanudar_pendientes(self) -> int:
+        """Relanza las importaciones sin proceso vivo. Regresa cuántas."""
+        relanzadas = 0
+        for importacion in await self.repository.obtener_activas():
+            if importacion.id in self._tareas or not self._huerfana(importacion):
+                continue
+            logger.info("Reanudando importacion %s desde el registro %s", importacion.id, importacion.cursor)
+            self.lanzar(importacion.id)
+            relanzadas += 1
+        return relanzadas
+
+    async def ejecutar(self, importacion_id: int) -> ImportacionAltaMasiva:
+        """
+        Procesa la importacion desde su cursor hasta terminar.
+
+        Raises:
+            NotFoundError: Si no existe
+            DatabaseError: Si no se pudo leer o tomar la importacion
+        """
+        importacion = await self.repository.obtener_por_id(importacion_id)
+        if importacion.estatus == EstatusImportacion.COMPLETADA:
+            return importacion
+        if not await self.repository.tomar(importacion):
+            logger.info("Importacion %s ya la tomó otro proceso", importacion_id)
+            return importacion
+
+        conciliar = importacion.intentos > 1
+        try:
+            while importacion.cursor < importacion.total_registros:
+                lote = importacion.registros[importacion.cursor:importacion.cursor + self.tamano_lote]
+                resultado = ResultadoProcesamiento()
+                pendientes = lote
+                if conciliar:
+                    pendientes = await self._conciliar(importacion.empresa_id, lote, resultado)
+                    conciliar = False
+
+                if pendientes:
+                    parcial = await alta_masiva_service.procesar(
+                        ResultadoValidacion(
+                            validos=[r for r in pendientes if r.resultado == ResultadoFila.VALIDO],
+                            reingresos=[r for r in pendientes if r.resultado == ResultadoFila.REINGRESO],
+                        ),
+                        importacion.empresa_id,
+                    )
+                    resultado.creados += parcial.creados
+                    resultado.reingresados += parcial.reingresados
+                    resultado.errores += parcial.errores
+                    resultado.detalles.extend(parcial.detalles)
+
+                importacion.cursor += len(lote)
+                importacion.creados += resultado.creados
+                importacion.reingresados += resultado.reingresados
+                importacion.errores += resultado.errores
+                importacion.detalles.extend(resultado.detalles)
+                if importacion.cursor >= importacion.total_registros:
+                    importacion.estatus = EstatusImportacion.COMPLETADA
+
+                if not await self.repository.guardar_avance(importacion):
+                    logger.warning("Importacion %s la tomó otro proceso; se detiene aquí", importacion_id)
+                    return importacion
+
+            if importacion.estatus != EstatusImportacion.COMPLETADA:
+                importacion.estatus = EstatusImportacion.COMPLETADA
+                await self.repository.guardar_avance(importacion)
+
+        except Exception as e:
+            logger.error(f"Error en importacion {importacion_id} (registro {importacion.cursor}): {e}")
+            importacion.estatus = EstatusImportacion.FALLIDA
+            importacion.error = str(e)
+            try:
+                await self.repository.guardar_avance(importacion)
+            except Exception as e_guardar:
+                logger.error(f"No se pudo marcar la importacion {importacion_id} como fallida: {e_guardar}")
+
+        return importacion
+
+    async def _correr(self, importacion_id: int) -> None:
+        try:
+            await self.ejecutar(importacion_id)
+        except Exception as e:
+            logger.error(f"No se pudo ejecutar la importacion {importacion_id}: {e}")
+
+    async def _conciliar(
+        self,
+        empresa_id: int,
+        lote: List[RegistroValidado],
+        resultado: ResultadoProcesamiento,
+    ) -> List[RegistroValidado]:
+        """
+        El proceso anterior pudo aplicar parte de este lote antes de caerse:
+        las filas cuyo empleado ya está ACTIVO en la empresa se registran
+        como hechas. Regresa las que faltan.
+        """
+        from app.services import empleado_service
+
+        existentes = await empleado_service.obtener_por_curps([r.curp for r in lote])
+
+        pendientes = []
+        for registro in lote:
+            empleado = existentes.get(registro.curp)
+            aplicado = (
+                empleado is not None
+                and empleado.empresa_id == empresa_id
+                and empleado.estatus == EstatusEmpleado.ACTIVO
+            )
+            if not aplicado:
+                pendientes.append(registro)
+                continue
+
+            if registro.resultado == ResultadoFila.REINGRESO:
+                resultado.reingresados += 1
+                mensaje = f"Reingresado: {empleado.clave}"
+            else:
+                resultado.creados += 1
+                mensaje = f"Creado: {empleado.clave}"
+            resultado.detalles.append(DetalleResultado(
+                fila=registro.fila,
+                curp=registro.curp,
+                resultado=registro.resultado,
+                clave=empleado.clave,
+                mensaje=mensaje,
+            ))
+        return pendientes
+
+    def _huerfana(self, importacion: ImportacionAltaMasiva) -> bool:
+        """True si nadie la está procesando (y no está completada)."""
+        if importacion.estatus == EstatusImportacion.COMPLETADA:
+            return False
+        if importacion.estatus != EstatusImportacion.PROCESANDO:
+            return True
+        if importacion.id in self._tareas:
+            return False
+        latido = importacion.latido
+        if latido is None:
+            return True
+        if latido.tzinfo is None:
+            latido = latido.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - latido).total_seconds() > LATIDO_VENCIDO_SEGUNDOS
+
+
+async def reanudar_importaciones_periodicamente(revision_segundos: float = REVISION_SEGUNDOS) -> None:
+    """
+    Tarea de lifespan: retoma las importaciones pendientes o cuyo
+    proceso dejó de dar latido (p. ej. tras un reinicio).
+    """
+    while True:
+        try:
+            await importacion_alta_masiva_service.reanudar_pendientes()
+        except Exception as e:
+            logger.warning("No se pudieron revisar las importaciones pendientes: %s", e)
+        await asyncio.sleep(revision_segundos)
+
+
+importacion_alta_masiva_service = ImportacionAltaMasivaService()
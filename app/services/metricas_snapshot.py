@@ -0,0 +1,155 @@
+"""
+Snapshots de métricas agregadas (dashboards).
+
+Un `SnapshotMetricas` guarda en el proceso el último resultado de una
+corrutina costosa junto con la hora en que se calculó. Leerlo es O(1):
+
+- Sin valor todavía: calcula y espera (sólo la primera vez).
+- Vencido (`intervalo_segundos`) o sucio: regresa el valor actual y
+  dispara el recálculo en segundo plano (stale-while-revalidate).
+
+Se marca sucio cuando se escribe (insert/update/upsert/delete) en alguna
+de sus `tablas`, vía `registro_consultas.al_escribir`. Como eso sólo ve
+las escrituras de este proceso, `refrescar_snapshots_periodicamente`
+(tarea de lifespan de la app) además recalcula los vencidos.
+
+Uso:
+    snapshot = SnapshotMetricas(
+        "dashboard", servicio.calcular_metricas,
+        tablas=("empresas", "contratos"),
+    )
+    metricas, calculado_en = await snapshot.obtener()
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from app.database.instrumentacion import RegistroConsultas, registro_consultas
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+INTERVALO_SEGUNDOS = 300
+# Cada cuánto revisa la tarea de fondo si hay snapshots sucios o vencidos
+REVISION_SEGUNDOS = 30
+
+_snapshots: List["SnapshotMetricas"] = []
+
+
+class SnapshotMetricas(Generic[T]):
+    """Último valor de `calcular()` con su marca de tiempo."""
+
+    def __init__(
+        self,
+        nombre: str,
+        calcular: Callable[[], Awaitable[T]],
+        *,
+        tablas: Iterable[str] = (),
+        intervalo_segundos: float = INTERVALO_SEGUNDOS,
+        registro: RegistroConsultas = registro_consultas,
+    ):
+        self.nombre = nombre
+        self.intervalo_segundos = intervalo_segundos
+        self.tablas = frozenset(tablas)
+        self._calcular = calcular
+        self._valor: Optional[T] = None
+        self._calculado_en: Optional[datetime] = None
+        self._calculado_mono = 0.0
+        self._sucio = False
+        self._refresco: Optional[asyncio.Future] = None
+        if self.tablas:
+            registro.al_escribir(self._al_escribir)
+        _snapshots.append(self)
+
+    @property
+    def calculado_en(self) -> Optional[datetime]:
+        return self._calculado_en
+
+    @property
+    def vigente(self) -> bool:
+        return (
+            self._valor is not None
+            and not self._sucio
+            and time.monotonic() - self._calculado_mono < self.intervalo_segundos
+        )
+
+    async def obtener(self, forzar: bool = False) -> Tuple[T, datetime]:
+        """
+        (valor, calculado_en). Con `forzar` recalcula y espera el valor nuevo.
+        """
+        if forzar or self._valor is None:
+            await self.refrescar()
+        elif not self.vigente:
+            self._iniciar_refresco()
+        return self._valor, self._calculado_en
+
+    async def refrescar(self) -> T:
+        """Recalcula (una sola vez aunque lo pidan varios a la vez)."""
+        return await asyncio.shield(self._iniciar_refresco())
+
+    def invalidar(self) -> None:
+        """Marca el snapshot para recálculo en la siguiente lectura o revisión."""
+        self._sucio = True
+
+    def limpiar(self) -> None:
+        """Descarta el valor (tests)."""
+        self._valor = None
+        self._calculado_en = None
+        self._sucio = False
+
+    def _al_escribir(self, tabla: str) -> None:
+        if tabla in self.tablas:
+            self._sucio = True
+
+    def _iniciar_refresco(self) -> asyncio.Future:
+        if self._refresco is None or self._refresco.done():
+            self._refresco = asyncio.ensure_future(self._recalcular())
+            self._refresco.add_done_callback(self._registrar_fallo)
+        return self._refresco
+
+    def _registrar_fallo(self, refresco: asyncio.Future) -> None:
+        # Los refrescos en segundo plano nadie los espera: se registra aquí
+        if not refresco.cancelled() and refresco.exception() is not None:
+            logger.warning(
+                "No se pudo recalcular el snapshot '%s'; se conserva el anterior: %s",
+                self.nombre, refresco.exception(),
+            )
+
+    async def _recalcular(self) -> T:
+        # Escrituras que lleguen mientras se calcula vuelven a ensuciarlo
+        self._sucio = False
+        inicio = time.perf_counter()
+        try:
+            valor = await self._calcular()
+        except Exception:
+            self._sucio = True
+            raise
+        self._valor = valor
+        self._calculado_en = datetime.now()
+        self._calculado_mono = time.monotonic()
+        logger.debug(
+            "Snapshot '%s' recalculado en %.0f ms",
+            self.nombre, (time.perf_counter() - inicio) * 1000,
+        )
+        return valor
+
+
+async def refrescar_snapshots_periodicamente(revision_segundos: float = REVISION_SEGUNDOS) -> None:
+    """
+    Tarea de lifespan: recalcula los snapshots sucios o vencidos que ya
+    se leyeron alguna vez (los que nadie ha pedido no se calculan).
+    """
+    while True:
+        for snapshot in list(_snapshots):
+            if snapshot.calculado_en is None or snapshot.vigente:
+                continue
+            try:
+                await snapshot.refrescar()
+            except Exception as e:
+                logger.warning("No se pudo refrescar el snapshot '%s': %s", snapshot.nombre, e)
+        await asyncio.sleep(revision_segundos)
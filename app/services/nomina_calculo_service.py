@@ -9,18 +9,27 @@ Integra:
 - CatalogoISR (tabla mensual Art. 96 + subsidio al empleo)
 - CatalogoUMA (valor UMA vigente para exenciones)
 - CalculadoraIMSS (cuotas obreras)
+- CalculadoraNominaVectorial (kernel columnar usado en modo lote)
 
 Patrón: Direct Access (sin repository).
 """
+import hashlib
 import logging
+from collections import defaultdict
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
 from app.database import db_manager
 from app.core.exceptions import DatabaseError, NotFoundError, BusinessRuleError
+from app.repositories.shared.query_helpers import es_funcion_inexistente, iterar
 from app.core.catalogs import CatalogoConceptosNomina, CatalogoUMA
 from app.core.catalogs.fiscal.isr import CatalogoISR
 from app.core.calculations.calculadora_imss import CalculadoraIMSS
+from app.core.calculations.calculadora_nomina_vectorial import (
+    CONCEPTOS_SISTEMA,
+    CalculadoraNominaVectorial,
+    ResultadoNominaVectorial,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +48,20 @@ _FACTOR_MENSUAL = {
 }
 
 
+# Modos soportados por calcular_periodo
+_MODOS_CALCULO = ('lote', 'individual', 'incremental')
+
+# Versión del formato de huella: incrementar al cambiar fórmulas del motor
+# para forzar el recálculo de todas las nóminas en modo incremental.
+_VERSION_HUELLA = 1
+
+# Empleados por bloque de escritura en modo lote (y IDs por filtro `in_`)
+_TAMANO_BLOQUE = 200
+
+# Filas por página en lecturas paginadas (<= max-rows de PostgREST)
+_TAMANO_PAGINA = 1000
+
+
 def _round2(value: Decimal) -> Decimal:
     """Redondea a 2 decimales (ROUND_HALF_UP = estándar contable)."""
     return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
@@ -60,13 +83,14 @@ class NominaCalculoService:
     def __init__(self):
         self.supabase = db_manager.get_client()
         self.calculadora_imss = CalculadoraIMSS()
+        self.calculadora_vectorial = CalculadoraNominaVectorial()
         self._concepto_ids: dict[str, int] = {}   # cache clave → id en BD
 
     # =========================================================================
     # PÚBLICO PRINCIPAL
     # =========================================================================
 
-    async def calcular_periodo(self, periodo_id: int) -> dict:
+    async def calcular_periodo(self, periodo_id: int, modo: str = 'lote') -> dict:
         """
         Orquestador: calcula la nómina completa de todos los empleados del período.
 
@@ -74,10 +98,24 @@ class NominaCalculoService:
         Calcula cada nómina individual, actualiza sus totales y luego
         actualiza los totales consolidados del período.
 
+        Args:
+            periodo_id: ID del período.
+            modo: 'lote' (default) agrupa las escrituras en pocas llamadas
+                  por bloque de empleados; 'individual' conserva el flujo
+                  de 4 round trips por empleado; 'incremental' es como
+                  'lote' pero solo recalcula las nóminas cuya huella de
+                  entradas cambió desde el último cálculo.
+
         Returns:
             Resumen: {empleados_calculados, total_percepciones,
-                      total_deducciones, total_neto, errores: []}
+                      total_deducciones, total_neto, errores: []}.
+            En modo incremental incluye además `empleados_sin_cambios`.
         """
+        if modo not in _MODOS_CALCULO:
+            raise BusinessRuleError(
+                f"Modo de cálculo '{modo}' no soportado. Use uno de {_MODOS_CALCULO}"
+            )
+
         periodo = await self._obtener_periodo(periodo_id)
         if periodo['estatus'] != 'EN_PROCESO_CONTABILIDAD':
             raise BusinessRuleError(
@@ -104,26 +142,31 @@ class NominaCalculoService:
             'errores': [],
         }
 
-        for nomina in nominas:
-            try:
-                totales = await self._calcular_nomina_empleado(nomina, periodo)
-                resumen['empleados_calculados'] += 1
-                resumen['total_percepciones'] += totales['total_percepciones']
-                resumen['total_deducciones'] += totales['total_deducciones']
-                resumen['total_neto'] += totales['total_neto']
-            except Exception as e:
-                emp_id = nomina.get('empleado_id', '?')
-                logger.error(f"Error calculando nómina empleado {emp_id}: {e}")
-                resumen['errores'].append({'empleado_id': emp_id, 'error': str(e)})
+        if modo == 'lote':
+            await self._calcular_periodo_lote(nominas, periodo, resumen)
+        elif modo == 'incremental':
+            resumen['empleados_sin_cambios'] = 0
+            await self._calcular_periodo_lote(
+                nominas, periodo, resumen, incremental=True
+            )
+        else:
+            for nomina in nominas:
+                try:
+                    totales = await self._calcular_nomina_empleado(nomina, periodo)
+                    self._acumular(resumen, totales)
+                except Exception as e:
+                    self._registrar_error(resumen, nomina, e)
 
         # Actualizar totales consolidados del período
         try:
-            self.supabase.table('periodos_nomina').update({
-                'total_percepciones': str(_round2(resumen['total_percepciones'])),
-                'total_deducciones': str(_round2(resumen['total_deducciones'])),
-                'total_neto': str(_round2(resumen['total_neto'])),
-                'total_empleados': resumen['empleados_calculados'],
-            }).eq('id', periodo_id).execute()
+            await self._ejecutar(
+                self.supabase.table('periodos_nomina').update({
+                    'total_percepciones': str(_round2(resumen['total_percepciones'])),
+                    'total_deducciones': str(_round2(resumen['total_deducciones'])),
+                    'total_neto': str(_round2(resumen['total_neto'])),
+                    'total_empleados': resumen['empleados_calculados'],
+                }).eq('id', periodo_id)
+            )
         except Exception as e:
             logger.error(f"Error actualizando totales período {periodo_id}: {e}")
 
@@ -152,11 +195,10 @@ class NominaCalculoService:
         await self._cargar_concepto_ids()
 
         # Obtener nomina_empleado
-        res = (
+        res = await self._ejecutar(
             self.supabase.table('nominas_empleado')
             .select('*')
             .eq('id', nomina_empleado_id)
-            .execute()
         )
         if not res.data:
             raise NotFoundError(f"NominaEmpleado {nomina_empleado_id} no encontrada")
@@ -175,11 +217,10 @@ class NominaCalculoService:
         y por orden_default del concepto.
         """
         try:
-            result = (
+            result = await self._ejecutar(
                 self.supabase.table('nomina_movimientos')
                 .select('*, conceptos_nomina(clave, nombre, orden_default)')
                 .eq('nomina_empleado_id', nomina_empleado_id)
-                .execute()
             )
             items = []
             for r in (result.data or []):
@@ -199,23 +240,319 @@ class NominaCalculoService:
             logger.error(f"Error obteniendo desglose nómina {nomina_empleado_id}: {e}")
             raise DatabaseError(f"Error obteniendo desglose de nómina: {e}")
 
+    # =========================================================================
+    # MODO LOTE
+    # =========================================================================
+
+    async def _calcular_periodo_lote(
+        self,
+        nominas: list[dict],
+        periodo: dict,
+        resumen: dict,
+        incremental: bool = False,
+    ) -> None:
+        """
+        Motor por lotes: minimiza round trips a PostgREST.
+
+        1. Lee todos los movimientos manuales del período (paginado)
+        2. Calcula en memoria los movimientos SISTEMA de todos los empleados
+           con el kernel vectorial (mismos resultados que la ruta escalar)
+        3. Por bloque de empleados: una llamada a `guardar_calculo_nominas`
+           que reemplaza los movimientos SISTEMA y actualiza los totales en
+           una transacción
+
+        Con `incremental=True`, las nóminas cuya huella guardada coincide
+        con la de sus entradas actuales no se recalculan ni se escriben:
+        sus totales guardados se suman tal cual al resumen del período.
+
+        Un error de cálculo se reporta por empleado; un error de escritura
+        se reporta para cada empleado del bloque afectado.
+        """
+        manuales = await self._obtener_manuales_por_nomina(
+            [n['id'] for n in nominas]
+        )
+
+        huellas: dict[int, str] = {}
+        pendientes: list[dict] = []
+        for nomina in nominas:
+            huella = self._huella_calculo(
+                nomina, periodo, manuales.get(nomina['id'], [])
+            )
+            if incremental and nomina.get('huella_calculo') == huella:
+                self._acumular(resumen, self._totales_guardados(nomina))
+                resumen['empleados_sin_cambios'] += 1
+                continue
+            huellas[nomina['id']] = huella
+            pendientes.append(nomina)
+
+        calculados: list[tuple[dict, list[dict], dict]] = []
+        for nomina, movimientos in self._calcular_movimientos_lote(
+            pendientes, periodo, resumen
+        ):
+            try:
+                totales = self._calcular_totales(
+                    nomina['id'], movimientos, manuales.get(nomina['id'], [])
+                )
+                totales['huella_calculo'] = huellas[nomina['id']]
+                calculados.append((nomina, movimientos, totales))
+            except Exception as e:
+                self._registrar_error(resumen, nomina, e)
+
+        for inicio in range(0, len(calculados), _TAMANO_BLOQUE):
+            bloque = calculados[inicio:inicio + _TAMANO_BLOQUE]
+            try:
+                await self._persistir_bloque(bloque)
+            except Exception as e:
+                logger.error(f"Error persistiendo bloque de {len(bloque)} nóminas: {e}")
+                for nomina, _, _ in bloque:
+                    self._registrar_error(resumen, nomina, e)
+                continue
+
+            for _, _, totales in bloque:
+                self._acumular(resumen, totales)
+
+    def _calcular_movimientos_lote(
+        self, nominas: list[dict], periodo: dict, resumen: dict
+    ) -> list[tuple[dict, list[dict]]]:
+        """
+        Equivalente columnar de `_calcular_movimientos` para N empleados.
+
+        Los empleados con salario inválido (o cuyo concepto no existe en BD)
+        se reportan en `resumen['errores']` y no se incluyen en el resultado.
+        """
+        validas: list[dict] = []
+        for nomina in nominas:
+            try:
+                self._validar_salario(nomina)
+                validas.append(nomina)
+            except Exception as e:
+                self._registrar_error(resumen, nomina, e)
+        if not validas:
+            return []
+
+        def _enteros(campo: str) -> list[int]:
+            return [int(n.get(campo) or 0) for n in validas]
+
+        def _flotantes(campo: str) -> list[float]:
+            return [float(n.get(campo) or 0) for n in validas]
+
+        res = self.calculadora_vectorial.calcular(
+            salario_diario=_flotantes('salario_diario'),
+            sdi=[
+                float(n.get('salario_diario_integrado') or n.get('salario_diario'))
+                for n in validas
+            ],
+            dias_trabajados=_enteros('dias_trabajados'),
+            factor_mensual=self._factor_mensual(periodo),
+            dias_faltas=_enteros('dias_faltas'),
+            dias_incapacidad=_enteros('dias_incapacidad'),
+            dias_vacaciones=_enteros('dias_vacaciones'),
+            horas_extra_dobles=_flotantes('horas_extra_dobles'),
+            horas_extra_triples=_flotantes('horas_extra_triples'),
+            domingos=_enteros('domingos_trabajados'),
+        )
+
+        # Columnas como listas de Python: evita indexar escalares NumPy
+        a_decimal = ResultadoNominaVectorial.a_decimal
+        columnas = [
+            (
+                clave, tipo,
+                res.aplica[clave].tolist(), res.monto[clave].tolist(),
+                res.gravable[clave].tolist(), res.exento[clave].tolist(),
+            )
+            for clave, tipo in CONCEPTOS_SISTEMA
+        ]
+
+        calculados: list[tuple[dict, list[dict]]] = []
+        for i, nomina in enumerate(validas):
+            try:
+                movimientos = [
+                    self._mov(
+                        nomina['id'], clave, tipo,
+                        a_decimal(monto[i]), a_decimal(gravable[i]), a_decimal(exento[i]),
+                    )
+                    for clave, tipo, aplica, monto, gravable, exento in columnas
+                    if aplica[i]
+                ]
+                calculados.append((nomina, movimientos))
+            except Exception as e:
+                self._registrar_error(resumen, nomina, e)
+        return calculados
+
+    async def _persistir_bloque(
+        self, bloque: list[tuple[dict, list[dict], dict]]
+    ) -> None:
+        """
+        Reemplaza movimientos SISTEMA y escribe totales de un bloque en una
+        sola transacción (`guardar_calculo_nominas`, migración 053). Nunca
+        se reenvían columnas leídas al inicio del cálculo.
+        """
+        filas = [
+            {'id': nomina['id'], **self._payload_totales(totales)}
+            for nomina, _, totales in bloque
+        ]
+        registros = [
+            self._serializar_mov(m)
+            for _, movimientos, _ in bloque
+            for m in movimientos
+        ]
+        try:
+            await self._ejecutar(
+                self.supabase.rpc('guardar_calculo_nominas', {
+                    'p_totales': filas,
+                    'p_movimientos': registros,
+                })
+            )
+        except Exception as e:
+            if not es_funcion_inexistente(e):
+                raise
+            logger.warning(
+                "guardar_calculo_nominas no existe (migración 053); escribiendo "
+                "sin transacción y los totales fila por fila (%s UPDATEs)", len(filas)
+            )
+            await self._persistir_sin_funcion(filas, registros)
+
+    async def _persistir_sin_funcion(self, filas: list[dict], registros: list[dict]) -> None:
+        """
+        Equivalente no atómico de `guardar_calculo_nominas`.
+
+        Primero borra la huella del bloque: si una escritura posterior falla,
+        el modo incremental no da por vigente una nómina a medio escribir.
+        """
+        ids = [fila['id'] for fila in filas]
+
+        await self._ejecutar(
+            self.supabase.table('nominas_empleado')
+            .update({'huella_calculo': None})
+            .in_('id', ids)
+        )
+        await self._ejecutar(
+            self.supabase.table('nomina_movimientos')
+            .delete()
+            .in_('nomina_empleado_id', ids)
+            .eq('origen', 'SISTEMA')
+            .eq('es_automatico', True)
+        )
+        if registros:
+            await self._ejecutar(
+                self.supabase.table('nomina_movimientos').insert(registros)
+            )
+        await self._actualizar_totales_por_fila(filas)
+
+    async def _actualizar_totales_por_fila(self, filas: list[dict]) -> None:
+        """
+        Totales de `guardar_calculo_nominas` sin la función: un UPDATE por
+        nómina (la huella cambia por empleado, así que no hay filas con
+        los mismos valores que agrupar). Sólo para BD sin la migración 053.
+        """
+        for fila in filas:
+            await self._ejecutar(
+                self.supabase.table('nominas_empleado')
+                .update({k: v for k, v in fila.items() if k != 'id'})
+                .eq('id', fila['id'])
+            )
+
+    async def _obtener_manuales_por_nomina(
+        self, nomina_ids: list[int]
+    ) -> dict[int, list[dict]]:
+        """
+        Lee los movimientos manuales (RRHH/Contabilidad) de varias nóminas.
+
+        Agrupa los IDs en bloques (límite práctico de URL para `in_`) y
+        recorre cada bloque con `iterar` (keyset por `id`) para no depender
+        del max-rows del servidor.
+        """
+        por_nomina: dict[int, list[dict]] = defaultdict(list)
+        for inicio in range(0, len(nomina_ids), _TAMANO_BLOQUE):
+            ids = nomina_ids[inicio:inicio + _TAMANO_BLOQUE]
+            async for pagina in iterar(
+                lambda: self.supabase.table('nomina_movimientos')
+                .select('id, nomina_empleado_id, tipo, monto, origen')
+                .in_('nomina_empleado_id', ids)
+                .neq('origen', 'SISTEMA'),
+                _TAMANO_PAGINA,
+                ejecutar=self._ejecutar,
+            ):
+                for fila in pagina:
+                    por_nomina[fila['nomina_empleado_id']].append(fila)
+        return por_nomina
+
+    @staticmethod
+    def _acumular(resumen: dict, totales: dict) -> None:
+        """Suma los totales de un empleado al resumen del período."""
+        resumen['empleados_calculados'] += 1
+        resumen['total_percepciones'] += totales['total_percepciones']
+        resumen['total_deducciones'] += totales['total_deducciones']
+        resumen['total_neto'] += totales['total_neto']
+
+    @staticmethod
+    def _registrar_error(resumen: dict, nomina: dict, error: Exception) -> None:
+        """Agrega el error de un empleado a `resumen['errores']`."""
+        emp_id = nomina.get('empleado_id', '?')
+        logger.error(f"Error calculando nómina empleado {emp_id}: {error}")
+        resumen['errores'].append({'empleado_id': emp_id, 'error': str(error)})
+
     # =========================================================================
     # CÁLCULO INTERNO
     # =========================================================================
 
     async def _calcular_nomina_empleado(self, nomina: dict, periodo: dict) -> dict:
         """
-        Flujo completo de cálculo para un empleado.
-
-        1. Borra movimientos SISTEMA anteriores (si existen)
-        2. Calcula: sueldo, horas extra, prima dominical, faltas
-        3. Calcula: exenciones ISR de cada percepción
-        4. Calcula: ISR proporcional al período
-        5. Calcula: subsidio al empleo
-        6. Calcula: IMSS obrero
-        7. Lee: movimientos manuales existentes (para totales)
-        8. Inserta: movimientos SISTEMA
-        9. Actualiza: totales en nominas_empleado
+        Flujo completo de cálculo para un empleado (modo individual).
+
+        1. Calcula en memoria los movimientos SISTEMA (ver `_calcular_movimientos`)
+        2. Borra movimientos SISTEMA anteriores (si existen)
+        3. Inserta: movimientos SISTEMA
+        4. Lee: movimientos manuales existentes (para totales)
+        5. Actualiza: totales en nominas_empleado
+        """
+        nomina_id = nomina['id']
+        movimientos_sistema = self._calcular_movimientos(nomina, periodo)
+
+        # ── Borrar movimientos SISTEMA anteriores ────────────────────────────
+        await self._ejecutar(
+            self.supabase.table('nomina_movimientos').delete().eq(
+                'nomina_empleado_id', nomina_id
+            ).eq('origen', 'SISTEMA').eq('es_automatico', True)
+        )
+
+        # ── Insertar movimientos SISTEMA ─────────────────────────────────────
+        if movimientos_sistema:
+            await self._ejecutar(
+                self.supabase.table('nomina_movimientos').insert(
+                    [self._serializar_mov(m) for m in movimientos_sistema]
+                )
+            )
+
+        # ── Leer movimientos manuales existentes (RRHH y Contabilidad) ───────
+        res_manual = await self._ejecutar(
+            self.supabase.table('nomina_movimientos')
+            .select('id, tipo, monto, origen')
+            .eq('nomina_empleado_id', nomina_id)
+            .neq('origen', 'SISTEMA')
+        )
+        manuales = res_manual.data or []
+        totales = self._calcular_totales(nomina_id, movimientos_sistema, manuales)
+        totales['huella_calculo'] = self._huella_calculo(nomina, periodo, manuales)
+
+        # ── Actualizar nominas_empleado ──────────────────────────────────────
+        await self._ejecutar(
+            self.supabase.table('nominas_empleado').update(
+                self._payload_totales(totales)
+            ).eq('id', nomina_id)
+        )
+
+        return totales
+
+    def _calcular_movimientos(self, nomina: dict, periodo: dict) -> list[dict]:
+        """
+        Calcula en memoria los movimientos SISTEMA de un empleado (sin I/O).
+
+        1. Calcula: sueldo, horas extra, prima dominical, faltas
+        2. Calcula: exenciones ISR de cada percepción
+        3. Calcula: ISR proporcional al período
+        4. Calcula: subsidio al empleo
+        5. Calcula: IMSS obrero
         """
         nomina_id = nomina['id']
         salario_diario = Decimal(str(nomina.get('salario_diario') or 0))
@@ -223,26 +560,15 @@ class NominaCalculoService:
         dias_trabajados = int(nomina.get('dias_trabajados') or 0)
         dias_faltas = int(nomina.get('dias_faltas') or 0)
         dias_incapacidad = int(nomina.get('dias_incapacidad') or 0)
-        dias_periodo = int(nomina.get('dias_periodo') or 15)
         horas_dobles = Decimal(str(nomina.get('horas_extra_dobles') or 0))
         horas_triples = Decimal(str(nomina.get('horas_extra_triples') or 0))
         domingos = int(nomina.get('domingos_trabajados') or 0)
-        periodicidad = periodo.get('periodicidad', 'QUINCENAL')
 
-        if salario_diario <= 0:
-            raise BusinessRuleError(
-                f"Empleado {nomina.get('empleado_id')} tiene salario_diario=0. "
-                "Actualice el salario antes de calcular."
-            )
+        self._validar_salario(nomina)
 
         uma_diario = CatalogoUMA.DIARIO
 
-        # ── 1. Borrar movimientos SISTEMA anteriores ─────────────────────────
-        self.supabase.table('nomina_movimientos').delete().eq(
-            'nomina_empleado_id', nomina_id
-        ).eq('origen', 'SISTEMA').eq('es_automatico', True).execute()
-
-        # ── 2. Calcular percepciones automáticas ─────────────────────────────
+        # ── 1. Calcular percepciones automáticas ─────────────────────────────
         movimientos_sistema: list[dict] = []
 
         # Sueldo
@@ -294,14 +620,14 @@ class NominaCalculoService:
                 monto_incap, Decimal('0'), Decimal('0')
             ))
 
-        # ── 3. Base gravable ISR (suma de monto_gravable de percepciones) ────
+        # ── 2. Base gravable ISR (suma de monto_gravable de percepciones) ────
         base_gravable_periodo = sum(
             m['monto_gravable'] for m in movimientos_sistema
             if m['tipo'] == 'PERCEPCION'
         )
 
-        # ── 4. ISR proporcional al período ────────────────────────────────────
-        factor = _FACTOR_MENSUAL.get(periodicidad, Decimal('2'))
+        # ── 3. ISR proporcional al período ────────────────────────────────────
+        factor = self._factor_mensual(periodo)
         base_mensual = _round2(base_gravable_periodo * factor)
 
         isr_mensual = CatalogoISR.calcular_isr_mensual(base_mensual)
@@ -313,7 +639,7 @@ class NominaCalculoService:
                 isr_periodo, Decimal('0'), Decimal('0')
             ))
 
-        # ── 5. Subsidio al empleo ─────────────────────────────────────────────
+        # ── 4. Subsidio al empleo ─────────────────────────────────────────────
         subsidio_mensual = CatalogoISR.calcular_subsidio(base_mensual)
         subsidio_periodo = _round2(subsidio_mensual / factor)
 
@@ -323,7 +649,7 @@ class NominaCalculoService:
                 subsidio_periodo, Decimal('0'), Decimal('0')
             ))
 
-        # ── 6. IMSS obrero ────────────────────────────────────────────────────
+        # ── 5. IMSS obrero ────────────────────────────────────────────────────
         # Días cotizables = trabajados + vacaciones (incapacidad los paga IMSS)
         dias_cotizables = dias_trabajados + int(nomina.get('dias_vacaciones') or 0)
         sdi_float = float(sdi)
@@ -343,74 +669,139 @@ class NominaCalculoService:
                 imss_obrero, Decimal('0'), Decimal('0')
             ))
 
-        # ── 7. Insertar movimientos SISTEMA ───────────────────────────────────
-        if movimientos_sistema:
-            # Convertir Decimals a float para Supabase
-            registros_bd = [
-                {k: float(v) if isinstance(v, Decimal) else v for k, v in m.items()}
-                for m in movimientos_sistema
-            ]
-            self.supabase.table('nomina_movimientos').insert(registros_bd).execute()
-
-        # ── 8. Leer movimientos manuales existentes (RRHH y Contabilidad) ────
-        res_manual = (
-            self.supabase.table('nomina_movimientos')
-            .select('tipo, monto, origen')
-            .eq('nomina_empleado_id', nomina_id)
-            .neq('origen', 'SISTEMA')
-            .execute()
+        return movimientos_sistema
+
+    @staticmethod
+    def _validar_salario(nomina: dict) -> None:
+        """El cálculo requiere salario diario positivo."""
+        if Decimal(str(nomina.get('salario_diario') or 0)) <= 0:
+            raise BusinessRuleError(
+                f"Empleado {nomina.get('empleado_id')} tiene salario_diario=0. "
+                "Actualice el salario antes de calcular."
+            )
+
+    @staticmethod
+    def _factor_mensual(periodo: dict) -> Decimal:
+        """Factor para proyectar la base del período a mensual."""
+        periodicidad = periodo.get('periodicidad', 'QUINCENAL')
+        return _FACTOR_MENSUAL.get(periodicidad, Decimal('2'))
+
+    @staticmethod
+    def _huella_calculo(nomina: dict, periodo: dict, manuales: list[dict]) -> str:
+        """
+        Huella (SHA-256) de todas las entradas que determinan el cálculo.
+
+        Incluye salario, SDI, días, horas extra, domingos, periodicidad,
+        año de los catálogos fiscales y los movimientos manuales (id, tipo
+        y monto). Si la huella no cambia, el resultado del cálculo tampoco.
+        """
+        def _num(valor) -> str:
+            return format(Decimal(str(valor or 0)).normalize(), 'f')
+
+        partes = [
+            f"v{_VERSION_HUELLA}",
+            f"{CatalogoISR.ANO}/{CatalogoUMA.ANO}",
+            periodo.get('periodicidad', 'QUINCENAL'),
+            _num(nomina.get('salario_diario')),
+            _num(nomina.get('salario_diario_integrado') or nomina.get('salario_diario')),
+            _num(nomina.get('dias_trabajados')),
+            _num(nomina.get('dias_faltas')),
+            _num(nomina.get('dias_incapacidad')),
+            _num(nomina.get('dias_vacaciones')),
+            _num(nomina.get('horas_extra_dobles')),
+            _num(nomina.get('horas_extra_triples')),
+            _num(nomina.get('domingos_trabajados')),
+        ]
+        partes.extend(
+            f"{m.get('id')}:{m['tipo']}:{_num(m['monto'])}"
+            for m in sorted(manuales, key=lambda m: m.get('id') or 0)
         )
-        manuales = res_manual.data or []
+        return hashlib.sha256('|'.join(partes).encode()).hexdigest()
+
+    @staticmethod
+    def _totales_guardados(nomina: dict) -> dict:
+        """Totales ya persistidos en una fila de nominas_empleado."""
+        return {
+            campo: Decimal(str(nomina.get(campo) or 0))
+            for campo in ('total_percepciones', 'total_deducciones',
+                          'total_otros_pagos', 'total_neto')
+        }
+
+    @staticmethod
+    def _calcular_totales(
+        nomina_id: int,
+        movimientos_sistema: list[dict],
+        manuales: list[dict],
+    ) -> dict:
+        """Consolida percepciones, deducciones, otros pagos y neto del recibo."""
+        cero = Decimal('0')
 
-        # ── 9. Calcular totales consolidados ──────────────────────────────────
         percepciones = sum(
-            Decimal(str(m['monto_gravable'])) + Decimal(str(m['monto_exento']))
-            for m in movimientos_sistema if m['tipo'] == 'PERCEPCION'
+            (Decimal(str(m['monto_gravable'])) + Decimal(str(m['monto_exento']))
+             for m in movimientos_sistema if m['tipo'] == 'PERCEPCION'),
+            cero,
         )
         percepciones += sum(
-            Decimal(str(m['monto'])) for m in manuales if m['tipo'] == 'PERCEPCION'
+            (Decimal(str(m['monto'])) for m in manuales if m['tipo'] == 'PERCEPCION'),
+            cero,
         )
 
         deducciones = sum(
-            Decimal(str(m['monto'])) for m in movimientos_sistema if m['tipo'] == 'DEDUCCION'
+            (Decimal(str(m['monto'])) for m in movimientos_sistema if m['tipo'] == 'DEDUCCION'),
+            cero,
         )
         deducciones += sum(
-            Decimal(str(m['monto'])) for m in manuales if m['tipo'] == 'DEDUCCION'
+            (Decimal(str(m['monto'])) for m in manuales if m['tipo'] == 'DEDUCCION'),
+            cero,
         )
 
         otros_pagos = sum(
-            Decimal(str(m['monto'])) for m in movimientos_sistema if m['tipo'] == 'OTRO_PAGO'
+            (Decimal(str(m['monto'])) for m in movimientos_sistema if m['tipo'] == 'OTRO_PAGO'),
+            cero,
         )
         otros_pagos += sum(
-            Decimal(str(m['monto'])) for m in manuales if m['tipo'] == 'OTRO_PAGO'
+            (Decimal(str(m['monto'])) for m in manuales if m['tipo'] == 'OTRO_PAGO'),
+            cero,
         )
 
         neto = _round2(percepciones - deducciones + otros_pagos)
-        percepciones = _round2(percepciones)
-        deducciones = _round2(deducciones)
-        otros_pagos = _round2(otros_pagos)
-
-        # ── 10. Actualizar nominas_empleado ────────────────────────────────────
-        self.supabase.table('nominas_empleado').update({
-            'total_percepciones': float(percepciones),
-            'total_deducciones': float(deducciones),
-            'total_otros_pagos': float(otros_pagos),
-            'total_neto': float(max(neto, Decimal('0'))),
-            'estatus': 'CALCULADO',
-        }).eq('id', nomina_id).execute()
 
         return {
             'nomina_empleado_id': nomina_id,
-            'total_percepciones': percepciones,
-            'total_deducciones': deducciones,
-            'total_otros_pagos': otros_pagos,
-            'total_neto': max(neto, Decimal('0')),
+            'total_percepciones': _round2(percepciones),
+            'total_deducciones': _round2(deducciones),
+            'total_otros_pagos': _round2(otros_pagos),
+            'total_neto': max(neto, cero),
+        }
+
+    @staticmethod
+    def _payload_totales(totales: dict) -> dict:
+        """Columnas de totales de nominas_empleado listas para Supabase."""
+        return {
+            'total_percepciones': float(totales['total_percepciones']),
+            'total_deducciones': float(totales['total_deducciones']),
+            'total_otros_pagos': float(totales['total_otros_pagos']),
+            'total_neto': float(totales['total_neto']),
+            'huella_calculo': totales.get('huella_calculo'),
+            'estatus': 'CALCULADO',
+        }
+
+    @staticmethod
+    def _serializar_mov(movimiento: dict) -> dict:
+        """Convierte Decimals a float para Supabase."""
+        return {
+            k: float(v) if isinstance(v, Decimal) else v
+            for k, v in movimiento.items()
         }
 
     # =========================================================================
     # HELPERS
     # =========================================================================
 
+    async def _ejecutar(self, query):
+        """Ejecuta la query en el pool de I/O para no bloquear el event loop."""
+        return await db_manager.ejecutar_query(query)
+
     def _mov(
         self,
         nomina_empleado_id: int,
@@ -456,11 +847,10 @@ class NominaCalculoService:
         if self._concepto_ids:
             return
         try:
-            result = (
+            result = await self._ejecutar(
                 self.supabase.table('conceptos_nomina')
                 .select('id, clave')
                 .in_('clave', list(_CLAVES_SISTEMA))
-                .execute()
             )
             for row in (result.data or []):
                 self._concepto_ids[row['clave']] = row['id']
@@ -476,25 +866,27 @@ class NominaCalculoService:
 
     async def _obtener_periodo(self, periodo_id: int) -> dict:
         """Obtiene período o lanza NotFoundError."""
-        result = (
+        result = await self._ejecutar(
             self.supabase.table('periodos_nomina')
             .select('*')
             .eq('id', periodo_id)
-            .execute()
         )
         if not result.data:
             raise NotFoundError(f"Período de nómina {periodo_id} no encontrado")
         return result.data[0]
 
     async def _obtener_nominas_del_periodo(self, periodo_id: int) -> list[dict]:
-        """Obtiene todas las nominas_empleado de un período."""
-        result = (
-            self.supabase.table('nominas_empleado')
+        """Obtiene todas las nominas_empleado de un período (paginado por id)."""
+        nominas: list[dict] = []
+        async for pagina in iterar(
+            lambda: self.supabase.table('nominas_empleado')
             .select('*')
-            .eq('periodo_id', periodo_id)
-            .execute()
-        )
-        return result.data or []
+            .eq('periodo_id', periodo_id),
+            _TAMANO_PAGINA,
+            ejecutar=self._ejecutar,
+        ):
+            nominas.extend(pagina)
+        return nominas
 
 
 # Singleton
@@ -15,6 +15,7 @@ from typing import Optional
 from app.database import db_manager
 from app.core.exceptions import DatabaseError, NotFoundError, BusinessRuleError
 from app.entities.periodo_nomina import PeriodoNomina
+from app.repositories.shared.query_helpers import iterar
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,18 @@ _ESTATUS_REPOBLABLES = (
 )
 
 
+def _asistencia_vacia() -> dict:
+    """Acumulador de asistencia de un empleado en el período."""
+    return {
+        'dias_trabajados': 0,
+        'dias_faltas': 0,
+        'dias_incapacidad': 0,
+        'dias_vacaciones': 0,
+        'horas_extra': 0.0,
+        'domingos': 0,
+    }
+
+
 class NominaPeriodoService:
     """
     Gestiona el ciclo de vida de los períodos de nómina.
@@ -59,6 +72,22 @@ class NominaPeriodoService:
         ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
         return float(diario)
 
+    @staticmethod
+    def _acumular_asistencia(acumulado: dict, registro: dict) -> None:
+        """Suma un registro de asistencia al acumulador del empleado."""
+        tipo = registro['tipo_registro']
+        if tipo == 'ASISTENCIA':
+            acumulado['dias_trabajados'] += 1
+            acumulado['horas_extra'] += float(registro['horas_extra'] or 0)
+            if date.fromisoformat(registro['fecha']).weekday() == 6:
+                acumulado['domingos'] += 1
+        elif tipo == 'FALTA':
+            acumulado['dias_faltas'] += 1
+        elif tipo in _TIPOS_INCAPACIDAD:
+            acumulado['dias_incapacidad'] += 1
+        elif tipo == 'VACACIONES':
+            acumulado['dias_vacaciones'] += 1
+
     def _mapear_salario_diario_por_empleado(self, empleado_ids: list[int]) -> dict[int, float]:
         """
         Resuelve salario diario vigente por empleado desde su asignación activa.
@@ -244,23 +273,20 @@ class NominaPeriodoService:
                     empleados_sin_salario,
                 )
 
-            # 2. Registros de asistencia del período (batch)
-            res_asist = (
+            # 2. Asistencias del período, acumuladas por empleado página a
+            #    página (keyset por id: completo aunque exceda max-rows)
+            por_empleado: dict[int, dict] = defaultdict(_asistencia_vacia)
+            async for pagina in iterar(lambda: (
                 self.supabase.table('registros_asistencia')
-                .select('empleado_id, fecha, tipo_registro, horas_extra')
+                .select('id, empleado_id, fecha, tipo_registro, horas_extra')
                 .eq('empresa_id', empresa_id)
                 .gte('fecha', fecha_inicio)
                 .lte('fecha', fecha_fin)
-                .execute()
-            )
-            asistencias_raw = res_asist.data or []
-
-            # 3. Agrupar asistencias por empleado
-            por_empleado: dict[int, list[dict]] = defaultdict(list)
-            for reg in asistencias_raw:
-                por_empleado[reg['empleado_id']].append(reg)
+            )):
+                for reg in pagina:
+                    self._acumular_asistencia(por_empleado[reg['empleado_id']], reg)
 
-            # 4. Construir registros nominas_empleado
+            # 3. Construir registros nominas_empleado
             dias_periodo = (
                 date.fromisoformat(fecha_fin) - date.fromisoformat(fecha_inicio)
             ).days + 1
@@ -269,30 +295,14 @@ class NominaPeriodoService:
             empleados_omitidos: list[int] = []
             for emp in empleados:
                 emp_id = emp['id']
-                asistencias = por_empleado.get(emp_id, [])
-
-                dias_trabajados = sum(
-                    1 for a in asistencias if a['tipo_registro'] == 'ASISTENCIA'
-                )
-                dias_faltas = sum(
-                    1 for a in asistencias if a['tipo_registro'] == 'FALTA'
-                )
-                dias_incapacidad = sum(
-                    1 for a in asistencias if a['tipo_registro'] in _TIPOS_INCAPACIDAD
-                )
-                dias_vacaciones = sum(
-                    1 for a in asistencias if a['tipo_registro'] == 'VACACIONES'
-                )
-                total_horas_extra = sum(
-                    float(a['horas_extra'] or 0)
-                    for a in asistencias
-                    if a['tipo_registro'] == 'ASISTENCIA'
-                )
-                domingos = sum(
-                    1 for a in asistencias
-                    if a['tipo_registro'] == 'ASISTENCIA'
-                    and date.fromisoformat(a['fecha']).weekday() == 6
-                )
+                asistencia = por_empleado.get(emp_id) or _asistencia_vacia()
+
+                dias_trabajados = asistencia['dias_trabajados']
+                dias_faltas = asistencia['dias_faltas']
+                dias_incapacidad = asistencia['dias_incapacidad']
+                dias_vacaciones = asistencia['dias_vacaciones']
+                total_horas_extra = asistencia['horas_extra']
+                domingos = asistencia['domingos']
 
                 # Distribución simple: primeras 9 horas = dobles, resto = triples
                 horas_dobles = min(total_horas_extra, 9.0)
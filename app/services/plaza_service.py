@@ -9,7 +9,7 @@ Patrón de manejo de errores:
 - El servicio agrega validaciones de reglas de negocio (BusinessRuleError)
 """
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from decimal import Decimal
 from datetime import date
 
@@ -22,6 +22,7 @@ from app.entities.plaza import (
     ResumenPlazasCategoria,
 )
 from app.repositories.plaza_repository import SupabasePlazaRepository
+from app.repositories.shared import Pagina
 from app.core.enums import EstatusPlaza
 from app.core.exceptions import BusinessRuleError, NotFoundError
 
@@ -191,23 +192,49 @@ class PlazaService:
             incluir_canceladas
         )
 
-        return [
-            PlazaResumen(
-                id=item['id'],
-                contrato_categoria_id=item['contrato_categoria_id'],
-                numero_plaza=item['numero_plaza'],
-                codigo=item.get('codigo', ''),
-                empleado_id=item.get('empleado_id'),
-                fecha_inicio=item['fecha_inicio'],
-                fecha_fin=item.get('fecha_fin'),
-                salario_mensual=Decimal(str(item['salario_mensual'])),
-                estatus=EstatusPlaza(item['estatus']),
-                notas=item.get('notas'),
-                empleado_nombre=item.get('empleado_nombre', ''),
-                empleado_curp=item.get('empleado_curp', ''),
-            )
-            for item in resumen_data
-        ]
+        return [self._resumen_de_categoria(item) for item in resumen_data]
+
+    async def obtener_resumen_pagina_de_categoria(
+        self,
+        contrato_categoria_id: int,
+        incluir_canceladas: bool = False,
+        cursor: Optional[str] = None,
+        limite: int = 50
+    ) -> Pagina[PlazaResumen]:
+        """
+        Obtiene una página (por cursor) del resumen de plazas de una categoría.
+
+        Returns:
+            Pagina de PlazaResumen ordenada por número de plaza
+        """
+        pagina = await self.repository.obtener_resumen_pagina_por_contrato_categoria(
+            contrato_categoria_id,
+            incluir_canceladas,
+            cursor,
+            limite,
+        )
+        return Pagina(
+            [self._resumen_de_categoria(item) for item in pagina.items],
+            pagina.siguiente_cursor,
+        )
+
+    @staticmethod
+    def _resumen_de_categoria(item: dict) -> PlazaResumen:
+        """Construye PlazaResumen desde un dict del resumen por categoría."""
+        return PlazaResumen(
+            id=item['id'],
+            contrato_categoria_id=item['contrato_categoria_id'],
+            numero_plaza=item['numero_plaza'],
+            codigo=item.get('codigo', ''),
+            empleado_id=item.get('empleado_id'),
+            fecha_inicio=item['fecha_inicio'],
+            fecha_fin=item.get('fecha_fin'),
+            salario_mensual=Decimal(str(item['salario_mensual'])),
+            estatus=EstatusPlaza(item['estatus']),
+            notas=item.get('notas'),
+            empleado_nombre=item.get('empleado_nombre', ''),
+            empleado_curp=item.get('empleado_curp', ''),
+        )
 
     async def calcular_totales_contrato(self, contrato_id: int) -> ResumenPlazasContrato:
         """
@@ -217,16 +244,24 @@ class PlazaService:
             ResumenPlazasContrato con totales por estatus
         """
         totales = await self.repository.obtener_totales_por_contrato(contrato_id)
+        return ResumenPlazasContrato(contrato_id=contrato_id, **totales)
 
-        return ResumenPlazasContrato(
-            contrato_id=contrato_id,
-            total_plazas=totales['total_plazas'],
-            plazas_vacantes=totales['plazas_vacantes'],
-            plazas_ocupadas=totales['plazas_ocupadas'],
-            plazas_suspendidas=totales['plazas_suspendidas'],
-            plazas_canceladas=totales['plazas_canceladas'],
-            costo_total_mensual=totales['costo_total_mensual'],
-        )
+    async def calcular_totales_contratos(
+        self,
+        contrato_ids: Optional[List[int]] = None,
+    ) -> Dict[int, ResumenPlazasContrato]:
+        """
+        Totales de plazas de varios contratos (o de todos) en una sola consulta.
+
+        Returns:
+            {contrato_id: ResumenPlazasContrato}; los contratos sin plazas
+            no aparecen
+        """
+        totales = await self.repository.obtener_totales_por_contratos(contrato_ids)
+        return {
+            contrato_id: ResumenPlazasContrato(contrato_id=contrato_id, **t)
+            for contrato_id, t in totales.items()
+        }
 
     async def obtener_resumen_categorias_con_plazas(
         self,
@@ -538,7 +573,7 @@ class PlazaService:
             contrato_categoria_id
         )
 
-        plazas_creadas = []
+        plazas = []
 
         for i in range(cantidad):
             numero_plaza = siguiente_numero + i
@@ -553,10 +588,9 @@ class PlazaService:
                 salario_mensual=salario_mensual,
                 estatus=EstatusPlaza.VACANTE,
             )
+            plazas.append(Plaza(**plaza_create.model_dump()))
 
-            plaza = Plaza(**plaza_create.model_dump())
-            plaza_creada = await self.repository.crear(plaza)
-            plazas_creadas.append(plaza_creada)
+        plazas_creadas = await self.repository.crear_lote(plazas)
 
         logger.info(
             f"Creadas {len(plazas_creadas)} plazas para contrato_categoria {contrato_categoria_id}"
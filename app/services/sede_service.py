@@ -26,6 +26,8 @@ class SedeService(DirectSupabaseService):
     Orquesta las operaciones de negocio con acceso directo a Supabase.
     """
 
+    cache_ttl = 600
+
     def __init__(self):
         super().__init__("sedes")
 
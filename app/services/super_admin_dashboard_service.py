@@ -2,13 +2,15 @@
 Servicio agregador para el Dashboard de Super Admin.
 
 Orquesta consultas a múltiples servicios existentes y retorna métricas
-agregadas con tolerancia a fallos parciales.
+agregadas con tolerancia a fallos parciales. Igual que el dashboard
+operativo, se sirve desde un `SnapshotMetricas`.
 """
 
 import asyncio
 import logging
 
 from app.entities.super_admin_dashboard import SuperAdminDashboard
+from app.services.metricas_snapshot import SnapshotMetricas
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +18,32 @@ logger = logging.getLogger(__name__)
 class SuperAdminDashboardService:
     """Servicio fachada para construir métricas del panel de super admin."""
 
-    async def obtener_metricas_super_admin(self) -> tuple[SuperAdminDashboard, list[str]]:
+    TABLAS = ("user_profiles", "instituciones", "instituciones_empresas", "empleados")
+
+    def __init__(self):
+        self.snapshot = SnapshotMetricas(
+            "super_admin", self.calcular_metricas_super_admin, tablas=self.TABLAS,
+        )
+
+    async def obtener_metricas_super_admin(
+        self, forzar: bool = False
+    ) -> tuple[SuperAdminDashboard, list[str]]:
         """
-        Obtiene métricas del panel de super admin.
+        Obtiene métricas del panel de super admin desde el último snapshot.
+
+        Args:
+            forzar: Recalcular ahora en vez de servir el snapshot.
 
         Returns:
             tuple[SuperAdminDashboard, list[str]]:
-                - DTO con métricas (parciales si alguna fuente falla)
+                - DTO con métricas (parciales si alguna fuente falla) y `calculado_en`
                 - Lista de advertencias por fallos parciales
         """
+        (metricas, advertencias), calculado_en = await self.snapshot.obtener(forzar=forzar)
+        return metricas.model_copy(update={"calculado_en": calculado_en}), list(advertencias)
+
+    async def calcular_metricas_super_admin(self) -> tuple[SuperAdminDashboard, list[str]]:
+        """Calcula las métricas del panel (ver `obtener_metricas_super_admin`)."""
         # Imports diferidos para evitar circularidad
         from app.services.dashboard_service import dashboard_service
         from app.services.institucion_service import institucion_service
@@ -44,10 +63,10 @@ class SuperAdminDashboardService:
                 )
                 return None
 
-        usuarios, instituciones, conteos_pipeline, metricas_operativas = await asyncio.gather(
+        conteos_usuarios, instituciones, conteos_pipeline, metricas_operativas = await asyncio.gather(
             _seguro(
                 "usuarios",
-                user_service.listar_usuarios(incluir_inactivos=True, limite=5000),
+                user_service.contar_usuarios(),
             ),
             _seguro(
                 "instituciones",
@@ -63,22 +82,11 @@ class SuperAdminDashboardService:
             ),
         )
 
-        if usuarios is not None:
-            metricas.usuarios_activos = sum(
-                1 for usuario in usuarios if bool(getattr(usuario, "activo", False))
-            )
-            metricas.usuarios_inactivos = sum(
-                1 for usuario in usuarios if not bool(getattr(usuario, "activo", False))
-            )
-            metricas.super_admins = sum(
-                1
-                for usuario in usuarios
-                if bool(getattr(usuario, "activo", False))
-                and bool(getattr(usuario, "puede_gestionar_usuarios", False))
-            )
-            metricas.usuarios_sin_ultimo_acceso = sum(
-                1 for usuario in usuarios if getattr(usuario, "ultimo_acceso", None) is None
-            )
+        if conteos_usuarios is not None:
+            metricas.usuarios_activos = conteos_usuarios["activos"]
+            metricas.usuarios_inactivos = conteos_usuarios["inactivos"]
+            metricas.super_admins = conteos_usuarios["super_admins"]
+            metricas.usuarios_sin_ultimo_acceso = conteos_usuarios["sin_ultimo_acceso"]
 
         if instituciones is not None:
             metricas.instituciones_activas = sum(
@@ -105,6 +113,10 @@ class SuperAdminDashboardService:
                 getattr(metricas_operativas, "contratos_por_vencer", 0) or 0
             )
 
+        if advertencias:
+            # Datos parciales: se sirven, pero no cuentan como snapshot vigente
+            self.snapshot.invalidar()
+
         return metricas, advertencias
 
 
@@ -152,6 +152,26 @@ class UserProfileService:
             logger.error("Error listando usuarios: %s", exc)
             raise DatabaseError(f"Error de base de datos: {exc}")
 
+    async def contar_usuarios(self) -> dict[str, int]:
+        """Conteos para el dashboard sin traer perfiles (`count='exact', head=True`)."""
+        try:
+            def _contar(**filtros) -> int:
+                query = self.root.supabase_admin.table(self.root.tabla_profiles)\
+                    .select("id", count="exact", head=True)
+                for campo, valor in filtros.items():
+                    query = query.is_(campo, "null") if valor is None else query.eq(campo, valor)
+                return query.execute().count or 0
+
+            return {
+                "activos": _contar(activo=True),
+                "inactivos": _contar(activo=False),
+                "super_admins": _contar(activo=True, puede_gestionar_usuarios=True),
+                "sin_ultimo_acceso": _contar(ultimo_acceso=None),
+            }
+        except Exception as exc:
+            logger.error("Error contando usuarios: %s", exc)
+            raise DatabaseError(f"Error de base de datos: {exc}")
+
     async def actualizar_ultimo_acceso(self, user_id: UUID) -> None:
         try:
             self.root._actualizar_profile_data(
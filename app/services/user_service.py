@@ -660,6 +660,18 @@ class UserService:
         chars = string.ascii_letters + string.digits + "!@#$"
         return ''.join(secrets.choice(chars) for _ in range(16))
 
+    async def contar_usuarios(self) -> dict[str, int]:
+        """
+        Cuenta usuarios por estado para el dashboard de super admin.
+
+        Returns:
+            {'activos', 'inactivos', 'super_admins', 'sin_ultimo_acceso'}
+
+        Raises:
+            DatabaseError: Si hay error de BD
+        """
+        return await self._profile_service.contar_usuarios()
+
     async def listar_usuarios_empresa(self, empresa_id: int) -> list[dict]:
         """
         Lista todos los usuarios asignados a una empresa, aplanando los datos del perfil.
@@ -0,0 +1,104 @@
+"""
+Presupuestos de queries para tests (detector de N+1).
+
+    with backend_en_memoria({'historial_laboral': [...], 'plazas': [...]}):
+        with presupuesto_queries(max=3):
+            await historial_laboral_service.obtener_todos(limite=50)
+
+`presupuesto_queries` observa `registro_consultas`, así que cuenta toda
+query que pase por `db_manager.get_client()` (incluidas las que corren en
+el pool de I/O). Al salir del bloque falla si:
+
+- se ejecutaron más de `max` queries (o más de `por_tabla[t]` en una tabla)
+- una misma forma de query (tabla + operación + columnas filtradas) se
+  repitió más de `max_repetidas` veces: N+1 probable.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from app.database import db_manager
+from app.database.instrumentacion import RegistroConsultas, registro_consultas
+from app.database.memoria import SupabaseEnMemoria
+from app.repositories.shared import alcance_loaders, cache_consultas
+
+
+class ConteoQueries:
+    """Queries observadas dentro de un `presupuesto_queries`."""
+
+    def __init__(self, consultas: List[dict]):
+        self.consultas = consultas
+
+    @property
+    def total(self) -> int:
+        return len(self.consultas)
+
+    def por_tabla(self) -> Counter:
+        return Counter(c["tabla"] for c in self.consultas)
+
+    def repetidas(self, max_repetidas: int) -> List[tuple]:
+        """[(veces, tabla, operacion, forma, llamador)] que exceden `max_repetidas`."""
+        formas = Counter((c["tabla"], c["operacion"], c["forma"]) for c in self.consultas)
+        llamadores = {
+            (c["tabla"], c["operacion"], c["forma"]): c["llamador"] for c in self.consultas
+        }
+        return [
+            (veces, *clave, llamadores[clave])
+            for clave, veces in formas.most_common()
+            if veces > max_repetidas
+        ]
+
+    def reporte(self) -> str:
+        return "\n".join(
+            f"  {i:>3}. {c['operacion']} {c['tabla']} [{c['forma']}] desde {c['llamador']}"
+            for i, c in enumerate(self.consultas, 1)
+        )
+
+
+@contextmanager
+def presupuesto_queries(
+    max: int,
+    *,
+    por_tabla: Optional[Dict[str, int]] = None,
+    max_repetidas: int = 2,
+    registro: RegistroConsultas = registro_consultas,
+) -> Iterator[ConteoQueries]:
+    """Falla con AssertionError si el bloque excede el presupuesto de queries."""
+    with registro.observar() as consultas:
+        conteo = ConteoQueries(consultas)
+        yield conteo
+
+    problemas = []
+    if conteo.total > max:
+        problemas.append(f"{conteo.total} queries (presupuesto: {max})")
+    for tabla, limite in (por_tabla or {}).items():
+        usadas = conteo.por_tabla()[tabla]
+        if usadas > limite:
+            problemas.append(f"{usadas} queries a '{tabla}' (presupuesto: {limite})")
+    for veces, tabla, operacion, forma, llamador in conteo.repetidas(max_repetidas):
+        problemas.append(
+            f"N+1 probable: {veces}x {operacion} {tabla} [{forma}] desde {llamador}"
+        )
+    if problemas:
+        raise AssertionError(
+            "Presupuesto de queries excedido:\n- "
+            + "\n- ".join(problemas)
+            + f"\nQueries:\n{conteo.reporte()}"
+        )
+
+
+@contextmanager
+def backend_en_memoria(tablas: Optional[Dict[str, list]] = None, **kwargs) -> Iterator[SupabaseEnMemoria]:
+    """
+    Redirige `db_manager` a un `SupabaseEnMemoria` con cache de
+    repositorios vacía y un alcance de DataLoaders propio.
+    """
+    cliente = SupabaseEnMemoria(tablas, **kwargs)
+    cache_consultas.limpiar()
+    try:
+        with db_manager.usar_cliente(cliente), alcance_loaders():
+            yield cliente
+    finally:
+        cache_consultas.limpiar()
@@ -0,0 +1,92 @@
+"""Conteos por estatus agrupados (migración 051) y su alternativa en Python."""
+
+import asyncio
+from decimal import Decimal
+
+from app.repositories.entregable_repository import SupabaseEntregableRepository
+from app.repositories.pago_repository import SupabasePagoRepository
+from app.repositories.plaza_repository import SupabasePlazaRepository
+from app.tests.presupuesto_queries import backend_en_memoria, presupuesto_queries
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+_TABLAS = {
+    "contratos": [
+        {"id": 1, "codigo": "C-1", "empresa_id": 10},
+        {"id": 2, "codigo": "C-2", "empresa_id": 10},
+        {"id": 3, "codigo": "C-3", "empresa_id": 20},
+    ],
+    "contrato_categorias": [{"id": 1, "contrato_id": 1}, {"id": 2, "contrato_id": 2}],
+    "plazas": [
+        {"id": 1, "contrato_categoria_id": 1, "estatus": "OCUPADA", "salario_mensual": "1000"},
+        {"id": 2, "contrato_categoria_id": 1, "estatus": "OCUPADA", "salario_mensual": "500"},
+        {"id": 3, "contrato_categoria_id": 1, "estatus": "VACANTE", "salario_mensual": "700"},
+        {"id": 4, "contrato_categoria_id": 2, "estatus": "CANCELADA", "salario_mensual": "700"},
+    ],
+    "entregables": [
+        {"id": 1, "contrato_id": 1, "estatus": "APROBADO", "monto_aprobado": "100"},
+        {"id": 2, "contrato_id": 1, "estatus": "PENDIENTE", "monto_aprobado": None},
+        {"id": 3, "contrato_id": 2, "estatus": "PREFACTURA_APROBADA", "monto_aprobado": "50"},
+        {"id": 4, "contrato_id": 3, "estatus": "PAGADO", "monto_aprobado": "70"},
+    ],
+    "pagos": [
+        {"id": 1, "contrato_id": 1, "monto": "30", "estatus": "PAGADO"},
+        {"id": 2, "contrato_id": 1, "monto": "20", "estatus": "PENDIENTE"},
+    ],
+}
+
+
+def _tablas():
+    return {tabla: [dict(fila) for fila in filas] for tabla, filas in _TABLAS.items()}
+
+
+def test_totales_plazas_por_contratos_sin_migracion():
+    with backend_en_memoria(_tablas()):
+        with presupuesto_queries(max=3):
+            totales = _run(SupabasePlazaRepository().obtener_totales_por_contratos([1, 2]))
+
+    assert totales[1]["plazas_ocupadas"] == 2
+    assert totales[1]["plazas_vacantes"] == 1
+    assert totales[1]["costo_total_mensual"] == Decimal("1500")
+    assert (totales[2]["total_plazas"], totales[2]["plazas_canceladas"]) == (1, 1)
+
+
+def test_estadisticas_entregables_sin_migracion():
+    with backend_en_memoria(_tablas()):
+        repo = SupabaseEntregableRepository()
+        globales = _run(repo.obtener_estadisticas_global())
+        empresa = _run(repo.obtener_estadisticas_empresa(10))
+        contrato = _run(repo.obtener_estadisticas_contrato(1))
+
+    assert (globales["total"], globales["pagados"], globales["por_facturar"]) == (4, 1, 1)
+    assert (empresa["total"], empresa["aprobados"], empresa["por_prefacturar"]) == (3, 1, 1)
+    assert (contrato.total_periodos, contrato.pendientes) == (2, 1)
+    assert contrato.monto_total_aprobado == Decimal("100")
+    assert contrato.monto_total_pagado == Decimal("30")
+
+
+def test_totales_pagos_usa_la_funcion_agrupada():
+    def _totales_pagos(db, p_contrato_ids, p_estatus):
+        return [{"contrato_id": 1, "total": "30"}]
+
+    with backend_en_memoria(_tablas(), rpcs={"totales_pagos_por_contrato": _totales_pagos}):
+        with presupuesto_queries(max=1, por_tabla={"pagos": 0}):
+            totales = _run(SupabasePagoRepository().obtener_totales_por_contratos([1, 2], estatus="PAGADO"))
+
+    assert totales == {1: Decimal("30"), 2: Decimal("0")}
+
+
+def test_totales_pagos_sin_migracion_consulta_por_lotes_de_ids():
+    from app.repositories.shared import TAMANO_LOTE_IDS
+
+    contrato_ids = list(range(1, TAMANO_LOTE_IDS + 2))
+    with backend_en_memoria(_tablas()):
+        with presupuesto_queries(max=3) as conteo:
+            totales = _run(SupabasePagoRepository().obtener_totales_por_contratos(contrato_ids))
+
+    assert conteo.por_tabla()["pagos"] == 2
+    assert totales[1] == Decimal("50")
+    assert len(totales) == len(contrato_ids)
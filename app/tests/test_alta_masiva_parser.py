@@ -0,0 +1,47 @@
+"""Parser en streaming de archivos de alta masiva."""
+
+import io
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.services.alta_masiva_parser import alta_masiva_parser
+
+
+def _csv(filas: int, encoding: str = "utf-8") -> bytes:
+    lineas = ["CURP;Nombre(s);Paterno;Teléfono;Otra"] + [
+        f"PEGA9001{i:02d}HPLRRN0{i % 10};JOSÉ;PEÑA;222 123 45{i:02d};x" for i in range(1, filas + 1)
+    ]
+    return "\n".join(lineas).encode(encoding)
+
+
+def test_csv_resuelve_headers_y_normaliza_registros():
+    registros = list(alta_masiva_parser.iterar(_csv(2, "latin-1"), "alta.csv"))
+
+    assert registros[0] == {
+        "curp": "PEGA900101HPLRRN01", "nombre": "JOSÉ",
+        "apellido_paterno": "PEÑA", "telefono": "222 123 4501",
+    }
+    assert len(registros) == 2
+
+
+def test_tope_de_filas_corta_la_lectura():
+    registros = alta_masiva_parser.iterar(_csv(50), "alta.csv", max_filas=3)
+
+    leidos = []
+    with pytest.raises(ValidationError, match="mas de 3"):
+        for registro in registros:
+            leidos.append(registro)
+    assert len(leidos) == 3
+
+
+def test_excel_sin_columnas_requeridas_falla_al_abrir():
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    wb.active.append(["curp", "nombre"])
+    wb.active.append(["PEGA900101HPLRRN01", "ANA"])
+    contenido = io.BytesIO()
+    wb.save(contenido)
+
+    with pytest.raises(ValidationError, match="apellido_paterno"):
+        alta_masiva_parser.iterar(contenido.getvalue(), "alta.xlsx")
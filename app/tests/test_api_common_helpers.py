@@ -38,11 +38,12 @@ class _SimpleAPIResponse:
     def __class_getitem__(cls, _item):
         return cls
 
-    def __init__(self, success: bool, data=None, total: int = 0, message=None):
+    def __init__(self, success: bool, data=None, total: int = 0, message=None, siguiente_cursor=None):
         self.success = success
         self.data = data
         self.total = total
         self.message = message
+        self.siguiente_cursor = siguiente_cursor
 
 
 class _SimpleAPIListResponse(_SimpleAPIResponse):
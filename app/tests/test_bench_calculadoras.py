@@ -0,0 +1,38 @@
+"""Tests del benchmark de calculadoras (casos ejecutables y detección de regresiones)."""
+
+import pytest
+
+from app.benchmarks.bench_calculadoras import CASOS, SALARIO_MINIMO, comparar, poblacion
+
+
+def test_poblacion_respeta_salario_minimo_y_es_reproducible():
+    filas = poblacion(500)
+
+    assert filas == poblacion(500)
+    salarios = [float(f["salario_diario"]) for f in filas]
+    assert min(salarios) >= SALARIO_MINIMO
+    assert sum(s == SALARIO_MINIMO for s in salarios) > 100
+
+
+@pytest.mark.parametrize("nombre", sorted(CASOS))
+def test_casos_corren_sobre_poblacion_chica(nombre):
+    CASOS[nombre](poblacion(20))()
+
+
+def test_comparar_reporta_solo_regresiones_sobre_umbral():
+    base = {
+        "isr@1000": {"ops_s": 1000.0, "kib_pico": 100.0},
+        "imss@1000": {"ops_s": 1000.0, "kib_pico": 100.0},
+    }
+    actual = {
+        "isr@1000": {"ops_s": 800.0, "kib_pico": 150.0},
+        "imss@1000": {"ops_s": 700.0, "kib_pico": 400.0},
+        "nuevo@1000": {"ops_s": 1.0, "kib_pico": 1.0},
+    }
+
+    regresiones = comparar(actual, base, umbral=0.25)
+
+    assert regresiones == [
+        "imss@1000: 700 ops/s vs 1000 (-30%)",
+        "imss@1000: 400 KiB pico vs 100",
+    ]
@@ -0,0 +1,160 @@
+"""Tests unitarios para la escritura por lotes de BaseRepository."""
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.exceptions import DatabaseError, DuplicateError
+from app.repositories.base_repository import BaseRepository
+from app.repositories.shared.bulk import escribir_en_lotes, filas_en_conflicto, partir_en_lotes
+
+
+class FakeResult:
+    def __init__(self, data=None):
+        self.data = data or []
+
+
+class FakeQuery:
+    def __init__(self, client):
+        self._client = client
+        self._op = None
+        self._payload = None
+        self._ids = None
+
+    def insert(self, payload):
+        self._op, self._payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self._op, self._payload = "update", payload
+        return self
+
+    def in_(self, _field, ids):
+        self._ids = list(ids)
+        return self
+
+    def execute(self):
+        self._client.sentencias.append((self._op, self._payload, self._ids))
+        if self._op == "insert":
+            filas = []
+            for fila in self._payload:
+                if fila["clave"] in self._client.claves:
+                    raise Exception(
+                        "{'code': '23505', 'details': 'Key (clave)=(%s) already exists.'}"
+                        % fila["clave"]
+                    )
+            for fila in self._payload:
+                self._client.claves.add(fila["clave"])
+                self._client.siguiente_id += 1
+                filas.append({"id": self._client.siguiente_id, **fila})
+            return FakeResult(filas)
+        return FakeResult([{"id": i, "clave": f"K{i}", **self._payload} for i in self._ids])
+
+
+class FakeClient:
+    def __init__(self, claves=()):
+        self.claves = set(claves)
+        self.sentencias = []
+        self.siguiente_id = 0
+
+    def table(self, _name):
+        return FakeQuery(self)
+
+
+class _Manager:
+    def __init__(self, client):
+        self._client = client
+
+    def get_client(self):
+        return self._client
+
+    async def ejecutar(self, fn):
+        return fn()
+
+
+class _Item(BaseModel):
+    id: int | None = None
+    clave: str
+    estatus: str = "ACTIVO"
+
+
+class _Repo(BaseRepository[_Item]):
+    tabla = "demo_bulk"
+    entidad_class = _Item
+
+
+def _repo(claves=()):
+    client = FakeClient(claves)
+    return _Repo(db=_Manager(client)), client
+
+
+class TestEscrituraPorLotes:
+
+    def test_crear_lote_parte_en_lotes_y_conserva_orden(self):
+        repo, client = _repo()
+        items = [_Item(clave=f"C{i:03d}") for i in range(12)]
+
+        creados = asyncio.run(repo.crear_lote(items, tamano_lote=5))
+
+        assert [c.clave for c in creados] == [i.clave for i in items]
+        assert all(c.id for c in creados)
+        assert [len(s[1]) for s in client.sentencias] == [5, 5, 2]
+
+    def test_crear_lote_mapea_duplicado_a_fila_de_entrada(self):
+        repo, _client = _repo(claves={"C007"})
+        items = [_Item(clave=f"C{i:03d}") for i in range(10)]
+
+        with pytest.raises(DuplicateError) as exc:
+            asyncio.run(repo.crear_lote(items, tamano_lote=4))
+
+        assert exc.value.field == "clave"
+        assert exc.value.value == "C007"
+        assert exc.value.details["filas"] == [7]
+        # Los otros lotes sí se confirmaron
+        assert exc.value.details["escritas"] == [0, 1, 2, 3, 8, 9]
+        assert [f["clave"] for f in exc.value.details["filas_escritas"]] == [
+            "C000", "C001", "C002", "C003", "C008", "C009",
+        ]
+
+    def test_actualizar_lote_agrupa_payloads_iguales(self):
+        repo, client = _repo()
+        cambios = {i: {"estatus": "INACTIVO"} for i in range(1, 8)}
+        cambios[9] = {"estatus": "SUSPENDIDO"}
+
+        actualizados = asyncio.run(repo.actualizar_lote(cambios, tamano_lote=5))
+
+        assert [a.id for a in actualizados] == [1, 2, 3, 4, 5, 6, 7, 9]
+        assert sorted((s[1]["estatus"], len(s[2])) for s in client.sentencias) == [
+            ("INACTIVO", 2), ("INACTIVO", 5), ("SUSPENDIDO", 1),
+        ]
+
+
+def test_escribir_en_lotes_reporta_lo_escrito_al_fallar():
+    def _escribir(lote):
+        if lote[0]["n"] == 2:
+            raise RuntimeError("timeout")
+        return [{"id": fila["n"], **fila} for fila in lote]
+
+    async def _inline(fn):
+        return fn()
+
+    with pytest.raises(DatabaseError) as exc:
+        asyncio.run(escribir_en_lotes([{"n": n} for n in range(5)], _escribir, _inline, tamano_lote=2))
+
+    assert str(exc.value) == "timeout"
+    assert exc.value.details["escritas"] == [0, 1, 4]
+    assert [f["id"] for f in exc.value.details["filas_escritas"]] == [0, 1, 4]
+
+
+def test_filas_en_conflicto_llave_compuesta():
+    error = Exception("Key (contrato_id, numero_periodo)=(4, 2) already exists.")
+    payloads = [
+        {"contrato_id": 4, "numero_periodo": 1},
+        {"contrato_id": 4, "numero_periodo": 2},
+    ]
+    assert filas_en_conflicto(error, payloads) == ("contrato_id, numero_periodo", "4, 2", [1])
+
+
+def test_partir_en_lotes():
+    assert partir_en_lotes([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,75 @@
+"""Búsqueda rankeada de empleados (migración 050)."""
+
+import asyncio
+
+from app.repositories.empleado_repository import SupabaseEmpleadoRepository
+from app.repositories.shared import normalizar_busqueda
+from app.tests.presupuesto_queries import backend_en_memoria, presupuesto_queries
+
+
+def _empleado(i: int, nombre: str, paterno: str, curp: str) -> dict:
+    return {
+        "id": i, "clave": f"B26-{i:05d}", "curp": curp, "nombre": nombre,
+        "apellido_paterno": paterno, "empresa_id": 1, "estatus": "ACTIVO",
+    }
+
+
+_EMPLEADOS = [
+    _empleado(1, "MARÍA", "PEÑA", "PEMA900101MPLXXR01"),
+    _empleado(2, "ANA", "MARTÍNEZ", "MAAA900101MPLXXN02"),
+    _empleado(3, "JOSÉ", "RUIZ", "RUJO900101HPLXXS03"),
+]
+
+llamadas: list = []
+
+
+def _buscar_rankeado(db, p_texto, p_empresa_id, p_limite, p_offset):
+    """Equivalente en memoria de `public.buscar_empleados_rankeado`."""
+    llamadas.append(p_texto)
+    filas = []
+    for fila in db.tablas["empleados"]:
+        campos = (fila.get(c) or "" for c in ("nombre", "apellido_paterno", "curp", "clave"))
+        texto = normalizar_busqueda(" ".join(campos))
+        if p_texto in texto:
+            prefijo = texto.startswith(p_texto) or f" {p_texto}" in texto
+            filas.append((not prefijo, fila["apellido_paterno"], fila))
+    filas.sort(key=lambda t: t[:2])
+    return [f for *_, f in filas][p_offset:p_offset + p_limite]
+
+
+def _buscar(texto, **kwargs):
+    return asyncio.run(SupabaseEmpleadoRepository().buscar_rankeado(texto, **kwargs))
+
+
+def test_normalizar_busqueda():
+    assert normalizar_busqueda("  Peña-Núñez, María ") == "pena nunez maria"
+    assert normalizar_busqueda("B26-00001") == "b26 00001"
+    assert normalizar_busqueda(None) == ""
+
+
+def test_nombre_sin_acentos_va_a_la_funcion_rankeada():
+    llamadas.clear()
+    with backend_en_memoria({"empleados": list(_EMPLEADOS)}, rpcs={"buscar_empleados_rankeado": _buscar_rankeado}):
+        resultado = _buscar("mar", empresa_id=1)
+
+    assert llamadas == ["mar"]
+    # Prefijo de palabra ("MARÍA", "MARTÍNEZ") antes que subcadena
+    assert [e.id for e in resultado] == [2, 1]
+
+
+def test_curp_completo_usa_camino_exacto():
+    llamadas.clear()
+    with backend_en_memoria({"empleados": list(_EMPLEADOS)}, rpcs={"buscar_empleados_rankeado": _buscar_rankeado}):
+        with presupuesto_queries(max=1) as conteo:
+            resultado = _buscar("rujo900101hplxxs03")
+
+    assert llamadas == []
+    assert conteo.consultas[0]["forma"].startswith("select(*) eq(curp)")
+    assert [e.id for e in resultado] == [3]
+
+
+def test_sin_migracion_cae_a_ilike():
+    with backend_en_memoria({"empleados": list(_EMPLEADOS)}):
+        resultado = _buscar("RUIZ")
+
+    assert [e.id for e in resultado] == [3]
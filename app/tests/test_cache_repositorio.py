@@ -0,0 +1,166 @@
+"""Tests unitarios para la cache read-through por tabla."""
+
+import asyncio
+
+from app.repositories.base_repository import BaseRepository
+from app.repositories.shared import cache as cache_mod
+from app.repositories.shared.cache import AUSENTE, CacheTabla, RegistroCache
+
+
+class FakeResult:
+    def __init__(self, data=None):
+        self.data = data or []
+
+
+class FakeQuery:
+    """Builder fake que aplica eq/update sobre filas en memoria."""
+
+    def __init__(self, client):
+        self._client = client
+        self._filtros = []
+        self._update = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def update(self, datos):
+        self._update = datos
+        return self
+
+    def eq(self, field, value):
+        self._filtros.append((field, value))
+        return self
+
+    def order(self, *_args, **_kwargs):
+        return self
+
+    def range(self, *_args):
+        return self
+
+    def execute(self):
+        self._client.ejecuciones += 1
+        filas = [
+            r for r in self._client.rows
+            if all(r[campo] == valor for campo, valor in self._filtros)
+        ]
+        if self._update is not None:
+            for fila in filas:
+                fila.update(self._update)
+        return FakeResult([dict(f) for f in filas])
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.ejecuciones = 0
+
+    def table(self, _name):
+        return FakeQuery(self)
+
+
+class _Manager:
+    def __init__(self, client):
+        self._client = client
+
+    def get_client(self):
+        return self._client
+
+    async def ejecutar(self, fn):
+        return fn()
+
+
+class _Entidad:
+    def __init__(self, **data):
+        self.__dict__.update(data)
+
+
+class _RepoCacheado(BaseRepository[_Entidad]):
+    tabla = "demo_cache"
+    entidad_class = _Entidad
+    cache_ttl = 60
+
+
+def _repo():
+    cache_mod.cache_consultas.limpiar()
+    client = FakeClient([
+        {"id": 1, "nombre": "A", "estatus": "ACTIVO"},
+        {"id": 2, "nombre": "B", "estatus": "ACTIVO"},
+    ])
+    return _RepoCacheado(db=_Manager(client)), client
+
+
+class TestCacheRepositorio:
+
+    def test_obtener_por_id_repetido_consulta_una_vez(self):
+        repo, client = _repo()
+
+        async def _run():
+            for _ in range(5):
+                assert (await repo.obtener_por_id(1)).nombre == "A"
+        asyncio.run(_run())
+
+        assert client.ejecuciones == 1
+        stats = cache_mod.cache_consultas.estadisticas()["demo_cache"]
+        assert (stats["hits"], stats["misses"]) == (4, 1)
+
+    def test_actualizar_invalida_id_y_listados_pero_no_otros_ids(self):
+        repo, client = _repo()
+
+        async def _run():
+            await repo.obtener_por_id(1)
+            await repo.obtener_por_id(2)
+            await repo.contar({"estatus": "ACTIVO"})
+            await repo.actualizar(1, {"nombre": "A2"})
+            client.ejecuciones = 0
+
+            assert (await repo.obtener_por_id(1)).nombre == "A2"
+            await repo.obtener_por_id(2)
+            await repo.contar({"estatus": "ACTIVO"})
+        asyncio.run(_run())
+
+        # por_id(1) y contar se recargan; por_id(2) sigue en cache
+        assert client.ejecuciones == 2
+
+
+class TestCacheTabla:
+
+    def test_expira_por_ttl(self, monkeypatch):
+        ahora = [1000.0]
+        monkeypatch.setattr(cache_mod.time, "monotonic", lambda: ahora[0])
+        cache = CacheTabla("t", ttl_segundos=10)
+
+        cache.guardar(("k",), 1)
+        ahora[0] += 9
+        assert cache.obtener(("k",)) == 1
+        ahora[0] += 2
+        assert cache.obtener(("k",)) is AUSENTE
+        assert cache.stats.expiradas == 1
+
+    def test_desaloja_menos_reciente(self):
+        cache = CacheTabla("t", ttl_segundos=60, max_entradas=2)
+        cache.guardar(("a",), 1)
+        cache.guardar(("b",), 2)
+        cache.obtener(("a",))
+        cache.guardar(("c",), 3)
+
+        assert cache.obtener(("b",)) is AUSENTE
+        assert cache.obtener(("a",)) == 1
+        assert cache.stats.desalojadas == 1
+
+    def test_no_guarda_lectura_concurrente_con_invalidacion(self):
+        cache = CacheTabla("t", ttl_segundos=60)
+
+        def _cargar_mientras_escriben():
+            cache.invalidar()
+            return "viejo"
+
+        assert cache.leer_o_cargar(("k",), _cargar_mientras_escriben) == "viejo"
+        assert cache.obtener(("k",)) is AUSENTE
+
+    def test_registro_comparte_cache_por_tabla(self):
+        registro = RegistroCache()
+        repo = registro.tabla("sedes", 600)
+        servicio = registro.tabla("sedes", 300, max_entradas=512)
+
+        assert repo is servicio
+        assert (repo.ttl_segundos, repo.max_entradas) == (300, 512)
@@ -0,0 +1,88 @@
+"""
+Tests de paridad del kernel vectorial contra la ruta escalar de
+`NominaCalculoService._calcular_movimientos`.
+
+El kernel debe reproducir al centavo cada movimiento (monto, gravable,
+exento) para cualquier combinación de entradas.
+"""
+
+import random
+
+import pytest
+
+from app.core.calculations import CalculadoraIMSS, CalculadoraNominaVectorial
+from app.services.nomina_calculo_service import NominaCalculoService, _CLAVES_SISTEMA
+
+
+def _service() -> NominaCalculoService:
+    service = object.__new__(NominaCalculoService)
+    service.supabase = None
+    service.calculadora_imss = CalculadoraIMSS()
+    service.calculadora_vectorial = CalculadoraNominaVectorial()
+    service._concepto_ids = {clave: i for i, clave in enumerate(sorted(_CLAVES_SISTEMA), 1)}
+    return service
+
+
+def _poblacion(semilla: int, n: int, dias_periodo: int) -> list[dict]:
+    rnd = random.Random(semilla)
+    nominas = []
+    for i in range(1, n + 1):
+        salario = f"{rnd.uniform(248.93, 4500):.2f}"
+        faltas = rnd.choice([0, 0, 0, 1, 2])
+        incapacidad = rnd.choice([0, 0, 0, 0, 1, 3])
+        vacaciones = rnd.choice([0, 0, 0, 2])
+        nominas.append({
+            "id": i,
+            "empleado_id": 1000 + i,
+            "salario_diario": salario,
+            "salario_diario_integrado": rnd.choice([None, f"{float(salario) * 1.0493:.2f}"]),
+            "dias_trabajados": max(dias_periodo - faltas - incapacidad, 0),
+            "dias_faltas": faltas,
+            "dias_incapacidad": incapacidad,
+            "dias_vacaciones": vacaciones,
+            "horas_extra_dobles": rnd.choice([None, "0", "3", "4.5", "9"]),
+            "horas_extra_triples": rnd.choice([None, "0", "2", "7.5"]),
+            "domingos_trabajados": rnd.choice([0, 0, 1, 2]),
+        })
+    return nominas
+
+
+def _clave_mov(mov: dict) -> tuple:
+    return (
+        mov["nomina_empleado_id"], mov["concepto_id"], mov["tipo"],
+        mov["monto"], mov["monto_gravable"], mov["monto_exento"],
+    )
+
+
+class TestParidadVectorial:
+
+    @pytest.mark.parametrize(
+        "periodicidad, dias",
+        [("SEMANAL", 7), ("CATORCENAL", 14), ("QUINCENAL", 15), ("MENSUAL", 30)],
+    )
+    def test_kernel_coincide_con_ruta_escalar(self, periodicidad, dias):
+        service = _service()
+        periodo = {"id": 1, "periodicidad": periodicidad}
+        nominas = _poblacion(semilla=dias, n=400, dias_periodo=dias)
+
+        resumen = {"errores": []}
+        vectorial = service._calcular_movimientos_lote(nominas, periodo, resumen)
+
+        assert resumen["errores"] == []
+        assert len(vectorial) == len(nominas)
+        for nomina, movimientos in vectorial:
+            escalar = service._calcular_movimientos(nomina, periodo)
+            assert [_clave_mov(m) for m in movimientos] == [_clave_mov(m) for m in escalar]
+
+    def test_salario_invalido_se_excluye_y_reporta(self):
+        service = _service()
+        nominas = _poblacion(semilla=1, n=3, dias_periodo=15)
+        nominas[1]["salario_diario"] = "0"
+        resumen = {"errores": []}
+
+        vectorial = service._calcular_movimientos_lote(
+            nominas, {"periodicidad": "QUINCENAL"}, resumen
+        )
+
+        assert [n["id"] for n, _ in vectorial] == [1, 3]
+        assert [e["empleado_id"] for e in resumen["errores"]] == [1002]
@@ -0,0 +1,81 @@
+"""Catálogos compartidos entre sesiones."""
+
+import asyncio
+
+from app.core.config import Config
+from app.database import db_manager
+from app.database.instrumentacion import RegistroConsultas
+from app.services.catalogos_compartidos import CatalogosCompartidos
+from app.tests.presupuesto_queries import backend_en_memoria, presupuesto_queries
+
+
+class FakeCargador:
+    def __init__(self):
+        self.llamadas = 0
+
+    async def __call__(self, *args):
+        self.llamadas += 1
+        await asyncio.sleep(0)
+        return [{"version": self.llamadas, "args": args}]
+
+
+def test_sesiones_comparten_una_sola_carga():
+    catalogos, cargador = CatalogosCompartidos(registro=RegistroConsultas()), FakeCargador()
+    catalogos.registrar("empresas_activas", cargador, tablas=("empresas",))
+
+    async def escenario():
+        # Varias sesiones montando la página a la vez
+        await asyncio.gather(*(catalogos.obtener("empresas_activas") for _ in range(5)))
+        return await catalogos.obtener("empresas_activas")
+
+    assert asyncio.run(escenario()) == [{"version": 1, "args": ()}]
+    assert cargador.llamadas == 1
+    assert catalogos.estadisticas()["empresas_activas"]["hits"] == 1
+
+
+def test_escritura_en_la_tabla_cambia_la_version():
+    catalogos, cargador = CatalogosCompartidos(), FakeCargador()
+    catalogos.registrar("tipos_servicio_activos", cargador, tablas=("tipos_servicio",))
+    catalogos.registrar("categorias_por_tipo", cargador, tablas=("categorias_puesto",))
+
+    async def escenario():
+        await catalogos.obtener("tipos_servicio_activos")
+        await catalogos.obtener("categorias_por_tipo", 1)
+
+        cliente = db_manager.get_client()
+        await db_manager.ejecutar_query(cliente.table("tipos_servicio").insert({"id": 1}))
+
+        with presupuesto_queries(max=0):
+            categorias = await catalogos.obtener("categorias_por_tipo", 1)
+        tipos = await catalogos.obtener("tipos_servicio_activos")
+        return categorias, tipos
+
+    with backend_en_memoria({"tipos_servicio": []}):
+        categorias, tipos = asyncio.run(escenario())
+
+    assert categorias == [{"version": 2, "args": (1,)}]
+    assert tipos == [{"version": 3, "args": ()}]
+
+
+def test_ttl_expirado_recarga():
+    catalogos, cargador = CatalogosCompartidos(ttl_segundos=0, registro=RegistroConsultas()), FakeCargador()
+    catalogos.registrar("sedes_activas", cargador, tablas=("sedes",))
+
+    asyncio.run(catalogos.obtener("sedes_activas"))
+    asyncio.run(catalogos.obtener("sedes_activas"))
+    assert cargador.llamadas == 2
+
+
+def test_escritura_invalida_sin_instrumentacion(monkeypatch):
+    monkeypatch.setattr(Config, "DB_INSTRUMENTACION", False)
+    catalogos, cargador = CatalogosCompartidos(), FakeCargador()
+    catalogos.registrar("sedes_activas", cargador, tablas=("sedes",))
+
+    async def escenario():
+        await catalogos.obtener("sedes_activas")
+        cliente = db_manager.get_client()
+        await db_manager.ejecutar_query(cliente.table("sedes").update({"nombre": "NORTE"}).eq("id", 1))
+        return await catalogos.obtener("sedes_activas")
+
+    with backend_en_memoria({"sedes": [{"id": 1, "nombre": "SUR"}]}):
+        assert asyncio.run(escenario()) == [{"version": 2, "args": ()}]
@@ -0,0 +1,179 @@
+"""Tests unitarios para DataLoader y el batching de lecturas por ID."""
+
+import asyncio
+
+import pytest
+
+from app.repositories.base_repository import BaseRepository
+from app.repositories.shared.data_loader import DataLoader, alcance_loaders, con_alcance_loaders
+from app.services.historial_laboral_service import HistorialLaboralService
+
+
+class FakeResult:
+    def __init__(self, data=None):
+        self.data = data or []
+
+
+class FakeQuery:
+    def __init__(self, client, tabla):
+        self._client = client
+        self._tabla = tabla
+        self._ids = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def in_(self, field, values):
+        assert field == "id"
+        self._ids = list(values)
+        return self
+
+    def execute(self):
+        self._client.consultas.append((self._tabla, self._ids))
+        return FakeResult([r for r in self._client.rows if r["id"] in self._ids])
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.consultas = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class _Manager:
+    def __init__(self, client):
+        self._client = client
+
+    def get_client(self):
+        return self._client
+
+    async def ejecutar(self, fn):
+        return fn()
+
+
+class _Entidad:
+    def __init__(self, **data):
+        self.__dict__.update(data)
+
+
+class _Repo(BaseRepository[_Entidad]):
+    tabla = "demo_loader"
+    entidad_class = _Entidad
+
+
+class TestDataLoader:
+
+    def test_cargas_concurrentes_se_agrupan_y_deduplican(self):
+        lotes = []
+
+        async def _cargar_lote(claves):
+            lotes.append(list(claves))
+            return {c: c * 10 for c in claves if c != 3}
+
+        async def _run():
+            loader = DataLoader(_cargar_lote)
+            return await loader.cargar_muchos([1, 2, 1, 3, 2])
+
+        assert asyncio.run(_run()) == [10, 20, 10, None, 20]
+        assert lotes == [[1, 2, 3]]
+
+    def test_respeta_max_lote(self):
+        lotes = []
+
+        async def _cargar_lote(claves):
+            lotes.append(len(claves))
+            return {c: c for c in claves}
+
+        async def _run():
+            await DataLoader(_cargar_lote, max_lote=4).cargar_muchos(range(10))
+
+        asyncio.run(_run())
+        assert lotes == [4, 4, 2]
+
+    def test_error_se_propaga_y_permite_reintentar(self):
+        intentos = []
+
+        async def _cargar_lote(claves):
+            intentos.append(claves)
+            if len(intentos) == 1:
+                raise RuntimeError("falla")
+            return {c: c for c in claves}
+
+        async def _run():
+            loader = DataLoader(_cargar_lote)
+            with pytest.raises(RuntimeError):
+                await loader.cargar(7)
+            return await loader.cargar(7)
+
+        assert asyncio.run(_run()) == 7
+        assert len(intentos) == 2
+
+    def test_repositorio_memoriza_dentro_del_alcance(self):
+        client = FakeClient([{"id": i, "nombre": f"E{i}"} for i in range(1, 6)])
+        repo = _Repo(db=_Manager(client))
+
+        async def _run():
+            with alcance_loaders():
+                await asyncio.gather(*(repo.loader().cargar(i) for i in (1, 2, 3)))
+                entidad = await repo.loader().cargar(2)
+                await repo.loader().cargar(4)
+                return entidad
+
+        assert asyncio.run(_run()).nombre == "E2"
+        assert client.consultas == [("demo_loader", [1, 2, 3]), ("demo_loader", [4])]
+
+    def test_handler_decorado_comparte_lecturas_secuenciales(self):
+        client = FakeClient([{"id": i, "nombre": f"E{i}"} for i in range(1, 6)])
+        repo = _Repo(db=_Manager(client))
+
+        async def handler():
+            # p. ej. validar el monto contra el contrato y luego recargarlo
+            await repo.loader().cargar(2)
+            return await repo.loader().cargar(2)
+
+        asyncio.run(handler())
+        assert client.consultas == [("demo_loader", [2]), ("demo_loader", [2])]
+
+        client.consultas.clear()
+        entidad = asyncio.run(con_alcance_loaders(handler)())
+        assert entidad.nombre == "E2"
+        assert client.consultas == [("demo_loader", [2])]
+
+
+class _HistorialRepoFake:
+    """Repositorio de historial con 50 filas que apuntan a 10 plazas."""
+
+    def __init__(self):
+        self.consultas_plazas = []
+
+    async def obtener_todos_con_join(self, *_args):
+        return [
+            {
+                "id": i,
+                "empleado_id": i,
+                "plaza_id": 100 + i % 10,
+                "tipo_movimiento": "ALTA",
+                "fecha_inicio": "2026-01-01",
+                "empleados": {"clave": f"B26-{i:05d}", "nombre": "Ana", "apellido_paterno": "Ruiz"},
+            }
+            for i in range(1, 51)
+        ]
+
+    def loader_datos_plaza(self):
+        async def _cargar_lote(ids):
+            self.consultas_plazas.append(sorted(ids))
+            return {i: {"numero_plaza": i, "categoria_nombre": "JARDINERO"} for i in ids}
+        return DataLoader(_cargar_lote)
+
+
+def test_historial_enriquece_plazas_en_una_sola_consulta():
+    service = HistorialLaboralService.__new__(HistorialLaboralService)
+    service.repository = _HistorialRepoFake()
+
+    resumenes = asyncio.run(service.obtener_todos(limite=50))
+
+    assert len(resumenes) == 50
+    assert service.repository.consultas_plazas == [list(range(100, 110))]
+    assert resumenes[0].plaza_numero == 101
@@ -0,0 +1,107 @@
+"""Tests unitarios para la ruta de ejecución no bloqueante del DatabaseManager."""
+
+import asyncio
+import threading
+
+from app.database.connection import DatabaseManager
+from app.repositories.base_repository import BaseRepository
+from app.repositories.pago_repository import SupabasePagoRepository
+
+
+class FakeResult:
+    """Resultado mínimo compatible con el cliente de Supabase."""
+
+    def __init__(self, data=None):
+        self.data = data or []
+        self.count = len(self.data)
+
+
+class FakeQuery:
+    """Query fake que registra el hilo donde se ejecuta."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def execute(self):
+        self._client.hilos.append(threading.current_thread().name)
+        return FakeResult([{"id": 1, "nombre": "UNO"}])
+
+
+class FakeClient:
+    def __init__(self):
+        self.hilos: list[str] = []
+
+    def table(self, _name):
+        return FakeQuery(self)
+
+
+def _manager_con_cliente(client) -> DatabaseManager:
+    """DatabaseManager sin conexión real (solo el pool de I/O)."""
+    manager = object.__new__(DatabaseManager)
+    manager.supabase = client
+    manager._executor = None
+    return manager
+
+
+class _Entidad:
+    def __init__(self, **data):
+        self.__dict__.update(data)
+
+
+class _Repo(BaseRepository[_Entidad]):
+    tabla = "demo"
+    entidad_class = _Entidad
+
+
+class _RepoEnLoop(_Repo):
+    usar_executor = False
+
+
+class TestDatabaseExecutor:
+
+    def test_ejecutar_query_corre_fuera_del_event_loop(self):
+        client = FakeClient()
+        manager = _manager_con_cliente(client)
+
+        async def _run():
+            loop_thread = threading.current_thread().name
+            result = await manager.ejecutar_query(client.table("demo").select("*"))
+            return loop_thread, result
+
+        loop_thread, result = asyncio.run(_run())
+        manager.cerrar()
+
+        assert result.data == [{"id": 1, "nombre": "UNO"}]
+        assert client.hilos[0].startswith("supabase-io")
+        assert client.hilos[0] != loop_thread
+
+    def test_repositorio_con_opt_out_ejecuta_en_el_loop(self):
+        client = FakeClient()
+        repo = _RepoEnLoop(db=_manager_con_cliente(client))
+
+        entidad = asyncio.run(repo.obtener_por_id(1))
+
+        assert entidad.nombre == "UNO"
+        assert client.hilos == ["MainThread"]
+
+    def test_repositorios_usan_el_pool_por_defecto(self):
+        client = FakeClient()
+        manager = _manager_con_cliente(client)
+        repo = _Repo(db=manager)
+
+        entidad = asyncio.run(repo.obtener_por_id(1))
+        existe = asyncio.run(repo.existe(1))
+        # Los repositorios que no heredan de BaseRepository también
+        asyncio.run(SupabasePagoRepository(db_manager=manager).contar_pagos(1))
+        manager.cerrar()
+
+        assert entidad.nombre == "UNO"
+        assert existe is True
+        assert len(client.hilos) == 3
+        assert all(h.startswith("supabase-io") for h in client.hilos)
@@ -0,0 +1,97 @@
+"""Altas y reingresos de empleados por lote (alta masiva)."""
+
+import asyncio
+from datetime import date
+
+from app.core.exceptions import BusinessRuleError, DuplicateError, NotFoundError
+from app.entities.empleado import Empleado, EmpleadoCreate
+from app.repositories.empleado_repository import SupabaseEmpleadoRepository
+from app.services.empleado_service import EmpleadoService
+from app.services.empleados.indice_busqueda import IndiceBusquedaEmpleados
+from app.tests.presupuesto_queries import backend_en_memoria
+
+_EMPRESA = {
+    "id": 1, "nombre_comercial": "LIMPIEZA DEL SUR", "razon_social": "LIMPIEZA DEL SUR SA DE CV",
+    "tipo_empresa": "NOMINA", "rfc": "LSU010101AB1", "estatus": "ACTIVO",
+}
+_CURPS = ["PEGA900101HPLRRN01", "PEGA900102HPLRRN02", "PEGA900103HPLRRN03"]
+_PREFIJO = f"B{str(date.today().year)[-2:]}"
+
+
+class FakeRepositorioConCarrera(SupabaseEmpleadoRepository):
+    """Otra alta corre en paralelo: el consecutivo leído ya está ocupado y
+    una CURP se registra después de consultarla."""
+
+    def __init__(self, curp_oculta: str):
+        super().__init__()
+        self.curp_oculta = curp_oculta
+        self.lecturas_consecutivo = 0
+
+    async def obtener_por_curps(self, curps):
+        existentes = await super().obtener_por_curps(curps)
+        existentes.pop(self.curp_oculta, None)
+        return existentes
+
+    async def obtener_siguiente_consecutivo(self, anio: int) -> int:
+        self.lecturas_consecutivo += 1
+        if self.lecturas_consecutivo == 1:
+            return 1
+        return await super().obtener_siguiente_consecutivo(anio)
+
+
+def _tablas():
+    return {
+        "empresas": [_EMPRESA],
+        "empleados": [
+            {
+                "id": 1, "clave": f"{_PREFIJO}-00001", "curp": _CURPS[1], "nombre": "LUIS",
+                "apellido_paterno": "GARCIA", "empresa_id": 1, "estatus": "ACTIVO",
+            },
+        ],
+    }
+
+
+def test_lote_parcial_conserva_resultado_por_fila():
+    creates = [
+        EmpleadoCreate(empresa_id=1, curp=curp, nombre="ANA", apellido_paterno="PEREZ")
+        for curp in _CURPS
+    ]
+
+    with backend_en_memoria(_tablas(), unicos={"empleados": [("curp",), ("clave",)]}) as db:
+        repositorio = FakeRepositorioConCarrera(curp_oculta=_CURPS[1])
+        servicio = EmpleadoService(repository=repositorio, indice_busqueda=IndiceBusquedaEmpleados())
+        resultados = asyncio.run(servicio.crear_lote(creates))
+        historial = db.tablas["historial_laboral"]
+
+    creado, duplicado, otro = resultados
+    assert isinstance(duplicado, DuplicateError) and duplicado.field == "curp"
+    assert (creado.clave, otro.clave) == (f"{_PREFIJO}-00002", f"{_PREFIJO}-00003")
+    assert repositorio.lecturas_consecutivo == 2
+    assert sorted(h["empleado_id"] for h in historial) == sorted([creado.id, otro.id])
+
+
+def test_reingreso_lote_aplica_reglas_por_fila():
+    tablas = _tablas()
+    tablas["empresas"].append({**_EMPRESA, "id": 2, "rfc": "LSU010101AB2"})
+    tablas["empleados"].append({
+        "id": 2, "clave": f"{_PREFIJO}-00002", "curp": _CURPS[2], "nombre": "ANA",
+        "apellido_paterno": "PEREZ", "empresa_id": 1, "estatus": "INACTIVO",
+        "fecha_baja": "2026-01-31", "motivo_baja": "RENUNCIA",
+    })
+    tablas["historial_laboral"] = [
+        {"id": 1, "empleado_id": 2, "tipo_movimiento": "ALTA", "fecha_inicio": "2026-01-01"},
+    ]
+
+    with backend_en_memoria(tablas) as db:
+        servicio = EmpleadoService(
+            repository=SupabaseEmpleadoRepository(), indice_busqueda=IndiceBusquedaEmpleados()
+        )
+        resultados = asyncio.run(servicio.reingresar_lote(1, [(1, None), (2, None), (2, None), (99, None)]))
+        historial = db.tablas["historial_laboral"]
+
+    activo, reingresado, repetido, inexistente = resultados
+    assert isinstance(activo, BusinessRuleError) and isinstance(repetido, BusinessRuleError)
+    assert isinstance(inexistente, NotFoundError)
+    assert isinstance(reingresado, Empleado) and reingresado.fecha_baja is None
+    assert historial[0]["fecha_fin"] is not None
+    assert (historial[1]["tipo_movimiento"], historial[1]["empresa_anterior_id"]) == ("REINGRESO", 1)
@@ -0,0 +1,68 @@
+"""Tests unitarios para la hidratación de confianza y la proyección de columnas."""
+
+from datetime import date
+from decimal import Decimal
+
+from app.benchmarks.bench_hidratacion import filas_empleado
+from app.entities.empleado import Empleado
+from app.entities.plaza import Plaza
+from app.repositories.shared.hidratacion import columnas_select, hidratar_confiable
+
+
+class TestHidratacionConfiable:
+
+    def test_equivale_a_validacion_completa_para_filas_validas(self):
+        filas = filas_empleado(3)
+
+        confiables = hidratar_confiable(Empleado, filas)
+
+        assert [e.model_dump() for e in confiables] == [
+            Empleado(**f).model_dump() for f in filas
+        ]
+        assert confiables[0].estatus == "ACTIVO"
+        assert confiables[0].nombre_completo() == "JUAN CARLOS PEREZ GARCIA"
+
+    def test_null_en_campo_no_anulable_toma_default(self):
+        fila = {
+            "id": 1, "contrato_categoria_id": 2, "numero_plaza": 1, "codigo": None,
+            "fecha_inicio": "2026-01-01", "salario_mensual": "1234.50", "estatus": "VACANTE",
+        }
+
+        plaza = hidratar_confiable(Plaza, [fila])[0]
+
+        assert plaza == Plaza(**fila)
+        assert plaza.codigo == ""
+        assert plaza.salario_mensual == Decimal("1234.50")
+
+    def test_proyeccion_deja_defaults_y_marca_campos_leidos(self):
+        empleado = hidratar_confiable(Empleado, [{"id": 7, "clave": "B25-00007", "nombre": "ANA"}])[0]
+
+        assert empleado.id == 7
+        assert empleado.estatus == "ACTIVO"
+        assert empleado.fecha_ingreso == date.today()
+        assert empleado.model_fields_set == {"id", "clave", "nombre"}
+
+
+def test_columnas_select():
+    assert columnas_select(None) == "*"
+    assert columnas_select(["nombre", "id", "nombre"], ("id", "apellido_paterno")) == (
+        "nombre, id, apellido_paterno"
+    )
+
+
+def test_pagina_con_campos_lee_solo_la_proyeccion():
+    import asyncio
+
+    from app.benchmarks.bench_hidratacion import CAMPOS_TABLA
+    from app.repositories.empleado_repository import SupabaseEmpleadoRepository
+    from app.tests.presupuesto_queries import backend_en_memoria
+
+    with backend_en_memoria({"empleados": filas_empleado(3)}):
+        pagina = asyncio.run(
+            SupabaseEmpleadoRepository().obtener_pagina(empresa_id=2, limite=10, campos=CAMPOS_TABLA)
+        )
+
+    empleado = pagina.items[0]
+    assert empleado.id == 1
+    assert empleado.nombre_completo() == "JUAN CARLOS PEREZ GARCIA"
+    assert empleado.model_fields_set == set(CAMPOS_TABLA)
@@ -71,6 +71,9 @@ class FakeDBManager:
     def get_client(self):
         return self._client
 
+    async def ejecutar_query(self, query):
+        return query.execute()
+
 
 def _historial_calls(client: FakeSupabaseClient) -> list[tuple]:
     return [call for call in client.calls if call[0] == "historial_laboral"]
@@ -0,0 +1,94 @@
+"""Importaciones de alta masiva en segundo plano (reanudables)."""
+
+import asyncio
+
+from app.entities.alta_masiva import (
+    EstatusImportacion,
+    RegistroValidado,
+    ResultadoFila,
+    ResultadoValidacion,
+)
+from app.repositories.importacion_repository import SupabaseImportacionAltaMasivaRepository
+from app.services.importacion_alta_masiva_service import ImportacionAltaMasivaService
+from app.tests.presupuesto_queries import backend_en_memoria
+
+_EMPRESA = {
+    "id": 1, "nombre_comercial": "LIMPIEZA DEL SUR", "razon_social": "LIMPIEZA DEL SUR SA DE CV",
+    "tipo_empresa": "NOMINA", "rfc": "LSU010101AB1", "estatus": "ACTIVO",
+}
+_CURPS = [f"PEGA9001{dia:02d}HPLRRN0{dia % 10}" for dia in range(1, 6)]
+_UNICOS = {
+    "empleados": [("curp",), ("clave",)],
+    "importaciones_alta_masiva": [("clave_idempotencia",)],
+}
+
+
+def _validacion():
+    return ResultadoValidacion(
+        total_filas=len(_CURPS),
+        validos=[
+            RegistroValidado(
+                fila=i + 2, resultado=ResultadoFila.VALIDO, curp=curp,
+                datos={"curp": curp, "nombre": "ANA", "apellido_paterno": "PEREZ"},
+            )
+            for i, curp in enumerate(_CURPS)
+        ],
+    )
+
+
+def _servicio():
+    return ImportacionAltaMasivaService(repository=SupabaseImportacionAltaMasivaRepository(), tamano_lote=2)
+
+
+def test_mismo_archivo_regresa_la_misma_importacion():
+    async def escenario():
+        servicio = _servicio()
+        primera = await servicio.iniciar(_validacion(), 1, "clave-archivo", "alta.csv")
+        segunda = await servicio.iniciar(_validacion(), 1, "clave-archivo", "alta.csv")
+        await asyncio.gather(*servicio._tareas.values())
+        return primera, segunda, await servicio.obtener(primera.id, con_detalle=True)
+
+    with backend_en_memoria({"empresas": [_EMPRESA]}, unicos=_UNICOS) as db:
+        primera, segunda, final = asyncio.run(escenario())
+        empleados = db.tablas["empleados"]
+
+    assert primera.id == segunda.id
+    assert len(empleados) == len(_CURPS)
+    assert final.estatus == EstatusImportacion.COMPLETADA
+    assert (final.cursor, final.creados, final.errores) == (5, 5, 0)
+    assert [d.fila for d in final.detalles] == [2, 3, 4, 5, 6]
+
+
+def test_reanuda_desde_el_cursor_y_concilia_el_lote_a_medias():
+    async def escenario():
+        servicio = _servicio()
+        importacion = await servicio.iniciar(_validacion(), 1, "clave-archivo", "alta.csv")
+        await asyncio.gather(*servicio._tareas.values())
+        return servicio, importacion.id
+
+    with backend_en_memoria({"empresas": [_EMPRESA]}, unicos=_UNICOS) as db:
+        servicio, importacion_id = asyncio.run(escenario())
+        # El proceso se cayó tras confirmar el primer lote y aplicar una
+        # fila del segundo (sin guardar su avance)
+        fila = db.tablas["importaciones_alta_masiva"][0]
+        aplicados = {_CURPS[0], _CURPS[1], _CURPS[2]}
+        db.tablas["empleados"] = [e for e in db.tablas["empleados"] if e["curp"] in aplicados]
+        fila.update(
+            estatus="PROCESANDO", cursor=2, creados=2, detalles=fila["detalles"][:2],
+            latido="2026-01-01T00:00:00+00:00",
+        )
+
+        async def reanudar():
+            relanzadas = await servicio.reanudar_pendientes()
+            await asyncio.gather(*servicio._tareas.values())
+            return relanzadas, await servicio.obtener(importacion_id, con_detalle=True)
+
+        relanzadas, final = asyncio.run(reanudar())
+        empleados = db.tablas["empleados"]
+
+    assert relanzadas == 1
+    assert final.estatus == EstatusImportacion.COMPLETADA
+    assert final.intentos == 2
+    assert (final.creados, final.errores) == (5, 0)
+    assert sorted(e["curp"] for e in empleados) == sorted(_CURPS)
+    assert [d.mensaje.split(":")[0] for d in final.detalles] == ["Creado"] * 5
@@ -0,0 +1,89 @@
+"""Índice de búsqueda de empleados en memoria."""
+
+import asyncio
+
+from app.entities.empleado import EmpleadoUpdate
+from app.services.empleado_service import EmpleadoService
+from app.services.empleados.indice_busqueda import IndiceBusquedaEmpleados
+from app.tests.presupuesto_queries import backend_en_memoria, presupuesto_queries
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _empleado(i: int, nombre: str, paterno: str, empresa_id: int = 1) -> dict:
+    return {
+        "id": i, "clave": f"B26-{i:05d}", "curp": f"XEXX9001{i:02d}HPLRRN0{i % 10}",
+        "nombre": nombre, "apellido_paterno": paterno, "empresa_id": empresa_id, "estatus": "ACTIVO",
+    }
+
+
+_EMPLEADOS = [
+    _empleado(1, "MARÍA", "PEÑA"),
+    _empleado(2, "ANA", "MARTÍNEZ"),
+    _empleado(3, "JOSÉ", "ROMERO"),
+    _empleado(4, "MARIO", "LÓPEZ", empresa_id=2),
+]
+
+
+class FakeCargador:
+    def __init__(self, filas):
+        self.filas = filas
+        self.llamadas = 0
+
+    async def __call__(self, empresa_id):
+        self.llamadas += 1
+        return [f for f in self.filas if f["empresa_id"] == empresa_id]
+
+
+class TestIndiceBusqueda:
+
+    def test_prefijo_de_palabra_antes_que_subcadena_y_sin_acentos(self):
+        indice, cargador = IndiceBusquedaEmpleados(), FakeCargador(_EMPLEADOS)
+
+        assert _run(indice.buscar(1, "mar", cargador)) == [2, 1]
+        assert _run(indice.buscar(1, "Peña", cargador)) == [1]
+        assert _run(indice.buscar(1, "b26-00003", cargador)) == [3]
+        assert cargador.llamadas == 1
+
+    def test_delta_refleja_cambios_sin_reconstruir(self):
+        indice, cargador = IndiceBusquedaEmpleados(), FakeCargador(_EMPLEADOS)
+        _run(indice.buscar(1, "x", cargador))
+
+        class Editado:
+            id, empresa_id, clave, curp, rfc = 3, 1, "B26-00003", None, None
+            nombre, apellido_paterno, apellido_materno = "JOSÉ", "MARTÍN", None
+
+        indice.actualizar(Editado())
+        assert _run(indice.buscar(1, "romero", cargador)) == []
+        assert _run(indice.buscar(1, "martin", cargador)) == [2, 3]
+
+        Editado.empresa_id = 2
+        indice.actualizar(Editado(), empresa_anterior_id=1)
+        assert _run(indice.buscar(1, "martin", cargador)) == [2]
+        assert cargador.llamadas == 1
+
+    def test_ttl_expirado_reconstruye(self):
+        indice, cargador = IndiceBusquedaEmpleados(ttl_segundos=0), FakeCargador(_EMPLEADOS)
+        _run(indice.buscar(1, "ana", cargador))
+        _run(indice.buscar(1, "ana", cargador))
+        assert cargador.llamadas == 2
+
+
+def test_buscar_indexado_lee_solo_los_resultados():
+    service = EmpleadoService(indice_busqueda=IndiceBusquedaEmpleados())
+    with backend_en_memoria({"empleados": list(_EMPLEADOS)}):
+        _run(service.buscar_indexado("ana", empresa_id=1))  # construye el índice
+
+        with presupuesto_queries(max=1) as conteo:
+            encontrados = _run(service.buscar_indexado("mar", empresa_id=1))
+
+        # La actualización entra al índice por el hook, sin reconstruir
+        _run(service.actualizar(3, EmpleadoUpdate(apellido_paterno="MARQUEZ")))
+        with presupuesto_queries(max=1):
+            despues = _run(service.buscar_indexado("marq", empresa_id=1))
+
+    assert [e.id for e in encontrados] == [2, 1]
+    assert conteo.consultas[0]["forma"] == "select(*) in_(id)"
+    assert [e.id for e in despues] == [3]
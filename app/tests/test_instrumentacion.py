@@ -0,0 +1,132 @@
+"""Tests unitarios para la instrumentación de queries del cliente Supabase."""
+
+import logging
+
+import pytest
+
+from app.core.config import Config
+from app.database.instrumentacion import ClienteInstrumentado, RegistroConsultas
+
+
+@pytest.fixture(autouse=True)
+def instrumentacion_activa(monkeypatch):
+    monkeypatch.setattr(Config, "DB_INSTRUMENTACION", True)
+    monkeypatch.setattr(Config, "DB_INSTRUMENTACION_MUESTRA", 1.0)
+
+
+class FakeResult:
+    def __init__(self, data=None):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, client):
+        self._client = client
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def or_(self, *_args):
+        return self
+
+    def order(self, *_args, **_kwargs):
+        return self
+
+    def execute(self):
+        if self._client.error:
+            raise RuntimeError("timeout")
+        return FakeResult(self._client.rows)
+
+
+class FakeClient:
+    def __init__(self, rows=None, error=False):
+        self.rows = rows or []
+        self.error = error
+        self.auth = "auth-real"
+
+    def table(self, _name):
+        return FakeQuery(self)
+
+
+def _consulta_de_servicio(cliente):
+    return cliente.table("empleados").select("id, nombre").eq("empresa_id", 3)\
+        .or_("nombre.ilike.%ANA%").order("apellido_paterno").execute()
+
+
+class TestClienteInstrumentado:
+
+    def test_registra_forma_filas_bytes_y_llamador_sin_valores(self, caplog):
+        registro = RegistroConsultas(umbral_lenta_ms=0)
+        cliente = ClienteInstrumentado(FakeClient(rows=[{"id": 1}, {"id": 2}]), registro)
+
+        with caplog.at_level(logging.WARNING):
+            resultado = _consulta_de_servicio(cliente)
+
+        assert len(resultado.data) == 2
+        stats = registro.estadisticas()
+        consulta = stats["consultas"][0]
+        assert (consulta["tabla"], consulta["operacion"]) == ("empleados", "select")
+        assert consulta["llamadas"] == 1
+        assert consulta["filas"] == 2
+        assert consulta["bytes"] == len('[{"id":1},{"id":2}]')
+        assert consulta["llamadores"][0]["metodo"].endswith("_consulta_de_servicio")
+        lenta = stats["lentas"][0]
+        assert lenta["forma"] == "select(id, nombre) eq(empresa_id) or_ order(apellido_paterno)"
+        assert "ANA" not in caplog.text and "Consulta lenta" in caplog.text
+
+    def test_errores_se_cuentan_y_propagan(self):
+        registro = RegistroConsultas()
+        cliente = ClienteInstrumentado(FakeClient(error=True), registro)
+
+        with pytest.raises(RuntimeError):
+            cliente.table("plazas").select("*").execute()
+
+        consulta = registro.estadisticas()["consultas"][0]
+        assert consulta["errores"] == 1
+        assert registro.estadisticas()["lentas"] == []
+
+    def test_fuera_de_la_muestra_no_recorre_la_pila_y_estima_bytes(self, monkeypatch):
+        registro = RegistroConsultas(umbral_lenta_ms=10_000)
+        cliente = ClienteInstrumentado(FakeClient(rows=[{"id": 1}, {"id": 2}]), registro)
+        _consulta_de_servicio(cliente)
+
+        monkeypatch.setattr(Config, "DB_INSTRUMENTACION_MUESTRA", 0.0)
+        monkeypatch.setattr(
+            "app.database.instrumentacion._llamador", lambda: pytest.fail("recorrió la pila")
+        )
+        monkeypatch.setattr(
+            "app.database.instrumentacion._tamano_respuesta", lambda _data: pytest.fail("serializó")
+        )
+        cliente.cliente.rows = [{"id": i} for i in range(1, 5)]
+        _consulta_de_servicio(cliente)
+
+        consulta = registro.estadisticas()["consultas"][0]
+        assert (consulta["llamadas"], consulta["filas"]) == (2, 6)
+        # 2 filas medidas en 19 bytes -> 4 filas estimadas en 38
+        assert consulta["bytes"] == 19 + 38
+        assert [l["llamadas"] for l in consulta["llamadores"]] == [1]
+
+    def test_apagada_no_mide(self, monkeypatch):
+        monkeypatch.setattr(Config, "DB_INSTRUMENTACION", False)
+        registro = RegistroConsultas()
+        _consulta_de_servicio(ClienteInstrumentado(FakeClient(rows=[{"id": 1}]), registro))
+
+        assert registro.estadisticas()["consultas"] == []
+
+    def test_delega_atributos_no_instrumentados(self):
+        cliente = ClienteInstrumentado(FakeClient(), RegistroConsultas())
+        assert cliente.auth == "auth-real"
+
+
+def test_percentiles_por_bucket():
+    registro = RegistroConsultas()
+    for ms in [3] * 90 + [40] * 9 + [7000]:
+        registro.registrar("contratos", "select", "select(*)", ms)
+
+    consulta = registro.estadisticas()["consultas"][0]
+    assert (consulta["p50_ms"], consulta["p95_ms"], consulta["p99_ms"]) == (5.0, 50.0, 50.0)
+    assert consulta["histograma"]["+inf"] == 1
+    assert consulta["max_ms"] == 7000
@@ -0,0 +1,88 @@
+"""Snapshots de métricas de dashboards."""
+
+import asyncio
+
+from app.core.config import Config
+from app.database import db_manager
+from app.services.metricas_snapshot import SnapshotMetricas
+from app.tests.presupuesto_queries import backend_en_memoria
+
+
+class FakeCalculo:
+    def __init__(self, fallar_en=()):
+        self.llamadas = 0
+        self.fallar_en = fallar_en
+
+    async def __call__(self):
+        self.llamadas += 1
+        if self.llamadas in self.fallar_en:
+            raise ConnectionError("PGRST timeout")
+        return self.llamadas
+
+
+def test_sirve_snapshot_y_recalcula_al_forzar_o_expirar():
+    async def escenario():
+        calculo = FakeCalculo()
+        snapshot = SnapshotMetricas("prueba", calculo, intervalo_segundos=3600)
+
+        primero, calculado_en = await snapshot.obtener()
+        segundo, _ = await snapshot.obtener()
+        forzado, _ = await snapshot.obtener(forzar=True)
+
+        snapshot.intervalo_segundos = 0
+        vencido, _ = await snapshot.obtener()  # sirve el anterior y recalcula atrás
+        await asyncio.sleep(0)
+        return primero, segundo, forzado, vencido, calculado_en, calculo.llamadas
+
+    primero, segundo, forzado, vencido, calculado_en, llamadas = asyncio.run(escenario())
+    assert (primero, segundo, forzado, vencido) == (1, 1, 2, 2)
+    assert calculado_en is not None
+    assert llamadas == 3
+
+
+def test_escritura_en_tabla_observada_lo_ensucia():
+    async def escenario():
+        calculo = FakeCalculo()
+        snapshot = SnapshotMetricas("prueba", calculo, tablas=("empresas",), intervalo_segundos=3600)
+        await snapshot.obtener()
+
+        cliente = db_manager.get_client()
+        await db_manager.ejecutar_query(cliente.table("sedes").insert({"id": 1}))
+        assert snapshot.vigente
+
+        await db_manager.ejecutar_query(cliente.table("empresas").insert({"id": 1}))
+        assert not snapshot.vigente
+        return await snapshot.refrescar()
+
+    with backend_en_memoria({"empresas": [], "sedes": []}):
+        assert asyncio.run(escenario()) == 2
+
+
+def test_escritura_lo_ensucia_sin_instrumentacion(monkeypatch):
+    monkeypatch.setattr(Config, "DB_INSTRUMENTACION", False)
+
+    async def escenario():
+        snapshot = SnapshotMetricas("prueba", FakeCalculo(), tablas=("empresas",), intervalo_segundos=3600)
+        await snapshot.obtener()
+        cliente = db_manager.get_client()
+        await db_manager.ejecutar_query(cliente.table("empresas").delete().eq("id", 1))
+        return snapshot.vigente
+
+    with backend_en_memoria({"empresas": [{"id": 1}]}):
+        assert asyncio.run(escenario()) is False
+
+
+def test_fallo_al_recalcular_conserva_el_valor_anterior():
+    async def escenario():
+        snapshot = SnapshotMetricas("prueba", FakeCalculo(fallar_en=(2,)), intervalo_segundos=3600)
+        await snapshot.obtener()
+        snapshot.invalidar()
+
+        servido, _ = await snapshot.obtener()  # dispara el recálculo que falla
+        await asyncio.sleep(0)
+        sucio = not snapshot.vigente
+        despues, _ = await snapshot.obtener()
+        await asyncio.sleep(0)
+        return servido, sucio, despues, (await snapshot.obtener())[0]
+
+    assert asyncio.run(escenario()) == (1, True, 1, 3)
@@ -0,0 +1,322 @@
+"""Tests unitarios para el modo lote de `NominaCalculoService.calcular_periodo`."""
+
+import asyncio
+from decimal import Decimal
+
+from app.core.calculations import CalculadoraIMSS, CalculadoraNominaVectorial
+from app.services.nomina_calculo_service import NominaCalculoService, _CLAVES_SISTEMA
+
+
+class FakeResult:
+    """Resultado mínimo compatible con el cliente de Supabase."""
+
+    def __init__(self, data=None):
+        self.data = data or []
+
+
+class FakeQuery:
+    """Builder fake: registra la operación y sus filtros al ejecutarse."""
+
+    def __init__(self, client, table_name: str):
+        self._client = client
+        self._table = table_name
+        self._op = None
+        self._payload = None
+        self._filters = []
+
+    def select(self, *_args, **_kwargs):
+        self._op = "select"
+        return self
+
+    def insert(self, payload):
+        self._op, self._payload = "insert", payload
+        return self
+
+    def upsert(self, payload, **_kwargs):
+        self._op, self._payload = "upsert", payload
+        return self
+
+    def update(self, payload):
+        self._op, self._payload = "update", payload
+        return self
+
+    def delete(self):
+        self._op = "delete"
+        return self
+
+    def eq(self, field, value):
+        self._filters.append(("eq", field, value))
+        return self
+
+    def neq(self, field, value):
+        self._filters.append(("neq", field, value))
+        return self
+
+    def gt(self, field, value):
+        self._filters.append(("gt", field, value))
+        return self
+
+    def in_(self, field, values):
+        self._filters.append(("in", field, list(values)))
+        return self
+
+    def order(self, *_args, **_kwargs):
+        return self
+
+    def range(self, *_args):
+        return self
+
+    def limit(self, *_args):
+        return self
+
+    def execute(self):
+        self._client.calls.append((self._table, self._op, self._payload, self._filters))
+        handler = self._client.handlers.get((self._table, self._op))
+        return FakeResult(handler(self) if handler else [])
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls: list[tuple] = []
+        self.handlers: dict = {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        query = FakeQuery(self, name)
+        query._op, query._payload = "rpc", params
+        return query
+
+
+def _nomina(nomina_id: int, salario: str = "400.00", **extra) -> dict:
+    base = {
+        "id": nomina_id,
+        "periodo_id": 9,
+        "empleado_id": 100 + nomina_id,
+        "empresa_id": 1,
+        "salario_diario": salario,
+        "salario_diario_integrado": salario,
+        "dias_trabajados": 15,
+        "dias_periodo": 15,
+    }
+    base.update(extra)
+    return base
+
+
+def _service(client: FakeClient) -> NominaCalculoService:
+    service = object.__new__(NominaCalculoService)
+    service.supabase = client
+    service.calculadora_imss = CalculadoraIMSS()
+    service.calculadora_vectorial = CalculadoraNominaVectorial()
+    service._concepto_ids = {clave: i for i, clave in enumerate(sorted(_CLAVES_SISTEMA), 1)}
+    return service
+
+
+def _inexistente(_q):
+    error = RuntimeError("Could not find the function")
+    error.code = "PGRST202"
+    raise error
+
+
+def _preparar(client: FakeClient, nominas: list[dict], manuales: list[dict]) -> None:
+    client.handlers[("periodos_nomina", "select")] = lambda q: [
+        {"id": 9, "estatus": "EN_PROCESO_CONTABILIDAD", "periodicidad": "QUINCENAL"}
+    ]
+    client.handlers[("nominas_empleado", "select")] = lambda q: nominas
+    client.handlers[("nomina_movimientos", "select")] = lambda q: manuales
+
+
+class TestCalculoPeriodoLote:
+
+    def test_lote_coincide_con_modo_individual(self):
+        nominas = [
+            _nomina(1),
+            _nomina(2, "250.00", horas_extra_dobles="4", domingos_trabajados=2),
+            _nomina(3, "900.00", dias_faltas=1, dias_trabajados=14),
+        ]
+        manuales = [{"id": 50, "nomina_empleado_id": 2, "tipo": "DEDUCCION", "monto": "120.00", "origen": "RRHH"}]
+
+        lote_client = FakeClient()
+        _preparar(lote_client, nominas, manuales)
+        resumen_lote = asyncio.run(_service(lote_client).calcular_periodo(9))
+
+        individual_client = FakeClient()
+        _preparar(individual_client, nominas, [])
+        individual_client.handlers[("nomina_movimientos", "select")] = lambda q: [
+            m for m in manuales
+            if ("eq", "nomina_empleado_id", m["nomina_empleado_id"]) in q._filters
+        ]
+        resumen_individual = asyncio.run(
+            _service(individual_client).calcular_periodo(9, modo="individual")
+        )
+
+        assert resumen_lote == resumen_individual
+        assert resumen_lote["empleados_calculados"] == 3
+        assert resumen_lote["errores"] == []
+
+    def test_lote_usa_round_trips_constantes(self):
+        nominas = [_nomina(i) for i in range(1, 51)]
+        client = FakeClient()
+        _preparar(client, nominas, [])
+
+        asyncio.run(_service(client).calcular_periodo(9))
+
+        escrituras = [
+            c for c in client.calls
+            if c[0] != "periodos_nomina" and c[1] in ("insert", "delete", "update", "upsert", "rpc")
+        ]
+        assert [c[1] for c in escrituras] == ["rpc"]
+        totales = escrituras[0][2]["p_totales"]
+        assert len(totales) == 50
+        assert {m["nomina_empleado_id"] for m in escrituras[0][2]["p_movimientos"]} == set(range(1, 51))
+        assert totales[0]["estatus"] == "CALCULADO"
+        # Solo totales: no reenvía columnas leídas al inicio del cálculo
+        assert not {"periodo_id", "empleado_id", "empresa_id", "salario_diario"} & set(totales[0])
+
+    def test_sin_funcion_actualiza_fila_por_fila(self):
+        nominas = [_nomina(1), _nomina(2), _nomina(3, "500.00")]
+        client = FakeClient()
+        _preparar(client, nominas, [])
+        client.handlers[("guardar_calculo_nominas", "rpc")] = _inexistente
+
+        resumen = asyncio.run(_service(client).calcular_periodo(9))
+
+        escrituras = [c for c in client.calls if c[1] in ("insert", "delete", "update")]
+        assert [c[1] for c in escrituras[:3]] == ["update", "delete", "insert"]
+        assert escrituras[0][2] == {"huella_calculo": None}
+        updates = [c for c in escrituras[3:] if c[:2] == ("nominas_empleado", "update")]
+        assert [c[3] for c in updates] == [[("eq", "id", i)] for i in (1, 2, 3)]
+        assert all("salario_diario" not in c[2] for c in updates)
+        assert not [c for c in client.calls if c[1] == "upsert"]
+        assert resumen["empleados_calculados"] == 3
+
+    def test_lote_reporta_errores_por_empleado(self):
+        nominas = [_nomina(1), _nomina(2, "0")]
+        client = FakeClient()
+        _preparar(client, nominas, [])
+
+        resumen = asyncio.run(_service(client).calcular_periodo(9))
+
+        assert resumen["empleados_calculados"] == 1
+        assert [e["empleado_id"] for e in resumen["errores"]] == [102]
+        rpc = next(c for c in client.calls if c[1] == "rpc")
+        assert [f["id"] for f in rpc[2]["p_totales"]] == [1]
+
+    def test_error_de_escritura_se_reporta_para_todo_el_bloque(self):
+        nominas = [_nomina(1), _nomina(2)]
+        client = FakeClient()
+        _preparar(client, nominas, [])
+
+        def _falla(_q):
+            raise RuntimeError("timeout")
+
+        client.handlers[("guardar_calculo_nominas", "rpc")] = _falla
+
+        resumen = asyncio.run(_service(client).calcular_periodo(9))
+
+        assert resumen["empleados_calculados"] == 0
+        assert resumen["total_neto"] == float(Decimal("0"))
+        assert sorted(e["empleado_id"] for e in resumen["errores"]) == [101, 102]
+
+
+class TestCalculoPeriodoIncremental:
+
+    @staticmethod
+    def _persistir_totales(client: FakeClient, nominas: list[dict]) -> None:
+        """Simula la BD: aplica los totales sobre las filas leídas."""
+        por_id = {n["id"]: n for n in nominas}
+
+        def _actualizar(q):
+            for fila in q._payload["p_totales"]:
+                por_id[fila["id"]].update(fila)
+            return [{"id": fila["id"]} for fila in q._payload["p_totales"]]
+
+        client.handlers[("guardar_calculo_nominas", "rpc")] = _actualizar
+
+    def test_segunda_corrida_sin_cambios_no_escribe(self):
+        nominas = [_nomina(i) for i in range(1, 6)]
+        client = FakeClient()
+        _preparar(client, nominas, [])
+        self._persistir_totales(client, nominas)
+        service = _service(client)
+
+        primero = asyncio.run(service.calcular_periodo(9, modo="incremental"))
+        client.calls.clear()
+        segundo = asyncio.run(service.calcular_periodo(9, modo="incremental"))
+
+        assert primero["empleados_sin_cambios"] == 0
+        assert segundo["empleados_sin_cambios"] == 5
+        assert not [
+            c for c in client.calls
+            if c[0] != "periodos_nomina" and c[1] in ("insert", "delete", "update", "rpc")
+        ]
+        assert {k: segundo[k] for k in ("empleados_calculados", "total_neto")} == {
+            k: primero[k] for k in ("empleados_calculados", "total_neto")
+        }
+
+    def test_solo_recalcula_nominas_con_entradas_modificadas(self):
+        nominas = [_nomina(i) for i in range(1, 6)]
+        manuales: list[dict] = []
+        client = FakeClient()
+        _preparar(client, nominas, manuales)
+        self._persistir_totales(client, nominas)
+        service = _service(client)
+        asyncio.run(service.calcular_periodo(9, modo="incremental"))
+
+        nominas[1]["horas_extra_dobles"] = "3"
+        manuales.append({"id": 7, "nomina_empleado_id": 4, "tipo": "DEDUCCION",
+                         "monto": "50.00", "origen": "RRHH"})
+        client.calls.clear()
+        incremental = asyncio.run(service.calcular_periodo(9, modo="incremental"))
+
+        rpc = next(c for c in client.calls if c[1] == "rpc")
+        assert sorted(f["id"] for f in rpc[2]["p_totales"]) == [2, 4]
+        assert incremental["empleados_sin_cambios"] == 3
+
+        completo = asyncio.run(_service(client).calcular_periodo(9))
+        for campo in ("empleados_calculados", "total_percepciones",
+                      "total_deducciones", "total_neto"):
+            assert incremental[campo] == completo[campo]
+
+    def test_bloque_a_medias_sin_funcion_se_recalcula(self):
+        nominas = [_nomina(i) for i in range(1, 4)]
+        client = FakeClient()
+        _preparar(client, nominas, [])
+        self._persistir_totales(client, nominas)
+        service = _service(client)
+        asyncio.run(service.calcular_periodo(9, modo="incremental"))
+
+        # Sin la función, el INSERT falla después del DELETE
+        por_id = {n["id"]: n for n in nominas}
+
+        def _actualizar(q):
+            ids = next(
+                v if op == "in" else [v] for op, campo, v in q._filters if campo == "id"
+            )
+            for nomina_id in ids:
+                por_id[nomina_id].update(q._payload)
+            return [{"id": i} for i in ids]
+
+        def _falla(_q):
+            raise RuntimeError("timeout")
+
+        client.handlers[("guardar_calculo_nominas", "rpc")] = _inexistente
+        client.handlers[("nominas_empleado", "update")] = _actualizar
+        client.handlers[("nomina_movimientos", "insert")] = _falla
+        nominas[0]["horas_extra_dobles"] = "2"
+        fallido = asyncio.run(service.calcular_periodo(9, modo="incremental"))
+        huella_tras_fallo = nominas[0]["huella_calculo"]
+
+        # Las entradas vuelven a como estaban: sin la huella borrada, la
+        # nómina se daría por vigente aunque perdió sus movimientos SISTEMA
+        nominas[0]["horas_extra_dobles"] = None
+        self._persistir_totales(client, nominas)
+        client.calls.clear()
+        siguiente = asyncio.run(service.calcular_periodo(9, modo="incremental"))
+
+        assert [e["empleado_id"] for e in fallido["errores"]] == [101]
+        assert huella_tras_fallo is None
+        rpc = next(c for c in client.calls if c[1] == "rpc")
+        assert [f["id"] for f in rpc[2]["p_totales"]] == [1]
+        assert siguiente["empleados_sin_cambios"] == 2
@@ -0,0 +1,374 @@
+"""
+Presupuestos de queries de los flujos críticos (detector de N+1).
+
+Cada test corre el servicio real contra `SupabaseEnMemoria` y falla si
+el número de queries excede el presupuesto o si una misma forma de query
+se repite por fila. Los presupuestos marcados `xfail(strict=True)` son
+fan-outs conocidos: al corregirlos el test pasa y hay que quitar la marca.
+"""
+
+import asyncio
+
+import pytest
+
+from app.database import db_manager
+from app.database.instrumentacion import RegistroConsultas
+from app.tests.presupuesto_queries import backend_en_memoria, presupuesto_queries
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestPresupuestoQueries:
+
+    def test_dentro_del_presupuesto_no_falla(self):
+        with backend_en_memoria({"plazas": [{"id": 1}, {"id": 2}]}):
+            db = db_manager.get_client()
+            with presupuesto_queries(max=1) as conteo:
+                db.table("plazas").select("*").in_("id", [1, 2]).execute()
+
+        assert conteo.total == 1
+        assert conteo.por_tabla() == {"plazas": 1}
+
+    def test_excede_maximo(self):
+        with backend_en_memoria({"plazas": []}):
+            db = db_manager.get_client()
+            with pytest.raises(AssertionError, match=r"2 queries \(presupuesto: 1\)"):
+                with presupuesto_queries(max=1):
+                    db.table("plazas").select("*").execute()
+                    db.table("plazas").select("id").execute()
+
+    def test_misma_forma_por_fila_se_reporta_como_n_mas_1(self):
+        def _cargar_por_id(db):
+            for plaza_id in range(1, 6):
+                db.table("plazas").select("*").eq("id", plaza_id).execute()
+
+        with backend_en_memoria({"plazas": [{"id": i} for i in range(1, 6)]}):
+            with pytest.raises(AssertionError) as error:
+                with presupuesto_queries(max=10):
+                    _cargar_por_id(db_manager.get_client())
+
+        mensaje = str(error.value)
+        assert "N+1 probable: 5x select plazas [select(*) eq(id)]" in mensaje
+        assert "_cargar_por_id" in mensaje
+
+    def test_registro_no_acumula_fuera_del_bloque(self):
+        registro = RegistroConsultas()
+        with presupuesto_queries(max=0, registro=registro):
+            pass
+        assert not registro.observado
+
+
+# =============================================================================
+# FLUJOS CRÍTICOS
+# =============================================================================
+
+def _empresa() -> dict:
+    return {
+        "id": 1, "nombre_comercial": "LIMPIEZA DEL SUR", "razon_social": "LIMPIEZA DEL SUR SA DE CV",
+        "tipo_empresa": "NOMINA", "rfc": "LSU010101AB1", "estatus": "ACTIVO",
+    }
+
+
+def _contratos(n: int) -> list:
+    return [
+        {
+            "id": i, "empresa_id": 1, "codigo": f"BUAP-{i:03d}", "tipo_contrato": "SERVICIOS",
+            "fecha_inicio": "2026-01-01", "fecha_fin": "2026-12-31", "estatus": "ACTIVO",
+            "descripcion_objeto": "Limpieza", "tiene_personal": True,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def test_historial_listado():
+    tablas = {
+        "empresas": [_empresa()],
+        "empleados": [
+            {"id": i, "clave": f"B26-{i:05d}", "nombre": "ANA", "apellido_paterno": "RUIZ", "empresa_id": 1}
+            for i in range(1, 21)
+        ],
+        "categorias_puesto": [{"id": 1, "nombre": "JARDINERO"}],
+        "contratos": _contratos(1),
+        "contrato_categorias": [{"id": 1, "contrato_id": 1, "categoria_puesto_id": 1}],
+        "plazas": [{"id": i, "contrato_categoria_id": 1, "numero_plaza": i} for i in range(1, 11)],
+        "historial_laboral": [
+            {
+                "id": i, "empleado_id": i % 20 + 1, "plaza_id": i % 10 + 1,
+                "tipo_movimiento": "ASIGNACION", "fecha_inicio": f"2026-01-{i % 28 + 1:02d}",
+            }
+            for i in range(1, 51)
+        ],
+    }
+    from app.services.historial_laboral_service import historial_laboral_service
+
+    with backend_en_memoria(tablas):
+        with presupuesto_queries(max=2):
+            registros = _run(historial_laboral_service.obtener_todos(limite=50))
+
+    assert len(registros) == 50
+    assert {r.categoria_nombre for r in registros} == {"JARDINERO"}
+
+
+def test_nomina_calculo_periodo_lote():
+    from app.services.nomina_calculo_service import NominaCalculoService, _CLAVES_SISTEMA
+
+    tablas = {
+        "periodos_nomina": [{"id": 9, "estatus": "EN_PROCESO_CONTABILIDAD", "periodicidad": "QUINCENAL"}],
+        "conceptos_nomina": [
+            {"id": i, "clave": clave} for i, clave in enumerate(sorted(_CLAVES_SISTEMA), 1)
+        ],
+        "nominas_empleado": [
+            {
+                "id": i, "periodo_id": 9, "empleado_id": 100 + i, "empresa_id": 1,
+                "salario_diario": "400.00", "salario_diario_integrado": "400.00",
+                "dias_trabajados": 15, "dias_periodo": 15,
+            }
+            for i in range(1, 41)
+        ],
+        "nomina_movimientos": [
+            {"id": 1, "nomina_empleado_id": 2, "tipo": "DEDUCCION", "monto": "120.00", "origen": "RRHH"},
+        ],
+    }
+
+    rpcs = {"guardar_calculo_nominas": _guardar_calculo_nominas}
+    with backend_en_memoria(tablas, rpcs=rpcs) as db:
+        with presupuesto_queries(max=8, max_repetidas=1):
+            resumen = _run(NominaCalculoService().calcular_periodo(9))
+        nominas = db.tablas["nominas_empleado"]
+        movimientos = db.tablas["nomina_movimientos"]
+
+    assert resumen["empleados_calculados"] == 40
+    assert resumen["errores"] == []
+    assert all(n["estatus"] == "CALCULADO" for n in nominas)
+    assert {m["nomina_empleado_id"] for m in movimientos if m["origen"] == "SISTEMA"} == set(range(1, 41))
+
+
+def _guardar_calculo_nominas(db, p_totales, p_movimientos):
+    """Equivalente en memoria de `public.guardar_calculo_nominas` (053)."""
+    ids = {fila["id"] for fila in p_totales}
+    movimientos = [
+        m for m in db.tablas["nomina_movimientos"]
+        if not (m["nomina_empleado_id"] in ids and m["origen"] == "SISTEMA" and m.get("es_automatico"))
+    ]
+    siguiente = max((m["id"] for m in movimientos), default=0) + 1
+    for i, movimiento in enumerate(p_movimientos):
+        movimientos.append({"id": siguiente + i, **movimiento})
+    db.tablas["nomina_movimientos"] = movimientos
+
+    por_id = {n["id"]: n for n in db.tablas["nominas_empleado"]}
+    actualizadas = []
+    for fila in p_totales:
+        nomina = por_id.get(fila["id"])
+        if nomina is not None:
+            nomina.update({k: v for k, v in fila.items() if k != "id"})
+            actualizadas.append({"id": fila["id"]})
+    return actualizadas
+
+
+def _totales_plazas_por_contrato(db, p_contrato_ids):
+    """Equivalente en memoria de `public.totales_plazas_por_contrato` (051)."""
+    contrato_de = {cc["id"]: cc["contrato_id"] for cc in db.tablas["contrato_categorias"]}
+    grupos = {}
+    for plaza in db.tablas["plazas"]:
+        contrato_id = contrato_de[plaza["contrato_categoria_id"]]
+        if p_contrato_ids is None or contrato_id in p_contrato_ids:
+            grupo = grupos.setdefault((contrato_id, plaza["estatus"]), [0, 0])
+            grupo[0] += 1
+            grupo[1] += float(plaza["salario_mensual"])
+    return [
+        {"contrato_id": c, "estatus": e, "total": t, "salario_total": s}
+        for (c, e), (t, s) in grupos.items()
+    ]
+
+
+def test_dashboard_metricas():
+    from app.services.dashboard_service import dashboard_service
+
+    tablas = {
+        "contratos": _contratos(6),
+        "contrato_categorias": [
+            {"id": i, "contrato_id": i, "categoria_puesto_id": 1, "cantidad_minima": 1, "cantidad_maxima": 2}
+            for i in range(1, 7)
+        ],
+        "plazas": [
+            {
+                "id": i, "contrato_categoria_id": i, "numero_plaza": 1, "codigo": f"P{i}",
+                "fecha_inicio": "2026-01-01", "salario_mensual": "9000", "estatus": "OCUPADA" if i % 2 else "VACANTE",
+            }
+            for i in range(1, 7)
+        ],
+    }
+
+    rpcs = {"totales_plazas_por_contrato": _totales_plazas_por_contrato}
+    with backend_en_memoria(tablas, rpcs=rpcs):
+        with presupuesto_queries(max=6, por_tabla={"plazas": 0}):
+            metricas = _run(dashboard_service.calcular_metricas())
+
+    assert (metricas.plazas_ocupadas, metricas.plazas_vacantes) == (3, 3)
+
+
+def test_alta_masiva_validacion():
+    from app.services.alta_masiva_service import alta_masiva_service
+
+    filas = ["curp,nombre,apellido_paterno"] + [
+        f"PEGA9001{i:02d}HPLRRN0{i % 10},ANA,PEREZ" for i in range(1, 21)
+    ]
+    tablas = {
+        "empresas": [_empresa()],
+        "empleados": [
+            {
+                "id": 1, "clave": "B26-00001", "curp": "PEGA900101HPLRRN01", "nombre": "ANA",
+                "apellido_paterno": "PEREZ", "empresa_id": 1, "estatus": "INACTIVO",
+            },
+        ],
+    }
+
+    with backend_en_memoria(tablas):
+        with presupuesto_queries(max=3):
+            resultado = _run(
+                alta_masiva_service.validar_archivo("\n".join(filas).encode(), "alta.csv", 1)
+            )
+
+    assert (len(resultado.validos), len(resultado.reingresos)) == (19, 1)
+
+
+def test_alta_masiva_validacion_por_lotes_detecta_curp_repetido_entre_lotes():
+    from app.services.alta_masiva_service import AltaMasivaService
+
+    curps = [f"PEGA9001{i:02d}HPLRRN0{i % 10}" for i in range(1, 6)]
+    filas = ["curp,nombre,apellido_paterno"] + [f"{curp},ANA,PEREZ" for curp in curps + curps[:1]]
+
+    with backend_en_memoria({"empresas": [_empresa()]}):
+        # Una consulta de empresa y una de CURPs por cada lote de 2 filas
+        with presupuesto_queries(max=4, max_repetidas=3):
+            resultado = _run(
+                AltaMasivaService(tamano_lote=2).validar_archivo("\n".join(filas).encode(), "alta.csv", 1)
+            )
+
+    assert resultado.total_filas == 6
+    assert [r.fila for r in resultado.validos] == [2, 3, 4, 5, 6]
+    assert [(r.fila, r.errores) for r in resultado.errores] == [
+        (7, [f"CURP {curps[0]} duplicado en el archivo"])
+    ]
+
+
+def test_alta_masiva_validacion_empresa_inexistente_reporta_total_de_filas():
+    from app.services.alta_masiva_service import AltaMasivaService
+
+    filas = ["curp,nombre,apellido_paterno"] + [
+        f"PEGA9001{i:02d}HPLRRN0{i % 10},ANA,PEREZ" for i in range(1, 6)
+    ]
+
+    with backend_en_memoria({"empresas": [_empresa()]}):
+        resultado = _run(
+            AltaMasivaService(tamano_lote=2).validar_archivo("\n".join(filas).encode(), "alta.csv", 99)
+        )
+
+    assert resultado.total_filas == 5
+    assert [r.mensaje for r in resultado.errores] == ["Empresa con ID 99 no encontrada"]
+    assert (resultado.validos, resultado.reingresos) == ([], [])
+
+
+def test_alta_masiva_procesamiento():
+    from app.entities.alta_masiva import RegistroValidado, ResultadoFila, ResultadoValidacion
+    from app.services.alta_masiva_service import alta_masiva_service
+
+    # Más filas de las que caben en un lote de escritura
+    curps = [
+        f"PE{letras}90{mes:02d}{dia:02d}HPLRRN0{dia % 10}"
+        for letras in ("GA", "RA") for mes in range(1, 13) for dia in range(1, 26)
+    ]
+    validacion = ResultadoValidacion(
+        validos=[
+            RegistroValidado(
+                fila=i + 2, resultado=ResultadoFila.VALIDO, curp=curp,
+                datos={"curp": curp, "nombre": "ANA", "apellido_paterno": "PEREZ"},
+            )
+            for i, curp in enumerate(curps[1:])
+        ],
+        reingresos=[
+            RegistroValidado(
+                fila=601, resultado=ResultadoFila.REINGRESO, curp=curps[0],
+                datos={"telefono": "2221234567"}, empleado_existente_id=1,
+            ),
+        ],
+    )
+    tablas = {
+        "empresas": [_empresa(), {**_empresa(), "id": 2, "rfc": "LSU010101AB2"}],
+        "empleados": [
+            {
+                "id": 1, "clave": "B26-00001", "curp": curps[0], "nombre": "ANA",
+                "apellido_paterno": "PEREZ", "empresa_id": 2, "estatus": "ACTIVO",
+            },
+        ],
+        "historial_laboral": [
+            {"id": 1, "empleado_id": 1, "tipo_movimiento": "ALTA", "fecha_inicio": "2026-01-01"},
+        ],
+    }
+
+    with backend_en_memoria(tablas, unicos={"empleados": [("curp",), ("clave",)]}) as db:
+        # Las formas repetidas son lotes (CURPs de 200 en 200, INSERTs de 500)
+        with presupuesto_queries(max=16, max_repetidas=3):
+            resultado = _run(alta_masiva_service.procesar(validacion, 1))
+        historial = db.tablas["historial_laboral"]
+
+    assert (resultado.creados, resultado.reingresados, resultado.errores) == (599, 1, 0)
+    assert len({d.clave for d in resultado.detalles}) == 600
+    assert len(historial) == 601 and historial[0]["fecha_fin"] is not None
+
+
+async def _cargar_detalle_cotizacion(codigo: str, empresa_id: int) -> None:
+    """Mismas llamadas que `CotizadorDetalleState` al abrir una cotización."""
+    from app.services import categoria_puesto_service, cotizacion_service
+
+    cotizacion, _ = await asyncio.gather(
+        cotizacion_service.obtener_por_codigo(codigo, empresa_id=empresa_id),
+        categoria_puesto_service.obtener_todas(),
+    )
+    partidas = await cotizacion_service.obtener_partidas(cotizacion.id, empresa_id=empresa_id)
+    partida_id = partidas[0].id
+    await asyncio.gather(
+        cotizacion_service.obtener_categorias_partida(partida_id, empresa_id=empresa_id),
+        cotizacion_service.obtener_conceptos_partida(partida_id, empresa_id=empresa_id),
+        cotizacion_service.obtener_valores_partida(partida_id, empresa_id=empresa_id),
+        cotizacion_service.recalcular_totales_partida(partida_id, empresa_id=empresa_id),
+        cotizacion_service.obtener_items(cotizacion.id, partida_id=partida_id, empresa_id=empresa_id),
+    )
+    await cotizacion_service.obtener_items(cotizacion.id, empresa_id=empresa_id)
+    await cotizacion_service.recalcular_totales_cotizacion(cotizacion.id, empresa_id=empresa_id)
+
+
+@pytest.mark.xfail(
+    strict=True,
+    raises=AssertionError,
+    reason="obtener_partidas calcula totales por partida y cada método re-consulta la cotización",
+)
+def test_cotizacion_carga_detalle():
+    tablas = {
+        "cotizaciones": [{"id": 1, "codigo": "COT-MAN-26001", "empresa_id": 1}],
+        "categorias_puesto": [
+            {"id": 1, "clave": "JAR", "nombre": "JARDINERO", "tipo_servicio_id": 1, "estatus": "ACTIVO"},
+            {"id": 2, "clave": "LIM", "nombre": "LIMPIEZA", "tipo_servicio_id": 1, "estatus": "ACTIVO"},
+        ],
+        "cotizacion_partidas": [{"id": i, "cotizacion_id": 1, "numero_partida": i} for i in (1, 2, 3)],
+        "cotizacion_partida_categorias": [
+            {
+                "id": i, "partida_id": 1, "categoria_puesto_id": i, "cantidad_minima": 1, "cantidad_maxima": 3,
+                "salario_base_mensual": "9000", "costo_patronal_calculado": "2000",
+            }
+            for i in (1, 2)
+        ],
+        "cotizacion_conceptos": [
+            {"id": i, "partida_id": 1, "nombre": f"CONCEPTO {i}", "orden": i} for i in (1, 2)
+        ],
+        "cotizacion_concepto_valores": [
+            {"id": i, "concepto_id": 1 + i % 2, "partida_categoria_id": 1 + i // 2, "valor_pesos": "100"}
+            for i in range(4)
+        ],
+    }
+
+    with backend_en_memoria(tablas):
+        with presupuesto_queries(max=15):
+            _run(_cargar_detalle_cotizacion("COT-MAN-26001", empresa_id=1))
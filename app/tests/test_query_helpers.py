@@ -3,6 +3,10 @@
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 
+import pytest
+
+from app.core.exceptions import ValidationError
+
 
 _MODULE_PATH = Path(__file__).resolve().parents[1] / "repositories" / "shared" / "query_helpers.py"
 _SPEC = spec_from_file_location("test_query_helpers_module", _MODULE_PATH)
@@ -15,6 +19,10 @@ apply_eq_filters = _MOD.apply_eq_filters
 apply_order = _MOD.apply_order
 apply_pagination = _MOD.apply_pagination
 build_ilike_or = _MOD.build_ilike_or
+apply_keyset = _MOD.apply_keyset
+cerrar_pagina = _MOD.cerrar_pagina
+decode_cursor = _MOD.decode_cursor
+encode_cursor = _MOD.encode_cursor
 
 
 class FakeQuery:
@@ -43,6 +51,18 @@ class FakeQuery:
         self.calls.append(("range", start, end))
         return self
 
+    def filter(self, field, op, value):
+        self.calls.append(("filter", field, op, value))
+        return self
+
+    def or_(self, expr):
+        self.calls.append(("or", expr))
+        return self
+
+    def limit(self, n):
+        self.calls.append(("limit", n))
+        return self
+
 
 class TestQueryHelpers:
     """Tests para query_helpers."""
@@ -91,3 +111,59 @@ class TestQueryHelpers:
     def test_build_ilike_or_omite_campos_vacios(self):
         value = build_ilike_or("abc", ["nombre", ""])
         assert value == "nombre.ilike.%abc%"
+
+
+class TestPaginacionKeyset:
+    """Tests para cursores y apply_keyset."""
+
+    def test_cursor_roundtrip(self):
+        cursor = encode_cursor("apellido_paterno", "López", 42)
+        assert decode_cursor(cursor, "apellido_paterno") == ("López", 42)
+
+    def test_cursor_de_otro_orden_es_invalido(self):
+        cursor = encode_cursor("fecha_creacion", "2026-01-01", 7)
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor, "apellido_paterno")
+
+    def test_cursor_corrupto_es_invalido(self):
+        with pytest.raises(ValidationError):
+            decode_cursor("no-es-un-cursor", "id")
+
+    def test_apply_keyset_primera_pagina(self):
+        query = FakeQuery()
+        apply_keyset(query, None, 50, "numero_plaza")
+        assert query.calls == [
+            ("order", "numero_plaza", False),
+            ("order", "id", False),
+            ("limit", 51),
+        ]
+
+    def test_apply_keyset_con_cursor_compuesto_desc(self):
+        query = FakeQuery()
+        cursor = encode_cursor("fecha_creacion", "2026-03-01T10:00:00", 9)
+        apply_keyset(query, cursor, 20, "fecha_creacion", desc=True)
+        assert query.calls[0] == (
+            "or",
+            'fecha_creacion.lt."2026-03-01T10:00:00",'
+            'and(fecha_creacion.eq."2026-03-01T10:00:00",id.lt.9)',
+        )
+        assert query.calls[1:] == [
+            ("order", "fecha_creacion", True),
+            ("order", "id", True),
+            ("limit", 21),
+        ]
+
+    def test_apply_keyset_por_id_usa_filtro_simple(self):
+        query = FakeQuery()
+        apply_keyset(query, encode_cursor("id", 15, 15), 10)
+        assert query.calls == [("filter", "id", "gt", 15), ("order", "id", False), ("limit", 11)]
+
+    def test_cerrar_pagina_recorta_y_genera_cursor(self):
+        filas = [{"id": i, "numero_plaza": i * 10} for i in range(1, 5)]
+        items, cursor = cerrar_pagina(filas, 3, "numero_plaza")
+        assert [f["id"] for f in items] == [1, 2, 3]
+        assert decode_cursor(cursor, "numero_plaza") == (30, 3)
+
+    def test_cerrar_pagina_ultima_sin_cursor(self):
+        filas = [{"id": 1}, {"id": 2}]
+        assert cerrar_pagina(filas, 2) == (filas, None)
@@ -0,0 +1,122 @@
+"""Tests unitarios para la iteración paginada por keyset (`iterar`)."""
+
+import asyncio
+
+from app.repositories.base_repository import BaseRepository
+from app.repositories.shared.query_helpers import iterar
+
+
+class FakeResult:
+    def __init__(self, data=None):
+        self.data = data or []
+
+
+class FakeQuery:
+    """Builder fake que aplica eq/gt/order/limit sobre filas en memoria."""
+
+    def __init__(self, client, rows):
+        self._client = client
+        self._rows = rows
+        self._limit = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, field, value):
+        self._rows = [r for r in self._rows if r[field] == value]
+        return self
+
+    def gt(self, field, value):
+        self._rows = [r for r in self._rows if r[field] > value]
+        return self
+
+    def order(self, field, desc=False):
+        self._rows = sorted(self._rows, key=lambda r: r[field], reverse=desc)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        self._client.ejecuciones += 1
+        return FakeResult(self._rows[:self._limit])
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.ejecuciones = 0
+
+    def table(self, _name):
+        return FakeQuery(self, list(self.rows))
+
+
+async def _ejecutar_inline(builder):
+    return builder.execute()
+
+
+def _recolectar(gen) -> list:
+    async def _run():
+        return [pagina async for pagina in gen]
+    return asyncio.run(_run())
+
+
+class _Entidad:
+    def __init__(self, **data):
+        self.__dict__.update(data)
+
+
+class _Repo(BaseRepository[_Entidad]):
+    tabla = "demo"
+    entidad_class = _Entidad
+
+
+class _Manager:
+    def __init__(self, client):
+        self._client = client
+
+    def get_client(self):
+        return self._client
+
+    async def ejecutar(self, fn):
+        return fn()
+
+
+class TestIterar:
+
+    def test_recorre_todas_las_filas_en_paginas(self):
+        client = FakeClient([{"id": i, "grupo": i % 2} for i in range(2500, 0, -1)])
+
+        paginas = _recolectar(iterar(
+            lambda: client.table("demo").select("id, grupo").eq("grupo", 0),
+            500,
+            ejecutar=_ejecutar_inline,
+        ))
+
+        ids = [fila["id"] for pagina in paginas for fila in pagina]
+        assert ids == list(range(2, 2501, 2))
+        assert [len(p) for p in paginas] == [500, 500, 250]
+        assert client.ejecuciones == 3
+
+    def test_pagina_exacta_hace_una_consulta_final_vacia(self):
+        client = FakeClient([{"id": i} for i in range(1, 11)])
+
+        paginas = _recolectar(iterar(
+            lambda: client.table("demo").select("id"), 5, ejecutar=_ejecutar_inline,
+        ))
+
+        assert [len(p) for p in paginas] == [5, 5]
+        assert client.ejecuciones == 3
+
+    def test_repositorio_itera_entidades_con_filtros(self):
+        client = FakeClient([
+            {"id": i, "estatus": "ACTIVO" if i % 3 else "INACTIVO"} for i in range(1, 31)
+        ])
+        repo = _Repo(db=_Manager(client))
+
+        paginas = _recolectar(repo.iterar(filtros={"estatus": "ACTIVO"}, page_size=8))
+
+        entidades = [e for pagina in paginas for e in pagina]
+        assert len(entidades) == 20
+        assert all(isinstance(e, _Entidad) and e.estatus == "ACTIVO" for e in entidades)
@@ -0,0 +1,59 @@
+"""Tests unitarios para el sustituto en memoria del cliente de Supabase."""
+
+import pytest
+from storage3.exceptions import StorageApiError
+
+from app.database.memoria import SupabaseEnMemoria
+
+
+class TestSupabaseEnMemoria:
+
+    def test_embebidos_conteo_y_filtros(self):
+        db = SupabaseEnMemoria({
+            "empresas": [{"id": 1, "nombre_comercial": "ACME"}],
+            "empleados": [
+                {"id": i, "empresa_id": 1, "nombre": n, "estatus": e}
+                for i, (n, e) in enumerate([("ANA", "ACTIVO"), ("LUIS", "BAJA"), ("ANDREA", "ACTIVO")], 1)
+            ],
+        })
+
+        result = db.table("empleados")\
+            .select("id, nombre, empresas(nombre_comercial)", count="exact")\
+            .or_("nombre.ilike.an%,estatus.eq.BAJA")\
+            .neq("id", 3)\
+            .order("nombre", desc=True)\
+            .execute()
+
+        assert result.count == 2
+        assert result.data == [
+            {"id": 2, "nombre": "LUIS", "empresas": {"nombre_comercial": "ACME"}},
+            {"id": 1, "nombre": "ANA", "empresas": {"nombre_comercial": "ACME"}},
+        ]
+
+    def test_storage_upload_upsert_y_url_firmada(self):
+        bucket = SupabaseEnMemoria().storage.from_("archivos")
+
+        bucket.upload("layouts/a.csv", b"v1", {"content-type": "text/csv"})
+        with pytest.raises(StorageApiError):
+            bucket.upload("layouts/a.csv", b"v2")
+        bucket.upload("layouts/a.csv", b"v3", {"upsert": "true"})
+
+        assert bucket.download("layouts/a.csv") == b"v3"
+        assert "archivos/layouts/a.csv" in bucket.create_signed_url("layouts/a.csv", 60)["signedURL"]
+        with pytest.raises(StorageApiError):
+            bucket.create_signed_url("layouts/b.csv", 60)
+
+    def test_latencia_por_llamada(self):
+        vistas = []
+
+        def _latencia(tabla, operacion):
+            vistas.append((tabla, operacion))
+            return 0
+
+        db = SupabaseEnMemoria(latencia_ms=_latencia)
+        db.table("plazas").insert({"numero_plaza": 1}).execute()
+        db.table("plazas").select("*").execute()
+        db.storage.from_("archivos").upload("x.txt", b"x")
+
+        assert vistas == [("plazas", "insert"), ("plazas", "select"), ("storage:archivos", "upload")]
+        assert db.llamadas == 3
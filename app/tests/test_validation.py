@@ -20,8 +20,12 @@ from app.core.validation import (
     CAMPO_EMAIL,
     CAMPO_TELEFONO,
     CAMPO_NOMBRE_COMERCIAL,
+    crear_validador,
     pydantic_field,
     campo_validador,
+    validador_para,
+    validar_curp_empleado,
+    validar_lote,
 )
 
 
@@ -456,3 +460,34 @@ class TestIntegracionCompleta:
         # RFC inválido debe fallar
         with pytest.raises(ValidationError):
             EmpleadoTest(rfc="INVALIDO")
+
+
+class TestValidarLote:
+    """Tests para el registro precompilado y validar_lote."""
+
+    def test_catalogo_se_compila_una_sola_vez(self):
+        """crear_validador regresa el validador registrado del catálogo."""
+        assert crear_validador(CAMPO_RFC) is validador_para(CAMPO_RFC)
+        assert crear_validador(CAMPO_RFC)("xaxx010101ab1") == ""
+
+    def test_errores_por_fila_en_orden_de_columnas(self):
+        """Cada fila conserva sus errores en el orden de los campos."""
+        registros = [
+            {"curp": "PEGA900101HPLRRN01", "rfc": "XAXX010101AB1", "email": "a@b.mx"},
+            {"curp": "ABC", "rfc": "INVALIDO", "email": "sin-arroba"},
+            {},
+        ]
+
+        errores = validar_lote(registros, {
+            "curp": validar_curp_empleado,
+            "rfc": CAMPO_RFC,
+            "email": CAMPO_EMAIL,
+        })
+
+        assert errores[0] == []
+        assert errores[1] == [
+            validar_curp_empleado("ABC"),
+            crear_validador(CAMPO_RFC)("INVALIDO"),
+            crear_validador(CAMPO_EMAIL)("sin-arroba"),
+        ]
+        assert errores[2] == ["CURP es obligatorio", "RFC es obligatorio"]
@@ -0,0 +1,15 @@
+-- =============================================================================
+-- Migration 048: Huella de cálculo en nominas_empleado
+-- =============================================================================
+-- Descripcion: Agrega la columna huella_calculo (SHA-256 de las entradas del
+--              último cálculo). NominaCalculoService.calcular_periodo en modo
+--              'incremental' omite las nóminas cuya huella no cambió.
+-- Dependencias: 043_create_modulo_nominas_operacion
+-- Idempotente: Sí (IF NOT EXISTS)
+-- =============================================================================
+
+ALTER TABLE public.nominas_empleado
+    ADD COLUMN IF NOT EXISTS huella_calculo VARCHAR(64);
+
+COMMENT ON COLUMN public.nominas_empleado.huella_calculo IS
+    'Huella de salario, asistencia, catálogos y movimientos manuales usados en el último cálculo. NULL = nunca calculado.';
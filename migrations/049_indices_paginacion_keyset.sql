@@ -0,0 +1,26 @@
+-- =============================================================================
+-- Migration 049: Índices compuestos para paginación por cursor (keyset)
+-- =============================================================================
+-- Descripcion: Los listados paginados con apply_keyset ordenan por
+--              (columna_orden, id) y filtran con "columna > v OR
+--              (columna = v AND id > ultimo_id)". Estos índices permiten que
+--              cada página sea un index range scan en vez de OFFSET.
+-- Dependencias: tablas empleados, plazas, empresas
+-- Idempotente: Sí (IF NOT EXISTS)
+-- =============================================================================
+
+-- Empleados de una empresa ordenados por apellido paterno
+CREATE INDEX IF NOT EXISTS idx_empleados_keyset_empresa_apellido
+    ON public.empleados (empresa_id, apellido_paterno, id);
+
+-- Empleados (sin filtro de empresa) ordenados por fecha de creación descendente
+CREATE INDEX IF NOT EXISTS idx_empleados_keyset_fecha_creacion
+    ON public.empleados (fecha_creacion DESC, id DESC);
+
+-- Plazas de una categoría de contrato ordenadas por número de plaza
+CREATE INDEX IF NOT EXISTS idx_plazas_keyset_categoria_numero
+    ON public.plazas (contrato_categoria_id, numero_plaza, id);
+
+-- Empresas ordenadas por fecha de creación descendente
+CREATE INDEX IF NOT EXISTS idx_empresas_keyset_fecha_creacion
+    ON public.empresas (fecha_creacion DESC, id DESC);
@@ -0,0 +1,107 @@
+-- =============================================================================
+-- Migration 050: Búsqueda de empleados con trigramas y ranking
+-- =============================================================================
+-- Descripcion: EmpleadoRepository.buscar hacía un OR de cinco
+--              "ilike '%texto%'" que obliga a un seq scan y regresa los
+--              resultados sin orden de relevancia. Se agrega una columna
+--              generada `busqueda` (nombre, apellidos, CURP, RFC y clave en
+--              minúsculas, sin acentos ni puntuación) con índice GIN de
+--              trigramas y la función buscar_empleados_rankeado, usada por
+--              SupabaseEmpleadoRepository.buscar_rankeado.
+--              La normalización debe coincidir con normalizar_busqueda()
+--              de app/repositories/shared/query_helpers.py.
+-- Dependencias: tabla empleados, extensiones pg_trgm y unaccent
+-- Idempotente: Sí (IF NOT EXISTS / CREATE OR REPLACE)
+-- =============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() es STABLE (depende del diccionario); fijar el diccionario
+-- permite declararla IMMUTABLE para usarla en columnas generadas e índices.
+CREATE OR REPLACE FUNCTION public.normalizar_busqueda(texto TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT btrim(regexp_replace(
+        lower(public.unaccent('public.unaccent'::regdictionary, coalesce(texto, ''))),
+        '[^a-z0-9]+', ' ', 'g'
+    ));
+$$;
+
+COMMENT ON FUNCTION public.normalizar_busqueda(TEXT) IS
+    'Minúsculas, sin acentos y con la puntuación colapsada a un espacio';
+
+-- =============================================================================
+-- 1. Columna de búsqueda e índices
+-- =============================================================================
+
+ALTER TABLE public.empleados
+    ADD COLUMN IF NOT EXISTS busqueda TEXT GENERATED ALWAYS AS (
+        public.normalizar_busqueda(
+            coalesce(nombre, '') || ' ' ||
+            coalesce(apellido_paterno, '') || ' ' ||
+            coalesce(apellido_materno, '') || ' ' ||
+            coalesce(curp, '') || ' ' ||
+            coalesce(rfc, '') || ' ' ||
+            coalesce(clave, '')
+        )
+    ) STORED;
+
+COMMENT ON COLUMN public.empleados.busqueda IS
+    'Texto normalizado para búsqueda por trigramas (generado)';
+
+-- Subcadena (LIKE '%t%'), prefijo de palabra y similitud por palabra (<%)
+CREATE INDEX IF NOT EXISTS idx_empleados_busqueda_trgm
+    ON public.empleados USING gin (busqueda gin_trgm_ops);
+
+-- Caminos exactos de buscar_rankeado (CURP y clave ya tienen índice en 007)
+CREATE INDEX IF NOT EXISTS idx_empleados_rfc
+    ON public.empleados (rfc);
+
+-- =============================================================================
+-- 2. Búsqueda rankeada
+-- =============================================================================
+-- Orden: primero los que tienen una palabra que empieza con el texto
+-- ("mar" -> "MARÍA", "MARTÍNEZ"), luego por similitud de palabra, y al
+-- final por apellido para que el orden sea estable entre páginas.
+-- SECURITY INVOKER (default): respeta las políticas RLS de empleados.
+
+CREATE OR REPLACE FUNCTION public.buscar_empleados_rankeado(
+    p_texto TEXT,
+    p_empresa_id INTEGER DEFAULT NULL,
+    p_limite INTEGER DEFAULT 20,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS SETOF public.empleados
+LANGUAGE sql
+STABLE
+AS $$
+    WITH q AS (SELECT public.normalizar_busqueda(p_texto) AS t)
+    SELECT e.*
+    FROM public.empleados e, q
+    WHERE q.t <> ''
+      AND (p_empresa_id IS NULL OR e.empresa_id = p_empresa_id)
+      AND (e.busqueda LIKE '%' || q.t || '%' OR q.t <% e.busqueda)
+    ORDER BY
+        (e.busqueda LIKE q.t || '%' OR e.busqueda LIKE '% ' || q.t || '%') DESC,
+        word_similarity(q.t, e.busqueda) DESC,
+        e.apellido_paterno,
+        e.id
+    LIMIT p_limite
+    OFFSET p_offset;
+$$;
+
+COMMENT ON FUNCTION public.buscar_empleados_rankeado(TEXT, INTEGER, INTEGER, INTEGER) IS
+    'Búsqueda de empleados insensible a acentos, con prefijo de palabra y ranking por similitud';
+
+-- =============================================================================
+-- Rollback
+-- =============================================================================
+-- DROP FUNCTION IF EXISTS public.buscar_empleados_rankeado(TEXT, INTEGER, INTEGER, INTEGER);
+-- DROP INDEX IF EXISTS idx_empleados_rfc;
+-- DROP INDEX IF EXISTS idx_empleados_busqueda_trgm;
+-- ALTER TABLE public.empleados DROP COLUMN IF EXISTS busqueda;
+-- DROP FUNCTION IF EXISTS public.normalizar_busqueda(TEXT);
@@ -0,0 +1,115 @@
+-- =============================================================================
+-- Migration 051: Conteos y sumas por estatus agrupados en la BD
+-- =============================================================================
+-- Descripcion: Los totales de plazas por contrato, las estadísticas de
+--              entregables (global, por empresa y por contrato) y los totales
+--              de pagos se calculaban leyendo todas las filas y contando en
+--              Python; el dashboard además lo repetía contrato por contrato.
+--              Estas funciones regresan una fila por (contrato, estatus) con
+--              COUNT/SUM, para uno, varios o todos los contratos:
+--                - totales_plazas_por_contrato
+--                - conteo_entregables_por_estatus
+--                - totales_pagos_por_contrato
+--              Las usan PlazaRepository.obtener_totales_por_contratos,
+--              EntregableRepository (estadísticas) y
+--              PagoRepository.obtener_totales_por_contratos; si la función
+--              aún no existe, los repositorios agregan en Python.
+-- Dependencias: plazas, contrato_categorias, entregables, contratos, pagos
+-- Idempotente: Sí (CREATE OR REPLACE)
+-- =============================================================================
+
+-- SECURITY INVOKER (default) en todas: respetan las políticas RLS.
+-- p_contrato_ids NULL = todos los contratos.
+
+-- =============================================================================
+-- 1. Plazas por contrato y estatus
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION public.totales_plazas_por_contrato(
+    p_contrato_ids INTEGER[] DEFAULT NULL
+)
+RETURNS TABLE (
+    contrato_id INTEGER,
+    estatus TEXT,
+    total BIGINT,
+    salario_total NUMERIC
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT cc.contrato_id, p.estatus::text, count(*), coalesce(sum(p.salario_mensual), 0)
+    FROM public.plazas p
+    JOIN public.contrato_categorias cc ON cc.id = p.contrato_categoria_id
+    WHERE p_contrato_ids IS NULL OR cc.contrato_id = ANY(p_contrato_ids)
+    GROUP BY cc.contrato_id, p.estatus;
+$$;
+
+COMMENT ON FUNCTION public.totales_plazas_por_contrato(INTEGER[]) IS
+    'Plazas y suma de salario mensual por contrato y estatus';
+
+-- =============================================================================
+-- 2. Entregables por estatus
+-- =============================================================================
+-- Con p_por_contrato = false se agrupa sólo por estatus (contrato_id NULL),
+-- para las estadísticas globales y por empresa.
+
+CREATE OR REPLACE FUNCTION public.conteo_entregables_por_estatus(
+    p_contrato_ids INTEGER[] DEFAULT NULL,
+    p_empresa_id INTEGER DEFAULT NULL,
+    p_por_contrato BOOLEAN DEFAULT true
+)
+RETURNS TABLE (
+    contrato_id INTEGER,
+    estatus TEXT,
+    total BIGINT,
+    monto_aprobado NUMERIC
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        CASE WHEN p_por_contrato THEN e.contrato_id END,
+        e.estatus::text,
+        count(*),
+        coalesce(sum(e.monto_aprobado), 0)
+    FROM public.entregables e
+    JOIN public.contratos c ON c.id = e.contrato_id
+    WHERE (p_contrato_ids IS NULL OR e.contrato_id = ANY(p_contrato_ids))
+      AND (p_empresa_id IS NULL OR c.empresa_id = p_empresa_id)
+    GROUP BY 1, e.estatus;
+$$;
+
+COMMENT ON FUNCTION public.conteo_entregables_por_estatus(INTEGER[], INTEGER, BOOLEAN) IS
+    'Entregables y suma de monto aprobado por estatus (y contrato)';
+
+-- =============================================================================
+-- 3. Pagos por contrato
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION public.totales_pagos_por_contrato(
+    p_contrato_ids INTEGER[],
+    p_estatus TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    contrato_id INTEGER,
+    total NUMERIC
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT p.contrato_id, coalesce(sum(p.monto), 0)
+    FROM public.pagos p
+    WHERE p.contrato_id = ANY(p_contrato_ids)
+      AND (p_estatus IS NULL OR p.estatus::text = p_estatus)
+    GROUP BY p.contrato_id;
+$$;
+
+COMMENT ON FUNCTION public.totales_pagos_por_contrato(INTEGER[], TEXT) IS
+    'Suma de pagos por contrato, opcionalmente de un estatus';
+
+-- =============================================================================
+-- Rollback
+-- =============================================================================
+-- DROP FUNCTION IF EXISTS public.totales_pagos_por_contrato(INTEGER[], TEXT);
+-- DROP FUNCTION IF EXISTS public.conteo_entregables_por_estatus(INTEGER[], INTEGER, BOOLEAN);
+-- DROP FUNCTION IF EXISTS public.totales_plazas_por_contrato(INTEGER[]);
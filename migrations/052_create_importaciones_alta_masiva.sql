@@ -0,0 +1,104 @@
+-- =============================================================================
+-- Migration 052: Importaciones de alta masiva en segundo plano
+-- =============================================================================
+-- Descripcion: La alta masiva se procesaba dentro de un solo evento de
+--              Reflex: un archivo grande ocupaba el websocket y si la
+--              conexion se caia el trabajo se perdia. Cada importacion
+--              confirmada se guarda aqui con sus registros validados y un
+--              cursor; ImportacionAltaMasivaService la procesa por lotes en
+--              segundo plano, guarda el avance tras cada lote y la reanuda
+--              desde el ultimo lote confirmado tras un reinicio.
+--                - clave_idempotencia: hash de empresa + archivo; volver a
+--                  enviar el mismo archivo regresa la misma importacion.
+--                - intentos / latido: un proceso la toma incrementando
+--                  intentos (UPDATE condicionado al valor leido) y renueva
+--                  latido con cada lote; si el latido vence, otro proceso
+--                  puede retomarla.
+-- Dependencias: 000_create_empresas, 015_create_user_auth_tables
+-- Idempotente: Si
+-- =============================================================================
+
+-- 1. Enum: estatus de la importacion
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'estatus_importacion') THEN
+        CREATE TYPE estatus_importacion AS ENUM (
+            'PENDIENTE',
+            'PROCESANDO',
+            'COMPLETADA',
+            'FALLIDA'
+        );
+    END IF;
+END $$;
+
+-- 2. Tabla
+CREATE TABLE IF NOT EXISTS public.importaciones_alta_masiva (
+    id SERIAL PRIMARY KEY,
+    empresa_id INTEGER NOT NULL REFERENCES public.empresas(id) ON DELETE CASCADE,
+    clave_idempotencia TEXT NOT NULL,
+    nombre_archivo TEXT NOT NULL DEFAULT '',
+    estatus estatus_importacion NOT NULL DEFAULT 'PENDIENTE',
+
+    -- Archivo validado: filas leidas y registros por procesar (en orden)
+    total_filas INTEGER NOT NULL DEFAULT 0,
+    registros JSONB NOT NULL DEFAULT '[]'::jsonb,
+    total_registros INTEGER NOT NULL DEFAULT 0,
+
+    -- Avance: registros[0:cursor] ya confirmados
+    cursor INTEGER NOT NULL DEFAULT 0,
+    creados INTEGER NOT NULL DEFAULT 0,
+    reingresados INTEGER NOT NULL DEFAULT 0,
+    errores INTEGER NOT NULL DEFAULT 0,
+    detalles JSONB NOT NULL DEFAULT '[]'::jsonb,
+    error TEXT,
+
+    -- Ejecucion
+    intentos INTEGER NOT NULL DEFAULT 0,
+    latido TIMESTAMPTZ,
+
+    fecha_creacion TIMESTAMPTZ DEFAULT NOW(),
+    fecha_actualizacion TIMESTAMPTZ DEFAULT NOW(),
+
+    CONSTRAINT uk_importaciones_clave UNIQUE (clave_idempotencia),
+    CONSTRAINT chk_importaciones_cursor CHECK (cursor >= 0 AND cursor <= total_registros)
+);
+
+-- 3. Indices
+CREATE INDEX IF NOT EXISTS idx_importaciones_empresa
+    ON public.importaciones_alta_masiva(empresa_id, fecha_creacion DESC);
+
+-- Importaciones por reanudar
+CREATE INDEX IF NOT EXISTS idx_importaciones_activas
+    ON public.importaciones_alta_masiva(estatus)
+    WHERE estatus IN ('PENDIENTE', 'PROCESANDO');
+
+-- 4. Trigger para fecha_actualizacion
+DROP TRIGGER IF EXISTS tr_importaciones_alta_masiva_updated ON public.importaciones_alta_masiva;
+CREATE TRIGGER tr_importaciones_alta_masiva_updated
+    BEFORE UPDATE ON public.importaciones_alta_masiva
+    FOR EACH ROW
+    EXECUTE FUNCTION update_fecha_actualizacion();
+
+COMMENT ON TABLE public.importaciones_alta_masiva
+    IS 'Importaciones de alta masiva procesadas por lotes en segundo plano (reanudables)';
+COMMENT ON COLUMN public.importaciones_alta_masiva.clave_idempotencia
+    IS 'sha256 de empresa + contenido del archivo: reenviar el mismo archivo no duplica altas';
+
+-- 5. RLS
+ALTER TABLE public.importaciones_alta_masiva ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS importaciones_service_all ON public.importaciones_alta_masiva;
+CREATE POLICY importaciones_service_all ON public.importaciones_alta_masiva
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+DROP POLICY IF EXISTS importaciones_empresa_all ON public.importaciones_alta_masiva;
+CREATE POLICY importaciones_empresa_all ON public.importaciones_alta_masiva
+    FOR ALL TO authenticated
+    USING (is_admin() OR empresa_id = ANY(get_user_companies()))
+    WITH CHECK (is_admin() OR empresa_id = ANY(get_user_companies()));
+
+-- =============================================================================
+-- Rollback
+-- =============================================================================
+-- DROP TABLE IF EXISTS public.importaciones_alta_masiva;
+-- DROP TYPE IF EXISTS estatus_importacion;
@@ -0,0 +1,98 @@
+-- =============================================================================
+-- Migration 053: Guardado atomico del calculo de nominas por lote
+-- =============================================================================
+-- Descripcion: NominaCalculoService (modo lote) escribia cada bloque de
+--              nominas con un DELETE de movimientos SISTEMA, un INSERT de
+--              los nuevos y un UPSERT por id de los totales, en tres
+--              peticiones independientes:
+--                - el UPSERT reenviaba las columnas NOT NULL leidas al inicio
+--                  del calculo: revertia cambios hechos mientras tanto (p. ej.
+--                  salario_diario), re-insertaba nominas borradas y exigia
+--                  permiso de INSERT;
+--                - si el INSERT o los totales fallaban tras el DELETE, la
+--                  nomina conservaba su huella_calculo anterior y el modo
+--                  incremental la daba por vigente sin movimientos SISTEMA.
+--              Esta funcion hace las tres escrituras en una sola transaccion
+--              y sólo actualiza las columnas de totales; las nominas que ya
+--              no existen se ignoran. Si la funcion aun no existe, el
+--              servicio hace las escrituras por separado, borrando antes la
+--              huella del bloque (ver _persistir_sin_funcion).
+-- Dependencias: 043_create_modulo_nominas_operacion, 048_add_huella_calculo_nomina
+-- Idempotente: Si (CREATE OR REPLACE)
+-- =============================================================================
+
+-- Version anterior de esta migracion (solo totales)
+DROP FUNCTION IF EXISTS public.actualizar_totales_nominas(JSONB);
+
+-- SECURITY INVOKER (default): respeta las politicas RLS de ambas tablas.
+CREATE OR REPLACE FUNCTION public.guardar_calculo_nominas(
+    p_totales JSONB,
+    p_movimientos JSONB DEFAULT '[]'::JSONB
+)
+RETURNS TABLE (id INTEGER)
+LANGUAGE plpgsql
+VOLATILE
+AS $$
+#variable_conflict use_column
+BEGIN
+    -- 1. Movimientos SISTEMA anteriores de las nominas del bloque
+    DELETE FROM public.nomina_movimientos m
+    USING jsonb_to_recordset(p_totales) AS t(id INTEGER)
+    WHERE m.nomina_empleado_id = t.id
+      AND m.origen = 'SISTEMA'
+      AND m.es_automatico;
+
+    -- 2. Movimientos SISTEMA recien calculados
+    INSERT INTO public.nomina_movimientos (
+        nomina_empleado_id, concepto_id, tipo, origen,
+        monto, monto_gravable, monto_exento, es_automatico
+    )
+    SELECT r.nomina_empleado_id,
+           r.concepto_id,
+           r.tipo::tipo_concepto_nomina,
+           r.origen::origen_movimiento_nomina,
+           r.monto,
+           r.monto_gravable,
+           r.monto_exento,
+           r.es_automatico
+    FROM jsonb_to_recordset(p_movimientos) AS r(
+        nomina_empleado_id INTEGER,
+        concepto_id INTEGER,
+        tipo TEXT,
+        origen TEXT,
+        monto NUMERIC,
+        monto_gravable NUMERIC,
+        monto_exento NUMERIC,
+        es_automatico BOOLEAN
+    );
+
+    -- 3. Solo las columnas de totales (y la huella del calculo)
+    RETURN QUERY
+    UPDATE public.nominas_empleado n
+    SET total_percepciones = t.total_percepciones,
+        total_deducciones = t.total_deducciones,
+        total_otros_pagos = t.total_otros_pagos,
+        total_neto = t.total_neto,
+        huella_calculo = t.huella_calculo,
+        estatus = t.estatus::estatus_nomina_empleado
+    FROM jsonb_to_recordset(p_totales) AS t(
+        id INTEGER,
+        total_percepciones NUMERIC,
+        total_deducciones NUMERIC,
+        total_otros_pagos NUMERIC,
+        total_neto NUMERIC,
+        huella_calculo TEXT,
+        estatus TEXT
+    )
+    WHERE n.id = t.id
+    RETURNING n.id;
+END;
+$$;
+
+COMMENT ON FUNCTION public.guardar_calculo_nominas(JSONB, JSONB) IS
+    'Reemplaza los movimientos SISTEMA y actualiza los totales de varias nominas_empleado en una transaccion (p_totales: [{id, total_*, huella_calculo, estatus}], p_movimientos: filas de nomina_movimientos); regresa los ids actualizados';
+
+-- =============================================================================
+-- Rollback
+-- =============================================================================
+-- DROP FUNCTION IF EXISTS public.guardar_calculo_nominas(JSONB, JSONB);